@@ -0,0 +1,34 @@
+"""Composite indexes for keyset listing of audit logs, files and notifications
+
+Revision ID: 3f1c2a9d7b10
+Revises:
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3f1c2a9d7b10"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_audit_logs_org_created_id", "audit_logs", ["organization_id", "created_at", "id"]),
+    ("ix_files_org_created_id", "files", ["organization_id", "created_at", "id"]),
+    ("ix_notifications_user_created_id", "notifications", ["user_id", "created_at", "id"]),
+]
+
+
+def upgrade():
+    # CONCURRENTLY keeps large tables writable while the index builds on Postgres;
+    # it cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
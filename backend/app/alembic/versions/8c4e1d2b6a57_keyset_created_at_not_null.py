@@ -0,0 +1,34 @@
+"""Make created_at NOT NULL on the keyset-listed tables
+
+Keyset cursors are built from (created_at, id), so a row without a timestamp
+could neither be encoded in a cursor nor ordered against one. Existing NULLs
+are backfilled with the migration time.
+
+Revision ID: 8c4e1d2b6a57
+Revises: 3f1c2a9d7b10
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8c4e1d2b6a57"
+down_revision = "3f1c2a9d7b10"
+branch_labels = None
+depends_on = None
+
+TABLES = ["audit_logs", "files", "notifications"]
+
+
+def upgrade():
+    for table in TABLES:
+        op.execute(f"UPDATE {table} SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL")
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column("created_at", existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade():
+    for table in TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column("created_at", existing_type=sa.DateTime(), nullable=True)
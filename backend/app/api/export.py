@@ -0,0 +1,32 @@
+from typing import AsyncIterator, Callable, List
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import AsyncSessionLocal, get_async_engine
+
+
+def _dump(schema, row) -> str:
+    if hasattr(schema, "model_validate"):
+        return schema.model_validate(row, from_attributes=True).model_dump_json()
+    return schema.from_orm(row).json()
+
+
+async def _ndjson_lines(batches: Callable[[AsyncSession], AsyncIterator[List]], schema) -> AsyncIterator[str]:
+    # The export outlives the request's dependencies, so it holds its own session
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        async for rows in batches(db):
+            yield "".join(_dump(schema, row) + "\n" for row in rows)
+
+
+def ndjson_response(batches: Callable[[AsyncSession], AsyncIterator[List]], schema, filename: str) -> StreamingResponse:
+    """
+    Streams every row produced by ``batches`` (a function of a session
+    yielding lists of ORM rows) as newline-delimited JSON, one batch per chunk.
+    """
+    return StreamingResponse(
+        _ndjson_lines(batches, schema),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -1,30 +1,52 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from app.schemas.audit_log import AuditLogOut, AuditLogCreate
-from app.crud.audit_log import get_audit_log, get_audit_logs_for_org, create_audit_log, delete_audit_log
-from app.api.deps import get_db
+from app.crud.audit_log import get_audit_log_async, get_audit_logs_page_async, iter_audit_logs_async, create_audit_log_async, delete_audit_log_async
+from app.crud.pagination import InvalidCursor
+from app.api.deps import get_async_db
+from app.api.export import ndjson_response
 
 router = APIRouter()
 
 @router.get("/", response_model=List[AuditLogOut])
-def list_audit_logs(organization_id: int, db: Session = Depends(get_db)):
-    return get_audit_logs_for_org(db, organization_id=organization_id)
+async def list_audit_logs(
+    response: Response,
+    organization_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        logs, next_cursor = await get_audit_logs_page_async(db, organization_id=organization_id, cursor=cursor, limit=limit)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return logs
+
+@router.get("/export")
+async def export_audit_logs(organization_id: int):
+    return ndjson_response(
+        lambda db: iter_audit_logs_async(db, organization_id=organization_id),
+        AuditLogOut,
+        f"audit_log_org_{organization_id}.ndjson",
+    )
 
 @router.get("/{log_id}", response_model=AuditLogOut)
-def retrieve_audit_log(log_id: int, db: Session = Depends(get_db)):
-    log = get_audit_log(db, log_id)
+async def retrieve_audit_log(log_id: int, db: AsyncSession = Depends(get_async_db)):
+    log = await get_audit_log_async(db, log_id)
     if not log:
         raise HTTPException(status_code=404, detail="Audit log not found")
     return log
 
 @router.post("/", response_model=AuditLogOut)
-def create_audit_log_api(log_in: AuditLogCreate, db: Session = Depends(get_db)):
-    return create_audit_log(db, log=log_in)
+async def create_audit_log_api(log_in: AuditLogCreate, db: AsyncSession = Depends(get_async_db)):
+    return await create_audit_log_async(db, log=log_in)
 
 @router.delete("/{log_id}")
-def delete_audit_log_api(log_id: int, db: Session = Depends(get_db)):
-    db_log = get_audit_log(db, log_id)
+async def delete_audit_log_api(log_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_log = await get_audit_log_async(db, log_id)
     if not db_log:
         raise HTTPException(status_code=404, detail="Audit log not found")
-    return delete_audit_log(db, db_log)
+    return await delete_audit_log_async(db, db_log)
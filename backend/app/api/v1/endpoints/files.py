@@ -1,37 +1,65 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File as FastAPIFile
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile, File as FastAPIFile
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from app.schemas.file import FileOut, FileCreate
-from app.crud.file import get_file, get_files_for_org, get_files_for_user, create_file, delete_file
-from app.api.deps import get_db, get_current_user
+from app.crud.file import get_file_async, get_files_page_async, iter_files_async, get_files_for_user_async, create_file_async, delete_file_async
+from app.crud.pagination import InvalidCursor
+from app.api.deps import get_async_db, get_current_user
+from app.api.export import ndjson_response
 import shutil
 import os
 
 router = APIRouter()
 
+def _store_upload(upload: UploadFile, upload_dir: str) -> str:
+    os.makedirs(upload_dir, exist_ok=True)
+    file_path = os.path.join(upload_dir, upload.filename)
+    with open(file_path, "wb") as buffer:
+        shutil.copyfileobj(upload.file, buffer)
+    return file_path
+
 @router.get("/", response_model=List[FileOut])
-def list_files(organization_id: int, db: Session = Depends(get_db)):
-    return get_files_for_org(db, organization_id=organization_id)
+async def list_files(
+    response: Response,
+    organization_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        files, next_cursor = await get_files_page_async(db, organization_id=organization_id, cursor=cursor, limit=limit)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return files
+
+@router.get("/export")
+async def export_files(organization_id: int):
+    return ndjson_response(
+        lambda db: iter_files_async(db, organization_id=organization_id),
+        FileOut,
+        f"files_org_{organization_id}.ndjson",
+    )
 
 @router.get("/{file_id}", response_model=FileOut)
-def retrieve_file(file_id: int, db: Session = Depends(get_db)):
-    file = get_file(db, file_id)
+async def retrieve_file(file_id: int, db: AsyncSession = Depends(get_async_db)):
+    file = await get_file_async(db, file_id)
     if not file:
         raise HTTPException(status_code=404, detail="File not found")
     return file
 
 @router.post("/", response_model=FileOut)
-def upload_file(
+async def upload_file(
     organization_id: int,
     owner_id: int,
     upload: UploadFile = FastAPIFile(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     upload_dir = f"./app/static/files/org_{organization_id}"
-    os.makedirs(upload_dir, exist_ok=True)
-    file_path = os.path.join(upload_dir, upload.filename)
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(upload.file, buffer)
+    # Blocking disk I/O stays off the event loop
+    file_path = await run_in_threadpool(_store_upload, upload, upload_dir)
     file_in = FileCreate(
         filename=upload.filename,
         size=os.path.getsize(file_path),
@@ -39,11 +67,11 @@ def upload_file(
         organization_id=organization_id,
         path=file_path,
     )
-    return create_file(db, file=file_in)
+    return await create_file_async(db, file=file_in)
 
 @router.delete("/{file_id}")
-def delete_file_api(file_id: int, db: Session = Depends(get_db)):
-    db_file = get_file(db, file_id)
+async def delete_file_api(file_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_file = await get_file_async(db, file_id)
     if not db_file:
         raise HTTPException(status_code=404, detail="File not found")
-    return delete_file(db, db_file)
+    return await delete_file_async(db, db_file)
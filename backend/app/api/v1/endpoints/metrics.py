@@ -0,0 +1,8 @@
+from fastapi import APIRouter
+from app.db.session import get_pool_metrics
+
+router = APIRouter()
+
+@router.get("/db-pool")
+def db_pool_metrics():
+    return get_pool_metrics()
@@ -1,37 +1,60 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from app.schemas.notification import NotificationOut, NotificationCreate
-from app.crud.notification import get_notification, get_notifications_for_user, create_notification, mark_notification_read, delete_notification
-from app.api.deps import get_db, get_current_user
+from app.crud.notification import get_notification_async, get_notifications_page_async, iter_notifications_async, create_notification_async, mark_notification_read_async, delete_notification_async
+from app.crud.pagination import InvalidCursor
+from app.api.deps import get_async_db, get_current_user
+from app.api.export import ndjson_response
 
 router = APIRouter()
 
 @router.get("/", response_model=List[NotificationOut])
-def list_notifications(db: Session = Depends(get_db), current_user=Depends(get_current_user)):
-    return get_notifications_for_user(db, user_id=current_user.id)
+async def list_notifications(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user)
+):
+    try:
+        notifs, next_cursor = await get_notifications_page_async(db, user_id=current_user.id, cursor=cursor, limit=limit)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return notifs
+
+@router.get("/export")
+async def export_notifications(current_user=Depends(get_current_user)):
+    user_id = current_user.id
+    return ndjson_response(
+        lambda db: iter_notifications_async(db, user_id=user_id),
+        NotificationOut,
+        f"notifications_user_{user_id}.ndjson",
+    )
 
 @router.get("/{notif_id}", response_model=NotificationOut)
-def retrieve_notification(notif_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
-    notif = get_notification(db, notif_id)
+async def retrieve_notification(notif_id: int, db: AsyncSession = Depends(get_async_db), current_user=Depends(get_current_user)):
+    notif = await get_notification_async(db, notif_id)
     if not notif:
         raise HTTPException(status_code=404, detail="Notification not found")
     return notif
 
 @router.post("/", response_model=NotificationOut)
-def create_notification_api(notif_in: NotificationCreate, db: Session = Depends(get_db)):
-    return create_notification(db, notif=notif_in)
+async def create_notification_api(notif_in: NotificationCreate, db: AsyncSession = Depends(get_async_db)):
+    return await create_notification_async(db, notif=notif_in)
 
 @router.post("/{notif_id}/mark-read", response_model=NotificationOut)
-def mark_read_api(notif_id: int, db: Session = Depends(get_db)):
-    notif = get_notification(db, notif_id)
+async def mark_read_api(notif_id: int, db: AsyncSession = Depends(get_async_db)):
+    notif = await get_notification_async(db, notif_id)
     if not notif:
         raise HTTPException(status_code=404, detail="Notification not found")
-    return mark_notification_read(db, notif)
+    return await mark_notification_read_async(db, notif)
 
 @router.delete("/{notif_id}")
-def delete_notification_api(notif_id: int, db: Session = Depends(get_db)):
-    notif = get_notification(db, notif_id)
+async def delete_notification_api(notif_id: int, db: AsyncSession = Depends(get_async_db)):
+    notif = await get_notification_async(db, notif_id)
     if not notif:
         raise HTTPException(status_code=404, detail="Notification not found")
-    return delete_notification(db, notif)
+    return await delete_notification_async(db, notif)
@@ -3,6 +3,16 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+def async_database_uri(uri: str) -> str:
+    """Maps a sync database URL to its asyncio driver (asyncpg / aiosqlite)."""
+    scheme, sep, rest = uri.partition("://")
+    driver = {
+        "postgresql": "postgresql+asyncpg",
+        "postgresql+psycopg2": "postgresql+asyncpg",
+        "sqlite": "sqlite+aiosqlite",
+    }.get(scheme, scheme)
+    return f"{driver}{sep}{rest}"
+
 class Settings:
     PROJECT_NAME: str = "AI-OS"
     VERSION: str = "1.0.0"
@@ -14,9 +24,18 @@ class Settings:
     POSTGRES_USER: str = os.getenv("POSTGRES_USER", "postgres")
     POSTGRES_PASSWORD: str = os.getenv("POSTGRES_PASSWORD", "postgres")
     POSTGRES_DB: str = os.getenv("POSTGRES_DB", "aios")
-    SQLALCHEMY_DATABASE_URI: str = (
+    SQLALCHEMY_DATABASE_URI: str = os.getenv(
+        "SQLALCHEMY_DATABASE_URI",
         f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}/{POSTGRES_DB}"
     )
+    ASYNC_SQLALCHEMY_DATABASE_URI: str = os.getenv(
+        "ASYNC_SQLALCHEMY_DATABASE_URI", async_database_uri(SQLALCHEMY_DATABASE_URI)
+    )
+    # Connection pool sizing, shared by the sync and async engines (each gets its own pool)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
     EMAILS_FROM_EMAIL: str = os.getenv("EMAILS_FROM_EMAIL", "noreply@example.com")
     EMAILS_FROM_NAME: str = os.getenv("EMAILS_FROM_NAME", "AI-OS")
     SMTP_HOST: str = os.getenv("SMTP_HOST", "localhost")
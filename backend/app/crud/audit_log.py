@@ -1,5 +1,9 @@
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.db.models.audit_log import AuditLog
+from app.crud.pagination import iter_keyset_async, keyset_page_async
 from app.schemas.audit_log import AuditLogCreate
 
 def get_audit_log(db: Session, log_id: int):
@@ -24,3 +28,31 @@ def delete_audit_log(db: Session, db_log: AuditLog):
     db.delete(db_log)
     db.commit()
     return db_log
+
+async def get_audit_log_async(db: AsyncSession, log_id: int):
+    result = await db.execute(select(AuditLog).where(AuditLog.id == log_id))
+    return result.scalars().first()
+
+async def get_audit_logs_page_async(db: AsyncSession, organization_id: int, cursor: Optional[str] = None, limit: int = 100):
+    return await keyset_page_async(db, select(AuditLog).where(AuditLog.organization_id == organization_id), AuditLog, cursor, limit)
+
+async def iter_audit_logs_async(db: AsyncSession, organization_id: int, batch_size: int = 1000):
+    async for rows in iter_keyset_async(db, select(AuditLog).where(AuditLog.organization_id == organization_id), AuditLog, batch_size):
+        yield rows
+
+async def create_audit_log_async(db: AsyncSession, log: AuditLogCreate):
+    db_log = AuditLog(
+        action=log.action,
+        user_id=log.user_id,
+        organization_id=log.organization_id,
+        detail=log.detail,
+    )
+    db.add(db_log)
+    await db.commit()
+    await db.refresh(db_log)
+    return db_log
+
+async def delete_audit_log_async(db: AsyncSession, db_log: AuditLog):
+    await db.delete(db_log)
+    await db.commit()
+    return db_log
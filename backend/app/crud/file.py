@@ -1,5 +1,9 @@
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.db.models.file import File
+from app.crud.pagination import iter_keyset_async, keyset_page_async
 from app.schemas.file import FileCreate
 
 def get_file(db: Session, file_id: int):
@@ -30,3 +34,38 @@ def delete_file(db: Session, db_file: File):
     db.commit()
     db.refresh(db_file)
     return db_file
+
+async def get_file_async(db: AsyncSession, file_id: int):
+    result = await db.execute(select(File).where(File.id == file_id))
+    return result.scalars().first()
+
+async def get_files_page_async(db: AsyncSession, organization_id: int, cursor: Optional[str] = None, limit: int = 100):
+    return await keyset_page_async(db, select(File).where(File.organization_id == organization_id), File, cursor, limit)
+
+async def iter_files_async(db: AsyncSession, organization_id: int, batch_size: int = 1000):
+    async for rows in iter_keyset_async(db, select(File).where(File.organization_id == organization_id), File, batch_size):
+        yield rows
+
+async def get_files_for_user_async(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100):
+    result = await db.execute(select(File).where(File.owner_id == user_id).offset(skip).limit(limit))
+    return result.scalars().all()
+
+async def create_file_async(db: AsyncSession, file: FileCreate):
+    db_file = File(
+        filename=file.filename,
+        size=file.size,
+        owner_id=file.owner_id,
+        organization_id=file.organization_id,
+        path=file.path,
+        is_deleted=file.is_deleted,
+    )
+    db.add(db_file)
+    await db.commit()
+    await db.refresh(db_file)
+    return db_file
+
+async def delete_file_async(db: AsyncSession, db_file: File):
+    db_file.is_deleted = True
+    await db.commit()
+    await db.refresh(db_file)
+    return db_file
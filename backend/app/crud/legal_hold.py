@@ -1,3 +1,5 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.db.models.legal_hold import LegalHold
 from app.schemas.legal_hold import LegalHoldCreate
@@ -29,3 +31,33 @@ def delete_legal_hold(db: Session, db_hold: LegalHold):
     db.delete(db_hold)
     db.commit()
     return db_hold
+
+async def get_legal_hold_async(db: AsyncSession, hold_id: int):
+    result = await db.execute(select(LegalHold).where(LegalHold.id == hold_id))
+    return result.scalars().first()
+
+async def get_legal_holds_for_org_async(db: AsyncSession, organization_id: int, skip: int = 0, limit: int = 100):
+    result = await db.execute(select(LegalHold).where(LegalHold.organization_id == organization_id).offset(skip).limit(limit))
+    return result.scalars().all()
+
+async def create_legal_hold_async(db: AsyncSession, hold: LegalHoldCreate):
+    db_hold = LegalHold(
+        organization_id=hold.organization_id,
+        file_id=hold.file_id,
+        active=hold.active
+    )
+    db.add(db_hold)
+    await db.commit()
+    await db.refresh(db_hold)
+    return db_hold
+
+async def release_legal_hold_async(db: AsyncSession, db_hold: LegalHold):
+    db_hold.active = False
+    await db.commit()
+    await db.refresh(db_hold)
+    return db_hold
+
+async def delete_legal_hold_async(db: AsyncSession, db_hold: LegalHold):
+    await db.delete(db_hold)
+    await db.commit()
+    return db_hold
@@ -1,3 +1,5 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.db.models.firewall import Firewall
 from app.schemas.firewall import FirewallCreate
@@ -34,3 +36,38 @@ def delete_firewall(db: Session, db_fw: Firewall):
     db.delete(db_fw)
     db.commit()
     return db_fw
+
+async def get_firewall_async(db: AsyncSession, fw_id: int):
+    result = await db.execute(select(Firewall).where(Firewall.id == fw_id))
+    return result.scalars().first()
+
+async def get_firewalls_for_org_async(db: AsyncSession, organization_id: int, skip: int = 0, limit: int = 100):
+    result = await db.execute(select(Firewall).where(Firewall.organization_id == organization_id).offset(skip).limit(limit))
+    return result.scalars().all()
+
+async def create_firewall_async(db: AsyncSession, fw: FirewallCreate):
+    db_fw = Firewall(
+        rule_name=fw.rule_name,
+        action=fw.action,
+        source=fw.source,
+        destination=fw.destination,
+        protocol=fw.protocol,
+        is_active=fw.is_active,
+        organization_id=fw.organization_id,
+    )
+    db.add(db_fw)
+    await db.commit()
+    await db.refresh(db_fw)
+    return db_fw
+
+async def update_firewall_async(db: AsyncSession, db_fw: Firewall, update_data: dict):
+    for field, value in update_data.items():
+        setattr(db_fw, field, value)
+    await db.commit()
+    await db.refresh(db_fw)
+    return db_fw
+
+async def delete_firewall_async(db: AsyncSession, db_fw: Firewall):
+    await db.delete(db_fw)
+    await db.commit()
+    return db_fw
@@ -1,5 +1,9 @@
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.db.models.notification import Notification
+from app.crud.pagination import iter_keyset_async, keyset_page_async
 from app.schemas.notification import NotificationCreate
 
 def get_notification(db: Session, notif_id: int):
@@ -30,3 +34,37 @@ def delete_notification(db: Session, notif: Notification):
     db.delete(notif)
     db.commit()
     return notif
+
+async def get_notification_async(db: AsyncSession, notif_id: int):
+    result = await db.execute(select(Notification).where(Notification.id == notif_id))
+    return result.scalars().first()
+
+async def get_notifications_page_async(db: AsyncSession, user_id: int, cursor: Optional[str] = None, limit: int = 100):
+    return await keyset_page_async(db, select(Notification).where(Notification.user_id == user_id), Notification, cursor, limit)
+
+async def iter_notifications_async(db: AsyncSession, user_id: int, batch_size: int = 1000):
+    async for rows in iter_keyset_async(db, select(Notification).where(Notification.user_id == user_id), Notification, batch_size):
+        yield rows
+
+async def create_notification_async(db: AsyncSession, notif: NotificationCreate):
+    db_notif = Notification(
+        message=notif.message,
+        user_id=notif.user_id,
+        organization_id=notif.organization_id,
+        read=notif.read,
+    )
+    db.add(db_notif)
+    await db.commit()
+    await db.refresh(db_notif)
+    return db_notif
+
+async def mark_notification_read_async(db: AsyncSession, notif: Notification):
+    notif.read = True
+    await db.commit()
+    await db.refresh(notif)
+    return notif
+
+async def delete_notification_async(db: AsyncSession, notif: Notification):
+    await db.delete(notif)
+    await db.commit()
+    return notif
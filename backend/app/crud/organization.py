@@ -1,3 +1,5 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.db.models.organization import Organization
 from app.schemas.organization import OrganizationCreate, OrganizationUpdate
@@ -33,3 +35,38 @@ def delete_organization(db: Session, db_org: Organization):
     db.delete(db_org)
     db.commit()
     return db_org
+
+async def get_organization_async(db: AsyncSession, org_id: int):
+    result = await db.execute(select(Organization).where(Organization.id == org_id))
+    return result.scalars().first()
+
+async def get_organization_by_name_async(db: AsyncSession, name: str):
+    result = await db.execute(select(Organization).where(Organization.name == name))
+    return result.scalars().first()
+
+async def get_organizations_async(db: AsyncSession, skip: int = 0, limit: int = 100):
+    result = await db.execute(select(Organization).offset(skip).limit(limit))
+    return result.scalars().all()
+
+async def create_organization_async(db: AsyncSession, org: OrganizationCreate):
+    db_org = Organization(
+        name=org.name,
+        display_name=org.display_name,
+        description=org.description,
+    )
+    db.add(db_org)
+    await db.commit()
+    await db.refresh(db_org)
+    return db_org
+
+async def update_organization_async(db: AsyncSession, db_org: Organization, org_update: OrganizationUpdate):
+    for field, value in org_update.dict(exclude_unset=True).items():
+        setattr(db_org, field, value)
+    await db.commit()
+    await db.refresh(db_org)
+    return db_org
+
+async def delete_organization_async(db: AsyncSession, db_org: Organization):
+    await db.delete(db_org)
+    await db.commit()
+    return db_org
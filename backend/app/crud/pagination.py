@@ -0,0 +1,64 @@
+import base64
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}") from e
+
+
+def keyset(stmt: Select, model, cursor: Optional[str], limit: int) -> Select:
+    """
+    Orders ``stmt`` newest first on (created_at, id) and resumes after
+    ``cursor``. With an index on (<filter column>, created_at, id) every page
+    is an index range scan, whatever its depth. Fetches one extra row to tell
+    whether another page follows.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+    return stmt.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+
+
+async def keyset_page_async(db: AsyncSession, stmt: Select, model, cursor: Optional[str] = None,
+                            limit: int = 100) -> Tuple[List, Optional[str]]:
+    """Returns one page of rows and the cursor of the next page (None on the last page)."""
+    result = await db.execute(keyset(stmt, model, cursor, limit))
+    rows = result.scalars().all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+
+async def iter_keyset_async(db: AsyncSession, stmt: Select, model, batch_size: int = 1000) -> AsyncIterator[List]:
+    """
+    Walks every row of ``stmt`` in keyset batches. Loaded rows are expunged
+    after each batch so memory stays bounded on large tables.
+    """
+    cursor = None
+    while True:
+        rows, cursor = await keyset_page_async(db, stmt, model, cursor, batch_size)
+        if rows:
+            yield rows
+        db.expunge_all()
+        if cursor is None:
+            return
@@ -1,3 +1,5 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.db.models.quota import Quota
 from app.schemas.quota import QuotaCreate
@@ -30,3 +32,34 @@ def delete_quota(db: Session, db_quota: Quota):
     db.delete(db_quota)
     db.commit()
     return db_quota
+
+async def get_quota_async(db: AsyncSession, quota_id: int):
+    result = await db.execute(select(Quota).where(Quota.id == quota_id))
+    return result.scalars().first()
+
+async def get_quotas_for_org_async(db: AsyncSession, organization_id: int):
+    result = await db.execute(select(Quota).where(Quota.organization_id == organization_id))
+    return result.scalars().all()
+
+async def create_quota_async(db: AsyncSession, input: QuotaCreate):
+    db_quota = Quota(
+        organization_id=input.organization_id,
+        resource=input.resource,
+        limit=input.limit,
+        used=input.used or 0
+    )
+    db.add(db_quota)
+    await db.commit()
+    await db.refresh(db_quota)
+    return db_quota
+
+async def update_quota_usage_async(db: AsyncSession, db_quota: Quota, used: int):
+    db_quota.used = used
+    await db.commit()
+    await db.refresh(db_quota)
+    return db_quota
+
+async def delete_quota_async(db: AsyncSession, db_quota: Quota):
+    await db.delete(db_quota)
+    await db.commit()
+    return db_quota
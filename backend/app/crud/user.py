@@ -1,3 +1,5 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.db.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
@@ -42,3 +44,47 @@ def delete_user(db: Session, db_user: User):
     db.delete(db_user)
     db.commit()
     return db_user
+
+async def get_user_async(db: AsyncSession, user_id: int):
+    result = await db.execute(select(User).where(User.id == user_id))
+    return result.scalars().first()
+
+async def get_user_by_username_async(db: AsyncSession, username: str):
+    result = await db.execute(select(User).where(User.username == username))
+    return result.scalars().first()
+
+async def get_user_by_email_async(db: AsyncSession, email: str):
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
+
+async def get_users_async(db: AsyncSession, skip: int = 0, limit: int = 100):
+    result = await db.execute(select(User).offset(skip).limit(limit))
+    return result.scalars().all()
+
+async def create_user_async(db: AsyncSession, user: UserCreate, org_id: int = None):
+    db_user = User(
+        username=user.username,
+        email=user.email,
+        full_name=user.full_name,
+        role=user.role,
+        hashed_password=hash_password(user.password),
+        is_active=True,
+        is_superuser=user.is_superuser,
+        organization_id=org_id
+    )
+    db.add(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
+
+async def update_user_async(db: AsyncSession, db_user: User, user_update: UserUpdate):
+    for field, value in user_update.dict(exclude_unset=True).items():
+        setattr(db_user, field, value)
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
+
+async def delete_user_async(db: AsyncSession, db_user: User):
+    await db.delete(db_user)
+    await db.commit()
+    return db_user
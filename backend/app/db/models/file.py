@@ -1,10 +1,11 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Index, Integer, String, DateTime, ForeignKey, Boolean
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base import Base
 
 class File(Base):
     __tablename__ = "files"
+    __table_args__ = (Index("ix_files_org_created_id", "organization_id", "created_at", "id"),)
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String, nullable=False)
     path = Column(String, nullable=False)
@@ -12,7 +13,7 @@ class File(Base):
     organization_id = Column(Integer, ForeignKey("organizations.id"))
     size = Column(Integer, nullable=False)
     is_deleted = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     owner = relationship("User", back_populates="files")
     organization = relationship("Organization", back_populates="files")
@@ -1,6 +1,112 @@
-from sqlalchemy import create_engine
+import threading
+from typing import Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, pool_pre_ping=True)
+
+def engine_options(url: str) -> dict:
+    """
+    Pool options for an engine on ``url``. SQLite in-memory databases use a
+    single-connection pool that does not accept sizing arguments.
+    """
+    options = {"pool_pre_ping": True}
+    if url.startswith("sqlite") and (":memory:" in url or url.rstrip("/").endswith(":")):
+        return options
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    return options
+
+
+class PoolMetrics:
+    """
+    Connection pool utilisation for one engine, fed by pool connect/checkout/
+    checkin events: connections currently in use, the peak, total checkouts
+    and physical connections opened.
+    """
+
+    def __init__(self, engine: Engine):
+        self.pool = engine.pool
+        self.lock = threading.Lock()
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.checkouts = 0
+        self.connects = 0
+
+        event.listen(self.pool, "connect", self._on_connect)
+        event.listen(self.pool, "checkout", self._on_checkout)
+        event.listen(self.pool, "checkin", self._on_checkin)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self.lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self.lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self.lock:
+            self.in_use = max(0, self.in_use - 1)
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            stats = {
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+            }
+        for name in ("size", "checkedin", "overflow"):
+            method = getattr(self.pool, name, None)
+            if callable(method):
+                stats[name] = method()
+        stats["pool"] = type(self.pool).__name__
+        return stats
+
+
+engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, **engine_options(settings.SQLALCHEMY_DATABASE_URI))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+pool_metrics = PoolMetrics(engine)
+
+_async_engine: Optional[AsyncEngine] = None
+_async_pool_metrics: Optional[PoolMetrics] = None
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Returns the asyncio engine, created on first use so that the async driver
+    (asyncpg / aiosqlite) is only required by code paths that use it.
+    """
+    global _async_engine, _async_pool_metrics
+    if _async_engine is None:
+        url = settings.ASYNC_SQLALCHEMY_DATABASE_URI
+        _async_engine = create_async_engine(url, **engine_options(url))
+        _async_pool_metrics = PoolMetrics(_async_engine.sync_engine)
+        AsyncSessionLocal.configure(bind=_async_engine)
+    return _async_engine
+
+
+async def dispose_async_engine():
+    global _async_engine, _async_pool_metrics
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_pool_metrics = None
+
+
+def get_pool_metrics() -> dict:
+    metrics = {"sync": pool_metrics.snapshot()}
+    if _async_pool_metrics is not None:
+        metrics["async"] = _async_pool_metrics.snapshot()
+    return metrics
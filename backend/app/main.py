@@ -1,6 +1,7 @@
 from fastapi import FastAPI
+from app.db.session import dispose_async_engine
 from app.api.v1.endpoints import (
-    auth, users, organizations, notifications, files, network, firewall, quota, audit_log, legal_hold
+    auth, users, organizations, notifications, files, network, firewall, quota, audit_log, legal_hold, metrics
 )
 
 app = FastAPI(title="AI-OS Backend", version="1.0.0")
@@ -16,3 +17,8 @@ app.include_router(firewall.router, prefix="/api/v1/firewall", tags=["firewall"]
 app.include_router(quota.router, prefix="/api/v1/quota", tags=["quota"])
 app.include_router(audit_log.router, prefix="/api/v1/audit-log", tags=["audit_log"])
 app.include_router(legal_hold.router, prefix="/api/v1/legal-hold", tags=["legal_hold"])
+app.include_router(metrics.router, prefix="/api/v1/metrics", tags=["metrics"])
+
+@app.on_event("shutdown")
+async def shutdown_db():
+    await dispose_async_engine()
@@ -2,16 +2,17 @@ from typing import Optional
 from pydantic import BaseModel
 from datetime import datetime
 
-class QuotaBase(BaseModel):
-    resource: str
-    limit: int
-    used: Optional[int] = 0
+class AuditLogBase(BaseModel):
+    action: str
+    detail: Optional[str] = None
 
-class QuotaCreate(QuotaBase):
+class AuditLogCreate(AuditLogBase):
+    user_id: int
     organization_id: int
 
-class QuotaOut(QuotaBase):
+class AuditLogOut(AuditLogBase):
     id: int
+    user_id: Optional[int] = None
     organization_id: int
     created_at: datetime
 
@@ -0,0 +1,42 @@
+# File: /backend/tests/conftest.py
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+# The backend reads its settings at import time, so point it at a throwaway
+# SQLite file (served through aiosqlite on the async path) before any import.
+BACKEND = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BACKEND)
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+os.environ.pop("ASYNC_SQLALCHEMY_DATABASE_URI", None)
+
+
+@pytest.fixture
+def tables():
+    from app.db.base import Base
+    from app.db.models import audit_log, file, notification, organization, user  # noqa: F401
+    from app.db.session import engine
+
+    Base.metadata.create_all(engine)
+    yield
+    Base.metadata.drop_all(engine)
+
+
+def make_app(*routers):
+    """A FastAPI app with only the given ``(router, prefix)`` pairs mounted."""
+    from fastapi import FastAPI
+
+    app = FastAPI()
+    for router, prefix in routers:
+        app.include_router(router, prefix=prefix)
+    return app
+
+
+async def request(app, method, path, **kwargs):
+    import httpx
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        return await client.request(method, path, **kwargs)
@@ -0,0 +1,55 @@
+# File: /backend/tests/test_async_db.py
+
+import asyncio
+
+from conftest import make_app, request
+
+
+def test_async_session_crud_round_trip(tables):
+    from app.api.deps import get_async_db
+    from app.crud.organization import create_organization_async, get_organization_by_name_async
+    from app.db.session import dispose_async_engine, get_async_engine
+    from app.schemas.organization import OrganizationCreate
+
+    async def scenario():
+        sessions = get_async_db()
+        db = await sessions.__anext__()
+        try:
+            created = await create_organization_async(db, OrganizationCreate(name="acme", display_name="Acme"))
+            assert created.id is not None
+            assert (await get_organization_by_name_async(db, "acme")).display_name == "Acme"
+            assert get_async_engine().url.drivername == "sqlite+aiosqlite"
+        finally:
+            await sessions.aclose()
+            await dispose_async_engine()
+
+    asyncio.run(scenario())
+
+
+def test_async_endpoints_and_pool_metrics(tables):
+    from app.api.v1.endpoints import metrics, organizations
+    from app.db.session import dispose_async_engine
+
+    app = make_app((organizations.router, "/api/v1/organizations"), (metrics.router, "/api/v1/metrics"))
+
+    async def scenario():
+        try:
+            created = await request(app, "POST", "/api/v1/organizations/", json={"name": "acme"})
+            assert created.status_code == 200
+            org_id = created.json()["id"]
+
+            updated = await request(app, "PATCH", f"/api/v1/organizations/{org_id}", json={"description": "d"})
+            assert updated.json()["description"] == "d"
+            listed = await request(app, "GET", "/api/v1/organizations/")
+            assert [org["name"] for org in listed.json()] == ["acme"]
+            assert (await request(app, "POST", "/api/v1/organizations/", json={"name": "acme"})).status_code == 400
+
+            pool = (await request(app, "GET", "/api/v1/metrics/db-pool")).json()
+            assert pool["async"]["checkouts"] >= 4
+            assert pool["async"]["in_use"] == 0
+            assert pool["async"]["pool"] == "AsyncAdaptedQueuePool"
+            assert "sync" in pool
+        finally:
+            await dispose_async_engine()
+
+    asyncio.run(scenario())
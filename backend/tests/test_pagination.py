@@ -0,0 +1,111 @@
+# File: /backend/tests/test_pagination.py
+
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+
+from conftest import make_app, request
+
+TIED = datetime(2026, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def audit_logs(tables):
+    """Seven logs for organization 1, four of them sharing one timestamp, and one for organization 2."""
+    from app.db.models.audit_log import AuditLog
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        for i in range(7):
+            created_at = TIED if i < 4 else datetime(2026, 1, 1, 12, 0, i)
+            db.add(AuditLog(action=f"action-{i}", user_id=1, organization_id=1, created_at=created_at))
+        db.add(AuditLog(action="other", user_id=1, organization_id=2, created_at=TIED))
+        db.commit()
+        return [log.id for log in db.query(AuditLog).filter(AuditLog.organization_id == 1)
+                .order_by(AuditLog.created_at.desc(), AuditLog.id.desc())]
+
+
+def audit_app():
+    from app.api.v1.endpoints import audit_log
+
+    return make_app((audit_log.router, "/api/v1/audit-log"))
+
+
+def run(scenario):
+    from app.db.session import dispose_async_engine
+
+    async def wrapped():
+        try:
+            return await scenario()
+        finally:
+            await dispose_async_engine()
+
+    return asyncio.run(wrapped())
+
+
+def test_cursor_round_trip_and_rejection():
+    from app.crud.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+    cursor = encode_cursor(TIED, 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (TIED, 42)
+    for bad in ("not-a-cursor", encode_cursor(TIED, 1)[:-3], "!!!"):
+        with pytest.raises(InvalidCursor):
+            decode_cursor(bad)
+
+
+def test_pages_walk_tied_timestamps_without_gaps_or_repeats(audit_logs):
+    app = audit_app()
+
+    async def scenario():
+        seen, cursor, pages = [], None, 0
+        while True:
+            params = {"organization_id": 1, "limit": 3}
+            if cursor:
+                params["cursor"] = cursor
+            response = await request(app, "GET", "/api/v1/audit-log/", params=params)
+            assert response.status_code == 200
+            seen += [log["id"] for log in response.json()]
+            pages += 1
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                return seen, pages
+
+    seen, pages = run(scenario)
+    assert seen == audit_logs and pages == 3
+
+
+def test_bad_cursor_is_a_400(audit_logs):
+    app = audit_app()
+    response = run(lambda: request(app, "GET", "/api/v1/audit-log/", params={"organization_id": 1, "cursor": "bogus"}))
+    assert response.status_code == 400
+
+
+def test_ndjson_export_streams_every_row(audit_logs):
+    from app.crud.audit_log import iter_audit_logs_async
+    from app.db.session import AsyncSessionLocal, get_async_engine
+
+    app = audit_app()
+    response = run(lambda: request(app, "GET", "/api/v1/audit-log/export", params={"organization_id": 1}))
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = response.text.splitlines()
+    assert len(lines) == len(audit_logs)
+    assert [json.loads(line)["id"] for line in lines] == audit_logs
+
+    async def batches():
+        get_async_engine()
+        async with AsyncSessionLocal() as db:
+            return [len(rows) async for rows in iter_audit_logs_async(db, organization_id=1, batch_size=3)]
+
+    assert run(batches) == [3, 3, 1]
+
+
+def test_created_at_is_required_for_cursor_columns():
+    from app.db.models.audit_log import AuditLog
+    from app.db.models.file import File
+    from app.db.models.notification import Notification
+
+    assert not any(model.__table__.c.created_at.nullable for model in (AuditLog, File, Notification))
@@ -3,13 +3,19 @@ crash_recovery.py
 
 Crash recovery logic for autonomous agents.
 
-This module continuously scans the agent health registry and triggers recovery 
-for agents that have not sent heartbeats within a defined timeout window.
+Every heartbeat recorded in the health registry pushes the agent's deadline
+(heartbeat time + timeout) onto a min-heap. A watcher thread sleeps until the
+earliest deadline and only pops agents that have actually expired, so
+detection cost does not grow with the number of healthy agents. Recoveries
+run on a worker pool.
 """
 
+import heapq
 import time
 import logging
-from typing import List, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 from core.agent_monitoring.models.monitor_model import health_registry
 from core.task_delegation.agent_registry import agent_registry
@@ -29,31 +35,137 @@ class CrashRecovery:
     Detects and recovers crashed agents by checking missed heartbeats.
     """
 
-    def __init__(self, timeout: int = 15):
+    def __init__(self, timeout: int = 15, max_latency: float = 0.25, workers: int = 4,
+                 registry=None, recover: Optional[Callable[[str], None]] = None):
         """
         :param timeout: Seconds to wait before considering an agent as unresponsive.
+        :param max_latency: Longest the watcher sleeps between checks, bounding how late an expiry is noticed.
+        :param workers: Size of the worker pool running recoveries.
+        :param registry: Health registry to follow (defaults to the shared one).
+        :param recover: Recovery action per expired agent (defaults to ``restart_agent``).
         """
         self.timeout = timeout
+        self.max_latency = max_latency
+        self.workers = workers
+        self.registry = registry or health_registry
+        self.recover = recover or self.restart_agent
         self.recovery_log: List[Tuple[str, float]] = []
 
-    def detect_and_recover(self):
+        self._deadlines: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._recovering: Set[str] = set()
+        self._cond = threading.Condition()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._watcher: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+        for agent_id, health in self.registry.get_all_health().items():
+            self._schedule(agent_id, health["last_heartbeat"])
+        self.registry.add_heartbeat_listener(self._schedule)
+
+    def _schedule(self, agent_id: str, heartbeat_time: Optional[float]):
         """
-        Main recovery loop. Scans the health registry and recovers agents that missed the heartbeat deadline.
+        Heartbeat listener: moves the agent's deadline, or forgets it when removed.
+        Superseded heap entries are skipped when popped.
         """
-        now = time.time()
-        logger.debug("[CrashRecovery] Scanning for failed agents...")
-
-        all_health = health_registry.get_all()
+        with self._cond:
+            if heartbeat_time is None:
+                self._deadlines.pop(agent_id, None)
+                return
+            deadline = heartbeat_time + self.timeout
+            self._deadlines[agent_id] = deadline
+            earliest = self._heap[0][0] if self._heap else None
+            heapq.heappush(self._heap, (deadline, agent_id))
+            if len(self._heap) > 4 * len(self._deadlines) + 1024:
+                self._heap = [(d, a) for a, d in self._deadlines.items()]
+                heapq.heapify(self._heap)
+            if earliest is None or deadline < earliest:
+                self._cond.notify()
+
+    def _pop_expired(self, now: float) -> List[str]:
+        """Caller holds the condition lock."""
+        expired = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, agent_id = heapq.heappop(self._heap)
+            if self._deadlines.get(agent_id) != deadline or agent_id in self._recovering:
+                continue
+            del self._deadlines[agent_id]
+            self._recovering.add(agent_id)
+            expired.append(agent_id)
+        return expired
+
+    def detect_and_recover(self, now: Optional[float] = None) -> List[str]:
+        """
+        Dispatches recovery for every agent whose heartbeat deadline has passed.
 
-        for agent_id, health in all_health.items():
-            time_since_last_heartbeat = now - health.last_heartbeat
+        :return: IDs of the agents handed to the worker pool.
+        """
+        now = time.time() if now is None else now
+        with self._cond:
+            expired = self._pop_expired(now)
+        for agent_id in expired:
+            logger.warning(f"[CrashRecovery] Agent '{agent_id}' unresponsive (no heartbeat for {self.timeout}s)")
+            self._executor().submit(self._run_recovery, agent_id)
+        return expired
+
+    def recover_now(self, agent_id: str) -> bool:
+        """
+        Dispatches recovery immediately, e.g. when the agent's process is known to be gone.
+        """
+        with self._cond:
+            if agent_id in self._recovering:
+                return False
+            self._deadlines.pop(agent_id, None)
+            self._recovering.add(agent_id)
+        self._executor().submit(self._run_recovery, agent_id)
+        return True
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="CrashRecoveryWorker")
+        return self._pool
+
+    def _run_recovery(self, agent_id: str):
+        try:
+            self.recover(agent_id)
+        except Exception as e:
+            logger.exception(f"[CrashRecovery] Recovery of agent '{agent_id}' failed: {e}")
+        finally:
+            with self._cond:
+                self._recovering.discard(agent_id)
 
-            if time_since_last_heartbeat > self.timeout:
-                logger.warning(
-                    f"[CrashRecovery] Agent '{agent_id}' unresponsive "
-                    f"(last seen {time_since_last_heartbeat:.2f}s ago)"
-                )
-                self.restart_agent(agent_id)
+    def start(self):
+        """
+        Starts the watcher thread that recovers agents as their deadlines pass.
+        """
+        if self._watcher is not None:
+            return
+        self._stopped.clear()
+        self._watcher = threading.Thread(target=self._watch, daemon=True, name="CrashRecoveryWatcher")
+        self._watcher.start()
+
+    def stop(self):
+        self._stopped.set()
+        with self._cond:
+            self._cond.notify()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _watch(self):
+        logger.info("[CrashRecovery] Deadline watcher running...")
+        while not self._stopped.is_set():
+            with self._cond:
+                wait = self.max_latency
+                if self._heap:
+                    wait = min(wait, max(0.0, self._heap[0][0] - time.time()))
+                if wait > 0:
+                    self._cond.wait(wait)
+            if not self._stopped.is_set():
+                self.detect_and_recover()
 
     def restart_agent(self, agent_id: str):
         """
@@ -61,7 +173,7 @@ class CrashRecovery:
 
         :param agent_id: ID of the agent to restart.
         """
-        agent = agent_registry.agents.get(agent_id)
+        agent = agent_registry.get_agent(agent_id)
 
         if not agent:
             logger.error(f"[CrashRecovery] Agent '{agent_id}' not found in registry.")
@@ -69,10 +181,10 @@ class CrashRecovery:
 
         try:
             # Update simulated agent status
-            agent["status"] = "restarted"
+            agent_registry.update_status(agent_id, "restarted")
 
-            # Reset heartbeat with zero resource usage
-            health_registry.update_heartbeat(agent_id, cpu=0.0, memory=0.0)
+            # Reset heartbeat with zero resource usage (this also schedules its next deadline)
+            self.registry.update_heartbeat(agent_id, cpu=0.0, memory=0.0)
 
             # Log the recovery
             recovery_time = time.time()
@@ -2,15 +2,16 @@
 health_monitor.py
 
 Tracks real-time health metrics for each agent (CPU %, memory %) and reports them to a central registry.
-Runs in a loop, periodically updating heartbeats for all monitored agents.
+Runs in a loop: each sweep reads every agent process in one pass through the
+shared ProcessSampler and records all heartbeats with a single registry update.
 """
 
-import psutil
 import time
 import logging
-from typing import List
+from typing import Callable, Dict, List, Optional
 
 from core.agent_monitoring.models.monitor_model import health_registry
+from core.agent_monitoring.sampler import ProcessSampler, process_sampler
 
 # Initialize logging
 logger = logging.getLogger("HealthMonitor")
@@ -25,13 +26,36 @@ logger.setLevel(logging.INFO)
 class HealthMonitor:
     """
     Monitors CPU and memory usage of agents and sends heartbeat updates to the health registry.
+
+    Agents registered with a PID report their own process usage. Agents
+    without one only get a liveness heartbeat carrying host-wide usage
+    (tagged ``source=host``), which is sampled once per sweep.
     """
 
-    def __init__(self, interval: int = 5):
+    def __init__(self, interval: int = 5, sampler: Optional[ProcessSampler] = None, registry=None):
         """
         :param interval: Interval (in seconds) between heartbeat updates.
+        :param sampler: Process sampler to use (defaults to the shared one).
+        :param registry: Health registry to feed (defaults to the shared one).
         """
         self.interval = interval
+        self.sampler = sampler or process_sampler
+        self.registry = registry or health_registry
+        self._exit_listeners: List[Callable[[str], None]] = []
+        self._exited = set()  # agents whose process is gone: no host heartbeat either
+
+    def register_process(self, agent_id: str, pid: int) -> bool:
+        """
+        Sample ``pid`` as the process backing ``agent_id``.
+        """
+        self._exited.discard(agent_id)
+        return self.sampler.watch(agent_id, pid)
+
+    def add_exit_listener(self, listener: Callable[[str], None]):
+        """
+        Register a callback invoked with the agent_id when its process disappears.
+        """
+        self._exit_listeners.append(listener)
 
     def heartbeat(self, agent_id: str):
         """
@@ -39,18 +63,47 @@ class HealthMonitor:
 
         :param agent_id: The unique identifier for the agent.
         """
-        try:
-            cpu_usage = psutil.cpu_percent(interval=None)
-            memory_usage = psutil.virtual_memory().percent
+        self.sweep([agent_id])
+
+    def sweep(self, agent_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Sample all agents once and record their heartbeats.
 
-            health_registry.update_heartbeat(agent_id, cpu=cpu_usage, memory=memory_usage)
+        :param agent_ids: Agents to heartbeat; watched processes are always included.
+        :return: The per-agent samples from this pass.
+        """
+        try:
+            samples = self.sampler.sample()
+            process_beats = {}
+            host_beats = {}
+            host = None
+            for agent_id, sample in samples.items():
+                if "error" in sample:
+                    self._exited.add(agent_id)
+                    for listener in self._exit_listeners:
+                        listener(agent_id)
+                else:
+                    process_beats[agent_id] = (sample["cpu_percent"], sample["memory_percent"])
+            for agent_id in agent_ids:
+                if agent_id in samples or agent_id in self._exited or self.sampler.is_watched(agent_id):
+                    continue
+                if host is None:
+                    host = self.sampler.host()
+                host_beats[agent_id] = (host["cpu_percent"], host["memory_percent"])
+
+            if process_beats:
+                self.registry.update_many(process_beats, tags={"source": "process"})
+            if host_beats:
+                self.registry.update_many(host_beats, tags={"source": "host"})
 
             logger.debug(
-                f"[HealthMonitor] Heartbeat updated for agent '{agent_id}' | "
-                f"CPU: {cpu_usage:.2f}%, Memory: {memory_usage:.2f}%"
+                f"[HealthMonitor] Heartbeats updated for {len(process_beats)} process agent(s) "
+                f"and {len(host_beats)} host agent(s)"
             )
+            return samples
         except Exception as e:
-            logger.exception(f"[HealthMonitor] Failed to update heartbeat for agent '{agent_id}': {e}")
+            logger.exception(f"[HealthMonitor] Failed to update heartbeats: {e}")
+            return {}
 
     def run(self, agent_ids: List[str]):
         """
@@ -66,9 +119,9 @@ class HealthMonitor:
 
         try:
             while True:
-                for agent_id in agent_ids:
-                    self.heartbeat(agent_id)
-                time.sleep(self.interval)
+                started = time.monotonic()
+                self.sweep(agent_ids)
+                time.sleep(max(0.0, self.interval - (time.monotonic() - started)))
         except KeyboardInterrupt:
             logger.info("[HealthMonitor] Stopped by user (KeyboardInterrupt).")
         except Exception as e:
@@ -7,7 +7,7 @@ and pruning feedback.
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 import time
 import threading
 import logging
@@ -58,6 +58,19 @@ class HealthRegistry:
     def __init__(self):
         self._registry: Dict[str, AgentHealth] = {}
         self._lock = threading.Lock()
+        self._listeners: List[Callable[[str, Optional[float]], None]] = []
+
+    def add_heartbeat_listener(self, listener: Callable[[str, Optional[float]], None]):
+        """
+        Registers a callback invoked with (agent_id, heartbeat_time) after every
+        heartbeat, and with (agent_id, None) when an agent is removed.
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, agent_ids, when: Optional[float]):
+        for listener in self._listeners:
+            for agent_id in agent_ids:
+                listener(agent_id, when)
 
     def update_heartbeat(self, agent_id: str, cpu: float, memory: float, tags: Optional[Dict[str, str]] = None):
         """
@@ -83,6 +96,36 @@ class HealthRegistry:
                 if tags:
                     agent.custom_tags.update(tags)
                 logger.debug(f"[HealthRegistry] Updated heartbeat for agent '{agent_id}'")
+        self._notify((agent_id,), now)
+
+    def update_many(self, heartbeats: Dict[str, Tuple[float, float]], tags: Optional[Dict[str, str]] = None):
+        """
+        Records a whole sampling pass under one lock acquisition.
+        ``heartbeats`` maps agent_id -> (cpu, memory).
+        """
+        now = time.time()
+        registered = []
+        with self._lock:
+            for agent_id, (cpu, memory) in heartbeats.items():
+                agent = self._registry.get(agent_id)
+                if agent is None:
+                    self._registry[agent_id] = AgentHealth(
+                        agent_id=agent_id,
+                        last_heartbeat=now,
+                        cpu_usage=cpu,
+                        memory_usage=memory,
+                        custom_tags=dict(tags or {})
+                    )
+                    registered.append(agent_id)
+                    continue
+                agent.last_heartbeat = now
+                agent.cpu_usage = cpu
+                agent.memory_usage = memory
+                if tags:
+                    agent.custom_tags.update(tags)
+        for agent_id in registered:
+            logger.info(f"[HealthRegistry] Registered new agent '{agent_id}'")
+        self._notify(heartbeats, now)
 
     def get_health(self, agent_id: str) -> Optional[AgentHealth]:
         """Returns a single agent's health info."""
@@ -97,11 +140,12 @@ class HealthRegistry:
     def remove_agent(self, agent_id: str) -> bool:
         """Manually remove an agent from registry."""
         with self._lock:
-            if agent_id in self._registry:
-                del self._registry[agent_id]
-                logger.info(f"[HealthRegistry] Agent '{agent_id}' removed.")
-                return True
-            return False
+            if agent_id not in self._registry:
+                return False
+            del self._registry[agent_id]
+        logger.info(f"[HealthRegistry] Agent '{agent_id}' removed.")
+        self._notify((agent_id,), None)
+        return True
 
     def prune_inactive_agents(self, timeout_seconds: float) -> int:
         """
@@ -117,6 +161,7 @@ class HealthRegistry:
                     removed.append(aid)
         for aid in removed:
             logger.warning(f"[HealthRegistry] Pruned inactive agent '{aid}' after {timeout_seconds}s timeout.")
+        self._notify(removed, None)
         return len(removed)
 
     def is_active(self, agent_id: str, threshold: float = 30.0) -> bool:
@@ -6,7 +6,6 @@ Spawns background threads that periodically check agent status and initiate reco
 """
 
 import threading
-import time
 import logging
 
 from core.agent_monitoring.health_monitor import health_monitor
@@ -33,6 +32,8 @@ class MonitorRunner:
     def __init__(self):
         # Load list of agent IDs from registry
         self.agents = list(agent_registry.agents.keys())
+        # A vanished agent process is recovered right away instead of waiting out its heartbeat timeout
+        health_monitor.add_exit_listener(crash_recovery.recover_now)
         logger.info(f"[MonitorRunner] Initialized with {len(self.agents)} agent(s).")
 
     def start(self):
@@ -51,29 +52,12 @@ class MonitorRunner:
             name="HealthMonitorThread"
         )
 
-        # Thread for crash recovery
-        crash_thread = threading.Thread(
-            target=self._crash_loop,
-            daemon=True,
-            name="CrashRecoveryThread"
-        )
-
         health_thread.start()
-        crash_thread.start()
 
-        logger.info("[MonitorRunner] Monitoring and recovery threads started.")
+        # Crash recovery watches heartbeat deadlines on its own thread
+        crash_recovery.start()
 
-    def _crash_loop(self):
-        """
-        Continuously check for crashed agents and try to recover them.
-        """
-        logger.info("[MonitorRunner] Crash recovery loop running...")
-        while True:
-            try:
-                crash_recovery.detect_and_recover()
-                time.sleep(5)  # Adjustable interval
-            except Exception as e:
-                logger.exception(f"[MonitorRunner] Error during crash recovery loop: {e}")
+        logger.info("[MonitorRunner] Monitoring and recovery threads started.")
 
 
 # Singleton instance exposed globally
@@ -0,0 +1,195 @@
+"""
+sampler.py
+
+Batched, non-blocking resource sampling for agent processes.
+
+A single ProcessSampler keeps one cached psutil.Process handle per agent and
+reads every process in one pass. CPU usage is computed from the CPU-time
+delta since the previous pass, so nothing sleeps the way
+``cpu_percent(interval=1.0)`` does. Each agent's samples go into a
+fixed-size MetricSeries ring buffer.
+"""
+
+import logging
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional
+
+import psutil
+
+logger = logging.getLogger("ProcessSampler")
+if not logger.handlers:
+    handler = logging.StreamHandler()
+    formatter = logging.Formatter("[%(asctime)s] [%(levelname)s] %(message)s")
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+logger.setLevel(logging.INFO)
+
+
+class MetricSeries:
+    """
+    Fixed-capacity time series of (timestamp, cpu %, memory MB, memory %)
+    stored in one flat array of doubles; the oldest sample is overwritten.
+    """
+
+    FIELDS = ("timestamp", "cpu_percent", "memory_mb", "memory_percent")
+    __slots__ = ("capacity", "_data", "_head", "_size")
+
+    def __init__(self, capacity: int = 720):
+        self.capacity = capacity
+        self._data = array("d", bytes(8 * len(self.FIELDS) * capacity))
+        self._head = 0  # next slot to write
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, timestamp: float, cpu_percent: float, memory_mb: float, memory_percent: float) -> None:
+        base = self._head * len(self.FIELDS)
+        self._data[base:base + 4] = array("d", (timestamp, cpu_percent, memory_mb, memory_percent))
+        self._head = (self._head + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def _row(self, index: int) -> Dict[str, float]:
+        base = index * len(self.FIELDS)
+        return dict(zip(self.FIELDS, self._data[base:base + len(self.FIELDS)]))
+
+    def latest(self) -> Optional[Dict[str, float]]:
+        if not self._size:
+            return None
+        return self._row((self._head - 1) % self.capacity)
+
+    def samples(self, since: Optional[float] = None) -> List[Dict[str, float]]:
+        """Samples oldest first, optionally only those taken at or after ``since``."""
+        start = (self._head - self._size) % self.capacity
+        rows = [self._row((start + i) % self.capacity) for i in range(self._size)]
+        if since is not None:
+            rows = [row for row in rows if row["timestamp"] >= since]
+        return rows
+
+    def mean(self, field: str, seconds: Optional[float] = None, now: Optional[float] = None) -> float:
+        since = None if seconds is None else (time.time() if now is None else now) - seconds
+        values = [row[field] for row in self.samples(since)]
+        return sum(values) / len(values) if values else 0.0
+
+
+class ProcessSampler:
+    """
+    Samples every watched agent process in a single pass.
+    """
+
+    def __init__(self, capacity: int = 720):
+        """
+        :param capacity: Samples kept per agent in its MetricSeries.
+        """
+        self.capacity = capacity
+        self._processes: Dict[str, psutil.Process] = {}
+        self._cpu_seen: Dict[str, tuple] = {}  # agent_id -> (cpu seconds, monotonic time)
+        self._errors: Dict[str, str] = {}
+        self.series: Dict[str, MetricSeries] = {}
+        self._lock = threading.Lock()
+        self._total_memory = psutil.virtual_memory().total
+
+    def watch(self, agent_id: str, pid: int) -> bool:
+        """
+        Starts sampling ``pid`` for ``agent_id``. A process that cannot be
+        opened is reported as an error by the next ``sample()``.
+        """
+        try:
+            process = psutil.Process(pid)
+            cpu = process.cpu_times()
+        except psutil.Error as e:
+            with self._lock:
+                self._errors[agent_id] = f"Cannot watch process {pid}: {e}"
+            return False
+        with self._lock:
+            self._processes[agent_id] = process
+            self._cpu_seen[agent_id] = (cpu.user + cpu.system, time.monotonic())
+            self.series.setdefault(agent_id, MetricSeries(self.capacity))
+            self._errors.pop(agent_id, None)
+        return True
+
+    def unwatch(self, agent_id: str) -> None:
+        with self._lock:
+            self._processes.pop(agent_id, None)
+            self._cpu_seen.pop(agent_id, None)
+            self._errors.pop(agent_id, None)
+
+    def is_watched(self, agent_id: str) -> bool:
+        return agent_id in self._processes
+
+    def sample(self) -> Dict[str, Dict]:
+        """
+        Reads every watched process once.
+
+        Returns:
+            Dict[str, Dict]: Per agent either ``cpu_percent``, ``memory_mb``,
+            ``memory_percent``, ``read_bytes``, ``write_bytes`` and
+            ``timestamp``, or ``error`` and ``timestamp`` for a process that
+            has gone away (it is dropped from the watch list).
+        """
+        with self._lock:
+            processes = list(self._processes.items())
+            errors, self._errors = self._errors, {}
+
+        timestamp = round(time.time(), 2)
+        results: Dict[str, Dict] = {agent_id: {"error": error, "timestamp": timestamp} for agent_id, error in errors.items()}
+        lost = []
+        for agent_id, process in processes:
+            try:
+                with process.oneshot():
+                    if not process.is_running():
+                        raise psutil.NoSuchProcess(process.pid)
+                    cpu = process.cpu_times()
+                    memory = process.memory_info()
+                    try:
+                        io = process.io_counters()
+                    except (AttributeError, psutil.AccessDenied):
+                        io = None
+            except psutil.NoSuchProcess:
+                error = f"Process {process.pid} no longer exists."
+            except psutil.AccessDenied:
+                error = f"Access denied to process {process.pid}."
+            except psutil.Error as e:
+                error = f"Unexpected error profiling process {process.pid}: {e}"
+            else:
+                now = time.monotonic()
+                cpu_seconds = cpu.user + cpu.system
+                prev_seconds, prev_time = self._cpu_seen.get(agent_id, (cpu_seconds, now))
+                self._cpu_seen[agent_id] = (cpu_seconds, now)
+                elapsed = now - prev_time
+                cpu_percent = round(100.0 * (cpu_seconds - prev_seconds) / elapsed, 2) if elapsed > 0 else 0.0
+                memory_mb = round(memory.rss / (1024 * 1024), 2)
+                memory_percent = round(100.0 * memory.rss / self._total_memory, 2)
+
+                self.series[agent_id].append(timestamp, cpu_percent, memory_mb, memory_percent)
+                results[agent_id] = {
+                    "cpu_percent": cpu_percent,
+                    "memory_mb": memory_mb,
+                    "memory_percent": memory_percent,
+                    "read_bytes": io.read_bytes if io else 0,
+                    "write_bytes": io.write_bytes if io else 0,
+                    "timestamp": timestamp,
+                }
+                continue
+
+            logger.warning(f"[ProcessSampler] {error}")
+            results[agent_id] = {"error": error, "timestamp": timestamp}
+            lost.append(agent_id)
+
+        if lost:
+            with self._lock:
+                for agent_id in lost:
+                    self._processes.pop(agent_id, None)
+                    self._cpu_seen.pop(agent_id, None)
+        return results
+
+    @staticmethod
+    def host() -> Dict[str, float]:
+        """Host-wide CPU % (since the previous call) and memory %, without blocking."""
+        return {"cpu_percent": psutil.cpu_percent(interval=None), "memory_percent": psutil.virtual_memory().percent}
+
+
+# Shared instance so every monitor reads processes through the same handles
+process_sampler = ProcessSampler()
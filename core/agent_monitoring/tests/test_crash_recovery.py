@@ -0,0 +1,67 @@
+# File: /core/agent_monitoring/tests/test_crash_recovery.py
+
+import threading
+import time
+
+from core.agent_monitoring.crash_recovery import CrashRecovery
+from core.agent_monitoring.models.monitor_model import HealthRegistry
+
+
+def make_recovery(timeout, **kwargs):
+    registry = HealthRegistry()
+    recovered = []
+    done = threading.Event()
+
+    def recover(agent_id):
+        recovered.append((agent_id, time.time()))
+        done.set()
+
+    recovery = CrashRecovery(timeout=timeout, registry=registry, recover=recover, **kwargs)
+    return registry, recovery, recovered, done
+
+
+def test_only_expired_agents_are_recovered():
+    registry, recovery, recovered, done = make_recovery(timeout=10)
+    registry.update_many({f"agent-{i}": (0.0, 0.0) for i in range(1000)})
+    now = time.time()
+
+    assert recovery.detect_and_recover(now + 5) == []
+    time.sleep(0.05)
+    registry.update_heartbeat("agent-7", cpu=0.0, memory=0.0)
+    registry.remove_agent("agent-8")
+    expired = recovery.detect_and_recover(now + 10.02)
+
+    assert len(expired) == 998
+    assert "agent-7" not in expired and "agent-8" not in expired
+    recovery.stop()
+    assert len(recovered) == 998
+
+
+def test_watcher_recovers_within_latency():
+    registry, recovery, recovered, done = make_recovery(timeout=0.2, max_latency=0.05)
+    recovery.start()
+    try:
+        registry.update_heartbeat("agent-1", cpu=0.0, memory=0.0)
+        deadline = time.time() + 0.2
+        assert done.wait(2)
+        assert recovered[0][0] == "agent-1"
+        assert recovered[0][1] - deadline < 0.15
+    finally:
+        recovery.stop()
+
+
+def test_recover_now_skips_agents_already_recovering():
+    gate = threading.Event()
+    registry = HealthRegistry()
+    calls = []
+
+    def slow_recover(agent_id):
+        calls.append(agent_id)
+        gate.wait(2)
+
+    recovery = CrashRecovery(timeout=60, registry=registry, recover=slow_recover)
+    assert recovery.recover_now("agent-1")
+    assert not recovery.recover_now("agent-1")
+    gate.set()
+    recovery.stop()
+    assert calls == ["agent-1"]
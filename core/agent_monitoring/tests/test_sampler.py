@@ -0,0 +1,66 @@
+# File: /core/agent_monitoring/tests/test_sampler.py
+
+import os
+import subprocess
+import sys
+import time
+
+from core.agent_monitoring.health_monitor import HealthMonitor
+from core.agent_monitoring.models.monitor_model import HealthRegistry
+from core.agent_monitoring.sampler import MetricSeries, ProcessSampler
+
+
+def test_metric_series_keeps_newest_samples():
+    series = MetricSeries(capacity=3)
+    for i in range(5):
+        series.append(float(i), i * 10.0, 1.0, 0.5)
+    assert len(series) == 3
+    assert [row["timestamp"] for row in series.samples()] == [2.0, 3.0, 4.0]
+    assert series.latest()["cpu_percent"] == 40.0
+    assert series.mean("cpu_percent", seconds=1.5, now=4.0) == 35.0
+
+
+def test_sample_reads_all_processes_without_blocking():
+    sampler = ProcessSampler(capacity=10)
+    busy = subprocess.Popen([sys.executable, "-c", "while True: pass"])
+    try:
+        sampler.watch("self", os.getpid())
+        sampler.watch("busy", busy.pid)
+        time.sleep(0.3)
+
+        started = time.perf_counter()
+        samples = sampler.sample()
+        assert time.perf_counter() - started < 0.5
+        assert samples["busy"]["cpu_percent"] > 20
+        assert samples["self"]["memory_mb"] > 0
+        assert len(sampler.series["busy"]) == 1
+    finally:
+        busy.kill()
+        busy.wait()
+
+    samples = sampler.sample()
+    assert "error" in samples["busy"]
+    assert not sampler.is_watched("busy")
+    assert "busy" not in sampler.sample()
+
+
+def test_sweep_feeds_registry_and_reports_exits():
+    registry = HealthRegistry()
+    monitor = HealthMonitor(sampler=ProcessSampler(), registry=registry)
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    exited = []
+    monitor.add_exit_listener(exited.append)
+    try:
+        monitor.register_process("worker", child.pid)
+        monitor.sweep(["worker", "virtual"])
+        assert registry.get_health("worker").custom_tags["source"] == "process"
+        assert registry.get_health("virtual").custom_tags["source"] == "host"
+    finally:
+        child.kill()
+        child.wait()
+
+    before = registry.get_health("worker").last_heartbeat
+    monitor.sweep(["worker", "virtual"])
+    monitor.sweep(["worker", "virtual"])
+    assert exited == ["worker"]
+    assert registry.get_health("worker").last_heartbeat == before
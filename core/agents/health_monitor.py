@@ -2,8 +2,8 @@
 
 import threading
 import time
-from typing import Dict
-from core.agents.agent_profiler import AgentProfiler
+from typing import Dict, Optional
+from core.agent_monitoring.sampler import ProcessSampler
 from core.logging.plugin_logger import PluginLogger
 from core.agents.recovery_manager import RecoveryManager
 
@@ -11,17 +11,24 @@ from core.agents.recovery_manager import RecoveryManager
 class AgentHealthMonitor:
     """
     Monitors agents by profiling system resource usage and triggering recovery logic.
+
+    All watched processes are read in one non-blocking pass per interval
+    through a ProcessSampler, which also keeps each agent's recent samples
+    in a ring buffer (``sampler.series[agent_id]``).
     """
 
-    def __init__(self, cpu_threshold: float = 90.0, memory_threshold: float = 100.0):
+    def __init__(self, cpu_threshold: float = 90.0, memory_threshold: float = 100.0,
+                 sampler: Optional[ProcessSampler] = None):
         """
         Initializes the health monitor.
 
         Args:
             cpu_threshold (float): CPU usage % beyond which agent recovery is triggered.
             memory_threshold (float): Memory usage in MB beyond which agent recovery is triggered.
+            sampler (ProcessSampler, optional): Sampler to read processes with (defaults to a private one).
         """
         self.watchlist: Dict[str, int] = {}  # agent_id -> pid
+        self.sampler = sampler or ProcessSampler()
         self.cpu_threshold = cpu_threshold
         self.memory_threshold = memory_threshold
         self.logger = PluginLogger()
@@ -36,6 +43,7 @@ class AgentHealthMonitor:
             pid (int): Process ID of the agent.
         """
         self.watchlist[agent_id] = pid
+        self.sampler.watch(agent_id, pid)
         self.logger.log(
             plugin_name="AgentHealthMonitor",
             input_code="add_agent",
@@ -69,9 +77,12 @@ class AgentHealthMonitor:
 
         try:
             while not self._stop_event.is_set():
-                for agent_id, pid in list(self.watchlist.items()):
-                    profiler = AgentProfiler(pid)
-                    stats = profiler.profile()
+                started = time.monotonic()
+                samples = self.sampler.sample()
+                for agent_id, stats in samples.items():
+                    pid = self.watchlist.get(agent_id)
+                    if pid is None:
+                        continue  # watched through a sampler shared with another monitor
 
                     if "error" in stats:
                         self.logger.log(
@@ -104,7 +115,7 @@ class AgentHealthMonitor:
                         )
                         RecoveryManager.restart_agent(agent_id, pid)
 
-                time.sleep(interval)
+                time.sleep(max(0.0, interval - (time.monotonic() - started)))
 
         except KeyboardInterrupt:
             self.logger.log(
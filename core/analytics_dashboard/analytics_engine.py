@@ -1,26 +1,36 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
+import json
 import logging
+import threading
+import uuid
 
 from .metrics_collector import MetricsCollector
-from .trends import TrendAnalyzer
 
 
 class AnalyticsEngine:
     """
     Coordinates logging and analysis of agent performance metrics.
     Supports recording task outcomes and generating trend reports.
+
+    Reports are read from the collector's incremental rollups, so their cost
+    depends on the number of time buckets and agents, not on the number of
+    records. pandas is only used by ``analyze_raw``/``dataframe`` for ad-hoc
+    analysis of the sampled raw records.
     """
 
-    def __init__(self, collector: MetricsCollector = None, trend_analyzer: TrendAnalyzer = None):
+    def __init__(self, collector: MetricsCollector = None, trend_analyzer=None):
         """
         Initialize the Analytics Engine with optional injected components.
 
         Args:
             collector (MetricsCollector, optional): Custom metrics collector (defaults to new instance).
-            trend_analyzer (TrendAnalyzer, optional): Custom trend analyzer (defaults to new instance).
+            trend_analyzer (type, optional): TrendAnalyzer class used for ad-hoc raw analysis.
         """
         self.collector = collector or MetricsCollector()
-        self.trend_analyzer = trend_analyzer or TrendAnalyzer()
+        self.trend_analyzer = trend_analyzer
+        self._response_lock = threading.Lock()
+        self._response: Optional[Tuple[int, str, str]] = None  # (version, etag, body)
+        self._etag_prefix = uuid.uuid4().hex[:8]  # keeps ETags from a previous process from matching
 
         self.logger = logging.getLogger("AnalyticsEngine")
         if not self.logger.handlers:
@@ -70,15 +80,12 @@ class AnalyticsEngine:
             }
         """
         try:
-            metrics = self.collector.get_metrics()
-            trends = self.trend_analyzer(metrics)
-
             result = {
-                "task_completion_trend": trends.task_completion_trend(),
-                "agent_success_rate": trends.agent_success_rate(),
+                "task_completion_trend": self.collector.task_completion_trend(),
+                "agent_success_rate": self.collector.agent_success_rate(),
             }
 
-            self.logger.info("Analytics analysis completed.")
+            self.logger.debug("Analytics analysis completed.")
             return result
 
         except Exception as e:
@@ -87,3 +94,46 @@ class AnalyticsEngine:
                 "task_completion_trend": {},
                 "agent_success_rate": {}
             }
+
+    def metrics_response(self) -> Tuple[str, str]:
+        """
+        Serialised ``analyze()`` report plus its ETag, rebuilt only when the
+        collector has recorded something since the last call.
+
+        Returns:
+            Tuple[str, str]: (etag, JSON body)
+        """
+        version = self.collector.version
+        cached = self._response
+        if cached is not None and cached[0] == version:
+            return cached[1], cached[2]
+        with self._response_lock:
+            cached = self._response
+            if cached is None or cached[0] != version:
+                body = json.dumps(self.analyze(), sort_keys=True)
+                cached = self._response = (version, f"{self._etag_prefix}-{version}", body)
+        return cached[1], cached[2]
+
+    def _trend_analyzer(self):
+        if self.trend_analyzer is None:
+            from .trends import TrendAnalyzer  # pandas is only needed for raw analysis
+            self.trend_analyzer = TrendAnalyzer
+        return self.trend_analyzer
+
+    def analyze_raw(self) -> Dict[str, Any]:
+        """
+        Same report computed with pandas over the sampled raw records.
+        """
+        trends = self._trend_analyzer()(self.collector.get_metrics())
+        return {
+            "task_completion_trend": trends.task_completion_trend(),
+            "agent_success_rate": trends.agent_success_rate(),
+        }
+
+    def dataframe(self, kind: str = "tasks"):
+        """
+        Builds a pandas DataFrame of the sampled raw ``tasks`` or ``errors`` on demand.
+        """
+        import pandas as pd
+
+        return pd.DataFrame(self.collector.get_metrics().get(kind, []))
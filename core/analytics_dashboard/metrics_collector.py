@@ -1,19 +1,82 @@
-from collections import defaultdict
-from datetime import datetime
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+import random
 import threading
-from typing import Dict, List, Union
+import time
+from typing import Any, Dict, List, Optional, Union
+
+
+class Reservoir:
+    """
+    Uniform random sample of at most ``size`` items from an unbounded stream
+    (Algorithm R), so memory stays bounded however many records arrive.
+    """
+
+    def __init__(self, size: int, seed: Optional[int] = None):
+        self.size = size
+        self.seen = 0
+        self.items: List[Any] = []
+        self._rng = random.Random(seed)
+
+    def add(self, item: Any) -> None:
+        self.seen += 1
+        if len(self.items) < self.size:
+            self.items.append(item)
+            return
+        index = self._rng.randrange(self.seen)
+        if index < self.size:
+            self.items[index] = item
+
+    def clear(self) -> None:
+        self.seen = 0
+        self.items = []
 
 
 class MetricsCollector:
     """
     In-memory thread-safe collector for agent task and error metrics.
+
+    Every record updates incremental rollups: task, success and error counts in
+    fixed-size time buckets (the newest ``max_buckets`` are kept), per-agent
+    success/total, and per-agent error counts. Raw records are kept only as a
+    bounded reservoir sample for ad-hoc analysis. ``version`` increases with
+    every change and can be used as a cache validator.
     """
 
-    def __init__(self):
-        self.metrics: Dict[str, List[Dict[str, Union[str, datetime]]]] = defaultdict(list)
+    def __init__(self, bucket_seconds: int = 86400, max_buckets: int = 366, reservoir_size: int = 10_000,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            bucket_seconds (int): Width of a rollup time bucket (default: one day).
+            max_buckets (int): Number of most recent buckets retained.
+            reservoir_size (int): Raw task and error records kept for ad-hoc analysis (each).
+            seed (int, optional): Seed for the reservoir sampling.
+        """
+        self.bucket_seconds = bucket_seconds
+        self.max_buckets = max_buckets
         self.lock = threading.Lock()
+        self.version = 0
+
+        self._buckets: "OrderedDict[int, List[int]]" = OrderedDict()  # start -> [tasks, successes, errors]
+        self._agent_tasks: Dict[str, List[int]] = {}  # agent_id -> [successes, total]
+        self._agent_errors: Counter = Counter()
+        self._task_samples = Reservoir(reservoir_size, seed)
+        self._error_samples = Reservoir(reservoir_size, seed)
 
-    def record_task(self, agent_id: str, task_type: str, status: str) -> None:
+    def _bucket(self, timestamp: float) -> List[int]:
+        """Caller holds the lock."""
+        start = int(timestamp // self.bucket_seconds) * self.bucket_seconds
+        bucket = self._buckets.get(start)
+        if bucket is None:
+            bucket = self._buckets[start] = [0, 0, 0]
+            if len(self._buckets) > 1 and start < next(reversed(self._buckets)):
+                # Late record for an older bucket: restore chronological order
+                self._buckets = OrderedDict(sorted(self._buckets.items()))
+            while len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        return bucket
+
+    def record_task(self, agent_id: str, task_type: str, status: str, timestamp: Optional[float] = None) -> None:
         """
         Logs a completed task for analytics purposes.
 
@@ -21,53 +84,120 @@ class MetricsCollector:
             agent_id (str): Unique agent identifier.
             task_type (str): Type of the task (e.g., 'design', 'seo').
             status (str): Task result status ('success', 'failure', etc.).
+            timestamp (float, optional): Epoch time of the task (defaults to now).
         """
         try:
+            timestamp = time.time() if timestamp is None else timestamp
+            success = status == "success"
             with self.lock:
-                self.metrics["tasks"].append({
+                bucket = self._bucket(timestamp)
+                bucket[0] += 1
+                bucket[1] += success
+                counts = self._agent_tasks.setdefault(agent_id, [0, 0])
+                counts[0] += success
+                counts[1] += 1
+                self._task_samples.add({
                     "agent_id": agent_id,
                     "task_type": task_type,
                     "status": status,
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": _isoformat(timestamp)
                 })
+                self.version += 1
         except Exception as e:
             print(f"[MetricsCollector] Failed to record task: {e}")
 
-    def record_error(self, agent_id: str, error_message: str) -> None:
+    def record_error(self, agent_id: str, error_message: str, timestamp: Optional[float] = None) -> None:
         """
         Logs an error event from an agent.
 
         Args:
             agent_id (str): Agent that experienced the error.
             error_message (str): Description of the error.
+            timestamp (float, optional): Epoch time of the error (defaults to now).
         """
         try:
+            timestamp = time.time() if timestamp is None else timestamp
             with self.lock:
-                self.metrics["errors"].append({
+                self._bucket(timestamp)[2] += 1
+                self._agent_errors[agent_id] += 1
+                self._error_samples.add({
                     "agent_id": agent_id,
                     "error": error_message,
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": _isoformat(timestamp)
                 })
+                self.version += 1
         except Exception as e:
             print(f"[MetricsCollector] Failed to record error: {e}")
 
     def get_metrics(self) -> Dict[str, List[Dict[str, str]]]:
         """
-        Retrieves all recorded metrics.
+        Retrieves the sampled raw records (all of them until the reservoir fills).
 
         Returns:
             Dict[str, List[Dict[str, str]]]: Dictionary with 'tasks' and 'errors'.
         """
         with self.lock:
-            # Ensure both keys exist
             return {
-                "tasks": list(self.metrics.get("tasks", [])),
-                "errors": list(self.metrics.get("errors", []))
+                "tasks": list(self._task_samples.items),
+                "errors": list(self._error_samples.items)
             }
 
+    def task_completion_trend(self) -> Dict[str, int]:
+        """
+        Number of tasks per day (YYYY-MM-DD, UTC), from the bucket rollups.
+        """
+        with self.lock:
+            buckets = [(start, counts[0]) for start, counts in self._buckets.items() if counts[0]]
+        trend: Dict[str, int] = {}
+        for start, count in buckets:
+            day = _isoformat(start)[:10]
+            trend[day] = trend.get(day, 0) + count
+        return trend
+
+    def agent_success_rate(self) -> Dict[str, float]:
+        """
+        Each agent's successes / total tasks (0.00 to 1.00).
+        """
+        with self.lock:
+            return {agent: round(success / total, 2) for agent, (success, total) in self._agent_tasks.items() if total}
+
+    def get_rollups(self) -> Dict[str, Union[int, Dict]]:
+        """
+        Returns:
+            Dict: ``version``, ``buckets`` (bucket start ISO time -> tasks /
+            successes / errors), ``agents`` (agent -> successes / total /
+            errors) and overall ``totals``.
+        """
+        with self.lock:
+            buckets = {
+                _isoformat(start): {"tasks": tasks, "successes": successes, "errors": errors}
+                for start, (tasks, successes, errors) in self._buckets.items()
+            }
+            agents = {
+                agent: {"successes": success, "total": total, "errors": self._agent_errors.get(agent, 0)}
+                for agent, (success, total) in self._agent_tasks.items()
+            }
+            for agent, errors in self._agent_errors.items():
+                agents.setdefault(agent, {"successes": 0, "total": 0, "errors": errors})
+            totals = {
+                "tasks": self._task_samples.seen,
+                "successes": sum(success for success, _ in self._agent_tasks.values()),
+                "errors": self._error_samples.seen,
+            }
+            return {"version": self.version, "buckets": buckets, "agents": agents, "totals": totals}
+
     def reset_metrics(self) -> None:
         """
         Clears all collected metrics (useful between report intervals).
         """
         with self.lock:
-            self.metrics.clear()
+            self._buckets.clear()
+            self._agent_tasks.clear()
+            self._agent_errors.clear()
+            self._task_samples.clear()
+            self._error_samples.clear()
+            self.version += 1
+
+
+def _isoformat(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).replace(tzinfo=None).isoformat()
@@ -1,4 +1,4 @@
-from flask import Flask, jsonify, send_from_directory, request
+from flask import Flask, Response, jsonify, send_from_directory, request
 from flask_cors import CORS
 from .analytics_engine import AnalyticsEngine
 import logging
@@ -21,8 +21,14 @@ logger = logging.getLogger(__name__)
 @app.route("/api/metrics")
 def metrics():
     try:
-        result = engine.analyze()
-        return jsonify(result)
+        etag, body = engine.metrics_response()
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype="application/json")
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "no-cache"
+        return response
     except Exception as e:
         logger.exception("Error while fetching metrics")
         return jsonify({"error": "Failed to fetch metrics"}), 500
@@ -48,11 +54,18 @@ def shutdown():
     func()
     return jsonify({"message": "Server shutting down..."}), 200
 
-@app.before_first_request
+_prepopulated = False
+
+@app.before_request
 def prepopulate_data():
     """
     Populate example metrics before first request.
+    (``before_first_request`` no longer exists in Flask 2.3+.)
     """
+    global _prepopulated
+    if _prepopulated:
+        return
+    _prepopulated = True
     try:
         engine.log_task("agent-A", "email_parse", "success")
         engine.log_task("agent-B", "data_scrape", "failure")
@@ -0,0 +1,68 @@
+# File: /core/analytics_dashboard/tests/test_rollups.py
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from core.analytics_dashboard.analytics_engine import AnalyticsEngine
+from core.analytics_dashboard.metrics_collector import MetricsCollector
+
+DAY = 86400
+JAN_1 = datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp()
+
+
+def test_rollups_match_raw_analysis():
+    collector = MetricsCollector(seed=1)
+    for i in range(30):
+        collector.record_task(f"agent-{i % 3}", "parse", "success" if i % 4 else "failure", JAN_1 + (i % 2) * DAY)
+    collector.record_error("agent-1", "timeout", JAN_1)
+    engine = AnalyticsEngine(collector)
+
+    report = engine.analyze()
+    assert report["task_completion_trend"] == {"2024-01-01": 15, "2024-01-02": 15}
+    assert report == engine.analyze_raw()
+
+    rollups = collector.get_rollups()
+    assert rollups["agents"]["agent-1"]["errors"] == 1
+    assert rollups["totals"] == {"tasks": 30, "successes": 22, "errors": 1}
+
+
+def test_buckets_and_raw_samples_are_bounded():
+    collector = MetricsCollector(max_buckets=7, reservoir_size=50, seed=1)
+    for day in range(10):
+        for _ in range(20):
+            collector.record_task("agent-A", "parse", "success", JAN_1 + day * DAY)
+
+    assert len(collector.get_rollups()["buckets"]) == 7
+    assert min(collector.task_completion_trend()) == "2024-01-04"
+    assert len(collector.get_metrics()["tasks"]) == 50
+    assert collector.agent_success_rate() == {"agent-A": 1.0}
+
+
+def test_metrics_response_is_cached_until_new_data():
+    engine = AnalyticsEngine(MetricsCollector())
+    engine.log_task("agent-A", "parse", "success")
+
+    etag, body = engine.metrics_response()
+    assert engine.metrics_response() == (etag, body)
+    assert json.loads(body)["agent_success_rate"] == {"agent-A": 1.0}
+
+    engine.log_task("agent-A", "parse", "failure")
+    new_etag, new_body = engine.metrics_response()
+    assert new_etag != etag
+    assert json.loads(new_body)["agent_success_rate"] == {"agent-A": 0.5}
+
+
+def test_api_metrics_honours_if_none_match():
+    pytest.importorskip("flask_cors")
+    from core.analytics_dashboard.server import app
+
+    client = app.test_client()
+    first = client.get("/api/metrics")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    cached = client.get("/api/metrics", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.data == b""
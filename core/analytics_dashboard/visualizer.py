@@ -1,7 +1,7 @@
 import matplotlib.pyplot as plt
 import seaborn as sns
 from .analytics_engine import AnalyticsEngine
-from typing import Optional
+from typing import Dict, Optional
 
 class Visualiser:
     def __init__(self, engine: AnalyticsEngine):
@@ -13,14 +13,16 @@ class Visualiser:
         """
         self.engine = engine
 
-    def plot_task_completion_trend(self, save_path: Optional[str] = None):
+    def plot_task_completion_trend(self, save_path: Optional[str] = None, report: Optional[Dict] = None):
         """
         Plots the task completion trend over time.
 
         Args:
             save_path (str, optional): If provided, saves the plot to this path instead of displaying it.
+            report (dict, optional): An ``analyze()`` result to plot instead of fetching a new one.
         """
-        task_trend = self.engine.analyze().get("task_completion_trend", {})
+        report = report if report is not None else self.engine.analyze()
+        task_trend = report.get("task_completion_trend", {})
 
         if not task_trend:
             print("[Visualiser] No data available for task completion trend.")
@@ -46,14 +48,16 @@ class Visualiser:
 
         plt.close()
 
-    def plot_agent_success_rate(self, save_path: Optional[str] = None):
+    def plot_agent_success_rate(self, save_path: Optional[str] = None, report: Optional[Dict] = None):
         """
         Plots the agent success rates.
 
         Args:
             save_path (str, optional): If provided, saves the plot to this path instead of displaying it.
+            report (dict, optional): An ``analyze()`` result to plot instead of fetching a new one.
         """
-        success_rate = self.engine.analyze().get("agent_success_rate", {})
+        report = report if report is not None else self.engine.analyze()
+        success_rate = report.get("agent_success_rate", {})
 
         if not success_rate:
             print("[Visualiser] No data available for agent success rate.")
@@ -87,11 +91,12 @@ class Visualiser:
             save (bool): If True, saves plots to files instead of displaying them.
             output_dir (str): Directory where charts will be saved if save=True.
         """
+        report = self.engine.analyze()  # one report shared by every chart
         if save:
             import os
             os.makedirs(output_dir, exist_ok=True)
-            self.plot_task_completion_trend(save_path=f"{output_dir}/task_trend.png")
-            self.plot_agent_success_rate(save_path=f"{output_dir}/agent_success.png")
+            self.plot_task_completion_trend(save_path=f"{output_dir}/task_trend.png", report=report)
+            self.plot_agent_success_rate(save_path=f"{output_dir}/agent_success.png", report=report)
         else:
-            self.plot_task_completion_trend()
-            self.plot_agent_success_rate()
+            self.plot_task_completion_trend(report=report)
+            self.plot_agent_success_rate(report=report)
@@ -1,21 +1,265 @@
-from typing import Callable, Dict, List, Any
-from threading import Lock
+from typing import Callable, Dict, Iterable, List, Any, Optional, Tuple
+from collections import OrderedDict, deque
+from enum import Enum
+from threading import Condition, Lock, Thread, current_thread
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
-class EventBus:
+
+class BackpressurePolicy(str, Enum):
+    BLOCK = "block"              # publisher waits for queue space
+    DROP_OLDEST = "drop_oldest"  # oldest queued event is discarded
+    COALESCE = "coalesce"        # newer event replaces a queued one with the same key
+
+
+class HandlerMetrics:
+    """
+    Delivery counters for a single handler.
+    """
+
     def __init__(self):
+        self.lock = Lock()
+        self.enqueued = 0
+        self.delivered = 0
+        self.batches = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.total_latency = 0.0   # seconds spent inside the handler
+        self.max_latency = 0.0
+        self.total_wait = 0.0      # seconds events spent queued
+        self.max_queue_depth = 0
+
+    def record_delivery(self, count: int, latency: float, wait: float = 0.0, failed: bool = False):
+        with self.lock:
+            self.delivered += count
+            self.batches += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+            self.total_wait += wait
+            if failed:
+                self.errors += 1
+
+    def snapshot(self, queue_depth: int = 0) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "enqueued": self.enqueued,
+                "delivered": self.delivered,
+                "batches": self.batches,
+                "dropped": self.dropped,
+                "coalesced": self.coalesced,
+                "errors": self.errors,
+                "avg_latency_ms": (self.total_latency / self.batches * 1000) if self.batches else 0.0,
+                "max_latency_ms": self.max_latency * 1000,
+                "avg_wait_ms": (self.total_wait / self.delivered * 1000) if self.delivered else 0.0,
+                "queue_depth": queue_depth,
+                "max_queue_depth": self.max_queue_depth,
+            }
+
+
+class SubscriberWorker:
+    """
+    Bounded per-handler queue drained by a dedicated daemon thread.
+    """
+
+    def __init__(
+        self,
+        handler: Callable,
+        name: str,
+        metrics: HandlerMetrics,
+        maxsize: int,
+        policy: BackpressurePolicy,
+        batch: bool,
+        max_batch: int,
+        coalesce_key: Optional[Callable[[str, Any], Any]] = None,
+    ):
+        self.handler = handler
+        self.name = name
+        self.metrics = metrics
+        self.maxsize = maxsize
+        self.policy = BackpressurePolicy(policy)
+        self.batch = batch
+        self.max_batch = max_batch
+        self.coalesce_key = coalesce_key or (lambda event_type, payload: event_type)
+
+        # COALESCE keeps an ordered map so a newer event can replace a queued one in place.
+        self.queue = OrderedDict() if self.policy == BackpressurePolicy.COALESCE else deque()
+        self.cond = Condition()
+        self.running = True
+        self.busy = False
+        self.thread = Thread(target=self._run, name=f"EventBus-{name}", daemon=True)
+        self.thread.start()
+
+    def put(self, event_type: str, payload: Any):
+        item = (time.perf_counter(), event_type, payload)
+        with self.cond:
+            if self.policy == BackpressurePolicy.COALESCE:
+                key = self.coalesce_key(event_type, payload)
+                if key in self.queue:
+                    self.queue[key] = item
+                    with self.metrics.lock:
+                        self.metrics.coalesced += 1
+                    return
+                if len(self.queue) >= self.maxsize:
+                    self.queue.popitem(last=False)
+                    with self.metrics.lock:
+                        self.metrics.dropped += 1
+                self.queue[key] = item
+            else:
+                if len(self.queue) >= self.maxsize:
+                    # A handler publishing into its own full queue would deadlock, so it drops instead.
+                    if self.policy == BackpressurePolicy.BLOCK and current_thread() is not self.thread:
+                        while len(self.queue) >= self.maxsize and self.running:
+                            self.cond.wait()
+                    else:
+                        self.queue.popleft()
+                        with self.metrics.lock:
+                            self.metrics.dropped += 1
+                self.queue.append(item)
+
+            with self.metrics.lock:
+                self.metrics.enqueued += 1
+                self.metrics.max_queue_depth = max(self.metrics.max_queue_depth, len(self.queue))
+            self.cond.notify_all()
+
+    def depth(self) -> int:
+        with self.cond:
+            return len(self.queue)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until every queued event has been handled.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.cond:
+            while self.queue or self.busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.cond.wait(remaining)
+        return True
+
+    def stop(self, timeout: Optional[float] = None):
+        self.flush(timeout)
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+        self.thread.join(timeout)
+
+    def _take(self) -> List[Tuple[float, str, Any]]:
+        limit = self.max_batch if self.batch else 1
+        items = []
+        while self.queue and len(items) < limit:
+            if isinstance(self.queue, OrderedDict):
+                items.append(self.queue.popitem(last=False)[1])
+            else:
+                items.append(self.queue.popleft())
+        return items
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while not self.queue and self.running:
+                    self.cond.wait()
+                if not self.queue and not self.running:
+                    return
+                items = self._take()
+                self.busy = True
+                self.cond.notify_all()
+
+            started = time.perf_counter()
+            wait = sum(started - enqueued_at for enqueued_at, _, _ in items)
+            failed = False
+            try:
+                if self.batch:
+                    self.handler([payload for _, _, payload in items])
+                else:
+                    self.handler(items[0][2])
+            except Exception as e:
+                failed = True
+                logger.exception(f"[EventBus] Error in async handler '{self.name}' for event '{items[0][1]}': {e}")
+            self.metrics.record_delivery(len(items), time.perf_counter() - started, wait, failed)
+
+            with self.cond:
+                self.busy = False
+                self.cond.notify_all()
+
+
+class EventBus:
+    """
+    In-process publish/subscribe bus.
+
+    By default handlers run synchronously on the publisher's thread. With
+    ``async_mode=True`` every handler gets its own bounded queue and worker
+    thread, so a slow subscriber no longer stalls publishers; the
+    ``backpressure`` policy decides what happens when a queue is full.
+    Handlers subscribed with ``batch=True`` (or carrying an
+    ``accepts_batch = True`` attribute) receive a list of payloads instead
+    of a single payload.
+    """
+
+    def __init__(
+        self,
+        async_mode: bool = False,
+        queue_size: int = 1000,
+        backpressure: str = BackpressurePolicy.BLOCK,
+        max_batch: int = 100,
+    ):
         self.subscribers: Dict[str, List[Callable[[Any], None]]] = {}
         self.lock = Lock()
+        self.async_mode = async_mode
+        self.queue_size = queue_size
+        self.backpressure = BackpressurePolicy(backpressure)
+        self.max_batch = max_batch
+        self.options: Dict[Callable, Dict[str, Any]] = {}
+        self.metrics: Dict[Callable, HandlerMetrics] = {}
+        self.workers: Dict[Callable, SubscriberWorker] = {}
 
-    def subscribe(self, event_type: str, handler: Callable[[Any], None]):
+    def configure(
+        self,
+        async_mode: Optional[bool] = None,
+        queue_size: Optional[int] = None,
+        backpressure: Optional[str] = None,
+        max_batch: Optional[int] = None,
+    ):
+        """
+        Switch dispatch mode or change defaults. Disabling async mode drains
+        and stops all workers first.
+        """
+        if async_mode is False and self.async_mode:
+            self.shutdown()
+        with self.lock:
+            if async_mode is not None:
+                self.async_mode = async_mode
+            if queue_size is not None:
+                self.queue_size = queue_size
+            if backpressure is not None:
+                self.backpressure = BackpressurePolicy(backpressure)
+            if max_batch is not None:
+                self.max_batch = max_batch
+
+    def subscribe(
+        self,
+        event_type: str,
+        handler: Callable[[Any], None],
+        batch: bool = False,
+        queue_size: Optional[int] = None,
+        backpressure: Optional[str] = None,
+        coalesce_key: Optional[Callable[[str, Any], Any]] = None,
+    ):
         """
         Register a handler for a specific event type.
 
         Args:
             event_type (str): The event identifier.
             handler (Callable): A function to handle the event.
+            batch (bool): Deliver lists of payloads instead of single payloads.
+            queue_size (int, optional): Async queue bound for this handler.
+            backpressure (str, optional): "block", "drop_oldest" or "coalesce" for this handler.
+            coalesce_key (Callable, optional): (event_type, payload) -> key for coalescing.
+                Defaults to the event type, i.e. only the latest event per type is kept.
         """
         with self.lock:
             if event_type not in self.subscribers:
@@ -26,6 +270,34 @@ class EventBus:
             else:
                 logger.debug(f"Handler already subscribed to event: {event_type}")
 
+            self.metrics.setdefault(handler, HandlerMetrics())
+            options = self.options.setdefault(handler, {})
+            options["batch"] = batch or options.get("batch", False) or getattr(handler, "accepts_batch", False)
+            if queue_size is not None:
+                options["queue_size"] = queue_size
+            if backpressure is not None:
+                options["backpressure"] = BackpressurePolicy(backpressure)
+            if coalesce_key is not None:
+                options["coalesce_key"] = coalesce_key
+
+    def unsubscribe(self, event_type: str, handler: Callable[[Any], None]) -> bool:
+        """
+        Remove a handler from an event type.
+
+        Returns:
+            bool: True if the handler was subscribed.
+        """
+        with self.lock:
+            handlers = self.subscribers.get(event_type, [])
+            if handler not in handlers:
+                return False
+            handlers.remove(handler)
+            still_used = any(handler in hs for hs in self.subscribers.values())
+            worker = None if still_used else self.workers.pop(handler, None)
+        if worker is not None:
+            worker.stop()
+        return True
+
     def publish(self, event_type: str, payload: Any):
         """
         Emit an event and notify all registered handlers.
@@ -37,13 +309,126 @@ class EventBus:
         with self.lock:
             handlers = list(self.subscribers.get(event_type, []))  # copy to avoid mutation during iteration
 
-        logger.info(f"Publishing event: {event_type} to {len(handlers)} handlers")
+        logger.debug(f"Publishing event: {event_type} to {len(handlers)} handlers")
 
         for handler in handlers:
-            try:
-                handler(payload)
-            except Exception as e:
-                logger.exception(f"[EventBus] Error in handler for event '{event_type}': {e}")
+            self._dispatch(handler, event_type, payload)
+
+    def publish_batch(self, events: Iterable[Tuple[str, Any]]) -> int:
+        """
+        Emit a batch of events in order, resolving handlers under a single lock.
+
+        In synchronous mode a batch handler is called once with the payloads
+        of every event in the batch it subscribes to, after the per-event
+        handlers have run.
+
+        Args:
+            events (Iterable[Tuple[str, Any]]): (event_type, payload) pairs.
+
+        Returns:
+            int: Number of events published.
+        """
+        events = list(events)
+        with self.lock:
+            handlers_by_type = {
+                event_type: list(self.subscribers.get(event_type, []))
+                for event_type in {event_type for event_type, _ in events}
+            }
+
+        logger.debug(f"Publishing batch of {len(events)} events")
+
+        batched: Dict[Callable, Tuple[str, List[Any]]] = {}
+        for event_type, payload in events:
+            for handler in handlers_by_type[event_type]:
+                if not self.async_mode and self.options.get(handler, {}).get("batch"):
+                    batched.setdefault(handler, (event_type, []))[1].append(payload)
+                else:
+                    self._dispatch(handler, event_type, payload)
+        for handler, (event_type, payloads) in batched.items():
+            self._deliver(handler, event_type, payloads, len(payloads))
+        return len(events)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until all async queues are drained.
+
+        Returns:
+            bool: False if the timeout expired first.
+        """
+        with self.lock:
+            workers = list(self.workers.values())
+        return all(worker.flush(timeout) for worker in workers)
+
+    def shutdown(self, timeout: Optional[float] = None):
+        """
+        Drains and stops every async worker.
+        """
+        with self.lock:
+            workers = list(self.workers.values())
+            self.workers.clear()
+        for worker in workers:
+            worker.stop(timeout)
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-handler delivery metrics, keyed by handler name.
+        """
+        with self.lock:
+            entries = [(h, m, self.workers.get(h)) for h, m in self.metrics.items()]
+        return {
+            self._handler_name(handler): metrics.snapshot(worker.depth() if worker else 0)
+            for handler, metrics, worker in entries
+        }
+
+    def _dispatch(self, handler: Callable, event_type: str, payload: Any):
+        if self.async_mode:
+            self._worker_for(handler).put(event_type, payload)
+            return
+
+        if self.options.get(handler, {}).get("batch"):
+            self._deliver(handler, event_type, [payload], 1)
+        else:
+            self._deliver(handler, event_type, payload, 1)
+
+    def _deliver(self, handler: Callable, event_type: str, argument: Any, count: int):
+        """
+        Calls a handler on the current thread and records ``count`` delivered events.
+        """
+        metrics = self.metrics.get(handler)
+        started = time.perf_counter()
+        failed = False
+        try:
+            handler(argument)
+        except Exception as e:
+            failed = True
+            logger.exception(f"[EventBus] Error in handler for event '{event_type}': {e}")
+        if metrics is not None:
+            metrics.record_delivery(count, time.perf_counter() - started, failed=failed)
+
+    def _worker_for(self, handler: Callable) -> SubscriberWorker:
+        worker = self.workers.get(handler)
+        if worker is not None:
+            return worker
+        with self.lock:
+            worker = self.workers.get(handler)
+            if worker is None:
+                options = self.options.get(handler, {})
+                worker = SubscriberWorker(
+                    handler,
+                    name=self._handler_name(handler),
+                    metrics=self.metrics.setdefault(handler, HandlerMetrics()),
+                    maxsize=options.get("queue_size", self.queue_size),
+                    policy=options.get("backpressure", self.backpressure),
+                    batch=options.get("batch", False),
+                    max_batch=self.max_batch,
+                    coalesce_key=options.get("coalesce_key"),
+                )
+                self.workers[handler] = worker
+            return worker
+
+    @staticmethod
+    def _handler_name(handler: Callable) -> str:
+        return getattr(handler, "__qualname__", None) or repr(handler)
 
 # Global singleton
 event_bus = EventBus()
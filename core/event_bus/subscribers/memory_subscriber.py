@@ -10,17 +10,15 @@ memory_store = []
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
-def store_event_in_memory(payload):
+def store_event_in_memory(payloads):
+    """
+    Batch-capable handler: the bus delivers a list of payloads.
+    """
     timestamp = datetime.utcnow().isoformat()
-    memory_record = {
-        "timestamp": timestamp,
-        "event": payload
-    }
+    memory_store.extend({"timestamp": timestamp, "event": payload} for payload in payloads)
 
-    memory_store.append(memory_record)
-
-    logger.info(f"[MemorySubscriber] Stored event at {timestamp}: {payload}")
+    logger.debug(f"[MemorySubscriber] Stored {len(payloads)} event(s) at {timestamp}")
 
 # Subscribe to relevant memory-influencing events
-event_bus.subscribe(EventType.TASK_COMPLETED, store_event_in_memory)
-event_bus.subscribe(EventType.TASK_FEEDBACK, store_event_in_memory)
+event_bus.subscribe(EventType.TASK_COMPLETED, store_event_in_memory, batch=True)
+event_bus.subscribe(EventType.TASK_FEEDBACK, store_event_in_memory, batch=True)
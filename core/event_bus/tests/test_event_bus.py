@@ -0,0 +1,79 @@
+# File: core/event_bus/tests/test_event_bus.py
+
+import threading
+
+from core.event_bus.event_bus import EventBus
+
+
+def test_sync_mode_delivers_batches_as_single_item_lists():
+    bus = EventBus()
+    received = []
+    bus.subscribe("evt", received.append, batch=True)
+    bus.publish("evt", 1)
+    assert received == [[1]]
+    assert bus.get_metrics()["list.append"]["delivered"] == 1
+
+def test_sync_publish_batch_delivers_one_list_per_batch_handler():
+    bus = EventBus()
+    batches, singles = [], []
+
+    def on_batch(payloads):
+        batches.append(payloads)
+
+    bus.subscribe("a", on_batch, batch=True)
+    bus.subscribe("b", on_batch, batch=True)
+    bus.subscribe("a", singles.append)
+
+    assert bus.publish_batch([("a", 1), ("b", 2), ("c", 3), ("a", 4)]) == 4
+    assert batches == [[1, 2, 4]]
+    assert singles == [1, 4]
+    metrics = bus.get_metrics()[on_batch.__qualname__]
+    assert metrics["delivered"] == 3 and metrics["batches"] == 1
+
+def test_async_mode_does_not_block_publisher_on_slow_handler():
+    bus = EventBus(async_mode=True)
+    gate = threading.Event()
+    seen = []
+
+    def slow(payload):
+        gate.wait(5)
+        seen.append(payload)
+
+    bus.subscribe("evt", slow)
+    for i in range(5):
+        bus.publish("evt", i)
+    assert seen == []
+    gate.set()
+    assert bus.flush(5)
+    assert seen == list(range(5))
+    bus.shutdown()
+
+def test_drop_oldest_and_coalesce_policies():
+    bus = EventBus(async_mode=True)
+    gate = threading.Event()
+    dropped, coalesced = [], []
+
+    def blocked_drop(payload):
+        gate.wait(5)
+        dropped.append(payload)
+
+    def blocked_coalesce(payloads):
+        gate.wait(5)
+        coalesced.extend(payloads)
+
+    bus.subscribe("evt", blocked_drop, queue_size=2, backpressure="drop_oldest")
+    bus.subscribe("evt", blocked_coalesce, batch=True, backpressure="coalesce",
+                  coalesce_key=lambda event_type, payload: payload % 2)
+    bus.publish("evt", 0)
+    bus.flush(0.2)  # let both workers pick up the first event and block
+    for i in range(1, 6):
+        bus.publish("evt", i)
+    gate.set()
+    assert bus.flush(5)
+
+    assert dropped == [0, 4, 5]
+    assert coalesced == [0, 5, 4]  # replaced events keep their queue slot
+    metrics = bus.get_metrics()
+    assert metrics["test_drop_oldest_and_coalesce_policies.<locals>.blocked_drop"]["dropped"] == 3
+    assert metrics["test_drop_oldest_and_coalesce_policies.<locals>.blocked_coalesce"]["coalesced"] == 3
+    bus.shutdown()
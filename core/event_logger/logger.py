@@ -29,7 +29,7 @@ class EventLogger:
                 "content": content
             }
             serialized = serialize_event(event)
-            self.store.save_event(serialized)
+            self.store.save_event(serialized, event)
         except Exception as e:
             logger.error(f"[EventLogger] Failed to log event: {e}")
 
@@ -40,4 +40,10 @@ class EventLogger:
         return self.store.get_all()
 
     def get_events_by_type(self, event_type):
-        return [e for e in self.get_all_events() if e.get("event_type") == event_type]
+        return self.store.get_events_by_type(event_type)
+
+    def iter_events(self, agent_id=None, event_type=None, start=None, end=None):
+        """
+        Lazily streams matching events without loading the full history.
+        """
+        return self.store.iter_events(agent_id=agent_id, event_type=event_type, start=start, end=end)
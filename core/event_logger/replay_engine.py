@@ -1,24 +1,104 @@
 import time
+import heapq
+import asyncio
 import logging
+from itertools import chain, islice
 from .store import EventStore
-from .serializer import deserialize_event
-# from core.event_bus import event_bus  # Optional
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+MAX_SPEED = float("inf")
+
+
+def _event_time(event):
+    return event.get("timestamp") or 0
+
+
+def _sorted_stream(events):
+    # Sorted on first use, so the segment is only read once the merge reaches it
+    yield from sorted(events, key=_event_time)
+
+
 class ReplayEngine:
-    def __init__(self, speed=1.0):
+    def __init__(self, speed=1.0, store=None, batch_size=100, bus=None):
         """
         Initialize the replay engine.
 
         Args:
             speed (float): Replay speed multiplier (e.g., 1.0 = real-time, 10.0 = 10x faster).
+                Use MAX_SPEED (or None) to replay without any sleeps.
+            store (EventStore, optional): Event store to replay from.
+            batch_size (int): Number of events republished to the event bus per batch.
+            bus (EventBus, optional): Target bus for emitted events. Defaults to the global event_bus.
+        """
+        self.store = store or EventStore()
+        self.speed = MAX_SPEED if speed is None else speed
+        self.batch_size = batch_size
+        self.bus = bus
+
+    def stream(self, agent_id=None, event_type=None, start=None, end=None, max_events=None):
+        """
+        Lazily yields events in timestamp order.
+
+        Segments are usually time-ordered already, so they are k-way merged
+        instead of sorted. Only segments whose time ranges overlap are merged
+        together; disjoint runs are chained, which bounds open files and
+        memory to one record per overlapping segment. A segment the store
+        saw an out-of-order append in is sorted on its own before it joins
+        the merge. Filters are pushed down to the store's indexes.
+
+        Args:
+            agent_id (str, optional): Replay events for a specific agent only.
+            event_type (str, optional): Replay events of this type only.
+            start (float, optional): Earliest timestamp to replay.
+            end (float, optional): Latest timestamp to replay.
+            max_events (int, optional): Maximum number of events to yield.
+        """
+        streams = self.store.segment_streams(agent_id=agent_id, event_type=event_type, start=start, end=end)
+        streams.sort(key=lambda item: item[0].min_ts if item[0].min_ts is not None else 0)
+
+        groups = []
+        group_end = None
+        for meta, events in streams:
+            if not meta.ordered:
+                events = _sorted_stream(events)
+            if groups and group_end is not None and meta.min_ts is not None and meta.min_ts <= group_end:
+                groups[-1].append(events)
+                group_end = max(group_end, meta.max_ts)
+            else:
+                groups.append([events])
+                group_end = meta.max_ts
+
+        merged = chain.from_iterable(
+            group[0] if len(group) == 1 else heapq.merge(*group, key=_event_time)
+            for group in groups
+        )
+        return islice(merged, max_events) if max_events else merged
+
+    def paced(self, events):
         """
-        self.store = EventStore()
-        self.speed = speed
+        Yields events at their original relative spacing divided by ``speed``.
+
+        Sleeps are scheduled against a wall-clock anchor, so per-event
+        overhead does not accumulate as drift.
+        """
+        if self.speed == MAX_SPEED:
+            yield from events
+            return
+
+        origin = wall_origin = None
+        for event in events:
+            timestamp = _event_time(event)
+            if origin is None:
+                origin, wall_origin = timestamp, time.monotonic()
+            else:
+                delay = wall_origin + (timestamp - origin) / self.speed - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            yield event
 
-    def replay(self, agent_id=None, max_events=None, emit=False):
+    def replay(self, agent_id=None, max_events=None, emit=False, event_type=None, start=None, end=None):
         """
         Replays historical events for a given agent or all agents.
 
@@ -26,26 +106,73 @@ class ReplayEngine:
             agent_id (str, optional): Replay events for a specific agent only.
             max_events (int, optional): Maximum number of events to replay.
             emit (bool): Whether to emit the event back to the event bus.
+            event_type (str, optional): Replay events of this type only.
+            start (float, optional): Earliest timestamp to replay.
+            end (float, optional): Latest timestamp to replay.
+
+        Returns:
+            int: Number of events replayed.
         """
-        events = self.store.get_all() if agent_id is None else self.store.get_events_by_agent(agent_id)
-        events = [deserialize_event(e) for e in events]
-        events.sort(key=lambda x: x["timestamp"])
+        events = self.paced(self.stream(agent_id, event_type, start, end, max_events))
+        bus = self._resolve_bus() if emit else None
+
+        count = 0
+        batch = []
+        for event in events:
+            count += 1
+            logger.debug(f"[{event['agent_id']}] -> {event['event_type']} @ {event['timestamp']} :: {event['content']}")
+            if bus is not None:
+                batch.append((event["event_type"], event["content"]))
+                # When pacing, deliver promptly instead of holding events back for a full batch.
+                if len(batch) >= self.batch_size or self.speed != MAX_SPEED:
+                    bus.publish_batch(batch)
+                    batch = []
+        if batch:
+            bus.publish_batch(batch)
 
-        if not events:
+        if not count:
             logger.warning("⚠️ No events to replay.")
-            return
+        else:
+            logger.info(f"Replayed {count} events")
+        return count
+
+    async def areplay(self, agent_id=None, max_events=None, emit=False, event_type=None, start=None, end=None):
+        """
+        Async generator variant of replay(); pacing uses asyncio.sleep so the
+        event loop is never blocked. Emitted batches are still published
+        through the (synchronous) event bus.
+
+        Yields:
+            dict: Each replayed event.
+        """
+        bus = self._resolve_bus() if emit else None
+        loop = asyncio.get_running_loop()
+        origin = wall_origin = None
+        batch = []
 
-        for i, event in enumerate(events):
-            if max_events and i >= max_events:
-                break
+        for event in self.stream(agent_id, event_type, start, end, max_events):
+            if self.speed != MAX_SPEED:
+                timestamp = _event_time(event)
+                if origin is None:
+                    origin, wall_origin = timestamp, loop.time()
+                else:
+                    delay = wall_origin + (timestamp - origin) / self.speed - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
 
-            delay = 0
-            if i > 0:
-                delay = (event["timestamp"] - events[i - 1]["timestamp"]) / self.speed
-            time.sleep(delay)
+            if bus is not None:
+                batch.append((event["event_type"], event["content"]))
+                if len(batch) >= self.batch_size or self.speed != MAX_SPEED:
+                    bus.publish_batch(batch)
+                    batch = []
+                    await asyncio.sleep(0)
+            yield event
 
-            logger.info(f"[{event['agent_id']}] -> {event['event_type']} @ {event['timestamp']} :: {event['content']}")
+        if batch:
+            bus.publish_batch(batch)
 
-            if emit:
-                # event_bus.publish(event["event_type"], event["content"])
-                pass
+    def _resolve_bus(self):
+        if self.bus is None:
+            from core.event_bus import event_bus
+            self.bus = event_bus
+        return self.bus
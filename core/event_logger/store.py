@@ -1,29 +1,417 @@
 import os
 import json
+import time
 import threading
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".jsonl"
+INDEX_SUFFIX = ".idx"
+LEGACY_LOG = "event_log.jsonl"
+
+
+@dataclass
+class SegmentMeta:
+    """
+    Bookkeeping for one append-only log segment.
+    """
+    segment_id: int
+    path: str
+    index_path: str
+    created_at: float
+    size: int = 0
+    count: int = 0
+    min_ts: Optional[float] = None
+    max_ts: Optional[float] = None
+    # False once an event was appended with an earlier timestamp than the one before it
+    ordered: bool = True
+    last_ts: float = 0
+
+    def covers(self, start: Optional[float], end: Optional[float]) -> bool:
+        if start is None and end is None:
+            return True
+        if self.min_ts is None:
+            return False
+        if start is not None and self.max_ts < start:
+            return False
+        if end is not None and self.min_ts > end:
+            return False
+        return True
+
 
 class EventStore:
-    def __init__(self, log_path="logs/event_log.jsonl"):
-        self.log_path = log_path
-        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    """
+    Segmented, append-only event log.
+
+    Events are appended as JSON lines to ``segment-NNNNNN.jsonl`` files in
+    ``log_dir``. A segment is sealed and a new one started once it exceeds
+    ``max_segment_bytes`` or is older than ``max_segment_seconds``. Each
+    segment has a sidecar ``.idx`` file with one compact entry per event
+    (offset, length, timestamp, agent_id, event_type). On startup only the
+    sidecars are read, which rebuilds the in-memory offset indexes:
+
+        agent_id   -> [(segment_id, offset), ...]
+        event_type -> [(segment_id, offset), ...]
+        segment    -> (min_ts, max_ts)
+
+    Queries seek straight to matching records and stream them lazily.
+
+    A store without segments imports the single-file log of earlier
+    versions (``event_log.jsonl`` next to ``log_dir``, i.e.
+    ``logs/event_log.jsonl``) on startup; the file is then renamed to
+    ``event_log.jsonl.imported``.
+    """
+
+    def __init__(
+        self,
+        log_dir="logs/events",
+        max_segment_bytes=64 * 1024 * 1024,
+        max_segment_seconds=3600,
+        legacy_path=None,
+    ):
+        """
+        Args:
+            legacy_path (str, optional): Single-file log to import; defaults to
+                ``event_log.jsonl`` in the parent directory of ``log_dir``.
+        """
+        self.log_dir = log_dir
+        if legacy_path is None:
+            legacy_path = os.path.join(os.path.dirname(os.path.abspath(log_dir)), LEGACY_LOG)
+        self.legacy_path = legacy_path
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_seconds = max_segment_seconds
+        os.makedirs(log_dir, exist_ok=True)
         self.lock = threading.Lock()
 
-    def save_event(self, event_data: str):
+        self.segments: Dict[int, SegmentMeta] = {}
+        self.agent_index: Dict[str, List[Tuple[int, int]]] = {}
+        self.type_index: Dict[str, List[Tuple[int, int]]] = {}
+        self._active: Optional[SegmentMeta] = None
+        self._log_file = None
+        self._index_file = None
+        self._load_segments()
+        self._import_legacy()
+
+    # ------------------------------------------------------------------ #
+    # Writing
+    # ------------------------------------------------------------------ #
+
+    def save_event(self, event_data: str, event: Optional[dict] = None):
+        """
+        Appends a serialized event to the active segment and indexes it.
+
+        Args:
+            event_data (str): JSON-serialized event.
+            event (dict, optional): The decoded event, saves re-parsing event_data.
+        """
         try:
-            with self.lock, open(self.log_path, 'a') as f:
-                f.write(event_data + "\n")
+            if event is None:
+                event = json.loads(event_data)
+            record = (event_data + "\n").encode("utf-8")
+            with self.lock:
+                segment = self._writable_segment(len(record))
+                offset = segment.size
+                self._log_file.write(record)
+                self._log_file.flush()
+                entry = [offset, len(record), event.get("timestamp"),
+                         event.get("agent_id"), event.get("event_type")]
+                self._index_file.write(json.dumps(entry) + "\n")
+                self._index_file.flush()
+                self._apply_index_entry(segment, entry)
         except Exception as e:
             print(f"[EventStore] Failed to save event: {e}")
 
+    def close(self):
+        """
+        Closes the active segment's file handles.
+        """
+        with self.lock:
+            self._close_active()
+
+    # ------------------------------------------------------------------ #
+    # Reading
+    # ------------------------------------------------------------------ #
+
+    def iter_events(self, agent_id=None, event_type=None, start=None, end=None) -> Iterator[dict]:
+        """
+        Lazily yields stored events in append order.
+
+        Args:
+            agent_id (str, optional): Only events from this agent.
+            event_type (str, optional): Only events of this type.
+            start (float, optional): Only events with timestamp >= start.
+            end (float, optional): Only events with timestamp <= end.
+
+        Yields:
+            dict: Decoded events.
+        """
+        for segment_id, offsets in self.plan_query(agent_id, event_type, start, end):
+            yield from self._filter(self._read_segment(segment_id, offsets), agent_id, event_type, start, end)
+
+    def segment_streams(self, agent_id=None, event_type=None, start=None, end=None) -> List[Tuple[SegmentMeta, Iterator[dict]]]:
+        """
+        Resolves a query to one lazy event stream per segment, with all
+        filters pushed down. Segment files are only opened once their stream
+        is first advanced.
+
+        Returns:
+            List of (segment metadata, event iterator) in segment order.
+        """
+        streams = []
+        for segment_id, offsets in self.plan_query(agent_id, event_type, start, end):
+            meta = self.segments[segment_id]
+            events = self._filter(self._read_segment(segment_id, offsets), agent_id, event_type, start, end)
+            streams.append((meta, events))
+        return streams
+
+    def plan_query(self, agent_id=None, event_type=None, start=None, end=None) -> List[Tuple[int, Optional[List[int]]]]:
+        """
+        Resolves a query to the segments (and offsets within them) to read.
+
+        Returns:
+            List of (segment_id, offsets) in append order; offsets is None
+            when the whole segment must be streamed.
+        """
+        with self.lock:
+            segment_ids = [sid for sid, meta in sorted(self.segments.items()) if meta.covers(start, end)]
+            if agent_id is None and event_type is None:
+                return [(sid, None) for sid in segment_ids]
+
+            candidates = []
+            if agent_id is not None:
+                candidates.append(self.agent_index.get(agent_id, []))
+            if event_type is not None:
+                candidates.append(self.type_index.get(event_type, []))
+            positions = min(candidates, key=len)[:]
+
+        wanted = set(segment_ids)
+        plan: Dict[int, List[int]] = {}
+        for segment_id, offset in positions:
+            if segment_id in wanted:
+                plan.setdefault(segment_id, []).append(offset)
+        return sorted(plan.items())
+
+    def segments_for_range(self, start=None, end=None) -> List[SegmentMeta]:
+        """
+        Returns metadata for segments whose time range overlaps [start, end].
+        """
+        with self.lock:
+            return [meta for _, meta in sorted(self.segments.items()) if meta.covers(start, end)]
+
     def get_all(self):
+        return list(self.iter_events())
+
+    def get_events_by_agent(self, agent_id):
+        return list(self.iter_events(agent_id=agent_id))
+
+    def get_events_by_type(self, event_type):
+        return list(self.iter_events(event_type=event_type))
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+
+    @classmethod
+    def _filter(cls, events, agent_id, event_type, start, end) -> Iterator[dict]:
+        for event in events:
+            if agent_id is not None and event.get("agent_id") != agent_id:
+                continue
+            if event_type is not None and event.get("event_type") != event_type:
+                continue
+            if not cls._in_window(event.get("timestamp"), start, end):
+                continue
+            yield event
+
+    @staticmethod
+    def _in_window(timestamp, start, end) -> bool:
+        if start is None and end is None:
+            return True
+        if timestamp is None:
+            return False
+        if start is not None and timestamp < start:
+            return False
+        if end is not None and timestamp > end:
+            return False
+        return True
+
+    def _read_segment(self, segment_id, offsets=None) -> Iterator[dict]:
+        meta = self.segments.get(segment_id)
+        if meta is None:
+            return
         try:
-            with open(self.log_path, 'r') as f:
-                return [json.loads(line.strip()) for line in f if line.strip()]
+            with open(meta.path, "rb") as f:
+                if offsets is None:
+                    limit = meta.size
+                    while f.tell() < limit:
+                        line = f.readline()
+                        if not line:
+                            break
+                        if line.strip():
+                            yield json.loads(line)
+                else:
+                    for offset in offsets:
+                        f.seek(offset)
+                        yield json.loads(f.readline())
         except FileNotFoundError:
-            return []
+            return
         except Exception as e:
             print(f"[EventStore] Failed to load events: {e}")
-            return []
 
-    def get_events_by_agent(self, agent_id):
-        return [e for e in self.get_all() if e.get("agent_id") == agent_id]
+    def _segment_paths(self, segment_id):
+        stem = os.path.join(self.log_dir, f"{SEGMENT_PREFIX}{segment_id:06d}")
+        return stem + SEGMENT_SUFFIX, stem + INDEX_SUFFIX
+
+    def _load_segments(self):
+        for name in sorted(os.listdir(self.log_dir)):
+            if not (name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)):
+                continue
+            try:
+                segment_id = int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+            except ValueError:
+                continue
+            path, index_path = self._segment_paths(segment_id)
+            meta = SegmentMeta(segment_id, path, index_path, created_at=os.path.getmtime(path))
+            self.segments[segment_id] = meta
+            self._load_sidecar(meta)
+            self._recover_tail(meta)
+
+        if self.segments:
+            self._active = self.segments[max(self.segments)]
+
+    def _import_legacy(self):
+        """
+        Appends every complete record of the legacy log to fresh segments.
+        The file is parked as ``<legacy_path>.importing`` meanwhile, so an
+        interrupted import discards its partial segments and starts over.
+        """
+        importing = self.legacy_path + ".importing"
+        if os.path.exists(importing):
+            with self.lock:
+                self._close_active()
+                for meta in self.segments.values():
+                    for path in (meta.path, meta.index_path):
+                        if os.path.exists(path):
+                            os.remove(path)
+                self.segments.clear()
+                self.agent_index.clear()
+                self.type_index.clear()
+        elif self.segments or not os.path.isfile(self.legacy_path):
+            return
+        else:
+            os.replace(self.legacy_path, importing)
+
+        imported = 0
+        with open(importing, "rb") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn or corrupt line; the old reader would have failed on it
+                if isinstance(event, dict):
+                    self.save_event(json.dumps(event), event)
+                    imported += 1
+        self.close()
+        os.replace(importing, self.legacy_path + ".imported")
+        print(f"[EventStore] Imported {imported} events from {self.legacy_path}")
+
+    def _load_sidecar(self, meta: SegmentMeta):
+        if not os.path.exists(meta.index_path):
+            return
+        valid_bytes = 0
+        with open(meta.index_path, "rb") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line) if line.endswith(b"\n") else None
+                except json.JSONDecodeError:
+                    entry = None
+                if entry is None:
+                    break  # torn final write; the segment tail is re-indexed below
+                valid_bytes += len(line)
+                if isinstance(entry, dict):
+                    meta.created_at = entry.get("created_at", meta.created_at)
+                    continue
+                self._apply_index_entry(meta, entry)
+        if valid_bytes < os.path.getsize(meta.index_path):
+            with open(meta.index_path, "ab") as f:
+                f.truncate(valid_bytes)
+
+    def _recover_tail(self, meta: SegmentMeta):
+        """
+        Re-indexes records that reached the segment but not its sidecar
+        (e.g. after a crash), and truncates a torn final record.
+        """
+        actual_size = os.path.getsize(meta.path)
+        if actual_size <= meta.size:
+            return
+
+        recovered = []
+        with open(meta.path, "rb") as f:
+            f.seek(meta.size)
+            offset = meta.size
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                recovered.append([offset, len(line), event.get("timestamp"),
+                                  event.get("agent_id"), event.get("event_type")])
+                offset += len(line)
+
+        with open(meta.index_path, "a") as idx:
+            for entry in recovered:
+                idx.write(json.dumps(entry) + "\n")
+                self._apply_index_entry(meta, entry)
+        if actual_size > meta.size:
+            with open(meta.path, "ab") as f:
+                f.truncate(meta.size)
+
+    def _apply_index_entry(self, meta: SegmentMeta, entry):
+        offset, length, timestamp, agent_id, event_type = entry
+        position = (meta.segment_id, offset)
+        meta.size = max(meta.size, offset + length)
+        meta.count += 1
+        sort_key = timestamp if isinstance(timestamp, (int, float)) else 0
+        if sort_key < meta.last_ts:
+            meta.ordered = False
+        meta.last_ts = sort_key
+        if isinstance(timestamp, (int, float)):
+            meta.min_ts = timestamp if meta.min_ts is None else min(meta.min_ts, timestamp)
+            meta.max_ts = timestamp if meta.max_ts is None else max(meta.max_ts, timestamp)
+        if agent_id is not None:
+            self.agent_index.setdefault(agent_id, []).append(position)
+        if event_type is not None:
+            self.type_index.setdefault(event_type, []).append(position)
+
+    def _writable_segment(self, record_size) -> SegmentMeta:
+        active = self._active
+        if active is not None and active.count:
+            too_big = active.size + record_size > self.max_segment_bytes
+            too_old = time.time() - active.created_at > self.max_segment_seconds
+            if too_big or too_old:
+                self._close_active()
+                active = None
+
+        if active is None:
+            segment_id = max(self.segments) + 1 if self.segments else 1
+            path, index_path = self._segment_paths(segment_id)
+            active = SegmentMeta(segment_id, path, index_path, created_at=time.time())
+            self.segments[segment_id] = active
+            self._active = active
+
+        if self._log_file is None:
+            self._log_file = open(active.path, "ab")
+            self._index_file = open(active.index_path, "a")
+            if not active.count:
+                self._index_file.write(json.dumps({"created_at": active.created_at}) + "\n")
+        return active
+
+    def _close_active(self):
+        for handle in (self._log_file, self._index_file):
+            if handle is not None:
+                handle.close()
+        self._log_file = None
+        self._index_file = None
+        self._active = None
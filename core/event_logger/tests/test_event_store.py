@@ -0,0 +1,106 @@
+# File: core/event_logger/tests/test_event_store.py
+
+import json
+import os
+
+from core.event_logger.store import EventStore
+
+
+def fill(store, count=30):
+    for i in range(count):
+        event = {"timestamp": 1000 + i, "agent_id": f"agent-{i % 3}", "event_type": f"type-{i % 2}", "content": i}
+        store.save_event(json.dumps(event), event)
+
+def test_segments_roll_over_and_indexes_answer_queries(tmp_path):
+    store = EventStore(str(tmp_path), max_segment_bytes=500)
+    fill(store)
+    assert len(store.segments) > 1
+    assert [e["content"] for e in store.get_events_by_agent("agent-1")] == list(range(1, 30, 3))
+    assert len(store.get_events_by_type("type-0")) == 15
+    assert [e["content"] for e in store.iter_events(start=1010, end=1012)] == [10, 11, 12]
+    assert [e["content"] for e in store.iter_events(agent_id="agent-0", event_type="type-1")] == [3, 9, 15, 21, 27]
+
+def test_reload_rebuilds_index_and_recovers_unindexed_tail(tmp_path):
+    store = EventStore(str(tmp_path), max_segment_bytes=500)
+    fill(store)
+    store.close()
+
+    last = os.path.join(str(tmp_path), "segment-%06d.jsonl" % max(store.segments))
+    with open(last, "a") as f:
+        f.write(json.dumps({"timestamp": 2000, "agent_id": "late", "event_type": "x", "content": "ok"}) + "\n")
+        f.write('{"timestamp": 20')  # torn write
+
+    reloaded = EventStore(str(tmp_path), max_segment_bytes=500)
+    assert len(reloaded.get_all()) == 31
+    assert [e["content"] for e in reloaded.get_events_by_agent("late")] == ["ok"]
+
+def test_replay_merges_segments_in_time_order_and_emits_batches(tmp_path):
+    from core.event_logger.replay_engine import MAX_SPEED, ReplayEngine
+
+    class RecordingBus:
+        def __init__(self):
+            self.batches = []
+
+        def publish_batch(self, events):
+            self.batches.append(list(events))
+
+    store = EventStore(str(tmp_path), max_segment_bytes=200)
+    for ts in [1, 5, 3, 7, 2, 9, 8]:  # two events per segment, overlapping ranges
+        event = {"timestamp": ts, "agent_id": "agent", "event_type": "tick", "content": ts}
+        store.save_event(json.dumps(event), event)
+
+    bus = RecordingBus()
+    engine = ReplayEngine(speed=MAX_SPEED, store=store, batch_size=3, bus=bus)
+    assert [e["content"] for e in engine.stream(start=2, end=8)] == sorted(
+        e["content"] for e in store.iter_events(start=2, end=8)
+    )
+    assert engine.replay(emit=True) == 7
+    assert [len(batch) for batch in bus.batches] == [3, 3, 1]
+
+def test_replay_sorts_segments_with_out_of_order_appends(tmp_path):
+    from core.event_logger.replay_engine import MAX_SPEED, ReplayEngine
+
+    store = EventStore(str(tmp_path))
+    for ts in [10, 30, 20, 40]:
+        event = {"timestamp": ts, "agent_id": "agent", "event_type": "tick", "content": ts}
+        store.save_event(json.dumps(event), event)
+    store.close()
+    ordered = EventStore(str(tmp_path / "ordered"))
+    for ts in [15, 25]:
+        event = {"timestamp": ts, "agent_id": "agent", "event_type": "tick", "content": ts}
+        ordered.save_event(json.dumps(event), event)
+
+    reloaded = EventStore(str(tmp_path))
+    assert not reloaded.segments[1].ordered and ordered.segments[1].ordered
+    engine = ReplayEngine(speed=MAX_SPEED, store=reloaded)
+    assert [e["content"] for e in engine.stream()] == [10, 20, 30, 40]
+    assert [e["content"] for e in engine.stream(agent_id="agent", start=15)] == [20, 30, 40]
+
+def test_legacy_single_file_log_is_imported_once(tmp_path):
+    legacy = tmp_path / "event_log.jsonl"
+    with open(legacy, "w") as f:
+        for i in range(5):
+            f.write(json.dumps({"timestamp": 100 + i, "agent_id": f"agent-{i % 2}", "event_type": "old", "content": i}) + "\n")
+        f.write('{"timestamp": 1')  # torn final write
+
+    store = EventStore(str(tmp_path / "events"), max_segment_bytes=200)
+    assert [e["content"] for e in store.get_all()] == [0, 1, 2, 3, 4]
+    assert [e["content"] for e in store.get_events_by_agent("agent-1")] == [1, 3]
+    assert not legacy.exists() and (tmp_path / "event_log.jsonl.imported").exists()
+    store.close()
+
+    reloaded = EventStore(str(tmp_path / "events"), max_segment_bytes=200)
+    assert len(reloaded.get_all()) == 5
+
+def test_interrupted_legacy_import_starts_over(tmp_path):
+    importing = tmp_path / "event_log.jsonl.importing"
+    importing.write_text("".join(
+        json.dumps({"timestamp": i, "agent_id": "a", "event_type": "old", "content": i}) + "\n" for i in range(3)
+    ))
+    partial = EventStore(str(tmp_path / "events"), legacy_path=str(tmp_path / "missing.jsonl"))
+    fill(partial, 2)  # segments left behind by the interrupted run
+    partial.close()
+
+    store = EventStore(str(tmp_path / "events"))
+    assert [e["content"] for e in store.get_all()] == [0, 1, 2]
+    assert not importing.exists()
@@ -5,9 +5,14 @@ from .memory_store import MemoryStore
 from .semantic_search import SemanticSearchEngine
 
 class MemoryEngine:
-    def __init__(self):
+    def __init__(self, vector_index=None):
+        """
+        Args:
+            vector_index: Optional ANN index (e.g. ``IVFVectorIndex``) enabling
+                ``search_memories(mode="ann")``.
+        """
         self.memory_store = MemoryStore()
-        self.semantic_search = SemanticSearchEngine()
+        self.semantic_search = SemanticSearchEngine(vector_index=vector_index)
 
     def store_memory(
         self,
@@ -46,7 +51,7 @@ class MemoryEngine:
         self.memory_store.insert(memory_object)
 
         try:
-            self.semantic_search.index_memory(memory_id, content)
+            self.semantic_search.index_memory(memory_id, content, agent_id)
         except Exception as e:
             print(f"[Warning] Semantic index failed for {memory_id}: {e}")
 
@@ -69,18 +74,30 @@ class MemoryEngine:
             print(f"[Warning] Failed to remove memory from semantic index: {e}")
         return True
 
-    def search_memories(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
+    def search_memories(
+        self,
+        query: str,
+        top_k: int = 5,
+        agent_id: Optional[str] = None,
+        mode: str = "exact",
+        nprobe: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
         """
         Searches memories using semantic similarity.
 
         Args:
             query (str): The semantic query.
             top_k (int): Max number of results to return.
+            agent_id (str, optional): Only search this agent's memories.
+            mode (str): "exact" or "ann" (requires a vector index).
+            nprobe (int, optional): ANN recall/latency knob for this call.
 
         Returns:
             List[Dict]: Matched memory objects.
         """
-        memory_ids = self.semantic_search.search(query, top_k=top_k)
+        memory_ids = self.semantic_search.search(
+            query, top_k=top_k, agent_id=agent_id, mode=mode, nprobe=nprobe
+        )
         return [self.memory_store.get_by_id(mem_id) for mem_id in memory_ids if mem_id]
 
     def get_memories_by_agent(self, agent_id: str) -> List[Dict[str, Any]]:
@@ -117,8 +134,7 @@ class MemoryEngine:
         Returns:
             int: Number of pruned memories.
         """
-        memories = self.get_memories_by_agent(agent_id)
-        to_delete = [m["id"] for m in memories if m.get("importance", 0) < threshold]
+        to_delete = [m["id"] for m in self.memory_store.get_below_importance(agent_id, threshold)]
 
         for mem_id in to_delete:
             self.delete_memory(mem_id)
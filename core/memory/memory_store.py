@@ -1,16 +1,69 @@
+from bisect import bisect_left, insort
 from threading import Lock
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 
 class MemoryStore:
     """
     In-memory memory store for agent memories with thread-safe access and retrieval utilities.
+
+    Secondary indexes (by agent, by tag, and a sorted importance index per
+    agent) are maintained on every insert/delete so lookups cost O(result)
+    rather than a scan of every stored memory.
     """
 
     def __init__(self):
         self.memory_db: Dict[str, Dict[str, Any]] = {}
+        self.agent_index: Dict[str, Dict[str, Dict[str, Any]]] = {}  # {agent_id: {memory_id: memory}}
+        self.tag_index: Dict[str, Dict[str, Dict[str, Any]]] = {}  # {tag: {memory_id: memory}}
+        self.importance_index: Dict[str, List[Tuple[float, str]]] = {}  # {agent_id: sorted [(importance, memory_id)]}
+        # Keys each memory was indexed under, recorded at insert time: stored objects are
+        # handed out by reference, so a caller may change them before they are re-inserted
+        self._indexed_keys: Dict[str, Tuple[str, frozenset, Tuple[float, str]]] = {}
         self.lock = Lock()
 
+    @staticmethod
+    def _importance_key(memory_object: Dict[str, Any]) -> Tuple[float, str]:
+        return (float(memory_object.get("importance", 0) or 0), memory_object["id"])
+
+    def _index(self, memory_object: Dict[str, Any]) -> None:
+        memory_id = memory_object["id"]
+        agent_id = memory_object["agent_id"]
+        tags = frozenset(memory_object.get("tags") or [])
+        importance_key = self._importance_key(memory_object)
+        self._indexed_keys[memory_id] = (agent_id, tags, importance_key)
+        self.agent_index.setdefault(agent_id, {})[memory_id] = memory_object
+        for tag in tags:
+            self.tag_index.setdefault(tag, {})[memory_id] = memory_object
+        insort(self.importance_index.setdefault(agent_id, []), importance_key)
+
+    def _unindex(self, memory_id: str) -> None:
+        indexed = self._indexed_keys.pop(memory_id, None)
+        if indexed is None:
+            return
+        agent_id, tags, key = indexed
+
+        by_agent = self.agent_index.get(agent_id)
+        if by_agent is not None:
+            by_agent.pop(memory_id, None)
+            if not by_agent:
+                del self.agent_index[agent_id]
+
+        for tag in tags:
+            by_tag = self.tag_index.get(tag)
+            if by_tag is not None:
+                by_tag.pop(memory_id, None)
+                if not by_tag:
+                    del self.tag_index[tag]
+
+        ranked = self.importance_index.get(agent_id)
+        if ranked is not None:
+            position = bisect_left(ranked, key)
+            if position < len(ranked) and ranked[position] == key:
+                del ranked[position]
+            if not ranked:
+                del self.importance_index[agent_id]
+
     def insert(self, memory_object: Dict[str, Any]) -> None:
         """
         Inserts a memory object into the store.
@@ -22,7 +75,9 @@ class MemoryStore:
             raise ValueError("Memory object must contain 'id' and 'agent_id'.")
 
         with self.lock:
+            self._unindex(memory_object["id"])
             self.memory_db[memory_object["id"]] = memory_object
+            self._index(memory_object)
 
     def get_by_id(self, memory_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -48,10 +103,10 @@ class MemoryStore:
             bool: True if deleted, False if not found.
         """
         with self.lock:
-            if memory_id in self.memory_db:
-                del self.memory_db[memory_id]
-                return True
-            return False
+            if self.memory_db.pop(memory_id, None) is None:
+                return False
+            self._unindex(memory_id)
+            return True
 
     def get_by_agent(self, agent_id: str) -> List[Dict[str, Any]]:
         """
@@ -64,7 +119,23 @@ class MemoryStore:
             List[Dict]: List of memory objects.
         """
         with self.lock:
-            return [mem for mem in self.memory_db.values() if mem.get("agent_id") == agent_id]
+            return list(self.agent_index.get(agent_id, {}).values())
+
+    def get_below_importance(self, agent_id: str, threshold: float) -> List[Dict[str, Any]]:
+        """
+        Retrieves an agent's memories with importance strictly below a threshold.
+
+        Args:
+            agent_id (str): The agent ID.
+            threshold (float): Importance cutoff (exclusive).
+
+        Returns:
+            List[Dict]: Matching memory objects, least important first.
+        """
+        with self.lock:
+            ranked = self.importance_index.get(agent_id, [])
+            cutoff = bisect_left(ranked, (float(threshold), ""))
+            return [self.memory_db[memory_id] for _, memory_id in ranked[:cutoff]]
 
     def list_all(self) -> List[Dict[str, Any]]:
         """
@@ -87,7 +158,7 @@ class MemoryStore:
             List[Dict]: Matching memory entries.
         """
         with self.lock:
-            return [mem for mem in self.memory_db.values() if tag in mem.get("tags", [])]
+            return list(self.tag_index.get(tag, {}).values())
 
     def count(self) -> int:
         """
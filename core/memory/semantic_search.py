@@ -1,31 +1,83 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import heapq
+import math
+import re
+from collections import Counter
 from threading import Lock
-from typing import List, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Same token rule as sklearn's TfidfVectorizer default: 2+ word characters.
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
 
 
 class SemanticSearchEngine:
     """
     A simple semantic search engine using TF-IDF and cosine similarity.
+
+    The index is maintained incrementally: a persistent vocabulary, postings
+    lists and document-frequency counters are updated on every insert/delete,
+    so indexing costs O(document length) and queries only walk the postings
+    of the query terms. IDF weighting and L2 normalisation match sklearn's
+    ``TfidfVectorizer`` defaults (smooth idf, sublinear_tf off).
+
+    An optional vector index (e.g. ``IVFVectorIndex``) can be attached to
+    serve approximate nearest-neighbour queries via ``search(mode="ann")``;
+    it is kept in sync with every insert and delete, under the same lock,
+    so concurrent writers cannot leave the two indexes disagreeing.
     """
 
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer()
+    SEARCH_MODES = ("exact", "ann")
+
+    def __init__(self, vector_index=None):
         self.indexed_memories = {}  # {memory_id: text}
-        self.tfidf_matrix = None
+        self.vocabulary: Dict[str, int] = {}  # {term: term_id}, ids are never reused
+        self.doc_freq: Dict[int, int] = {}  # {term_id: number of docs containing term}
+        self.postings: Dict[int, Dict[str, int]] = {}  # {term_id: {memory_id: tf}}
+        self.doc_terms: Dict[str, Dict[int, int]] = {}  # {memory_id: {term_id: tf}}
+        self._norm_cache: Dict[str, Tuple[int, float]] = {}  # {memory_id: (version, norm)}
+        self.doc_agents: Dict[str, Optional[str]] = {}  # {memory_id: agent_id}
+        self.vector_index = vector_index
+        self._version = 0
         self.lock = Lock()
 
-    def index_memory(self, memory_id: str, text: str) -> None:
+    @staticmethod
+    def _tokenize(text: str) -> List[str]:
+        return TOKEN_PATTERN.findall(text.lower())
+
+    def index_memory(self, memory_id: str, text: str, agent_id: Optional[str] = None) -> None:
         """
         Adds or updates a memory in the semantic index.
 
         Args:
             memory_id (str): Unique memory ID.
             text (str): Memory content.
+            agent_id (str, optional): Owning agent, enables agent-scoped search.
+        """
+        with self.lock:
+            self._add_document(memory_id, text, agent_id)
+            self._version += 1
+            if self.vector_index is not None:
+                self.vector_index.add(memory_id, text, agent_id)
+
+    def index_many(self, memories: Iterable[Sequence]) -> int:
         """
+        Bulk-indexes memories under a single lock acquisition.
+
+        Args:
+            memories (Iterable): (memory_id, text) or (memory_id, text, agent_id) tuples.
+
+        Returns:
+            int: Number of memories indexed.
+        """
+        batch = [(item[0], item[1], item[2] if len(item) > 2 else None) for item in memories]
         with self.lock:
-            self.indexed_memories[memory_id] = text
-            self._rebuild_index()
+            for memory_id, text, agent_id in batch:
+                self._add_document(memory_id, text, agent_id)
+            if batch:
+                self._version += 1
+            if self.vector_index is not None:
+                for memory_id, text, agent_id in batch:
+                    self.vector_index.add(memory_id, text, agent_id)
+        return len(batch)
 
     def remove_from_index(self, memory_id: str) -> bool:
         """
@@ -38,53 +90,151 @@ class SemanticSearchEngine:
             bool: True if removed, False if not found.
         """
         with self.lock:
-            if memory_id in self.indexed_memories:
-                del self.indexed_memories[memory_id]
-                self._rebuild_index()
-                return True
-            return False
+            if memory_id not in self.indexed_memories:
+                return False
+            self._remove_document(memory_id)
+            self._version += 1
+            if self.vector_index is not None:
+                self.vector_index.remove(memory_id)
+        return True
 
-    def search(self, query: str, top_k: int = 5, return_scores: bool = False) -> List:
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        return_scores: bool = False,
+        agent_id: Optional[str] = None,
+        mode: str = "exact",
+        nprobe: Optional[int] = None,
+    ) -> List:
         """
         Performs a semantic search on the indexed memories.
 
+        In ``exact`` mode only memories sharing at least one term with the
+        query are scored, so results may be shorter than ``top_k``. ``ann``
+        mode delegates to the attached vector index.
+
         Args:
             query (str): The search query.
             top_k (int): Number of top results to return.
             return_scores (bool): Whether to return similarity scores.
+            agent_id (str, optional): Restrict results to this agent's memories.
+            mode (str): "exact" (TF-IDF inverted index) or "ann" (vector index).
+            nprobe (int, optional): ANN cells to probe, overriding the index default.
 
         Returns:
             List[str] or List[Tuple[str, float]]: Top matching memory IDs or (ID, score) tuples.
         """
+        if mode not in self.SEARCH_MODES:
+            raise ValueError(f"Unknown search mode '{mode}'. Expected one of {self.SEARCH_MODES}.")
+        if mode == "ann":
+            if self.vector_index is None:
+                raise ValueError("ANN search requested but no vector index is configured.")
+            ranked = self.vector_index.search(query, top_k=top_k, agent_id=agent_id, nprobe=nprobe)
+            if return_scores:
+                return ranked
+            return [memory_id for memory_id, _ in ranked]
+
         with self.lock:
-            if not self.indexed_memories:
+            if not self.indexed_memories or top_k <= 0:
                 return []
 
-            documents = list(self.indexed_memories.values())
-            memory_ids = list(self.indexed_memories.keys())
-
-            all_texts = documents + [query]
-            tfidf_matrix = self.vectorizer.fit_transform(all_texts)
+            query_weights = self._query_weights(query)
+            if not query_weights:
+                return []
 
-            query_vec = tfidf_matrix[-1]
-            doc_matrix = tfidf_matrix[:-1]
+            dot_products: Dict[str, float] = {}
+            for term_id, q_weight in query_weights.items():
+                idf = self._idf(term_id)
+                for memory_id, tf in self.postings[term_id].items():
+                    if agent_id is not None and self.doc_agents.get(memory_id) != agent_id:
+                        continue
+                    dot_products[memory_id] = dot_products.get(memory_id, 0.0) + q_weight * tf * idf
 
-            similarities = cosine_similarity(query_vec, doc_matrix).flatten()
-            ranked_indices = similarities.argsort()[::-1][:top_k]
+            scored = [
+                (dot / self._doc_norm(memory_id), memory_id)
+                for memory_id, dot in dot_products.items()
+            ]
+            ranked = heapq.nlargest(top_k, scored)
 
             if return_scores:
-                return [(memory_ids[i], float(similarities[i])) for i in ranked_indices]
-            return [memory_ids[i] for i in ranked_indices]
+                return [(memory_id, float(score)) for score, memory_id in ranked]
+            return [memory_id for _, memory_id in ranked]
+
+    def _add_document(self, memory_id: str, text: str, agent_id: Optional[str] = None) -> None:
+        """
+        Inserts (or replaces) a document's postings. Caller must hold the lock.
+        """
+        if memory_id in self.indexed_memories:
+            self._remove_document(memory_id)
+
+        term_counts: Dict[int, int] = {}
+        for term, tf in Counter(self._tokenize(text)).items():
+            term_id = self.vocabulary.get(term)
+            if term_id is None:
+                term_id = len(self.vocabulary)
+                self.vocabulary[term] = term_id
+            term_counts[term_id] = tf
+            self.postings.setdefault(term_id, {})[memory_id] = tf
+            self.doc_freq[term_id] = self.doc_freq.get(term_id, 0) + 1
+
+        self.indexed_memories[memory_id] = text
+        self.doc_terms[memory_id] = term_counts
+        self.doc_agents[memory_id] = agent_id
+
+    def _remove_document(self, memory_id: str) -> None:
+        """
+        Drops a document's postings and df contributions. Caller must hold the lock.
+        """
+        for term_id in self.doc_terms.pop(memory_id, {}):
+            postings = self.postings.get(term_id)
+            if postings is not None:
+                postings.pop(memory_id, None)
+                if not postings:
+                    del self.postings[term_id]
+            remaining = self.doc_freq.get(term_id, 0) - 1
+            if remaining > 0:
+                self.doc_freq[term_id] = remaining
+            else:
+                self.doc_freq.pop(term_id, None)
+        self.indexed_memories.pop(memory_id, None)
+        self.doc_agents.pop(memory_id, None)
+        self._norm_cache.pop(memory_id, None)
+
+    def _idf(self, term_id: int) -> float:
+        n_docs = len(self.indexed_memories)
+        return math.log((1 + n_docs) / (1 + self.doc_freq.get(term_id, 0))) + 1.0
+
+    def _query_weights(self, query: str) -> Dict[int, float]:
+        """
+        Transforms the query into L2-normalised TF-IDF weights over known terms.
+        """
+        weights: Dict[int, float] = {}
+        for term, tf in Counter(self._tokenize(query)).items():
+            term_id = self.vocabulary.get(term)
+            if term_id is not None and term_id in self.postings:
+                weights[term_id] = tf * self._idf(term_id)
 
-    def _rebuild_index(self):
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        if norm == 0.0:
+            return {}
+        return {term_id: w / norm for term_id, w in weights.items()}
+
+    def _doc_norm(self, memory_id: str) -> float:
         """
-        Rebuilds the TF-IDF matrix after any insert/delete operation.
+        Returns the document's TF-IDF L2 norm, recomputing it only when the
+        corpus has changed since it was last cached.
         """
-        texts = list(self.indexed_memories.values())
-        if texts:
-            self.tfidf_matrix = self.vectorizer.fit_transform(texts)
-        else:
-            self.tfidf_matrix = None
+        cached = self._norm_cache.get(memory_id)
+        if cached is not None and cached[0] == self._version:
+            return cached[1]
+
+        norm = math.sqrt(sum(
+            (tf * self._idf(term_id)) ** 2
+            for term_id, tf in self.doc_terms[memory_id].items()
+        )) or 1.0
+        self._norm_cache[memory_id] = (self._version, norm)
+        return norm
 
     def list_all_indexed_ids(self) -> List[str]:
         """
@@ -102,4 +252,12 @@ class SemanticSearchEngine:
         """
         with self.lock:
             self.indexed_memories.clear()
-            self.tfidf_matrix = None
+            self.vocabulary.clear()
+            self.doc_freq.clear()
+            self.postings.clear()
+            self.doc_terms.clear()
+            self._norm_cache.clear()
+            self.doc_agents.clear()
+            self._version += 1
+        if self.vector_index is not None:
+            self.vector_index.clear()
@@ -0,0 +1,55 @@
+# File: core/memory/tests/test_memory_store.py
+
+from core.memory.memory_engine import MemoryEngine
+from core.memory.memory_store import MemoryStore
+
+
+def memory(mem_id, agent_id, importance, tags=()):
+    return {"id": mem_id, "agent_id": agent_id, "importance": importance, "tags": list(tags)}
+
+def test_indexes_follow_insert_and_delete():
+    store = MemoryStore()
+    store.insert(memory("m1", "a", 0.1, ["x"]))
+    store.insert(memory("m2", "a", 0.9, ["x", "y"]))
+    store.insert(memory("m3", "b", 0.5, ["y"]))
+
+    assert {m["id"] for m in store.get_by_agent("a")} == {"m1", "m2"}
+    assert {m["id"] for m in store.filter_by_tag("y")} == {"m2", "m3"}
+
+    store.delete("m2")
+    assert [m["id"] for m in store.get_by_agent("a")] == ["m1"]
+    assert [m["id"] for m in store.filter_by_tag("y")] == ["m3"]
+    assert store.filter_by_tag("missing") == []
+
+def test_reinsert_moves_memory_between_indexes():
+    store = MemoryStore()
+    store.insert(memory("m1", "a", 0.1, ["x"]))
+    store.insert(memory("m1", "b", 0.7, ["z"]))
+    assert store.get_by_agent("a") == []
+    assert store.filter_by_tag("x") == []
+    assert store.get_below_importance("b", 0.8)[0]["id"] == "m1"
+    assert store.count() == 1
+
+def test_reinserting_a_mutated_stored_object_keeps_indexes_consistent():
+    store = MemoryStore()
+    store.insert(memory("m1", "a", 0.1, ["x"]))
+    stored = store.get_by_id("m1")
+    stored["importance"] = 0.9
+    stored["tags"] = ["y"]
+    store.insert(stored)
+
+    assert store.filter_by_tag("x") == []
+    assert [m["id"] for m in store.filter_by_tag("y")] == ["m1"]
+    assert store.get_below_importance("a", 0.5) == []
+    assert store.delete("m1")
+    assert store.get_below_importance("a", 1.0) == []
+    assert store.importance_index == {} and store.tag_index == {}
+
+def test_prune_low_importance_uses_threshold_exclusively():
+    engine = MemoryEngine()
+    engine.store_memory("low", [], "agent", importance=0.1)
+    engine.store_memory("edge", [], "agent", importance=0.2)
+    engine.store_memory("other agent", [], "someone-else", importance=0.0)
+    assert engine.prune_low_importance("agent", threshold=0.2) == 1
+    assert [m["content"] for m in engine.get_memories_by_agent("agent")] == ["edge"]
+    assert len(engine.get_memories_by_agent("someone-else")) == 1
@@ -0,0 +1,56 @@
+# File: core/memory/tests/test_semantic_search.py
+
+from core.memory.semantic_search import SemanticSearchEngine
+
+
+def build_engine():
+    engine = SemanticSearchEngine()
+    engine.index_many([
+        ("m1", "the cat sat on the mat"),
+        ("m2", "dogs chase the cat"),
+        ("m3", "stock market prices rise"),
+        ("m4", "cat cat market"),
+    ])
+    return engine
+
+def test_search_ranks_by_tfidf_cosine():
+    engine = build_engine()
+    results = engine.search("cat market", top_k=2, return_scores=True)
+    assert [mem_id for mem_id, _ in results] == ["m4", "m3"]
+    assert abs(results[0][1] - 0.94375830) < 1e-6
+
+def test_remove_updates_postings_and_df():
+    engine = build_engine()
+    assert engine.remove_from_index("m4") is True
+    assert engine.remove_from_index("m4") is False
+    assert "m4" not in engine.search("cat market", top_k=10)
+    assert engine.search("market") == ["m3"]
+
+def test_reindex_replaces_document():
+    engine = build_engine()
+    engine.index_memory("m3", "weather report")
+    assert engine.search("stock") == []
+    assert engine.search("weather") == ["m3"]
+
+def test_unknown_terms_return_nothing():
+    engine = build_engine()
+    assert engine.search("zebra") == []
+    engine.clear_index()
+    assert engine.search("cat") == []
+
+def test_vector_index_is_updated_inside_the_engine_lock():
+    class RecordingIndex:
+        def __init__(self):
+            self.calls = []
+
+        def add(self, memory_id, text, agent_id=None):
+            self.calls.append(("add", memory_id, engine.lock.locked()))
+
+        def remove(self, memory_id):
+            self.calls.append(("remove", memory_id, engine.lock.locked()))
+
+    engine = SemanticSearchEngine(vector_index=RecordingIndex())
+    engine.index_memory("m1", "the cat sat")
+    engine.index_many([("m2", "dogs chase the cat")])
+    engine.remove_from_index("m1")
+    assert engine.vector_index.calls == [("add", "m1", True), ("add", "m2", True), ("remove", "m1", True)]
@@ -0,0 +1,45 @@
+# File: core/memory/tests/test_vector_index.py
+
+import pytest
+
+from core.memory.memory_engine import MemoryEngine
+from core.memory.vector_index import IVFVectorIndex
+
+WORDS = "alpha beta gamma delta epsilon zeta eta theta iota kappa".split()
+
+
+def build_engine(count=400):
+    index = IVFVectorIndex(dim=64, train_threshold=100, exact_threshold=10, nprobe=4)
+    engine = MemoryEngine(vector_index=index)
+    ids = []
+    for i in range(count):
+        content = " ".join(WORDS[(i + j) % len(WORDS)] for j in range(3))
+        ids.append(engine.store_memory(content, [], f"agent-{i % 4}"))
+    return engine, index, ids
+
+def test_index_trains_and_ann_finds_exact_match():
+    engine, index, _ = build_engine()
+    assert index.centroids is not None
+    results = engine.search_memories("alpha beta gamma", top_k=3, mode="ann", nprobe=len(index.cell_rows))
+    assert results[0]["content"] == "alpha beta gamma"
+
+def test_ann_agent_filter_only_returns_agent_memories():
+    engine, _, _ = build_engine()
+    results = engine.search_memories("delta epsilon", top_k=5, agent_id="agent-2", mode="ann")
+    assert results
+    assert all(mem["agent_id"] == "agent-2" for mem in results)
+
+def test_delete_removes_vectors():
+    engine, index, ids = build_engine()
+    for mem_id in ids[:300]:
+        engine.delete_memory(mem_id)
+    assert len(index.id_to_row) == 100
+    remaining = set(ids[300:])
+    results = engine.semantic_search.search("alpha", top_k=50, mode="ann")
+    assert set(results) <= remaining
+
+def test_ann_mode_requires_vector_index():
+    engine = MemoryEngine()
+    engine.store_memory("alpha beta", [], "agent-0")
+    with pytest.raises(ValueError):
+        engine.search_memories("alpha", mode="ann")
@@ -0,0 +1,329 @@
+import re
+import zlib
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+
+class HashingEmbedder:
+    """
+    Stateless text embedder using the signed feature-hashing trick.
+
+    Produces L2-normalised dense vectors without a fitted vocabulary, so
+    embeddings never need recomputing as the corpus grows.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+        self._buckets: Dict[str, Tuple[int, float]] = {}
+
+    def _bucket(self, token: str) -> Tuple[int, float]:
+        bucket = self._buckets.get(token)
+        if bucket is None:
+            h = zlib.crc32(token.encode("utf-8"))
+            bucket = (h % self.dim, 1.0 if (h >> 31) & 1 else -1.0)
+            self._buckets[token] = bucket
+        return bucket
+
+    def __call__(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in TOKEN_PATTERN.findall(text.lower()):
+            index, sign = self._bucket(token)
+            vector[index] += sign
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+
+class _RowList:
+    """
+    Unordered list of matrix rows with O(1) add and swap-remove.
+    """
+
+    __slots__ = ("rows", "positions")
+
+    def __init__(self):
+        self.rows: List[int] = []
+        self.positions: Dict[int, int] = {}
+
+    def add(self, row: int) -> None:
+        self.positions[row] = len(self.rows)
+        self.rows.append(row)
+
+    def remove(self, row: int) -> None:
+        position = self.positions.pop(row)
+        last = self.rows.pop()
+        if last != row:
+            self.rows[position] = last
+            self.positions[last] = position
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+class IVFVectorIndex:
+    """
+    Inverted-file (IVF) approximate nearest-neighbour index over dense embeddings.
+
+    Vectors are partitioned into ``nlist`` k-means cells; a query scores only
+    the ``nprobe`` nearest cells. Each cell keeps a separate row list per
+    agent, so agent-scoped searches never touch other agents' vectors.
+
+    Recall/latency knobs:
+        nlist: Number of cells (default ~sqrt(N) at training time).
+        nprobe: Cells scanned per query; higher means better recall, slower queries.
+        exact_threshold: Candidate sets at or below this size are scored exactly.
+    """
+
+    def __init__(
+        self,
+        embedder: Optional[Callable[[str], np.ndarray]] = None,
+        dim: int = 256,
+        nlist: Optional[int] = None,
+        nprobe: int = 8,
+        train_threshold: int = 1024,
+        exact_threshold: int = 2048,
+        kmeans_iters: int = 10,
+        seed: int = 0,
+    ):
+        self.embedder = embedder or HashingEmbedder(dim)
+        self.dim = dim
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_threshold = train_threshold
+        self.exact_threshold = exact_threshold
+        self.kmeans_iters = kmeans_iters
+        self._rng = np.random.default_rng(seed)
+
+        self.vectors = np.zeros((1024, dim), dtype=np.float32)
+        self.id_to_row: Dict[str, int] = {}
+        self.row_ids: List[Optional[str]] = []
+        self.row_agents: List[Optional[str]] = []
+        self.free_rows: List[int] = []
+        self.agent_rows: Dict[Optional[str], _RowList] = {}
+
+        self.centroids: Optional[np.ndarray] = None
+        self.row_cells: Dict[int, int] = {}
+        self.cell_rows: List[_RowList] = []
+        self.cell_agent_rows: Dict[Tuple[int, Optional[str]], _RowList] = {}
+        self._trained_size = 0
+        self.lock = Lock()
+
+    def add(self, memory_id: str, text: str, agent_id: Optional[str] = None) -> None:
+        """
+        Embeds and inserts (or replaces) a memory.
+
+        Args:
+            memory_id (str): Unique memory ID.
+            text (str): Memory content.
+            agent_id (str, optional): Owning agent, used for filtered search.
+        """
+        vector = np.asarray(self.embedder(text), dtype=np.float32)
+        with self.lock:
+            if memory_id in self.id_to_row:
+                self._remove_row(self.id_to_row[memory_id])
+            self._add_row(memory_id, vector, agent_id)
+            self._maybe_train()
+
+    def remove(self, memory_id: str) -> bool:
+        """
+        Removes a memory from the index.
+
+        Returns:
+            bool: True if removed, False if not found.
+        """
+        with self.lock:
+            row = self.id_to_row.get(memory_id)
+            if row is None:
+                return False
+            self._remove_row(row)
+            return True
+
+    def clear(self) -> None:
+        """
+        Drops all vectors and the trained partitioning.
+        """
+        with self.lock:
+            self.id_to_row.clear()
+            self.row_ids.clear()
+            self.row_agents.clear()
+            self.free_rows.clear()
+            self.agent_rows.clear()
+            self._reset_cells()
+            self.centroids = None
+            self._trained_size = 0
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        agent_id: Optional[str] = None,
+        exact: bool = False,
+        nprobe: Optional[int] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Finds the memories whose embeddings have the highest cosine similarity.
+
+        Args:
+            query (str): The search query.
+            top_k (int): Number of results to return.
+            agent_id (str, optional): Restrict results to this agent's memories.
+            exact (bool): Brute-force over all candidates instead of probing cells.
+            nprobe (int, optional): Per-call override for the number of probed cells.
+
+        Returns:
+            List[Tuple[str, float]]: (memory_id, score) pairs, best first.
+        """
+        query_vec = np.asarray(self.embedder(query), dtype=np.float32)
+        with self.lock:
+            if agent_id is not None:
+                owned = self.agent_rows.get(agent_id)
+                if owned is None:
+                    return []
+                total = len(owned)
+            else:
+                total = len(self.id_to_row)
+            if total == 0 or top_k <= 0:
+                return []
+
+            if exact or self.centroids is None or total <= self.exact_threshold:
+                if agent_id is not None:
+                    rows = np.fromiter(owned.rows, dtype=np.int64, count=total)
+                else:
+                    rows = np.fromiter(self.id_to_row.values(), dtype=np.int64, count=total)
+            else:
+                rows = self._probe(query_vec, agent_id, nprobe or self.nprobe)
+                if rows.size == 0:
+                    return []
+
+            scores = self.vectors[rows] @ query_vec
+            k = min(top_k, rows.size)
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best])]
+            return [(self.row_ids[rows[i]], float(scores[i])) for i in best]
+
+    def rebuild(self) -> None:
+        """
+        Re-trains the cell centroids on the current vectors and reassigns rows.
+        """
+        with self.lock:
+            self._train()
+
+    def _probe(self, query_vec: np.ndarray, agent_id: Optional[str], nprobe: int) -> np.ndarray:
+        cell_scores = self.centroids @ query_vec
+        nprobe = min(nprobe, len(cell_scores))
+        cells = np.argpartition(-cell_scores, nprobe - 1)[:nprobe]
+
+        chunks = []
+        for cell in cells:
+            if agent_id is None:
+                row_list = self.cell_rows[cell]
+            else:
+                row_list = self.cell_agent_rows.get((int(cell), agent_id))
+            if row_list:
+                chunks.append(row_list.rows)
+        if not chunks:
+            return np.empty(0, dtype=np.int64)
+        return np.fromiter((row for chunk in chunks for row in chunk), dtype=np.int64)
+
+    def _add_row(self, memory_id: str, vector: np.ndarray, agent_id: Optional[str]) -> None:
+        if self.free_rows:
+            row = self.free_rows.pop()
+            self.row_ids[row] = memory_id
+            self.row_agents[row] = agent_id
+        else:
+            row = len(self.row_ids)
+            if row >= self.vectors.shape[0]:
+                grown = np.zeros((self.vectors.shape[0] * 2, self.dim), dtype=np.float32)
+                grown[:row] = self.vectors[:row]
+                self.vectors = grown
+            self.row_ids.append(memory_id)
+            self.row_agents.append(agent_id)
+
+        self.vectors[row] = vector
+        self.id_to_row[memory_id] = row
+        self.agent_rows.setdefault(agent_id, _RowList()).add(row)
+        if self.centroids is not None:
+            self._assign(row, int(np.argmax(self.centroids @ vector)))
+
+    def _remove_row(self, row: int) -> None:
+        memory_id = self.row_ids[row]
+        agent_id = self.row_agents[row]
+        del self.id_to_row[memory_id]
+
+        owned = self.agent_rows[agent_id]
+        owned.remove(row)
+        if not owned:
+            del self.agent_rows[agent_id]
+
+        cell = self.row_cells.pop(row, None)
+        if cell is not None:
+            self.cell_rows[cell].remove(row)
+            key = (cell, agent_id)
+            cell_owned = self.cell_agent_rows[key]
+            cell_owned.remove(row)
+            if not cell_owned:
+                del self.cell_agent_rows[key]
+
+        self.row_ids[row] = None
+        self.row_agents[row] = None
+        self.free_rows.append(row)
+
+    def _assign(self, row: int, cell: int) -> None:
+        self.row_cells[row] = cell
+        self.cell_rows[cell].add(row)
+        self.cell_agent_rows.setdefault((cell, self.row_agents[row]), _RowList()).add(row)
+
+    def _reset_cells(self) -> None:
+        self.row_cells.clear()
+        self.cell_rows = []
+        self.cell_agent_rows.clear()
+
+    def _maybe_train(self) -> None:
+        size = len(self.id_to_row)
+        if self.centroids is None:
+            if size >= self.train_threshold:
+                self._train()
+        elif size >= 4 * self._trained_size:
+            self._train()
+
+    def _train(self) -> None:
+        """
+        Runs spherical k-means on a sample of rows and reassigns every row.
+        """
+        self._reset_cells()
+        rows = np.fromiter(self.id_to_row.values(), dtype=np.int64, count=len(self.id_to_row))
+        if rows.size == 0:
+            self.centroids = None
+            self._trained_size = 0
+            return
+
+        nlist = self.nlist or max(1, int(np.sqrt(rows.size)))
+        nlist = min(nlist, rows.size)
+        sample_size = min(rows.size, nlist * 64)
+        sample = self.vectors[self._rng.choice(rows, size=sample_size, replace=False)]
+
+        centroids = sample[self._rng.choice(sample_size, size=nlist, replace=False)].copy()
+        for _ in range(self.kmeans_iters):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            for cell in range(nlist):
+                members = sample[labels == cell]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    norm = np.linalg.norm(centroid)
+                    if norm > 0:
+                        centroids[cell] = centroid / norm
+
+        self.centroids = centroids
+        self.cell_rows = [_RowList() for _ in range(nlist)]
+        labels = np.empty(rows.size, dtype=np.int64)
+        for start in range(0, rows.size, 65536):
+            chunk = rows[start:start + 65536]
+            labels[start:start + 65536] = np.argmax(self.vectors[chunk] @ centroids.T, axis=1)
+        for row, cell in zip(rows.tolist(), labels.tolist()):
+            self._assign(row, cell)
+        self._trained_size = rows.size
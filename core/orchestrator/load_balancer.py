@@ -1,59 +1,57 @@
-import json
-import os
 import time
 import random
 import threading
 
+from core.orchestrator.state_backend import AgentStateBackend, InProcessBackend
+
 class LoadBalancer:
-    def __init__(self, agent_status_file='core/data/agent_status.json', ttl=120):
+    """
+    Chooses agents from heartbeat state kept in memory.
+
+    Heartbeats and decisions only touch the state backend: the default
+    InProcessBackend, or a SharedMemoryBackend to share one table between
+    worker processes. ``agent_status_file`` is just a durability snapshot.
+    It is loaded at startup and rewritten at most every ``snapshot_interval``
+    seconds, and on ``save_snapshot()``/``close()``.
+    """
+
+    def __init__(self, agent_status_file='core/data/agent_status.json', ttl=120,
+                 backend: AgentStateBackend = None, snapshot_interval=30.0):
         self.agent_status_file = agent_status_file
         self.last_index = 0
         self.ttl = ttl  # Time-to-live in seconds for stale agents
         self.lock = threading.Lock()
+        self.snapshot_interval = snapshot_interval
+        self.backend = backend or InProcessBackend(ttl=ttl)
+        if self.backend.ttl is None:
+            self.backend.ttl = ttl
+        if getattr(self.backend, "created", True):  # don't clobber a table other processes already fill
+            self.backend.restore(self.agent_status_file)
+        self._last_snapshot = time.monotonic()
 
-    def _load_agents(self):
-        if not os.path.exists(self.agent_status_file):
-            return []
-        with self.lock, open(self.agent_status_file, 'r') as f:
+    def _maybe_snapshot(self):
+        if self.snapshot_interval is None or time.monotonic() - self._last_snapshot < self.snapshot_interval:
+            return
+        if self.lock.acquire(blocking=False):
             try:
-                return json.load(f).get("agents", [])
-            except json.JSONDecodeError:
-                return []
-
-    def _save_agents(self, agents):
-        with self.lock, open(self.agent_status_file, 'w') as f:
-            json.dump({"agents": agents}, f, indent=2)
+                self._last_snapshot = time.monotonic()
+                self.backend.snapshot(self.agent_status_file)
+            except OSError as e:
+                print(f"[LoadBalancer] Failed to snapshot agent state: {e}")
+            finally:
+                self.lock.release()
 
-    def _cleanup_stale_agents(self, agents):
-        now = time.time()
-        return [a for a in agents if now - a.get("timestamp", now) <= self.ttl]
+    def save_snapshot(self):
+        with self.lock:
+            self._last_snapshot = time.monotonic()
+            self.backend.snapshot(self.agent_status_file)
 
     def register_agent(self, agent_id, cpu_usage, memory_usage, task_queue):
-        now = time.time()
-        agents = self._load_agents()
-        existing = next((a for a in agents if a["id"] == agent_id), None)
-
-        if existing:
-            existing.update({
-                "cpu": cpu_usage,
-                "memory": memory_usage,
-                "queue": task_queue,
-                "timestamp": now
-            })
-        else:
-            agents.append({
-                "id": agent_id,
-                "cpu": cpu_usage,
-                "memory": memory_usage,
-                "queue": task_queue,
-                "timestamp": now
-            })
-
-        agents = self._cleanup_stale_agents(agents)
-        self._save_agents(agents)
+        self.backend.upsert(agent_id, cpu_usage, memory_usage, task_queue, time.time())
+        self._maybe_snapshot()
 
     def choose_agent(self, strategy="least_loaded"):
-        agents = self._cleanup_stale_agents(self._load_agents())
+        agents = self.backend.live(ttl=self.ttl)
         if not agents:
             raise Exception("❌ No active agents registered")
 
@@ -73,9 +71,12 @@ class LoadBalancer:
             raise ValueError(f"⚠️ Unknown strategy: {strategy}")
 
     def deregister_agent(self, agent_id):
-        agents = self._load_agents()
-        agents = [a for a in agents if a["id"] != agent_id]
-        self._save_agents(agents)
+        self.backend.remove(agent_id)
+        self._maybe_snapshot()
 
     def list_agents(self):
-        return self._cleanup_stale_agents(self._load_agents())
+        return self.backend.live(ttl=self.ttl)
+
+    def close(self):
+        self.save_snapshot()
+        self.backend.close()
@@ -0,0 +1,319 @@
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are only serialised within one process
+    fcntl = None
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+
+def _agent(agent_id: str, cpu: float, memory: float, queue: float, timestamp: float) -> Dict:
+    return {"id": agent_id, "cpu": cpu, "memory": memory, "queue": queue, "timestamp": timestamp}
+
+
+class AgentStateBackend:
+    """
+    Storage for the load balancer's per-agent heartbeat state.
+
+    Reads never take a lock. TTL expiry is lazy: ``live`` filters by age and
+    writers reclaim expired entries. Files are only touched by ``snapshot``
+    and ``restore``.
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        self.ttl = ttl
+
+    def upsert(self, agent_id: str, cpu: float, memory: float, queue: float, timestamp: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    def remove(self, agent_id: str) -> None:
+        raise NotImplementedError
+
+    def all(self) -> List[Dict]:
+        """Every stored agent, including expired ones."""
+        raise NotImplementedError
+
+    def live(self, now: Optional[float] = None, ttl: Optional[float] = None) -> List[Dict]:
+        now = time.time() if now is None else now
+        ttl = self.ttl if ttl is None else ttl
+        if ttl is None:
+            return self.all()
+        return [a for a in self.all() if now - a["timestamp"] <= ttl]
+
+    def snapshot(self, path: str) -> None:
+        """Atomically writes ``{"agents": [...]}`` to ``path``."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"agents": self.all()}, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def restore(self, path: str) -> int:
+        """Loads agents from a snapshot file; returns how many were loaded."""
+        if not os.path.exists(path):
+            return 0
+        try:
+            with open(path, "r") as f:
+                agents = json.load(f).get("agents", [])
+        except (json.JSONDecodeError, OSError):
+            return 0
+        for a in agents:
+            self.upsert(a["id"], a.get("cpu", 0), a.get("memory", 0), a.get("queue", 0), a.get("timestamp", 0))
+        return len(agents)
+
+    def close(self) -> None:
+        pass
+
+
+class InProcessBackend(AgentStateBackend):
+    """
+    Dict of immutable tuples: a write swaps one value, so readers iterate a
+    consistent copy without locking.
+    """
+
+    SWEEP_EVERY = 256
+
+    def __init__(self, ttl: Optional[float] = None):
+        super().__init__(ttl)
+        self._agents: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def upsert(self, agent_id, cpu, memory, queue, timestamp=None):
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            self._agents[agent_id] = (agent_id, cpu, memory, queue, timestamp)
+            self._writes += 1
+            if self.ttl is not None and self._writes % self.SWEEP_EVERY == 0:
+                cutoff = timestamp - self.ttl
+                for stale in [k for k, v in self._agents.items() if v[4] < cutoff]:
+                    del self._agents[stale]
+
+    def remove(self, agent_id):
+        with self._lock:
+            self._agents.pop(agent_id, None)
+
+    def all(self):
+        return [_agent(*values) for values in list(self._agents.values())]
+
+
+class SharedMemoryBackend(AgentStateBackend):
+    """
+    Fixed-slot agent table in shared memory, visible to every process that
+    opens the same ``name`` (a ``multiprocessing.shared_memory`` segment)
+    or ``path`` (an mmap-ed file).
+
+    Each slot holds a sequence counter, the agent id and four doubles.
+    Writers serialise on a file lock and bump the counter to odd before
+    and even after writing the slot (a seqlock). Readers copy the table
+    without locking and retry only the slots that changed mid-read. A slot
+    that stays odd past ``STABLE_READ_SECONDS`` was left by a writer that
+    died mid-write (or is stalled): the reader takes the write lock, which
+    waits out a live writer, and clears the slot if it is still torn.
+    Removed or expired slots are reused for new agents.
+    """
+
+    MAGIC = b"AIOS"
+    HEADER = struct.Struct("<4sIQ")  # magic, slot count, slots in use
+    SLOT = struct.Struct("<Q64s4d")  # seq, agent id, cpu, memory, queue, timestamp
+    ID_BYTES = 64
+    STABLE_READ_SECONDS = 0.05
+
+    def __init__(self, name: str = "aios_agent_status", slots: int = 1024, path: Optional[str] = None,
+                 ttl: Optional[float] = None):
+        super().__init__(ttl)
+        self.name = name
+        self.path = path
+        self.slots = slots
+        size = self.HEADER.size + slots * self.SLOT.size
+        self._shm = None
+        self._mmap = None
+        self.created = False
+
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                self.created = os.fstat(fd).st_size == 0
+                if os.fstat(fd).st_size < size:
+                    os.ftruncate(fd, size)
+                self._mmap = mmap.mmap(fd, size)
+            finally:
+                os.close(fd)
+            self.buf = memoryview(self._mmap)
+            lock_path = path + ".lock"
+        else:
+            if shared_memory is None:
+                raise RuntimeError("multiprocessing.shared_memory is not available")
+            self._shm = self._open_segment(name, size)
+            self.buf = self._shm.buf
+            lock_path = os.path.join(tempfile.gettempdir(), f"{name}.lock")
+
+        self._thread_lock = threading.Lock()
+        self._lock_fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600) if fcntl else None
+        self._slot_of: Dict[str, int] = {}
+
+        with self._write_lock():
+            magic, stored_slots, _ = self.HEADER.unpack_from(self.buf, 0)
+            if magic != self.MAGIC:
+                self.buf[:size] = bytes(size)
+                self.HEADER.pack_into(self.buf, 0, self.MAGIC, slots, 0)
+            elif stored_slots != slots:
+                raise ValueError(f"Shared agent table has {stored_slots} slots, expected {slots}")
+
+    def _open_segment(self, name: str, size: int):
+        def open_segment(create: bool):
+            try:  # Python 3.13+: keep the segment alive after this process exits
+                return shared_memory.SharedMemory(name=name, create=create, size=size, track=False)
+            except TypeError:
+                return shared_memory.SharedMemory(name=name, create=create, size=size)
+
+        try:
+            return open_segment(False)
+        except FileNotFoundError:
+            pass
+        try:
+            segment = open_segment(True)
+            self.created = True
+            return segment
+        except FileExistsError:
+            return open_segment(False)
+
+    @contextmanager
+    def _write_lock(self):
+        with self._thread_lock:
+            if self._lock_fd is not None:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if self._lock_fd is not None:
+                    fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _offset(self, slot: int) -> int:
+        return self.HEADER.size + slot * self.SLOT.size
+
+    def _in_use(self) -> int:
+        return self.HEADER.unpack_from(self.buf, 0)[2]
+
+    def _write_slot(self, slot: int, agent_id: bytes, values) -> None:
+        offset = self._offset(slot)
+        seq = struct.unpack_from("<Q", self.buf, offset)[0]
+        seq += seq % 2  # left odd by a writer that died mid-write
+        struct.pack_into("<Q", self.buf, offset, seq + 1)  # odd: write in progress
+        self.SLOT.pack_into(self.buf, offset, seq + 1, agent_id, *values)
+        struct.pack_into("<Q", self.buf, offset, seq + 2)
+
+    def _find_slot(self, key: bytes, now: float) -> Optional[int]:
+        """Slot already holding ``key``, else the first reusable one. Caller holds the write lock."""
+        in_use = self._in_use()
+        cached = self._slot_of.get(key.decode("utf-8"))
+        if cached is not None and cached < in_use and self.SLOT.unpack_from(self.buf, self._offset(cached))[1] == key:
+            return cached
+
+        reusable = None
+        for slot in range(in_use):
+            _, stored, _, _, _, timestamp = self.SLOT.unpack_from(self.buf, self._offset(slot))
+            if stored == key:
+                return slot
+            expired = self.ttl is not None and now - timestamp > self.ttl
+            if reusable is None and (stored[0] == 0 or expired):
+                reusable = slot
+        return reusable
+
+    def upsert(self, agent_id, cpu, memory, queue, timestamp=None):
+        timestamp = time.time() if timestamp is None else timestamp
+        key = agent_id.encode("utf-8")
+        if len(key) > self.ID_BYTES:
+            raise ValueError(f"Agent id longer than {self.ID_BYTES} bytes: {agent_id!r}")
+        key = key.ljust(self.ID_BYTES, b"\0")
+
+        with self._write_lock():
+            slot = self._find_slot(key, timestamp)
+            if slot is None:
+                in_use = self._in_use()
+                if in_use >= self.slots:
+                    raise RuntimeError(f"Shared agent table is full ({self.slots} slots)")
+                slot = in_use
+                self.HEADER.pack_into(self.buf, 0, self.MAGIC, self.slots, in_use + 1)
+            self._write_slot(slot, key, (cpu, memory, queue, timestamp))
+            self._slot_of[agent_id] = slot
+
+    def remove(self, agent_id):
+        key = agent_id.encode("utf-8").ljust(self.ID_BYTES, b"\0")
+        with self._write_lock():
+            for slot in range(self._in_use()):
+                if self.SLOT.unpack_from(self.buf, self._offset(slot))[1] == key:
+                    self._write_slot(slot, bytes(self.ID_BYTES), (0.0, 0.0, 0.0, 0.0))
+            self._slot_of.pop(agent_id, None)
+
+    def _read_stable(self, slot: int) -> tuple:
+        offset = self._offset(slot)
+        deadline = time.monotonic() + self.STABLE_READ_SECONDS
+        while time.monotonic() < deadline:
+            values = self.SLOT.unpack_from(self.buf, offset)
+            if values[0] % 2 == 0 and struct.unpack_from("<Q", self.buf, offset)[0] == values[0]:
+                return values
+            time.sleep(0)
+        return self._repair_slot(slot)
+
+    def _repair_slot(self, slot: int) -> tuple:
+        """Clears a slot whose writer died between its two counter stores."""
+        with self._write_lock():
+            values = self.SLOT.unpack_from(self.buf, self._offset(slot))
+            if values[0] % 2 == 0:
+                return values  # a stalled writer finished
+            self._write_slot(slot, bytes(self.ID_BYTES), (0.0, 0.0, 0.0, 0.0))
+            return self.SLOT.unpack_from(self.buf, self._offset(slot))
+
+    def all(self):
+        in_use = self._in_use()
+        start = self.HEADER.size
+        end = start + in_use * self.SLOT.size
+        first = bytes(self.buf[start:end])
+        second = bytes(self.buf[start:end])
+
+        agents = []
+        for slot, (values, recheck) in enumerate(zip(self.SLOT.iter_unpack(first), self.SLOT.iter_unpack(second))):
+            if values[0] % 2 or values[0] != recheck[0]:
+                values = self._read_stable(slot)
+            seq, key, cpu, memory, queue, timestamp = values
+            if key[0] == 0:
+                continue
+            agents.append(_agent(key.rstrip(b"\0").decode("utf-8"), cpu, memory, queue, timestamp))
+        return agents
+
+    def close(self):
+        if self.buf is not None and self._mmap is not None:
+            self.buf.release()
+        self.buf = None
+        if self._shm is not None:
+            self._shm.close()
+        if self._mmap is not None:
+            self._mmap.close()
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    def unlink(self):
+        """Destroys the shared table (call from the owning process on shutdown)."""
+        if self._shm is not None:
+            self._shm.unlink()
+        elif self.path and os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,100 @@
+# File: /core/orchestrator/tests/test_load_balancer.py
+
+import multiprocessing
+import os
+import struct
+import threading
+import time
+
+import pytest
+
+from core.orchestrator.load_balancer import LoadBalancer
+from core.orchestrator.state_backend import InProcessBackend, SharedMemoryBackend
+
+
+def _heartbeat_worker(path, agent_id, count):
+    backend = SharedMemoryBackend(path=path, slots=16)
+    for i in range(count):
+        backend.upsert(agent_id, float(i), 1.0, 0.0)
+    backend.close()
+
+
+def test_heartbeats_and_decisions_skip_the_status_file(tmp_path):
+    status_file = str(tmp_path / "agent_status.json")
+    balancer = LoadBalancer(status_file, ttl=60, snapshot_interval=None)
+    balancer.register_agent("busy", 90, 50, 3)
+    balancer.register_agent("idle", 5, 10, 0)
+    balancer.register_agent("busy", 80, 50, 2)
+
+    assert not os.path.exists(status_file)
+    assert balancer.choose_agent()["id"] == "idle"
+    assert len(balancer.list_agents()) == 2
+
+    balancer.close()
+    restored = LoadBalancer(status_file, ttl=60)
+    assert sorted(a["id"] for a in restored.list_agents()) == ["busy", "idle"]
+
+
+def test_expired_agents_are_ignored_lazily():
+    backend = InProcessBackend(ttl=10)
+    now = time.time()
+    backend.upsert("old", 1, 1, 0, timestamp=now - 60)
+    backend.upsert("new", 1, 1, 0, timestamp=now)
+    assert [a["id"] for a in backend.live(now)] == ["new"]
+    assert len(backend.all()) == 2
+
+
+def test_shared_table_reuses_slots(tmp_path):
+    backend = SharedMemoryBackend(path=str(tmp_path / "agents.bin"), slots=2, ttl=10)
+    now = time.time()
+    backend.upsert("a", 1, 1, 0, now - 60)
+    backend.upsert("b", 2, 2, 0, now)
+    backend.upsert("c", 3, 3, 0, now)  # takes over the expired slot of "a"
+    backend.remove("b")
+    backend.upsert("d", 4, 4, 0, now)
+    assert sorted(a["id"] for a in backend.live(now)) == ["c", "d"]
+    with pytest.raises(RuntimeError):
+        backend.upsert("e", 5, 5, 0, now)
+    backend.close()
+
+
+def test_slot_left_odd_by_a_dead_writer_is_cleared(tmp_path):
+    backend = SharedMemoryBackend(path=str(tmp_path / "agents.bin"), slots=4)
+    now = time.time()
+    backend.upsert("a", 1, 1, 0, now)
+    backend.upsert("b", 2, 2, 0, now)
+    offset = backend._offset(0)
+    seq = struct.unpack_from("<Q", backend.buf, offset)[0]
+    struct.pack_into("<Q", backend.buf, offset, seq + 1)  # the writer died after its first store
+
+    reader_view = SharedMemoryBackend(path=str(tmp_path / "agents.bin"), slots=4)
+    result = []
+    reader = threading.Thread(target=lambda: result.append(reader_view.all()), daemon=True)
+    reader.start()
+    reader.join(5)
+    assert not reader.is_alive()
+    assert [a["id"] for a in result[0]] == ["b"]
+    assert struct.unpack_from("<Q", backend.buf, offset)[0] % 2 == 0
+
+    backend.upsert("a", 3, 3, 0, now)
+    assert sorted(a["id"] for a in reader_view.all()) == ["a", "b"]
+    reader_view.close()
+    backend.close()
+
+
+def test_shared_table_is_visible_across_processes(tmp_path):
+    path = str(tmp_path / "agents.bin")
+    backend = SharedMemoryBackend(path=path, slots=16)
+    balancer = LoadBalancer(str(tmp_path / "status.json"), backend=backend, snapshot_interval=None)
+
+    ctx = multiprocessing.get_context("spawn")
+    workers = [ctx.Process(target=_heartbeat_worker, args=(path, f"worker-{i}", 200)) for i in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    agents = {a["id"]: a for a in balancer.list_agents()}
+    assert sorted(agents) == ["worker-0", "worker-1", "worker-2"]
+    assert all(a["cpu"] == 199.0 for a in agents.values())
+    backend.close()
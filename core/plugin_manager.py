@@ -1,11 +1,34 @@
-import importlib.util
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from plugins.plugin_cache import shared_cache
 from utils.logger import logger
 
 class PluginManager:
-    def __init__(self, plugin_dir="plugins"):
+    def __init__(self, plugin_dir="plugins", lazy=False, cache=None, max_workers=None):
+        """
+        :param lazy: Only discover plugin files in load_plugins(); each plugin is
+            loaded on its first get_plugin() call.
+        :param cache: PluginCache holding compiled plugin code (defaults to the shared one).
+        :param max_workers: Threads used to load plugins in parallel.
+        """
         self.plugin_dir = plugin_dir
+        self.lazy = lazy
+        self.cache = cache or shared_cache()
+        self.max_workers = max_workers or self.cache.max_workers
         self.plugins = {}
+        self._available = {}
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def discover(self):
+        """Maps plugin names to file paths without reading the files."""
+        self._available = {
+            entry.name[:-3]: entry.path
+            for entry in os.scandir(self.plugin_dir)
+            if entry.name.endswith(".py") and not entry.name.startswith("__") and entry.is_file()
+        }
+        return self._available
 
     def load_plugins(self):
         logger.info(f"🔌 Loading plugins from '{self.plugin_dir}'...")
@@ -13,26 +36,43 @@ class PluginManager:
             logger.warning(f"⚠️ Plugin directory '{self.plugin_dir}' does not exist.")
             return
 
-        for filename in os.listdir(self.plugin_dir):
-            if filename.endswith(".py") and not filename.startswith("__"):
-                module_name = filename[:-3]
-                path = os.path.join(self.plugin_dir, filename)
+        available = self.discover()
+        if self.lazy:
+            logger.info(f"🔌 Discovered {len(available)} plugins (loaded on first use)")
+            return
+
+        # Hashing and compiling happen in the prefetch; unchanged plugins are skipped
+        self.cache.prefetch(available.values())
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            list(pool.map(self._load_plugin, available.keys(), available.values()))
 
-                try:
-                    spec = importlib.util.spec_from_file_location(module_name, path)
-                    mod = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(mod)
+    def _load_plugin(self, module_name, path):
+        try:
+            entry = self.cache.get(path)
+            with self._lock:
+                if self._versions.get(module_name) == entry.sha256:
+                    return
+            mod = self.cache.load_entry(entry, module_name)
 
-                    if hasattr(mod, "register"):
-                        self.plugins[module_name] = mod.register()
-                        logger.info(f"✅ Plugin loaded: {module_name}")
-                    else:
-                        logger.warning(f"⚠️ No 'register()' function in plugin '{module_name}'")
-                except Exception as e:
-                    logger.error(f"❌ Failed to load plugin '{module_name}': {e}")
+            if hasattr(mod, "register"):
+                self.plugins[module_name] = mod.register()
+                logger.info(f"✅ Plugin loaded: {module_name}")
+            else:
+                logger.warning(f"⚠️ No 'register()' function in plugin '{module_name}'")
+            # Recorded only once loaded, so a version that failed is retried on the next call
+            with self._lock:
+                self._versions[module_name] = entry.sha256
+        except Exception as e:
+            logger.error(f"❌ Failed to load plugin '{module_name}': {e}")
 
     def get_plugin(self, name):
+        path = self._available.get(name)
+        if path is not None:
+            # Loads on first use and reloads when the file changed
+            self._load_plugin(name, path)
         return self.plugins.get(name)
 
     def list_plugins(self):
+        if self.lazy:
+            return sorted(set(self._available) | set(self.plugins))
         return list(self.plugins.keys())
@@ -1,34 +1,98 @@
 # File: /core/realtime/pubsub/broker.py
 
 from collections import defaultdict
-from typing import Callable, Any
+from threading import Lock
+from typing import Callable, Any, Dict, Tuple
 import traceback
 from core.logging.plugin_logger import PluginLogger
+from .topic_trie import TopicTrie
+
 
 class PubSubBroker:
-    def __init__(self):
-        self.subscribers = defaultdict(list)
+    """
+    Topic broker supporting hierarchical wildcard subscriptions
+    (``agent.*`` matches one segment, ``task.#`` matches any depth).
+
+    Patterns live in a TopicTrie; the topic -> callbacks resolution is cached
+    and invalidated whenever a subscription changes, so steady-state publish
+    is a dict lookup plus the callback calls. Deliveries are tallied in
+    per-topic counters instead of being written to disk one by one; only
+    a sample of failures is logged (the first, then every
+    ``error_log_every``-th per topic). Call ``log_stats()`` to persist an
+    aggregated snapshot.
+    """
+
+    def __init__(self, error_log_every: int = 100, cache_size: int = 4096):
+        self.subscribers = defaultdict(list)  # {pattern: [callbacks]}
+        self.trie = TopicTrie()
         self.logger = PluginLogger()
+        self.lock = Lock()
+        self.error_log_every = error_log_every
+        self.cache_size = cache_size
+        self._resolved: Dict[str, Tuple[Callable, ...]] = {}
+        self.stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"published": 0, "delivered": 0, "failed": 0, "unrouted": 0})
 
     def publish(self, topic: str, data: Any) -> None:
-        callbacks = self.subscribers.get(topic, [])
+        callbacks = self.resolve(topic)
+        stats = self.stats[topic]
+        stats["published"] += 1
         if not callbacks:
-            self.logger.log("PubSubBroker", input_code=f"publish:{topic}", output="No subscribers", success=False)
+            stats["unrouted"] += 1
             return
 
         for callback in callbacks:
             try:
                 callback(data)
-                self.logger.log("PubSubBroker", input_code=f"publish:{topic}", output="Callback executed", success=True)
-            except Exception as e:
-                self.logger.log("PubSubBroker", input_code=f"publish:{topic}", output="Callback failed", success=False, error=traceback.format_exc())
+                stats["delivered"] += 1
+            except Exception:
+                stats["failed"] += 1
+                if stats["failed"] % self.error_log_every == 1 or self.error_log_every == 1:
+                    self.logger.log(
+                        "PubSubBroker", input_code=f"publish:{topic}", output="Callback failed",
+                        success=False, error=traceback.format_exc(),
+                        metadata={"failed_so_far": stats["failed"]},
+                    )
+
+    def resolve(self, topic: str) -> Tuple[Callable, ...]:
+        """
+        Returns the callbacks subscribed to ``topic`` directly or via wildcards.
+        """
+        callbacks = self._resolved.get(topic)
+        if callbacks is not None:
+            return callbacks
+        with self.lock:
+            callbacks = tuple(self.trie.match(topic))
+            if len(self._resolved) >= self.cache_size:
+                self._resolved.clear()
+            self._resolved[topic] = callbacks
+        return callbacks
 
     def subscribe(self, topic: str, callback: Callable) -> None:
-        if callback not in self.subscribers[topic]:
+        with self.lock:
+            if not self.trie.add(topic, callback):
+                return
             self.subscribers[topic].append(callback)
-            self.logger.log("PubSubBroker", input_code=f"subscribe:{topic}", output="Subscriber added", success=True)
+            self._resolved = {}
+        self.logger.log("PubSubBroker", input_code=f"subscribe:{topic}", output="Subscriber added", success=True, error=None)
 
     def unsubscribe(self, topic: str, callback: Callable) -> None:
-        if callback in self.subscribers[topic]:
+        with self.lock:
+            if not self.trie.remove(topic, callback):
+                return
             self.subscribers[topic].remove(callback)
-            self.logger.log("PubSubBroker", input_code=f"unsubscribe:{topic}", output="Subscriber removed", success=True)
+            if not self.subscribers[topic]:
+                del self.subscribers[topic]
+            self._resolved = {}
+        self.logger.log("PubSubBroker", input_code=f"unsubscribe:{topic}", output="Subscriber removed", success=True, error=None)
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        return {topic: dict(counts) for topic, counts in self.stats.items()}
+
+    def log_stats(self, reset: bool = False) -> None:
+        """
+        Writes one aggregated log entry with the per-topic delivery counters.
+        """
+        stats = self.get_stats()
+        if reset:
+            self.stats.clear()
+        self.logger.log("PubSubBroker", input_code="stats", output="Delivery counters", success=True, error=None, metadata=stats)
@@ -0,0 +1,49 @@
+# File: core/realtime/pubsub/tests/test_broker.py
+
+import pytest
+
+from core.realtime.pubsub.broker import PubSubBroker
+
+
+@pytest.fixture
+def broker(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return PubSubBroker()
+
+def test_wildcards_match_one_or_many_segments(broker):
+    seen = []
+    broker.subscribe("agent.*", lambda data: seen.append(("star", data)))
+    broker.subscribe("task.#", lambda data: seen.append(("hash", data)))
+    broker.subscribe("agent.status", lambda data: seen.append(("exact", data)))
+
+    broker.publish("agent.status", 1)
+    broker.publish("agent.status.detail", 2)
+    broker.publish("task", 3)
+    broker.publish("task.update.progress", 4)
+
+    assert seen == [("exact", 1), ("star", 1), ("hash", 3), ("hash", 4)]
+    assert broker.get_stats()["agent.status.detail"]["unrouted"] == 1
+
+def test_resolution_cache_invalidated_on_subscription_change(broker):
+    seen = []
+    callback = seen.append
+    broker.publish("agent.status", 0)  # caches an empty resolution
+    broker.subscribe("agent.*", callback)
+    broker.publish("agent.status", 1)
+    broker.unsubscribe("agent.*", callback)
+    broker.publish("agent.status", 2)
+    assert seen == [1]
+    assert broker.trie.patterns() == []
+
+def test_failures_are_counted_not_raised(broker):
+    def boom(data):
+        raise RuntimeError("boom")
+
+    broker.subscribe("event.error", boom)
+    for _ in range(3):
+        broker.publish("event.error", {})
+    assert broker.get_stats()["event.error"]["failed"] == 3
+
+def test_invalid_patterns_rejected(broker):
+    with pytest.raises(ValueError):
+        broker.subscribe("agent.st*", print)
@@ -0,0 +1,108 @@
+# File: /core/realtime/pubsub/topic_trie.py
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+SEPARATOR = "."
+SINGLE_WILDCARD = "*"   # matches exactly one segment:   agent.*  -> agent.status
+MULTI_WILDCARD = "#"    # matches zero or more segments: task.#   -> task, task.update.progress
+
+
+class _Node:
+    __slots__ = ("children", "callbacks")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.callbacks: List[Callable] = []
+
+
+class TopicTrie:
+    """
+    Subscription patterns stored segment-by-segment so a published topic is
+    matched by walking the trie once instead of testing every pattern.
+    """
+
+    def __init__(self):
+        self.root = _Node()
+
+    @staticmethod
+    def split(pattern: str) -> List[str]:
+        segments = pattern.split(SEPARATOR)
+        for segment in segments:
+            if not segment:
+                raise ValueError(f"Invalid topic '{pattern}': empty segment")
+            if segment not in (SINGLE_WILDCARD, MULTI_WILDCARD) and (
+                SINGLE_WILDCARD in segment or MULTI_WILDCARD in segment
+            ):
+                raise ValueError(f"Invalid topic '{pattern}': wildcards must be whole segments")
+        return segments
+
+    def add(self, pattern: str, callback: Callable) -> bool:
+        node = self.root
+        for segment in self.split(pattern):
+            node = node.children.setdefault(segment, _Node())
+        if callback in node.callbacks:
+            return False
+        node.callbacks.append(callback)
+        return True
+
+    def remove(self, pattern: str, callback: Callable) -> bool:
+        path: List[Tuple[_Node, str]] = []
+        node: Optional[_Node] = self.root
+        for segment in self.split(pattern):
+            child = node.children.get(segment)
+            if child is None:
+                return False
+            path.append((node, segment))
+            node = child
+        if callback not in node.callbacks:
+            return False
+        node.callbacks.remove(callback)
+
+        # Prune branches that no longer lead to any subscription.
+        for parent, segment in reversed(path):
+            child = parent.children[segment]
+            if child.callbacks or child.children:
+                break
+            del parent.children[segment]
+        return True
+
+    def match(self, topic: str) -> List[Callable]:
+        """
+        Returns the callbacks of every pattern matching ``topic``, without
+        duplicates, in a stable order.
+        """
+        segments = topic.split(SEPARATOR)
+        matched: Dict[Callable, None] = {}
+        self._match(self.root, segments, 0, matched)
+        return list(matched)
+
+    def _match(self, node: _Node, segments: List[str], index: int, matched: Dict[Callable, None]) -> None:
+        multi = node.children.get(MULTI_WILDCARD)
+        if multi is not None:
+            # '#' may swallow any number of the remaining segments (including none).
+            for consumed in range(index, len(segments) + 1):
+                self._match(multi, segments, consumed, matched)
+
+        if index == len(segments):
+            for callback in node.callbacks:
+                matched[callback] = None
+            return
+
+        exact = node.children.get(segments[index])
+        if exact is not None:
+            self._match(exact, segments, index + 1, matched)
+        single = node.children.get(SINGLE_WILDCARD)
+        if single is not None:
+            self._match(single, segments, index + 1, matched)
+
+    def patterns(self) -> List[str]:
+        found: List[str] = []
+
+        def walk(node: _Node, prefix: List[str]):
+            if node.callbacks:
+                found.append(SEPARATOR.join(prefix))
+            for segment, child in node.children.items():
+                walk(child, prefix + [segment])
+
+        walk(self.root, [])
+        return found
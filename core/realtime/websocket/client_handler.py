@@ -12,6 +12,7 @@ async def handle_client(ws, path):
     """
     Handles lifecycle of a single WebSocket client connection.
     - Registers client.
+    - Handles {"action": "subscribe"/"unsubscribe", "topics": [...]} requests.
     - Listens for messages.
     - Publishes to internal event system.
     - Unregisters on disconnect.
@@ -21,6 +22,18 @@ async def handle_client(ws, path):
         async for msg in ws:
             try:
                 data = json.loads(msg)
+
+                # Topic subscriptions control which broadcasts this client receives
+                action = data.get("action")
+                if action in ("subscribe", "unsubscribe"):
+                    topics = data.get("topics", [])
+                    if action == "subscribe":
+                        ws_manager.subscribe(ws, topics)
+                    else:
+                        ws_manager.unsubscribe(ws, topics)
+                    await ws.send(json.dumps({"status": f"{action}d", "topics": topics}))
+                    continue
+
                 topic = data.get("topic", Topics.TASK_UPDATE)
                 payload = data.get("payload", {})
 
@@ -1,28 +1,179 @@
 # File: /core/realtime/websocket/manager.py
 
+import asyncio
+import json
 import logging
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from core.realtime.pubsub.topic_trie import TopicTrie
+
+
+class ClientSession:
+    """
+    Per-client bounded outbound queue drained by its own sender task.
+    """
+
+    def __init__(self, ws, max_queue: int):
+        self.ws = ws
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.topics: Set[str] = set()  # empty = receive every message
+        self.sender: Optional[asyncio.Task] = None
+        self.sent = 0
+
 
 class WebSocketManager:
-    def __init__(self):
+    """
+    Fans messages out to WebSocket clients without letting a slow client
+    delay the others.
+
+    ``broadcast`` serialises each message once and only enqueues it; every
+    client has a bounded queue drained by its own task. A client whose queue
+    is full, or whose send exceeds ``send_timeout``, is evicted. Clients that
+    subscribe to topic patterns (``agent.*``, ``task.#``) only receive
+    matching messages; clients without subscriptions receive everything.
+    """
+
+    def __init__(self, max_queue: int = 256, send_timeout: float = 5.0):
         self.clients = set()
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self.sessions: Dict[Any, ClientSession] = {}
+        self.firehose: Set[ClientSession] = set()
+        self.topic_trie = TopicTrie()
+        self._routes: Dict[str, Set[ClientSession]] = {}
+        self.evicted = 0
 
     async def register(self, ws):
+        session = ClientSession(ws, self.max_queue)
+        session.sender = asyncio.create_task(self._drain(session))
         self.clients.add(ws)
-        logging.info(f"[WebSocketManager] Client registered: {ws.remote_address}")
+        self.sessions[ws] = session
+        self.firehose.add(session)
+        logging.info(f"[WebSocketManager] Client registered: {getattr(ws, 'remote_address', None)}")
 
     async def unregister(self, ws):
+        session = self.sessions.pop(ws, None)
         if ws in self.clients:
             self.clients.remove(ws)
-            logging.info(f"[WebSocketManager] Client unregistered: {ws.remote_address}")
+            logging.info(f"[WebSocketManager] Client unregistered: {getattr(ws, 'remote_address', None)}")
+        if session is None:
+            return
+        self.firehose.discard(session)
+        for pattern in list(session.topics):
+            self.topic_trie.remove(pattern, session)
+        if session.topics:
+            self._routes = {}
+        if session.sender is not None and session.sender is not asyncio.current_task():
+            session.sender.cancel()
+
+    def subscribe(self, ws, topics: Iterable[str]) -> None:
+        session = self.sessions.get(ws)
+        if session is None:
+            return
+        topics = self._validated(topics)
+        for pattern in topics:
+            if self.topic_trie.add(pattern, session):
+                session.topics.add(pattern)
+        if session.topics:
+            self.firehose.discard(session)
+        self._routes = {}
+
+    def unsubscribe(self, ws, topics: Iterable[str]) -> None:
+        session = self.sessions.get(ws)
+        if session is None:
+            return
+        topics = self._validated(topics)
+        for pattern in topics:
+            if self.topic_trie.remove(pattern, session):
+                session.topics.discard(pattern)
+        if not session.topics:
+            self.firehose.add(session)
+        self._routes = {}
+
+    @staticmethod
+    def _validated(topics: Iterable[str]) -> List[str]:
+        """
+        Checks every pattern up front, so an invalid one raises ValueError
+        before the trie or the session has changed.
+        """
+        topics = list(topics)
+        for pattern in topics:
+            TopicTrie.split(pattern)
+        return topics
 
-    async def broadcast(self, msg: str):
-        dead_clients = set()
-        for client in self.clients:
+    async def broadcast(self, msg: Any, topic: Optional[str] = None) -> int:
+        """
+        Queues a message for every interested client.
+
+        Args:
+            msg: A pre-serialised string, or any JSON-serialisable object (serialised once).
+            topic (str, optional): Routes the message to clients subscribed to a
+                matching pattern. Untopiced messages go to every client.
+
+        Returns:
+            int: Number of clients the message was queued for.
+        """
+        payload = msg if isinstance(msg, str) else json.dumps(msg)
+        if topic is None:
+            targets = list(self.sessions.values())
+        else:
+            targets = self._route(topic)
+
+        slow = []
+        for session in targets:
             try:
-                await client.send(msg)
+                session.queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                slow.append(session)
+
+        if slow:
+            logging.warning(f"[WebSocketManager] Evicting {len(slow)} slow client(s)")
+            await asyncio.gather(*(self._evict(session) for session in slow))
+        return len(targets) - len(slow)
+
+    async def flush(self) -> None:
+        """
+        Waits until every client's queue has been sent.
+        """
+        await asyncio.gather(*(session.queue.join() for session in list(self.sessions.values())))
+
+    def _route(self, topic: str) -> Set[ClientSession]:
+        routed = self._routes.get(topic)
+        if routed is None:
+            routed = set(self.topic_trie.match(topic))
+            self._routes[topic] = routed
+        return routed | self.firehose
+
+    async def _drain(self, session: ClientSession):
+        while True:
+            payload = await session.queue.get()
+            try:
+                await asyncio.wait_for(session.ws.send(payload), self.send_timeout)
+                session.sent += 1
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 logging.warning(f"[WebSocketManager] Failed to send message: {e}")
-                dead_clients.add(client)
+                self._discard_pending(session)
+                await self._evict(session)
+                return
+            finally:
+                # Also when eviction cancels a send in flight; otherwise flush() waits forever
+                session.queue.task_done()
+
+    @staticmethod
+    def _discard_pending(session: ClientSession):
+        while not session.queue.empty():
+            session.queue.get_nowait()
+            session.queue.task_done()
 
-        for client in dead_clients:
-            await self.unregister(client)
+    async def _evict(self, session: ClientSession):
+        if session.ws not in self.sessions:
+            return
+        self.evicted += 1
+        self._discard_pending(session)
+        await self.unregister(session.ws)
+        try:
+            await session.ws.close()
+        except Exception:
+            pass
@@ -0,0 +1,86 @@
+# File: /core/realtime/websocket/tests/test_manager.py
+
+import asyncio
+
+import pytest
+
+from core.realtime.websocket.manager import WebSocketManager
+
+
+class FakeSocket:
+    def __init__(self, blocked=False):
+        self.received = []
+        self.closed = False
+        self.unblock = asyncio.Event()
+        if not blocked:
+            self.unblock.set()
+
+    async def send(self, payload):
+        await self.unblock.wait()
+        self.received.append(payload)
+
+    async def close(self):
+        self.closed = True
+
+
+def test_topics_and_flush():
+    async def scenario():
+        manager = WebSocketManager(max_queue=8)
+        everything, agents = FakeSocket(), FakeSocket()
+        await manager.register(everything)
+        await manager.register(agents)
+        manager.subscribe(agents, ["agent.*"])
+
+        assert await manager.broadcast({"n": 1}, topic="agent.status") == 2
+        assert await manager.broadcast("plain", topic="task.update") == 1
+        await asyncio.wait_for(manager.flush(), 1)
+        return everything.received, agents.received
+
+    everything, agents = asyncio.run(scenario())
+    assert everything == ['{"n": 1}', "plain"]
+    assert agents == ['{"n": 1}']
+
+
+def test_evicting_a_client_mid_send_does_not_hang_flush():
+    async def scenario():
+        manager = WebSocketManager(max_queue=1, send_timeout=30)
+        slow, fast = FakeSocket(blocked=True), FakeSocket()
+        await manager.register(slow)
+        await manager.register(fast)
+
+        await manager.broadcast("m1")
+        await asyncio.sleep(0)  # slow's sender takes m1 and blocks inside send
+        flushing = asyncio.create_task(manager.flush())  # already waiting on slow's queue
+        await manager.broadcast("m2")  # fills slow's queue
+        await asyncio.sleep(0)  # fast keeps up
+        await manager.broadcast("m3")  # queue full: slow is evicted while sending m1
+        await asyncio.wait_for(flushing, 1)
+        return manager, slow, fast
+
+    manager, slow, fast = asyncio.run(scenario())
+    assert manager.evicted == 1 and slow.closed and slow not in manager.sessions
+    assert slow.received == []
+    assert fast.received == ["m1", "m2", "m3"]
+
+
+def test_invalid_pattern_leaves_subscriptions_unchanged():
+    async def scenario():
+        manager = WebSocketManager(max_queue=8)
+        client = FakeSocket()
+        await manager.register(client)
+        assert await manager.broadcast("before", topic="zzz") == 1  # fills the route cache
+
+        with pytest.raises(ValueError):
+            manager.subscribe(client, ["agent.status", "bad..x"])
+        assert manager.sessions[client].topics == set()
+        assert manager.topic_trie.match("agent.status") == []
+        assert await manager.broadcast("after", topic="zzz") == 1  # still a firehose client
+
+        manager.subscribe(client, ["agent.status"])
+        with pytest.raises(ValueError):
+            manager.unsubscribe(client, ["agent.status", "bad..x"])
+        assert await manager.broadcast("filtered", topic="zzz") == 0
+        await asyncio.wait_for(manager.flush(), 1)
+        return client.received
+
+    assert asyncio.run(scenario()) == ["before", "after"]
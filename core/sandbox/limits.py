@@ -1,3 +1,4 @@
+import math
 import resource
 import logging
 
@@ -19,3 +20,21 @@ def set_limits(cpu_seconds=2, max_memory_mb=100):
         logger.error(f"[Limiter] ValueError: {ve}")
     except resource.error as re:
         logger.error(f"[Limiter] ResourceError: {re}")
+
+def set_memory_limit(max_memory_mb=100):
+    max_memory = max_memory_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (max_memory, max_memory))
+
+def set_cpu_budget(cpu_seconds=2):
+    """
+    Allows ``cpu_seconds`` more CPU time from now on. RLIMIT_CPU counts the
+    whole process lifetime, so a long-lived worker renews the soft limit before
+    every run; the hard limit is left alone so it can be renewed again.
+    """
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(math.ceil(usage.ru_utime + usage.ru_stime))
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = used + cpu_seconds
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
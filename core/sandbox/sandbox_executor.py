@@ -6,8 +6,12 @@ import tempfile
 import shutil
 import uuid
 import json
+import logging
 import sys
 from core.sandbox.limits import set_limits
+from core.sandbox.worker_pool import SandboxUnavailable, shared_pool
+
+logger = logging.getLogger("SandboxExecutor")
 
 class SandboxExecutor:
     def __init__(self, config_path="core/sandbox/sandbox_config.json"):
@@ -20,7 +24,11 @@ class SandboxExecutor:
             "max_memory_mb": 128,
             "max_runtime": 5,
             "use_docker": False,
-            "docker_image": "python:3.11-slim"
+            "docker_image": "python:3.11-slim",
+            "use_pool": True,
+            "pool_size": 2,
+            "recycle_after": 100,
+            "preload": []
         }
         if not os.path.exists(self.config_path):
             self.config = default_config
@@ -28,7 +36,7 @@ class SandboxExecutor:
                 json.dump(default_config, f, indent=2)
         else:
             with open(self.config_path, 'r') as f:
-                self.config = json.load(f)
+                self.config = {**default_config, **json.load(f)}
 
     def _write_temp_script(self, code_str):
         temp_dir = tempfile.mkdtemp(prefix="sandbox_")
@@ -52,6 +60,27 @@ class SandboxExecutor:
         except subprocess.TimeoutExpired as e:
             raise TimeoutError("Execution exceeded time limit") from e
 
+    def _run_with_pool(self, code_str):
+        """
+        Runs the script in a warm worker from the shared sandbox pool, which
+        applies the same CPU and memory limits as the subprocess path.
+        """
+        pool = shared_pool(
+            self.config["max_cpu_seconds"],
+            self.config["max_memory_mb"],
+            size=self.config["pool_size"],
+            recycle_after=self.config["recycle_after"],
+            preload=self.config["preload"],
+        )
+        status, value = pool.run_script(code_str, timeout=self.config["max_runtime"])
+        if status == "timeout":
+            raise TimeoutError("Execution exceeded time limit")
+        if status == "success":
+            return subprocess.CompletedProcess(
+                ["sandbox-worker"], value["returncode"], value["stdout"].encode(), value["stderr"].encode()
+            )
+        return subprocess.CompletedProcess(["sandbox-worker"], 1, b"", str(value).encode())
+
     def _run_with_docker(self, script_path):
         container_name = f"sandbox_{uuid.uuid4().hex[:8]}"
         cmd = [
@@ -75,11 +104,20 @@ class SandboxExecutor:
             raise TimeoutError("Docker execution timeout") from e
 
     def execute(self, plugin_code: str) -> dict:
-        temp_dir, script_path = self._write_temp_script(plugin_code)
+        temp_dir = None
         try:
-            result = (self._run_with_docker(script_path)
-                      if self.config.get("use_docker")
-                      else self._run_with_subprocess(script_path))
+            result = None
+            if self.config.get("use_docker"):
+                temp_dir, script_path = self._write_temp_script(plugin_code)
+                result = self._run_with_docker(script_path)
+            elif self.config.get("use_pool"):
+                try:
+                    result = self._run_with_pool(plugin_code)
+                except SandboxUnavailable as e:
+                    logger.warning(f"[SandboxExecutor] Worker pool unavailable, using a subprocess: {e}")
+            if result is None:
+                temp_dir, script_path = self._write_temp_script(plugin_code)
+                result = self._run_with_subprocess(script_path)
 
             return {
                 "success": result.returncode == 0,
@@ -100,4 +138,5 @@ class SandboxExecutor:
                 "error": f"❌ Execution failed: {str(e)}"
             }
         finally:
-            shutil.rmtree(temp_dir, ignore_errors=True)
+            if temp_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
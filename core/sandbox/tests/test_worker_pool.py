@@ -0,0 +1,134 @@
+# File: /core/sandbox/tests/test_worker_pool.py
+
+import json
+import os
+import time
+
+import pytest
+
+from core.sandbox.sandbox_executor import SandboxExecutor
+from core.sandbox.worker_pool import SandboxUnavailable, SandboxWorkerPool, shared_pool
+from plugin_eval.sandbox_runner import SandboxRunner, restricted_runner
+from plugin_eval.test_suite import PluginTestSuite
+
+BUSY_LOOP = """
+import time
+end = time.process_time() + {seconds}
+while time.process_time() < end:
+    pass
+print("done")
+"""
+
+
+def add(a, b):
+    return a + b
+
+
+def fail():
+    raise ValueError("boom")
+
+
+@pytest.fixture
+def pool():
+    pool = SandboxWorkerPool(size=1, recycle_after=3)
+    yield pool
+    pool.close()
+
+
+def test_script_output_and_exit_codes(pool):
+    status, result = pool.run_script("print('hello')\nimport sys\nprint('warn', file=sys.stderr)")
+    assert status == "success"
+    assert result == {"returncode": 0, "stdout": "hello\n", "stderr": "warn\n"}
+
+    assert pool.run_script("raise SystemExit(3)")[1]["returncode"] == 3
+    failed = pool.run_script("1 / 0")[1]
+    assert failed["returncode"] == 1 and "ZeroDivisionError" in failed["stderr"]
+
+
+def test_calls_reuse_warm_worker_until_recycled(pool):
+    assert pool.call(add, (2, 3)) == ("success", 5)
+    assert pool.call(fail) == ("error", "boom")
+    assert pool.run_snippet("result = input_data['a'] * 2", {"a": 21}) == ("success", 42)
+
+    pids = [pool.call(os.getpid)[1] for _ in range(4)]
+    assert pids[0] != os.getpid()
+    assert len(set(pids)) == 2  # recycled after every 3 runs
+    assert pool.stats["recycled"] == 2
+
+
+def test_timeout_replaces_worker(pool):
+    status, _ = pool.call(time.sleep, (5,), timeout=0.2)
+    assert status == "timeout"
+    assert pool.call(add, (1, 1)) == ("success", 2)
+
+
+def test_unpicklable_callable_is_rejected_and_runner_falls_back(pool):
+    with pytest.raises(SandboxUnavailable):
+        pool.call(lambda: 1)
+    assert pool.call(add, (1, 2)) == ("success", 3)
+    assert restricted_runner(lambda x: x + 1, [1]) == ("success", 2)
+
+
+def test_scripts_get_their_own_builtins(pool):
+    status, result = pool.run_script("__builtins__['len'] = lambda obj: -1\nprint(len('ab'))")
+    assert (status, result["stdout"]) == ("success", "-1\n")
+    assert pool.run_script("print(len('ab'))")[1]["stdout"] == "2\n"
+
+
+def test_runner_loads_plugin_in_worker(tmp_path):
+    path = tmp_path / "pid_plugin.py"
+    path.write_text("import os\n\ndef run(data=None):\n    return os.getpid(), data\n")
+    plugin, err = PluginTestSuite(SandboxRunner(), scanner=object()).load_plugin(str(path))
+    assert err is None
+
+    runs = shared_pool().stats["runs"]
+    outcome = SandboxRunner().run_plugin(plugin, entry_function="run", args=["x"])
+    assert outcome["status"] == "success"
+    pid, data = outcome["result"]
+    assert data == "x" and pid != os.getpid()
+    assert shared_pool().stats["runs"] == runs + 1  # served by the pool, not the fallback
+    assert SandboxRunner().run_plugin(plugin, entry_function="missing")["status"] == "load_error"
+
+
+def test_cpu_budget_is_renewed_per_run():
+    with SandboxWorkerPool(size=1, cpu_seconds=1) as pool:
+        for _ in range(2):
+            status, result = pool.run_script(BUSY_LOOP.format(seconds=0.6), timeout=5)
+            assert status == "success" and result["stdout"] == "done\n"
+        status, reason = pool.run_script(BUSY_LOOP.format(seconds=5), timeout=10)
+        assert (status, reason) == ("crashed", "CPU time limit exceeded")
+        assert pool.call(add, (1, 1)) == ("success", 2)
+
+
+def test_memory_limit_applies():
+    with SandboxWorkerPool(size=1, max_memory_mb=64) as pool:
+        status, result = pool.run_script("blob = bytearray(256 * 1024 * 1024)")
+        assert status == "success"
+        assert result["returncode"] == 1 and "MemoryError" in result["stderr"]
+
+
+def test_sandbox_executor_uses_pool(tmp_path):
+    config = tmp_path / "sandbox_config.json"
+    config.write_text(json.dumps({"max_cpu_seconds": 2, "max_memory_mb": 128, "max_runtime": 1, "pool_size": 1}))
+    executor = SandboxExecutor(config_path=str(config))
+
+    assert executor.execute("print('hi')") == {"success": True, "output": "hi", "error": ""}
+    started = time.perf_counter()
+    for _ in range(20):
+        executor.execute("print(sum(range(100)))")
+    assert (time.perf_counter() - started) / 20 < 0.05
+    assert executor.execute("while True: pass")["error"] == "⏱️ Execution exceeded time limit"
+
+
+def test_sandbox_executor_logs_pool_fallback(tmp_path, monkeypatch, caplog):
+    config = tmp_path / "sandbox_config.json"
+    config.write_text(json.dumps({"max_cpu_seconds": 2, "max_memory_mb": 128, "max_runtime": 5}))
+    executor = SandboxExecutor(config_path=str(config))
+
+    def unavailable(code):
+        raise SandboxUnavailable("no workers")
+
+    monkeypatch.setattr(executor, "_run_with_pool", unavailable)
+    with caplog.at_level("WARNING", logger="SandboxExecutor"):
+        assert executor.execute("print('hi')")["output"] == "hi"
+    assert "no workers" in caplog.records[0].getMessage()
@@ -0,0 +1,318 @@
+# File: core/sandbox/worker_pool.py
+
+"""
+Pre-forked pool of sandbox worker processes.
+
+Starting an interpreter per plugin call costs far more than most plugin calls
+themselves. The pool keeps a few rlimit-constrained workers alive instead:
+each one imports its warm modules once, applies the memory limit from
+``core.sandbox.limits`` at startup and renews its CPU budget before every
+run. Requests and responses travel over a pipe per worker.
+
+A worker that times out, crashes or hits a limit is killed and replaced, and
+every worker is recycled after ``recycle_after`` runs so state leaked by
+plugins does not accumulate.
+"""
+
+import atexit
+import builtins
+import contextlib
+import importlib
+import io
+import logging
+import multiprocessing
+import os
+import pickle
+import queue
+import signal
+import sys
+import threading
+import traceback
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from core.sandbox.limits import set_cpu_budget, set_memory_limit
+
+logger = logging.getLogger("SandboxWorkerPool")
+
+
+class SandboxUnavailable(Exception):
+    """The request cannot run in a pooled worker (e.g. it cannot be pickled)."""
+
+
+# --- worker side ---
+
+def _run_script(code: str) -> Dict[str, Any]:
+    """Runs ``code`` as a __main__ script, capturing stdout/stderr and the exit code."""
+    stdout, stderr = io.StringIO(), io.StringIO()
+    returncode = 0
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            # A copy, so a script rebinding builtins cannot leak them into the next run on this worker
+            exec(compile(code, "plugin.py", "exec"), {"__name__": "__main__", "__file__": "plugin.py",
+                                                      "__builtins__": dict(vars(builtins))})
+        except SystemExit as e:
+            if isinstance(e.code, int) or e.code is None:
+                returncode = e.code or 0
+            else:
+                print(e.code, file=sys.stderr)
+                returncode = 1
+        except BaseException:
+            traceback.print_exc()
+            returncode = 1
+    return {"returncode": returncode, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+
+def _run_snippet(code: str, input_data: dict) -> Any:
+    local_vars = {"input_data": input_data}
+    exec(code, {}, local_vars)
+    return local_vars.get("result", "No result.")
+
+
+def _run_call(func, args) -> Any:
+    return func(*args)
+
+
+_HANDLERS = {"script": _run_script, "snippet": _run_snippet, "call": _run_call}
+
+
+def _worker_main(conn, cpu_seconds: Optional[int], max_memory_mb: Optional[int], preload: Tuple[str, ...]):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for name in preload:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            logger.warning(f"[SandboxWorker] Could not preload {name}: {e}")
+    if max_memory_mb:
+        set_memory_limit(max_memory_mb)
+    try:
+        conn.send(("ready", os.getpid()))
+    except OSError:
+        return  # the pool was closed while this worker was starting
+
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            break
+        except Exception as e:
+            conn.send(("unavailable", f"{type(e).__name__}: {e}"))
+            continue
+        if request is None:
+            break
+        kind, payload = request
+        if cpu_seconds:
+            set_cpu_budget(cpu_seconds)
+        try:
+            response = ("success", _HANDLERS[kind](*payload))
+        except BaseException as e:
+            response = ("error", str(e))
+        try:
+            conn.send(response)
+        except Exception as e:
+            conn.send(("error", f"Unpicklable result: {e}"))
+    conn.close()
+
+
+# --- parent side ---
+
+class _Worker:
+    def __init__(self, ctx, cpu_seconds, max_memory_mb, preload):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, cpu_seconds, max_memory_mb, preload),
+            name="SandboxWorker",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+        self.runs = 0
+
+    def wait_ready(self, timeout: float) -> bool:
+        if not self.ready and self.conn.poll(timeout):
+            try:
+                self.ready = self.conn.recv()[0] == "ready"
+            except (EOFError, OSError):
+                return False
+        return self.ready
+
+    def exit_reason(self) -> str:
+        self.process.join(1)
+        code = self.process.exitcode
+        if code == -signal.SIGXCPU:
+            return "CPU time limit exceeded"
+        if code is not None and code < 0:
+            return f"Worker killed by signal {-code}"
+        return f"Worker exited with code {code}"
+
+    def stop(self):
+        """Graceful stop: the worker exits after reading the sentinel."""
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.conn.close()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class SandboxWorkerPool:
+    """
+    Fixed-size pool of warm sandbox workers; callers block until a worker is free.
+
+    Results are ``(status, value)`` with status ``success``, ``error``,
+    ``timeout`` or ``crashed``.
+    """
+
+    def __init__(self, size: int = 2, recycle_after: int = 100, cpu_seconds: Optional[int] = None,
+                 max_memory_mb: Optional[int] = None, preload: Iterable[str] = (),
+                 start_method: str = "spawn", startup_timeout: float = 30.0):
+        """
+        Args:
+            size (int): Number of worker processes.
+            recycle_after (int): Runs after which a worker is replaced.
+            cpu_seconds (int, optional): CPU time allowed per run (RLIMIT_CPU).
+            max_memory_mb (int, optional): Address-space limit per worker (RLIMIT_AS).
+            preload (Iterable[str]): Modules each worker imports before serving.
+            start_method (str): multiprocessing start method for the workers.
+            startup_timeout (float): Longest wait for a new worker to become ready.
+        """
+        self.size = size
+        self.recycle_after = recycle_after
+        self.cpu_seconds = cpu_seconds
+        self.max_memory_mb = max_memory_mb
+        self.preload = tuple(preload)
+        self.startup_timeout = startup_timeout
+        self._ctx = multiprocessing.get_context(start_method)
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._closed = False
+        self._stats_lock = threading.Lock()
+        self.stats = {"runs": 0, "timeouts": 0, "crashes": 0, "recycled": 0}
+        for _ in range(size):
+            self._idle.put(self._spawn())
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self._ctx, self.cpu_seconds, self.max_memory_mb, self.preload)
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _checkout(self) -> _Worker:
+        if self._closed:
+            raise RuntimeError("SandboxWorkerPool is closed")
+        worker = self._idle.get()
+        if not worker.wait_ready(self.startup_timeout):
+            worker.kill()
+            worker = self._spawn()
+            if not worker.wait_ready(self.startup_timeout):
+                worker.kill()
+                self._idle.put(self._spawn())
+                raise SandboxUnavailable("Sandbox worker failed to start")
+        return worker
+
+    def run(self, kind: str, payload: tuple, timeout: Optional[float] = None) -> Tuple[str, Any]:
+        """
+        Runs one request in a free worker.
+
+        Raises:
+            SandboxUnavailable: The request could not be sent to or decoded by a worker.
+        """
+        worker = self._checkout()
+        keep = False
+        try:
+            try:
+                worker.conn.send((kind, payload))
+            except (pickle.PicklingError, TypeError, AttributeError) as e:
+                keep = True  # nothing was written, the worker is untouched
+                raise SandboxUnavailable(f"Request cannot be sent to a sandbox worker: {e}") from e
+
+            if not worker.conn.poll(timeout):
+                self._count("timeouts")
+                return "timeout", "Execution timed out"
+            try:
+                status, value = worker.conn.recv()
+            except (EOFError, OSError):
+                self._count("crashes")
+                return "crashed", worker.exit_reason()
+
+            keep = True
+            if status == "unavailable":
+                raise SandboxUnavailable(value)
+            worker.runs += 1
+            self._count("runs")
+            return status, value
+        finally:
+            self._checkin(worker, keep)
+
+    def _checkin(self, worker: _Worker, keep: bool):
+        if keep and worker.runs < self.recycle_after:
+            self._idle.put(worker)
+            return
+        if keep:
+            self._count("recycled")
+            worker.stop()
+        else:
+            worker.kill()
+        if self._closed:
+            return
+        self._idle.put(self._spawn())
+
+    def run_script(self, code: str, timeout: Optional[float] = None) -> Tuple[str, Any]:
+        return self.run("script", (code,), timeout)
+
+    def run_snippet(self, code: str, input_data: dict, timeout: Optional[float] = None) -> Tuple[str, Any]:
+        return self.run("snippet", (code, input_data), timeout)
+
+    def call(self, func, args=(), timeout: Optional[float] = None) -> Tuple[str, Any]:
+        return self.run("call", (func, tuple(args)), timeout)
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            worker.stop()
+            worker.process.join(1)
+            if worker.process.is_alive():
+                worker.kill()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_shared_pools: Dict[Tuple, SandboxWorkerPool] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_pool(cpu_seconds: Optional[int] = None, max_memory_mb: Optional[int] = None,
+                **kwargs) -> SandboxWorkerPool:
+    """
+    Process-wide pool for the given limits, created on first use and closed at exit.
+    """
+    key = (cpu_seconds, max_memory_mb)
+    with _shared_lock:
+        pool = _shared_pools.get(key)
+        if pool is None:
+            kwargs.setdefault("size", min(4, os.cpu_count() or 1))
+            pool = _shared_pools[key] = SandboxWorkerPool(cpu_seconds=cpu_seconds, max_memory_mb=max_memory_mb,
+                                                          **kwargs)
+        return pool
+
+
+@atexit.register
+def _close_shared_pools():
+    with _shared_lock:
+        for pool in _shared_pools.values():
+            pool.close()
+        _shared_pools.clear()
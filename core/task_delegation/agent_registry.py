@@ -29,6 +29,20 @@ class AgentRegistry:
                     self.agents[agent_id]["tasks"].append(task_id)
                     self.agents[agent_id]["status"] = "busy"
 
+    def complete_task(self, agent_id: str, task_id: str) -> bool:
+        with self.lock:
+            agent = self.agents.get(agent_id)
+            if agent is None or task_id not in agent["tasks"]:
+                return False
+            agent["tasks"].remove(task_id)
+            if not agent["tasks"]:
+                agent["status"] = "idle"
+            return True
+
+    def get_agents_with_skill(self, skill: str) -> List[str]:
+        with self.lock:
+            return [aid for aid, data in self.agents.items() if skill in data["skills"]]
+
     def get_idle_agents_with_skill(self, skill: str) -> List[str]:
         with self.lock:
             return [
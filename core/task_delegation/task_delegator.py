@@ -1,18 +1,32 @@
 # /core/task_delegation/task_delegator.py
 
-import random
-from time import time
+from time import time, perf_counter
 from core.task_delegation.agent_registry import agent_registry
 from core.task_delegation.queue_manager import queue_manager
 from core.agent_messaging.agent_protocol import AgentMessage
-from core.agent_messaging.agent_messenger import agent_messenger
+from core.agent_messaging import agent_messenger
+from core.tasks.routing import InFlightTracker, RoutingEngine
 
 MAX_RETRY_COUNT = 3
 RETRY_TRACKER = {}
 
+AVAILABLE_STATUSES = ("idle", "busy")
+
 class TaskDelegator:
-    def __init__(self):
-        pass
+    """
+    Assigns queued tasks to agents through a load-aware RoutingEngine.
+
+    An agent is a candidate while it has fewer than ``max_outstanding``
+    delegated tasks in flight. Its tasks are released by ``complete_task``, or
+    all at once when the agent reports back as idle through
+    ``agent_registry.update_status``. The delegator keeps its own in-flight
+    counters, separate from the TaskDispatcher's.
+    """
+
+    def __init__(self, strategy: str = "least_outstanding", max_outstanding: int = 1):
+        self.engine = RoutingEngine(strategy, inflight=InFlightTracker())
+        self.max_outstanding = max_outstanding
+        self.assignments = {}  # task_id -> (agent_id, dispatched_at)
 
     def delegate(self):
         task = queue_manager.get_next_task()
@@ -20,13 +34,19 @@ class TaskDelegator:
             print("[Delegator] No tasks in queue.")
             return
 
+        self.release_idle_agents()
+
         task_id, task_data = task
         required_skill = task_data.get("skill")
         if not required_skill:
             print(f"[Delegator] Task {task_id} missing skill requirement.")
             return
 
-        candidates = agent_registry.get_idle_agents_with_skill(required_skill)
+        candidates = [
+            agent_id for agent_id in agent_registry.get_agents_with_skill(required_skill)
+            if agent_registry.get_agent(agent_id)["status"] in AVAILABLE_STATUSES
+            and self.engine.inflight.outstanding(agent_id) < self.max_outstanding
+        ]
         if not candidates:
             retry_count = RETRY_TRACKER.get(task_id, 0)
             if retry_count >= MAX_RETRY_COUNT:
@@ -38,8 +58,10 @@ class TaskDelegator:
             queue_manager.enqueue_task(task_data["priority"], task_id, task_data)
             return
 
-        assigned_agent = random.choice(candidates)
+        assigned_agent = self.engine.select(candidates, key=task_data.get("affinity_key"))
         agent_registry.assign_task(assigned_agent, task_id)
+        self.engine.acquire(assigned_agent)
+        self.assignments[task_id] = (assigned_agent, perf_counter())
 
         message = AgentMessage(
             sender="delegator",
@@ -52,7 +74,34 @@ class TaskDelegator:
         print(f"[Delegator] ✅ Assigned task {task_id} to agent {assigned_agent}.")
         RETRY_TRACKER.pop(task_id, None)  # Clear retry tracker on success
 
-    def add_task(self, task_id: str, skill: str, priority: str, details: dict):
+    def complete_task(self, task_id: str) -> bool:
+        """Marks a delegated task finished, releasing its agent's in-flight slot."""
+        assignment = self.assignments.pop(task_id, None)
+        if assignment is None:
+            return False
+        agent_id, dispatched_at = assignment
+        self.engine.release(agent_id, perf_counter() - dispatched_at)
+        agent_registry.complete_task(agent_id, task_id)
+        return True
+
+    def release_idle_agents(self) -> int:
+        """
+        Completes the tasks of agents that reported back as idle (or were
+        deregistered) since they were assigned.
+
+        :return: Number of tasks released.
+        """
+        released = 0
+        for task_id, (agent_id, _) in list(self.assignments.items()):
+            agent = agent_registry.get_agent(agent_id)
+            if agent is None or agent["status"] == "idle":
+                released += self.complete_task(task_id)
+        return released
+
+    def get_metrics(self):
+        return self.engine.get_metrics()
+
+    def add_task(self, task_id: str, skill: str, priority: str, details: dict, affinity_key: str = None):
         if not all([task_id, skill, priority, details]):
             print(f"[Delegator] Invalid task input. Missing fields.")
             return
@@ -64,6 +113,8 @@ class TaskDelegator:
             "timestamp": timestamp,
             "details": details
         }
+        if affinity_key is not None:
+            task_data["affinity_key"] = affinity_key
         queue_manager.enqueue_task(priority, task_id, task_data)
         print(f"[Delegator] 📝 Task {task_id} queued with priority '{priority}'.")
 
@@ -0,0 +1,59 @@
+# File: /core/task_delegation/tests/test_task_delegator.py
+
+import importlib
+
+import pytest
+
+from core.task_delegation.agent_registry import AgentRegistry
+from core.task_delegation.queue_manager import MultiAgentQueueManager
+from core.task_delegation.task_delegator import TaskDelegator
+from core.tasks.routing import default_inflight
+
+# The package re-exports the singleton under the module's name
+delegator_module = importlib.import_module("core.task_delegation.task_delegator")
+
+
+@pytest.fixture
+def env(monkeypatch):
+    registry, queue, sent = AgentRegistry(), MultiAgentQueueManager(), []
+    monkeypatch.setattr(delegator_module, "agent_registry", registry)
+    monkeypatch.setattr(delegator_module, "queue_manager", queue)
+    monkeypatch.setattr(delegator_module.agent_messenger, "send", sent.append)
+    monkeypatch.setattr(delegator_module, "RETRY_TRACKER", {})
+    return registry, queue, sent
+
+
+def test_agent_is_freed_when_it_reports_idle(env):
+    registry, queue, sent = env
+    registry.register_agent("a1", ["nlp"])
+    delegator = TaskDelegator(max_outstanding=1)
+
+    delegator.add_task("t1", "nlp", "high", {"text": "x"})
+    delegator.add_task("t2", "nlp", "high", {"text": "y"})
+    delegator.delegate()
+    assert [m.receiver for m in sent] == ["a1"]
+
+    delegator.delegate()  # a1 is at its limit, t2 is requeued
+    assert len(sent) == 1 and queue.queue_sizes()["high"] == 1
+
+    registry.update_status("a1", "idle")
+    delegator.delegate()
+    assert [m.payload["task_id"] for m in sent] == ["t1", "t2"]
+    assert "t1" not in delegator.assignments
+    assert registry.get_agent("a1")["tasks"] == ["t2"]
+
+
+def test_complete_task_releases_and_tracker_is_private(env):
+    registry, _, sent = env
+    registry.register_agent("a1", ["nlp"])
+    delegator = TaskDelegator()
+
+    delegator.add_task("t1", "nlp", "medium", {"text": "x"})
+    delegator.delegate()
+    assert delegator.engine.inflight.outstanding("a1") == 1
+    assert default_inflight.outstanding("a1") == 0
+
+    assert delegator.complete_task("t1")
+    assert not delegator.complete_task("t1")
+    assert delegator.engine.inflight.outstanding("a1") == 0
+    assert registry.get_agent("a1")["status"] == "idle"
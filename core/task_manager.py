@@ -1,58 +1,207 @@
 # File: core/task_runtime/task_manager.py
 
 import os
+import sys
 import json
 import asyncio
 from datetime import datetime
-from importlib import import_module
+from importlib import import_module, reload
 from utils.logger import logger  # Optional if you have one
 
 class TaskManager:
-    def __init__(self, task_file="data/tasks/task_queue.json"):
+    """
+    Persistent task queue.
+
+    State lives in a JSON snapshot (``task_file``) plus an append-only
+    write-ahead log (``task_file`` with a ``.wal`` suffix) of task state
+    transitions. Every change appends one WAL line instead of rewriting the
+    queue; after ``compact_every`` records the queue is compacted into a
+    fresh snapshot (written to a temp file and atomically renamed) and the
+    WAL is truncated. On startup the snapshot is loaded and the WAL
+    replayed; a torn final WAL line is discarded, and tasks that were
+    ``running`` when the process died are returned to ``pending``.
+
+    ``run_all`` runs up to ``max_concurrency`` tasks at once (1 keeps the
+    original one-at-a-time behaviour); ``command_limits`` caps concurrency
+    per command. Plugin handler maps returned by ``register()`` are cached
+    per module and refreshed when the module is reloaded.
+    """
+
+    def __init__(self, task_file="data/tasks/task_queue.json", compact_every=1000, fsync=False,
+                 max_concurrency=1, command_limits=None):
         self.task_file = task_file
+        self.max_concurrency = max_concurrency
+        self.command_limits = dict(command_limits or {})
+        self._handler_cache = {}  # {module_name: (register_fn, handlers)}
+        self._running = {}  # {task_id: (loop, asyncio.Task)}
+        self.wal_file = os.path.splitext(task_file)[0] + ".wal"
+        self.compact_every = compact_every
+        self.fsync = fsync
         self.queue = []
+        self.tasks_by_id = {}
+        self.next_id = 1
+        self._wal_records = 0
+        self._wal = None
         os.makedirs(os.path.dirname(task_file), exist_ok=True)
         self._load_queue()
 
     def _load_queue(self):
-        """Load tasks from persistent JSON file."""
+        """Load the snapshot, replay the WAL on top of it and recover interrupted tasks."""
+        self.queue = []
         if os.path.exists(self.task_file):
             with open(self.task_file, "r") as f:
                 self.queue = json.load(f)
-        else:
-            self.queue = []
+        self.tasks_by_id = {task["id"]: task for task in self.queue}
+
+        replayed = self._replay_wal()
+        self.next_id = max(self.tasks_by_id, default=0) + 1
+
+        interrupted = [task for task in self.queue if task["status"] == "running"]
+        for task in interrupted:
+            self._update_task(task, status="pending")
+        if interrupted:
+            logger.warning(f"[TaskManager] Re-queued {len(interrupted)} task(s) interrupted while running.")
+        if replayed >= self.compact_every:
+            self.compact()
+
+    def _replay_wal(self) -> int:
+        if not os.path.exists(self.wal_file):
+            return 0
+
+        replayed = 0
+        valid_bytes = 0
+        with open(self.wal_file, "rb") as f:
+            for line in f:
+                try:
+                    record = json.loads(line) if line.endswith(b"\n") else None
+                except json.JSONDecodeError:
+                    record = None
+                if record is None:
+                    break
+                self._apply(record)
+                valid_bytes += len(line)
+                replayed += 1
+
+        if valid_bytes < os.path.getsize(self.wal_file):
+            logger.warning(f"[TaskManager] Discarding torn record at end of {self.wal_file}")
+            with open(self.wal_file, "ab") as f:
+                f.truncate(valid_bytes)
+        self._wal_records = replayed
+        return replayed
+
+    def _apply(self, record: dict):
+        """Apply one WAL record to the in-memory queue. Records are idempotent."""
+        if record["op"] == "add":
+            task = record["task"]
+            existing = self.tasks_by_id.get(task["id"])
+            if existing is not None:
+                existing.update(task)
+            else:
+                self.queue.append(task)
+                self.tasks_by_id[task["id"]] = task
+        elif record["op"] == "update":
+            task = self.tasks_by_id.get(record["id"])
+            if task is not None:
+                task.update(record["fields"])
+
+    def _append_wal(self, record: dict):
+        line = json.dumps(record, separators=(",", ":")) + "\n"  # fails before anything is written
+        if self._wal is None:
+            self._wal = open(self.wal_file, "a", encoding="utf-8")
+        self._wal.write(line)
+        self._wal.flush()
+        if self.fsync:
+            os.fsync(self._wal.fileno())
+        self._wal_records += 1
+
+    def _maybe_compact(self):
+        # Only called once the logged change is also applied in memory, so the snapshot includes it
+        if self._wal_records >= self.compact_every:
+            self.compact()
+
+    def _update_task(self, task: dict, **fields):
+        """Apply a state transition to a task and log it to the WAL."""
+        self._append_wal({"op": "update", "id": task["id"], "fields": fields})
+        task.update(fields)
+        self._maybe_compact()
 
-    def _save_queue(self):
-        """Save current queue to file."""
-        with open(self.task_file, "w") as f:
-            json.dump(self.queue, f, indent=2)
+    def compact(self):
+        """Write the full queue to a new snapshot and truncate the WAL."""
+        tmp_path = self.task_file + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.queue, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.task_file)
+
+        if self._wal is not None:
+            self._wal.close()
+        self._wal = open(self.wal_file, "w", encoding="utf-8")
+        self._wal_records = 0
+        logger.debug(f"[TaskManager] Compacted {len(self.queue)} tasks into {self.task_file}")
+
+    def close(self):
+        """Close the WAL handle."""
+        if self._wal is not None:
+            self._wal.close()
+            self._wal = None
 
     def add_task(self, command: str, args=None, priority=1) -> dict:
         """Add a new task to the queue."""
         task = {
-            "id": len(self.queue) + 1,
+            "id": self.next_id,
             "command": command,
             "args": args or [],
             "priority": priority,
             "created_at": datetime.utcnow().isoformat(),
             "status": "pending"
         }
+        self.next_id += 1
         self.queue.append(task)
-        self._save_queue()
+        self.tasks_by_id[task["id"]] = task
+        self._append_wal({"op": "add", "task": task})
+        self._maybe_compact()
         logger.info(f"[TaskManager] Added task {task['id']}: {command}")
         return task
 
     def cancel_task(self, task_id: int) -> dict:
-        """Mark a task as cancelled."""
-        for task in self.queue:
-            if task["id"] == task_id:
-                task["status"] = "cancelled"
-                self._save_queue()
-                logger.info(f"[TaskManager] Cancelled task {task_id}")
-                return {"cancelled": task_id}
+        """Mark a task as cancelled, interrupting it if it is currently running."""
+        task = self.tasks_by_id.get(task_id)
+        if task is not None:
+            self._update_task(task, status="cancelled")
+            running = self._running.get(task_id)
+            if running is not None:
+                loop, handler_task = running
+                loop.call_soon_threadsafe(handler_task.cancel)
+            logger.info(f"[TaskManager] Cancelled task {task_id}")
+            return {"cancelled": task_id}
         logger.warning(f"[TaskManager] Task {task_id} not found to cancel.")
         return {"error": "Task not found"}
 
+    def get_handler(self, command: str):
+        """Resolve a command to its plugin handler, caching each plugin's register() map."""
+        base_name = command.split("_")[0]
+        module_name = f"plugins.{base_name}_plugin"
+        plugin_module = sys.modules.get(module_name) or import_module(module_name)
+
+        cached = self._handler_cache.get(module_name)
+        # A reloaded module re-binds register, which invalidates the cached map.
+        if cached is None or cached[0] is not plugin_module.register:
+            cached = (plugin_module.register, plugin_module.register())
+            self._handler_cache[module_name] = cached
+        return cached[1].get(command)
+
+    def reload_plugin(self, base_name: str):
+        """Reload a task plugin module and drop its cached handlers."""
+        module_name = f"plugins.{base_name}_plugin"
+        self._handler_cache.pop(module_name, None)
+        if module_name in sys.modules:
+            reload(sys.modules[module_name])
+
+    def invalidate_handlers(self):
+        """Forget every cached plugin handler map."""
+        self._handler_cache.clear()
+
     def get_queue(self) -> list:
         """Get the task queue sorted by priority and timestamp."""
         return sorted(self.queue, key=lambda t: (-t["priority"], t["created_at"]))
@@ -66,38 +215,60 @@ class TaskManager:
         if task["status"] != "pending":
             return
 
-        task["status"] = "running"
-        self._save_queue()
+        self._update_task(task, status="running")
         logger.info(f"[TaskManager] Running task {task['id']}: {task['command']}")
 
         try:
-            # Dynamic plugin loader
-            base_name = task["command"].split("_")[0]
-            module_name = f"plugins.{base_name}_plugin"
-            plugin_module = import_module(module_name)
-            plugin = plugin_module.register()
-
-            # Task handler lookup
-            handler = plugin.get(task["command"])
+            handler = self.get_handler(task["command"])
             if not handler:
                 raise ValueError(f"No handler found for command: {task['command']}")
 
-            # Run handler (assumed to be async)
-            result = await handler(task["args"])
-            task["result"] = result
-            task["status"] = "complete"
+            # Run handler (assumed to be async) as its own task so cancel_task can interrupt it
+            handler_task = asyncio.ensure_future(handler(task["args"]))
+            self._running[task["id"]] = (asyncio.get_running_loop(), handler_task)
+            try:
+                result = await handler_task
+            finally:
+                self._running.pop(task["id"], None)
+
+            self._update_task(task, status="complete", result=result)
             logger.info(f"[TaskManager] Task {task['id']} complete.")
 
+        except asyncio.CancelledError:
+            if task["status"] != "cancelled":
+                raise  # run_task itself was cancelled, not the task
+            logger.info(f"[TaskManager] Task {task['id']} cancelled while running.")
+
         except Exception as e:
-            task["status"] = "error"
-            task["error"] = str(e)
+            self._update_task(task, status="error", error=str(e))
             logger.error(f"[TaskManager] Task {task['id']} failed: {e}")
 
-        finally:
-            self._save_queue()
+    async def run_all(self, max_concurrency=None):
+        """
+        Run all tasks in the queue that are still pending.
+
+        Tasks start in priority order; up to ``max_concurrency`` (default
+        ``self.max_concurrency``) run at once, subject to ``command_limits``.
+        """
+        limit = max_concurrency or self.max_concurrency
+        pending = [task for task in self.get_queue() if task["status"] == "pending"]
+        if limit <= 1 and not self.command_limits:
+            for task in pending:
+                if task["status"] == "pending":
+                    await self.run_task(task)
+            return
+
+        slots = asyncio.Semaphore(limit)
+        command_slots = {command: asyncio.Semaphore(cap) for command, cap in self.command_limits.items()}
+
+        async def run_limited(task):
+            command_slot = command_slots.get(task["command"])
+            if command_slot is not None:
+                # Take the per-command slot first so a capped command never holds a global slot idle.
+                async with command_slot, slots:
+                    await self.run_task(task)
+            else:
+                async with slots:
+                    await self.run_task(task)
 
-    async def run_all(self):
-        """Run all tasks in the queue that are still pending."""
-        for task in self.get_queue():
-            if task["status"] == "pending":
-                await self.run_task(task)
+        await asyncio.gather(*(run_limited(task) for task in pending))
@@ -1,45 +1,54 @@
 # /core/task_router_ai/agent_profile.py
 
-from collections import defaultdict
+from .aggregates import HistoryColumns, ProfileAggregator
 
 class AgentProfile:
-    def __init__(self, history_db):
+    """
+    Per-agent performance profiles backed by incrementally maintained
+    aggregates: the history is folded once at construction and every
+    subsequent ``record_task_result`` updates the matching (agent, task_type)
+    entry in O(1), so profile lookups no longer depend on history length.
+    """
+
+    def __init__(self, history_db, ewma_alpha=0.2):
         self.history_db = history_db
-
-    def build_profiles(self):
+        self.aggregator = ProfileAggregator(alpha=ewma_alpha)
+        self.rebuild()
+        history_db.add_listener(self._on_result)
+
+    def _on_result(self, agent_id, entry):
+        if entry is None:  # history cleared
+            self.rebuild()
+            return
+        self.aggregator.record(agent_id, entry.get("task_type"), entry.get("success", False),
+                               entry.get("duration", 0.0), entry.get("timestamp"))
+
+    def build_profiles(self, half_life=None, window=None, now=None):
         """
         Build performance profiles for each agent based on historical task data.
         Each profile includes per-task-type success rate and average duration.
+
+        With ``half_life`` and/or ``window`` (seconds) the profiles are
+        recomputed in bulk from a NumPy column store with time-decayed
+        weights instead of being read from the running aggregates; rolled-up
+        history contributes at daily resolution.
+        """
+        if half_life or window is not None:
+            columns = HistoryColumns(self.history_db.get_all_data(), self._history_call("get_daily_rollups"))
+            return columns.aggregate(now=now, half_life=half_life, window=window)
+        return self.aggregator.profiles()
+
+    def profiles_for_task(self, task_type):
         """
-        profiles = {}
-        all_data = self.history_db.get_all_data()
-
-        for agent_id, task_records in all_data.items():
-            task_summary = defaultdict(lambda: {
-                "total": 0,
-                "success": 0,
-                "total_duration": 0.0
-            })
-
-            for task in task_records:
-                task_type = task.get("task_type")
-                success = task.get("success", False)
-                duration = task.get("duration", 0.0)
-
-                entry = task_summary[task_type]
-                entry["total"] += 1
-                entry["total_duration"] += duration
-                if success:
-                    entry["success"] += 1
-
-            # Post-process to compute averages and success rate
-            for task_type, stats in task_summary.items():
-                total = stats["total"]
-                stats["avg_duration"] = round(stats["total_duration"] / total, 2) if total else 0.0
-                stats["success_rate"] = round(stats["success"] / total, 2) if total else 0.0
-                # Clean up the temp variable
-                del stats["total_duration"]
-
-            profiles[agent_id] = dict(task_summary)
-
-        return profiles
+        Profiles of every agent with history for ``task_type``, in O(#agents).
+        """
+        return self.aggregator.for_task(task_type)
+
+    def rebuild(self):
+        """Refold the aggregates from the raw history and the rolled-up summaries."""
+        self.aggregator.rebuild(self.history_db.get_all_data(), self._history_call("get_archived_stats"))
+
+    def _history_call(self, name):
+        # Plain history sources without rollups only provide get_all_data().
+        method = getattr(self.history_db, name, None)
+        return method() if method else None
@@ -0,0 +1,268 @@
+# /core/task_router_ai/aggregates.py
+
+import math
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+def to_epoch(timestamp) -> float:
+    """Convert an ISO-8601 string (naive = UTC) or number to epoch seconds."""
+    if isinstance(timestamp, (int, float)):
+        return float(timestamp)
+    if not timestamp:
+        return 0.0
+    parsed = datetime.fromisoformat(timestamp)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class DurationSketch:
+    """
+    Log-bucketed histogram giving percentiles within ``relative_accuracy``
+    using O(log range) memory, independent of the number of samples.
+    """
+
+    __slots__ = ("gamma", "log_gamma", "buckets", "zeros", "count")
+
+    def __init__(self, relative_accuracy: float = 0.02):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value: float, count: int = 1) -> None:
+        self.count += count
+        if value <= 0:
+            self.zeros += count
+            return
+        key = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + count
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        if rank < self.zeros:
+            return 0.0
+        seen = self.zeros
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"zeros": self.zeros, "buckets": {str(k): v for k, v in self.buckets.items()}}
+
+    def load(self, data: Dict[str, Any]) -> None:
+        self.zeros += data.get("zeros", 0)
+        self.count += data.get("zeros", 0)
+        for key, count in data.get("buckets", {}).items():
+            self.buckets[int(key)] = self.buckets.get(int(key), 0) + count
+            self.count += count
+
+
+class TaskStats:
+    """
+    Running aggregate for one (agent, task_type) pair, updated in O(1).
+    """
+
+    __slots__ = ("total", "success", "total_duration", "ewma_duration", "ewma_success", "last_seen", "sketch", "alpha")
+
+    def __init__(self, alpha: float = 0.2):
+        self.alpha = alpha
+        self.total = 0
+        self.success = 0
+        self.total_duration = 0.0
+        self.ewma_duration: Optional[float] = None
+        self.ewma_success: Optional[float] = None
+        self.last_seen = 0.0
+        self.sketch = DurationSketch()
+
+    def update(self, success: bool, duration: float, timestamp: float = 0.0) -> None:
+        self.total += 1
+        self.success += 1 if success else 0
+        self.total_duration += duration
+        self.sketch.add(duration)
+        self.last_seen = max(self.last_seen, timestamp)
+        outcome = 1.0 if success else 0.0
+        if self.ewma_duration is None:
+            self.ewma_duration, self.ewma_success = duration, outcome
+        else:
+            self.ewma_duration += self.alpha * (duration - self.ewma_duration)
+            self.ewma_success += self.alpha * (outcome - self.ewma_success)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "success": self.success,
+            "total_duration": self.total_duration,
+            "ewma_duration": self.ewma_duration,
+            "ewma_success": self.ewma_success,
+            "last_seen": self.last_seen,
+            "sketch": self.sketch.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], alpha: float = 0.2) -> "TaskStats":
+        stats = cls(alpha)
+        stats.total = data.get("total", 0)
+        stats.success = data.get("success", 0)
+        stats.total_duration = data.get("total_duration", 0.0)
+        stats.ewma_duration = data.get("ewma_duration")
+        stats.ewma_success = data.get("ewma_success")
+        stats.last_seen = data.get("last_seen", 0.0)
+        stats.sketch.load(data.get("sketch", {}))
+        return stats
+
+    def profile(self) -> Dict[str, Any]:
+        """Profile entry in the shape AgentProfile.build_profiles has always returned, plus extras."""
+        total = self.total
+        return {
+            "total": total,
+            "success": self.success,
+            "avg_duration": round(self.total_duration / total, 2) if total else 0.0,
+            "success_rate": round(self.success / total, 2) if total else 0.0,
+            "ewma_duration": round(self.ewma_duration or 0.0, 4),
+            "ewma_success": round(self.ewma_success or 0.0, 4),
+            "p50_duration": round(self.sketch.quantile(0.5), 4),
+            "p95_duration": round(self.sketch.quantile(0.95), 4),
+            "last_seen": self.last_seen,
+        }
+
+
+class ProfileAggregator:
+    """
+    Incrementally maintained per-(agent, task_type) statistics, indexed by
+    task type so ranking candidates for one task type is O(#agents).
+    """
+
+    def __init__(self, alpha: float = 0.2):
+        self.alpha = alpha
+        self.by_task: Dict[str, Dict[str, TaskStats]] = defaultdict(dict)
+
+    def record(self, agent_id: str, task_type: str, success: bool, duration: float, timestamp=None) -> None:
+        stats = self.by_task[task_type].get(agent_id)
+        if stats is None:
+            stats = self.by_task[task_type][agent_id] = TaskStats(self.alpha)
+        stats.update(success, duration, to_epoch(timestamp))
+
+    def rebuild(self, all_data: Dict[str, List[Dict[str, Any]]],
+                archived: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None) -> None:
+        """
+        Refold from raw records, seeded with summaries of records that have
+        already been rolled out of the raw history (``{agent: {task_type: TaskStats dict}}``).
+        """
+        self.by_task = defaultdict(dict)
+        for agent_id, task_stats in (archived or {}).items():
+            for task_type, data in task_stats.items():
+                self.by_task[task_type][agent_id] = TaskStats.from_dict(data, self.alpha)
+        for agent_id, records in all_data.items():
+            for record in records:
+                self.record(agent_id, record.get("task_type"), record.get("success", False),
+                            record.get("duration", 0.0), record.get("timestamp"))
+
+    def for_task(self, task_type: str) -> Dict[str, Dict[str, Any]]:
+        return {agent_id: stats.profile() for agent_id, stats in self.by_task.get(task_type, {}).items()}
+
+    def profiles(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        result: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+        for task_type, agents in self.by_task.items():
+            for agent_id, stats in agents.items():
+                result[agent_id][task_type] = stats.profile()
+        return dict(result)
+
+
+class HistoryColumns:
+    """
+    Column-oriented NumPy copy of the history for bulk, vectorised
+    recomputation (time-decayed weights, sliding windows).
+    """
+
+    def __init__(self, all_data: Dict[str, List[Dict[str, Any]]],
+                 daily: Optional[Dict[str, Dict[str, Dict[str, List[float]]]]] = None):
+        """
+        Args:
+            all_data: Raw records per agent.
+            daily: Downsampled rollups ``{agent: {task_type: {YYYY-MM-DD: [count, successes, duration_sum]}}}``;
+                each bucket becomes one row weighted by its count, stamped at midday.
+        """
+        agents: Dict[str, int] = {}
+        tasks: Dict[str, int] = {}
+        agent_codes, task_codes, count, success, duration, timestamp = [], [], [], [], [], []
+
+        for agent_id, records in all_data.items():
+            agent_code = agents.setdefault(agent_id, len(agents))
+            for record in records:
+                agent_codes.append(agent_code)
+                task_codes.append(tasks.setdefault(record.get("task_type"), len(tasks)))
+                count.append(1.0)
+                success.append(1.0 if record.get("success", False) else 0.0)
+                duration.append(float(record.get("duration", 0.0)))
+                timestamp.append(to_epoch(record.get("timestamp")))
+
+        for agent_id, task_buckets in (daily or {}).items():
+            agent_code = agents.setdefault(agent_id, len(agents))
+            for task_type, buckets in task_buckets.items():
+                task_code = tasks.setdefault(task_type, len(tasks))
+                for day, (bucket_count, bucket_success, bucket_duration) in buckets.items():
+                    agent_codes.append(agent_code)
+                    task_codes.append(task_code)
+                    count.append(float(bucket_count))
+                    success.append(float(bucket_success))
+                    duration.append(float(bucket_duration))
+                    timestamp.append(to_epoch(f"{day}T12:00:00"))
+
+        self.agents = list(agents)
+        self.task_types = list(tasks)
+        self.agent = np.asarray(agent_codes, dtype=np.int32)
+        self.task = np.asarray(task_codes, dtype=np.int32)
+        self.count = np.asarray(count, dtype=np.float64)
+        self.success = np.asarray(success, dtype=np.float64)  # successes per row
+        self.duration = np.asarray(duration, dtype=np.float64)  # duration sum per row
+        self.timestamp = np.asarray(timestamp, dtype=np.float64)
+
+    def aggregate(self, now: Optional[float] = None, half_life: Optional[float] = None,
+                  window: Optional[float] = None) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Weighted per-(agent, task_type) success rate and mean duration.
+
+        Args:
+            now (float, optional): Reference epoch time (defaults to the newest record).
+            half_life (float, optional): Seconds after which a record's weight halves.
+            window (float, optional): Ignore records older than this many seconds.
+        """
+        if self.agent.size == 0:
+            return {}
+        now = float(self.timestamp.max()) if now is None else now
+        weights = np.ones(self.agent.size)
+        if half_life:
+            weights = np.exp2(-(now - self.timestamp) / half_life)
+        if window is not None:
+            weights = np.where(now - self.timestamp <= window, weights, 0.0)
+
+        n_tasks = len(self.task_types)
+        cell = self.agent.astype(np.int64) * n_tasks + self.task
+        size = len(self.agents) * n_tasks
+        counts = np.bincount(cell, weights=np.where(weights > 0, self.count, 0.0), minlength=size)
+        w_total = np.bincount(cell, weights=weights * self.count, minlength=size)
+        w_success = np.bincount(cell, weights=weights * self.success, minlength=size)
+        w_duration = np.bincount(cell, weights=weights * self.duration, minlength=size)
+
+        profiles: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for index in np.flatnonzero(w_total > 0):
+            agent_id = self.agents[index // n_tasks]
+            task_type = self.task_types[index % n_tasks]
+            profiles.setdefault(agent_id, {})[task_type] = {
+                "total": int(round(counts[index])),
+                "weight": round(float(w_total[index]), 4),
+                "avg_duration": round(float(w_duration[index] / w_total[index]), 2),
+                "success_rate": round(float(w_success[index] / w_total[index]), 2),
+            }
+        return profiles
+
@@ -3,33 +3,103 @@
 import json
 import os
 from collections import defaultdict
-from datetime import datetime
-from typing import List, Dict, Any
+from datetime import datetime, timedelta
+from typing import Callable, List, Dict, Any, Optional
+
+from .aggregates import TaskStats, to_epoch
 
 DEFAULT_DB_PATH = "data/agent_task_history.json"
+SNAPSHOT_VERSION = 1
+
 
 class AgentHistoryDB:
-    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+    """
+    Task outcome history persisted as an append-only log plus a snapshot.
+
+    ``record_task_result`` appends one JSON line to ``<base>.log.jsonl``;
+    every ``rollup_every`` records the history is rolled up: raw records
+    beyond the retention policy (the newest ``retention_records`` per agent,
+    and nothing older than ``retention_days``) are folded into per-agent
+    summaries (lifetime ``TaskStats``) and downsampled daily buckets, the
+    result is written atomically to ``<base>.snapshot.json`` and the log is
+    truncated. Startup reads the snapshot and replays the log tail.
+
+    A legacy ``db_path`` JSON file is imported on first start.
+    """
+
+    def __init__(
+        self,
+        db_path: str = DEFAULT_DB_PATH,
+        rollup_every: int = 1000,
+        retention_records: Optional[int] = 1000,
+        retention_days: Optional[float] = None,
+    ):
         self.db_path = db_path
+        base = os.path.splitext(db_path)[0]
+        self.log_path = base + ".log.jsonl"
+        self.snapshot_path = base + ".snapshot.json"
+        self.rollup_every = rollup_every
+        self.retention_records = retention_records
+        self.retention_days = retention_days
+
         self.db: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self.archived: Dict[str, Dict[str, TaskStats]] = defaultdict(dict)
+        self.daily: Dict[str, Dict[str, Dict[str, List[float]]]] = defaultdict(lambda: defaultdict(dict))
+        self._listeners: List[Callable[[str, Dict[str, Any]], None]] = []
+        self._log = None
+        self._since_rollup = 0
         self._load()
 
     def _load(self):
-        """Load history from disk if available."""
-        if os.path.exists(self.db_path):
-            try:
+        """Load the snapshot (or legacy JSON file) and replay the log tail."""
+        try:
+            if os.path.exists(self.snapshot_path):
+                with open(self.snapshot_path, 'r') as f:
+                    self._restore(json.load(f))
+            elif os.path.exists(self.db_path):
                 with open(self.db_path, 'r') as f:
-                    data = json.load(f)
-                    self.db.update({k: v for k, v in data.items()})
-            except Exception as e:
-                print(f"[AgentHistoryDB] Failed to load history: {e}")
+                    self.db.update({k: v for k, v in json.load(f).items()})
+                self._since_rollup = self.rollup_every  # migrate on the first rollup
+        except Exception as e:
+            print(f"[AgentHistoryDB] Failed to load history: {e}")
+
+        if not os.path.exists(self.log_path):
+            return
+        good_bytes = 0
+        with open(self.log_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn final line from an interrupted write
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                good_bytes += len(line)
+                agent_id = record.pop("agent_id")
+                self.db[agent_id].append(record)
+                self._since_rollup += 1
+        if good_bytes < os.path.getsize(self.log_path):
+            with open(self.log_path, 'r+b') as f:
+                f.truncate(good_bytes)
 
-    def _save(self):
-        """Persist current memory to disk."""
+    def _restore(self, snapshot: Dict[str, Any]):
+        self.db.update(snapshot.get("records", {}))
+        for agent_id, task_stats in snapshot.get("archived", {}).items():
+            for task_type, data in task_stats.items():
+                self.archived[agent_id][task_type] = TaskStats.from_dict(data)
+        for agent_id, task_buckets in snapshot.get("daily", {}).items():
+            for task_type, buckets in task_buckets.items():
+                self.daily[agent_id][task_type].update(buckets)
+
+    def _append_log(self, agent_id: str, entry: Dict[str, Any]):
         try:
-            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-            with open(self.db_path, 'w') as f:
-                json.dump(self.db, f, indent=2)
+            if self._log is None:
+                directory = os.path.dirname(self.log_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._log = open(self.log_path, 'a')
+            self._log.write(json.dumps({"agent_id": agent_id, **entry}) + "\n")
+            self._log.flush()
         except Exception as e:
             print(f"[AgentHistoryDB] Failed to save history: {e}")
 
@@ -42,7 +112,81 @@ class AgentHistoryDB:
             "timestamp": datetime.utcnow().isoformat()
         }
         self.db[agent_id].append(entry)
-        self._save()
+        self._append_log(agent_id, entry)
+        self._since_rollup += 1
+        if self.rollup_every and self._since_rollup >= self.rollup_every:
+            self.rollup()
+        for listener in self._listeners:
+            listener(agent_id, entry)
+
+    def rollup(self):
+        """
+        Apply the retention policy, fold expired records into the summaries
+        and daily buckets, write a new snapshot and truncate the log.
+        """
+        cutoff = None
+        if self.retention_days is not None:
+            cutoff = (datetime.utcnow() - timedelta(days=self.retention_days)).isoformat()
+
+        for agent_id, records in self.db.items():
+            keep_from = 0
+            if self.retention_records is not None:
+                keep_from = max(0, len(records) - self.retention_records)
+            if cutoff is not None:
+                while keep_from < len(records) and records[keep_from].get("timestamp", "") < cutoff:
+                    keep_from += 1
+            if keep_from:
+                for record in records[:keep_from]:
+                    self._archive(agent_id, record)
+                del records[:keep_from]
+
+        self._write_snapshot()
+        self._since_rollup = 0
+
+    def _archive(self, agent_id: str, record: Dict[str, Any]):
+        task_type = record.get("task_type")
+        success = record.get("success", False)
+        duration = record.get("duration", 0.0)
+        timestamp = record.get("timestamp") or ""
+
+        stats = self.archived[agent_id].get(task_type)
+        if stats is None:
+            stats = self.archived[agent_id][task_type] = TaskStats()
+        stats.update(success, duration, to_epoch(timestamp))
+
+        bucket = self.daily[agent_id][task_type].setdefault(timestamp[:10], [0, 0, 0.0])
+        bucket[0] += 1
+        bucket[1] += 1 if success else 0
+        bucket[2] += duration
+
+    def _write_snapshot(self):
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "records": {agent_id: records for agent_id, records in self.db.items() if records},
+            "archived": self.get_archived_stats(),
+            "daily": self.get_daily_rollups(),
+        }
+        try:
+            directory = os.path.dirname(self.snapshot_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.snapshot_path + ".tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(snapshot, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            # Only drop the log once the snapshot covering it is durable.
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+            open(self.log_path, 'w').close()
+        except Exception as e:
+            print(f"[AgentHistoryDB] Failed to save history: {e}")
+
+    def add_listener(self, listener: Callable[[str, Dict[str, Any]], None]):
+        """Register a callback invoked with (agent_id, entry) for every recorded result."""
+        self._listeners.append(listener)
 
     def get_agent_history(self, agent_id: str) -> List[Dict[str, Any]]:
         return self.db.get(agent_id, [])
@@ -50,7 +194,33 @@ class AgentHistoryDB:
     def get_all_data(self) -> Dict[str, List[Dict[str, Any]]]:
         return self.db
 
+    def get_archived_stats(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Summaries of records rolled out of the raw history, as {agent: {task_type: TaskStats dict}}."""
+        return {
+            agent_id: {task_type: stats.to_dict() for task_type, stats in task_stats.items()}
+            for agent_id, task_stats in self.archived.items()
+            if task_stats
+        }
+
+    def get_daily_rollups(self) -> Dict[str, Dict[str, Dict[str, List[float]]]]:
+        """Downsampled rolled-out records as {agent: {task_type: {YYYY-MM-DD: [count, successes, duration_sum]}}}."""
+        return {
+            agent_id: {task_type: dict(buckets) for task_type, buckets in task_buckets.items()}
+            for agent_id, task_buckets in self.daily.items()
+            if task_buckets
+        }
+
+    def close(self):
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
     def clear(self):
         """Clear all history (useful for tests)."""
         self.db.clear()
-        self._save()
+        self.archived.clear()
+        self.daily.clear()
+        self._write_snapshot()
+        self._since_rollup = 0
+        for listener in self._listeners:
+            listener(None, None)
@@ -0,0 +1,49 @@
+# /core/task_router_ai/tests/test_aggregates.py
+
+import os
+import tempfile
+import unittest
+
+from core.task_router_ai.agent_profile import AgentProfile
+from core.task_router_ai.aggregates import DurationSketch
+from core.task_router_ai.history_db import AgentHistoryDB
+
+
+class TestProfileAggregates(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = AgentHistoryDB(os.path.join(self.tmpdir.name, "history.json"))
+        self.db.record_task_result("agent-A", "translate", True, 4.0)
+        self.profile = AgentProfile(self.db)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_aggregates_follow_new_results(self):
+        self.db.record_task_result("agent-A", "translate", False, 6.0)
+        self.db.record_task_result("agent-B", "summarize", True, 1.0)
+
+        stats = self.profile.profiles_for_task("translate")["agent-A"]
+        self.assertEqual(stats["total"], 2)
+        self.assertEqual(stats["success_rate"], 0.5)
+        self.assertEqual(stats["avg_duration"], 5.0)
+        self.assertEqual(list(self.profile.profiles_for_task("summarize")), ["agent-B"])
+
+    def test_windowed_bulk_recompute_ignores_old_records(self):
+        self.db.db["agent-A"][0]["timestamp"] = "2020-01-01T00:00:00"
+        self.db.record_task_result("agent-A", "translate", False, 8.0)
+        recent = self.profile.build_profiles(window=3600)
+        self.assertEqual(recent["agent-A"]["translate"]["total"], 1)
+        self.assertEqual(recent["agent-A"]["translate"]["success_rate"], 0.0)
+
+    def test_duration_sketch_percentiles_are_close(self):
+        sketch = DurationSketch()
+        for value in range(1, 1001):
+            sketch.add(float(value))
+        self.assertAlmostEqual(sketch.quantile(0.5), 500, delta=500 * 0.03)
+        self.assertAlmostEqual(sketch.quantile(0.95), 950, delta=950 * 0.03)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+# /core/task_router_ai/tests/test_history_db.py
+
+import json
+import os
+import tempfile
+import unittest
+
+from core.task_router_ai.agent_profile import AgentProfile
+from core.task_router_ai.history_db import AgentHistoryDB
+
+
+class TestAgentHistoryLog(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "history.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def open_db(self, **kwargs):
+        db = AgentHistoryDB(self.path, **kwargs)
+        self.addCleanup(db.close)
+        return db
+
+    def test_results_are_appended_and_replayed(self):
+        db = self.open_db(rollup_every=100)
+        for i in range(5):
+            db.record_task_result("agent-A", "translate", i % 2 == 0, float(i))
+        db.close()
+
+        with open(db.log_path) as f:
+            self.assertEqual(len(f.readlines()), 5)
+        reopened = self.open_db(rollup_every=100)
+        self.assertEqual([r["duration"] for r in reopened.get_agent_history("agent-A")], [0.0, 1.0, 2.0, 3.0, 4.0])
+
+    def test_rollup_applies_retention_and_truncates_log(self):
+        db = self.open_db(rollup_every=10, retention_records=4)
+        for i in range(10):
+            db.record_task_result("agent-A", "translate", i < 6, 2.0)
+
+        self.assertEqual(os.path.getsize(db.log_path), 0)
+        self.assertEqual(len(db.get_agent_history("agent-A")), 4)
+        archived = db.get_archived_stats()["agent-A"]["translate"]
+        self.assertEqual((archived["total"], archived["success"]), (6, 6))
+        [bucket] = db.get_daily_rollups()["agent-A"]["translate"].values()
+        self.assertEqual(bucket, [6, 6, 12.0])
+
+        db.record_task_result("agent-A", "translate", False, 2.0)
+        db.close()
+        reopened = self.open_db(rollup_every=10, retention_records=4)
+        self.assertEqual(len(reopened.get_agent_history("agent-A")), 5)
+        self.assertEqual(reopened.get_archived_stats(), db.get_archived_stats())
+
+    def test_profiles_include_rolled_up_history(self):
+        db = self.open_db(rollup_every=4, retention_records=2)
+        profile = AgentProfile(db)
+        for success in (True, True, False, False, True):
+            db.record_task_result("agent-A", "translate", success, 1.0)
+
+        live = profile.profiles_for_task("translate")["agent-A"]
+        db.close()
+        rebuilt = AgentProfile(self.open_db(rollup_every=4, retention_records=2))
+        self.assertEqual(rebuilt.profiles_for_task("translate")["agent-A"]["total"], 5)
+        self.assertEqual(rebuilt.profiles_for_task("translate")["agent-A"]["success_rate"], live["success_rate"])
+        self.assertEqual(rebuilt.build_profiles(half_life=86400)["agent-A"]["translate"]["total"], 5)
+
+    def test_legacy_json_is_imported_and_torn_tail_dropped(self):
+        with open(self.path, "w") as f:
+            json.dump({"agent-A": [{"task_type": "t", "success": True, "duration": 1.0,
+                                    "timestamp": "2024-01-01T00:00:00"}]}, f)
+        db = self.open_db()
+        db.record_task_result("agent-A", "t", False, 3.0)
+        db.close()
+        self.assertTrue(os.path.exists(db.snapshot_path))
+        with open(db.log_path, "a") as f:
+            f.write('{"agent_id": "agent-A", "task_ty')
+
+        reopened = self.open_db()
+        self.assertEqual(len(reopened.get_agent_history("agent-A")), 2)
+        reopened.record_task_result("agent-A", "t", True, 2.0)
+        reopened.close()
+        self.assertEqual(len(self.open_db().get_agent_history("agent-A")), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,8 +4,8 @@ from datetime import datetime
 from .trace_storage import TraceStorage
 
 class ExecutionLogger:
-    def __init__(self):
-        self.storage = TraceStorage()
+    def __init__(self, storage=None):
+        self.storage = storage or TraceStorage()
 
     def log(self, agent_id, task_name, action, result, metadata=None, level="INFO", action_type="operation"):
         trace_id = str(uuid.uuid4())
@@ -29,11 +29,12 @@ class ExecutionLogger:
     def time_action(self, agent_id, task_name, action_label, func, *args, **kwargs):
         """
         Automatically logs the start/end time, duration, and result of a function.
+        Tracing only adds an in-memory append; persistence happens off-thread.
         """
-        start = time.time()
+        start = time.perf_counter()
         try:
             result = func(*args, **kwargs)
-            duration = round(time.time() - start, 4)
+            duration = round(time.perf_counter() - start, 4)
             self.log(
                 agent_id=agent_id,
                 task_name=task_name,
@@ -44,7 +45,7 @@ class ExecutionLogger:
             )
             return result
         except Exception as e:
-            duration = round(time.time() - start, 4)
+            duration = round(time.perf_counter() - start, 4)
             self.log(
                 agent_id=agent_id,
                 task_name=task_name,
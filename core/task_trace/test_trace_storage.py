@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from core.task_trace.execution_logger import ExecutionLogger
+from core.task_trace.trace_storage import TraceStorage
+
+
+def test_ring_buffer_evicts_oldest_and_keeps_indexes_consistent():
+    storage = TraceStorage(capacity=3)
+    for i in range(5):
+        storage.store_trace({"trace_id": f"t{i}", "agent_id": f"agent-{i % 2}"})
+
+    assert [t["trace_id"] for t in storage.get_all_traces()] == ["t2", "t3", "t4"]
+    assert storage.get_trace_by_id("t0") is None
+    assert [t["trace_id"] for t in storage.get_trace_by_agent("agent-0")] == ["t2", "t4"]
+
+
+def test_batched_segments_survive_reload_with_deletes(tmp_path):
+    storage = TraceStorage(str(tmp_path), flush_interval=60)
+    logger = ExecutionLogger(storage)
+    assert logger.time_action("agent-1", "task", "add", lambda a, b: a + b, 2, 3) == 5
+    trace_id = logger.log("agent-2", "task", "noop", "success")
+    storage.delete_trace(trace_id)
+    storage.close()
+
+    reloaded = TraceStorage(str(tmp_path))
+    traces = reloaded.get_all_traces()
+    assert len(traces) == 1
+    assert traces[0]["metadata"]["duration_sec"] >= 0
+    assert reloaded.get_trace(trace_id) is None
+    reloaded.close()
+
+
+def test_torn_final_record_is_truncated_on_load(tmp_path):
+    storage = TraceStorage(str(tmp_path), flush_interval=60)
+    storage.store_trace({"trace_id": "t1", "agent_id": "a"})
+    storage.close()
+    segment = next(tmp_path.iterdir())
+    complete = segment.read_bytes()
+    with open(segment, "ab") as f:
+        f.write(b'{"trace_id": "t2", "age')
+
+    reloaded = TraceStorage(str(tmp_path))
+    assert [t["trace_id"] for t in reloaded.get_all_traces()] == ["t1"]
+    assert segment.read_bytes() == complete
+    reloaded.close()
+
+
+def test_delete_of_evicted_trace_survives_reload(tmp_path):
+    storage = TraceStorage(str(tmp_path), capacity=1, flush_interval=60)
+    storage.store_trace({"trace_id": "t1", "agent_id": "a"})
+    storage.store_trace({"trace_id": "t2", "agent_id": "a"})
+    assert storage.delete_trace("t1") is False  # only on disk
+    storage.close()
+
+    reloaded = TraceStorage(str(tmp_path), capacity=10)
+    assert [t["trace_id"] for t in reloaded.get_all_traces()] == ["t2"]
+    reloaded.close()
+
+
+def test_legacy_trace_file_is_migrated(tmp_path):
+    path = tmp_path / "traces.json"
+    path.write_text(json.dumps([{"trace_id": "t1", "agent_id": "a"}, {"trace_id": "t2", "agent_id": "b"}]))
+
+    storage = TraceStorage(str(path))
+    assert [t["trace_id"] for t in storage.get_all_traces()] == ["t1", "t2"]
+    storage.close()
+    assert path.is_dir() and not (tmp_path / "traces.json.migrating").exists()
+
+    other = tmp_path / "notes.txt"
+    other.write_text("not traces")
+    with pytest.raises(ValueError, match="must be a directory"):
+        TraceStorage(str(other))
+    assert other.read_text() == "not traces"
@@ -1,49 +1,255 @@
+import atexit
 import json
 import os
-from typing import List, Dict, Optional
+import threading
+from collections import deque
+from typing import Deque, List, Dict, Optional
+
+SEGMENT_PREFIX = "traces-"
+SEGMENT_SUFFIX = ".jsonl"
+LEGACY_SUFFIX = ".migrating"
+
 
 class TraceStorage:
-    def __init__(self, storage_path: str = None):
-        self._traces: List[Dict] = []
+    """
+    Trace sink with an in-memory ring buffer and batched on-disk persistence.
+
+    ``store_trace`` only appends to the ring buffer, updates the trace_id and
+    per-agent indexes and queues the record for persistence, so it costs a
+    few microseconds. When ``storage_path`` is set it names a directory of
+    JSONL segments; a background thread appends queued traces in batches
+    every ``flush_interval`` seconds (or as soon as ``batch_size`` are
+    pending) and rolls to a new segment past ``segment_max_bytes``. The ring
+    buffer keeps the newest ``capacity`` traces; older ones stay on disk.
+    A ``storage_path`` that is still a file from the old single-JSON-array
+    format is migrated into the first segment on startup.
+    """
+
+    def __init__(
+        self,
+        storage_path: str = None,
+        capacity: int = 100_000,
+        flush_interval: float = 1.0,
+        batch_size: int = 5000,
+        segment_max_bytes: int = 32 * 1024 * 1024,
+    ):
         self.storage_path = storage_path
-        if storage_path and os.path.exists(storage_path):
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.segment_max_bytes = segment_max_bytes
+
+        self._traces: Deque[Dict] = deque()
+        self._by_id: Dict[str, Dict] = {}
+        self._by_agent: Dict[str, Deque[str]] = {}
+        self._pending: List[Dict] = []
+        self.lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+        if storage_path:
+            self._migrate_legacy_file()
+            os.makedirs(storage_path, exist_ok=True)
             self.load_from_disk()
+            self._flusher = threading.Thread(target=self._flush_loop, name="TraceStorageFlusher", daemon=True)
+            self._flusher.start()
+            atexit.register(self.close)
 
     def store_trace(self, trace: Dict):
-        self._traces.append(trace)
-        self._autosave()
+        with self.lock:
+            self._append(trace)
+            if self.storage_path:
+                self._pending.append(trace)
+                if len(self._pending) >= self.batch_size:
+                    self._wakeup.set()
 
     def get_trace_by_agent(self, agent_id: str) -> List[Dict]:
-        return [t for t in self._traces if t.get('agent_id') == agent_id]
+        with self.lock:
+            return [self._by_id[trace_id] for trace_id in self._by_agent.get(agent_id, ())]
 
     def get_trace_by_id(self, trace_id: str) -> Optional[Dict]:
-        return next((t for t in self._traces if t.get('trace_id') == trace_id), None)
+        return self._by_id.get(trace_id)
+
+    get_trace = get_trace_by_id
 
     def get_all_traces(self) -> List[Dict]:
-        return self._traces
+        with self.lock:
+            return list(self._traces)
 
     def delete_trace(self, trace_id: str) -> bool:
-        original_len = len(self._traces)
-        self._traces = [t for t in self._traces if t.get('trace_id') != trace_id]
-        if len(self._traces) < original_len:
-            self._autosave()
-            return True
-        return False
+        """
+        :return: Whether the trace was in the ring buffer. With persistence a
+            tombstone is written either way, so traces that were already
+            evicted to disk stay deleted after a reload too.
+        """
+        with self.lock:
+            if self.storage_path:
+                self._pending.append({"deleted": trace_id})
+            trace = self._by_id.pop(trace_id, None)
+            if trace is None:
+                return False
+            self._traces.remove(trace)
+            agent_ids = self._by_agent.get(trace.get("agent_id"))
+            if agent_ids is not None:
+                agent_ids.remove(trace_id)
+        return True
 
     def clear_all(self):
-        self._traces = []
-        self._autosave()
+        with self._io_lock, self.lock:
+            self._traces.clear()
+            self._by_id.clear()
+            self._by_agent.clear()
+            self._pending = []
+            for segment in self._segments():
+                os.remove(segment)
 
     def save_to_disk(self):
-        if self.storage_path:
-            with open(self.storage_path, 'w') as f:
-                json.dump(self._traces, f, indent=2)
+        """
+        Synchronously writes every pending trace.
+        """
+        if not self.storage_path:
+            return
+        with self.lock:
+            batch, self._pending = self._pending, []
+        self._write_batch(batch)
 
     def load_from_disk(self):
-        if self.storage_path and os.path.exists(self.storage_path):
-            with open(self.storage_path, 'r') as f:
-                self._traces = json.load(f)
+        """
+        Reloads the newest ``capacity`` traces from the segment files.
+        """
+        if not (self.storage_path and os.path.isdir(self.storage_path)):
+            return
+        loaded: List[Dict] = []
+        deleted = set()
+        for segment in reversed(self._segments()):
+            for record in reversed(self._read_segment(segment)):
+                if "deleted" in record:
+                    deleted.add(record["deleted"])
+                elif record.get("trace_id") not in deleted:
+                    loaded.append(record)
+            if len(loaded) >= self.capacity:
+                break
+
+        with self.lock:
+            self._traces.clear()
+            self._by_id.clear()
+            self._by_agent.clear()
+            for trace in reversed(loaded[:self.capacity]):
+                self._append(trace)
+
+    def close(self):
+        """
+        Stops the background flusher after writing everything still pending.
+        """
+        if self._flusher is None:
+            return
+        self._stopped.set()
+        self._wakeup.set()
+        self._flusher.join()
+        self._flusher = None
+        self.save_to_disk()
+
+    def _append(self, trace: Dict):
+        """
+        Adds a trace to the ring buffer and indexes. Caller must hold the lock.
+        """
+        if len(self._traces) >= self.capacity:
+            evicted = self._traces.popleft()
+            self._by_id.pop(evicted.get("trace_id"), None)
+            agent_ids = self._by_agent.get(evicted.get("agent_id"))
+            if agent_ids:
+                agent_ids.popleft()
+                if not agent_ids:
+                    del self._by_agent[evicted.get("agent_id")]
+
+        self._traces.append(trace)
+        trace_id = trace.get("trace_id")
+        self._by_id[trace_id] = trace
+        self._by_agent.setdefault(trace.get("agent_id"), deque()).append(trace_id)
+
+    def _flush_loop(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.save_to_disk()
+            except Exception as e:
+                print(f"[TraceStorage] Failed to flush traces: {e}")
+
+    def _read_segment(self, path: str) -> List[Dict]:
+        """
+        Reads one segment, truncating a torn final record left by an interrupted write.
+        """
+        records: List[Dict] = []
+        valid_bytes = 0
+        with self._io_lock:
+            with open(path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    if line.strip():
+                        try:
+                            records.append(json.loads(line))
+                        except json.JSONDecodeError:
+                            break
+                    valid_bytes += len(line)
+            if valid_bytes < os.path.getsize(path):
+                print(f"[TraceStorage] Discarding torn record at end of {path}")
+                with open(path, "r+b") as f:
+                    f.truncate(valid_bytes)
+        return records
+
+    def _migrate_legacy_file(self):
+        """
+        Converts a ``storage_path`` file holding the old JSON array of traces
+        into a segment directory at the same path. The file is parked under
+        ``<storage_path>.migrating`` until its segment is written, so an
+        interrupted migration is redone on the next start.
+        """
+        legacy_path = self.storage_path + LEGACY_SUFFIX
+        source = self.storage_path if os.path.isfile(self.storage_path) else legacy_path
+        if not os.path.isfile(source):
+            return
+
+        try:
+            with open(source, "r", encoding="utf-8") as f:
+                traces = json.load(f)
+            if not isinstance(traces, list):
+                raise ValueError("expected a JSON array of traces")
+        except ValueError as e:
+            raise ValueError(
+                f"TraceStorage storage_path must be a directory of trace segments; "
+                f"{source} is a file that is not a legacy trace list ({e})"
+            ) from e
+
+        if source == self.storage_path:
+            os.replace(self.storage_path, legacy_path)
+        os.makedirs(self.storage_path, exist_ok=True)
+        for segment in self._segments():
+            os.remove(segment)  # left by an interrupted migration
+        self._write_batch(traces)
+        os.remove(legacy_path)
+
+    def _segments(self) -> List[str]:
+        if not (self.storage_path and os.path.isdir(self.storage_path)):
+            return []
+        return sorted(
+            os.path.join(self.storage_path, name)
+            for name in os.listdir(self.storage_path)
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+        )
 
-    def _autosave(self):
-        if self.storage_path:
-            self.save_to_disk()
+    def _write_batch(self, batch: List[Dict]):
+        if not batch:
+            return
+        data = "".join(json.dumps(record, default=str) + "\n" for record in batch)
+        with self._io_lock:
+            segments = self._segments()
+            path = segments[-1] if segments else None
+            if path is None or os.path.getsize(path) >= self.segment_max_bytes:
+                number = int(os.path.basename(path)[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]) + 1 if path else 1
+                path = os.path.join(self.storage_path, f"{SEGMENT_PREFIX}{number:06d}{SEGMENT_SUFFIX}")
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(data)
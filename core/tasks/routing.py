@@ -0,0 +1,277 @@
+# core/tasks/routing.py
+
+import bisect
+import hashlib
+import math
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+class InFlightTracker:
+    """
+    Thread-safe per-agent count of dispatched-but-unfinished tasks.
+
+    Dispatchers call ``acquire`` when they hand a task to an agent and
+    ``release`` when it finishes; routing strategies read ``outstanding``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._outstanding: Dict[str, int] = {}
+
+    def acquire(self, agent_id: str) -> int:
+        with self._lock:
+            count = self._outstanding.get(agent_id, 0) + 1
+            self._outstanding[agent_id] = count
+            return count
+
+    def release(self, agent_id: str) -> int:
+        with self._lock:
+            count = max(0, self._outstanding.get(agent_id, 0) - 1)
+            if count:
+                self._outstanding[agent_id] = count
+            else:
+                self._outstanding.pop(agent_id, None)
+            return count
+
+    def outstanding(self, agent_id: str) -> int:
+        return self._outstanding.get(agent_id, 0)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._outstanding)
+
+
+class RoutingStrategy:
+    """
+    Picks one agent id out of a non-empty candidate list.
+    """
+
+    name = "base"
+
+    def choose(self, candidates: Sequence[str], inflight: InFlightTracker, key: Optional[str] = None) -> str:
+        raise NotImplementedError
+
+
+class FirstCandidate(RoutingStrategy):
+    """The original behaviour: always the first registered candidate."""
+
+    name = "first"
+
+    def choose(self, candidates, inflight, key=None):
+        return candidates[0]
+
+
+class LeastOutstanding(RoutingStrategy):
+    """
+    Candidate with the fewest in-flight tasks; ties rotate so equally loaded
+    agents share work instead of the first one absorbing every burst.
+    """
+
+    name = "least_outstanding"
+
+    def __init__(self):
+        self._turn = 0
+
+    def choose(self, candidates, inflight, key=None):
+        self._turn += 1
+        count = len(candidates)
+        best, best_load = None, None
+        for offset in range(count):
+            agent_id = candidates[(self._turn + offset) % count]
+            load = inflight.outstanding(agent_id)
+            if best_load is None or load < best_load:
+                best, best_load = agent_id, load
+                if load == 0:
+                    break
+        return best
+
+
+class PowerOfTwoChoices(RoutingStrategy):
+    """
+    Samples two random candidates and keeps the less loaded one: O(1) per
+    decision and close to least-outstanding balance without scanning the pool.
+    """
+
+    name = "power_of_two"
+
+    def __init__(self, seed: Optional[int] = None):
+        self._rng = random.Random(seed)
+
+    def choose(self, candidates, inflight, key=None):
+        if len(candidates) == 1:
+            return candidates[0]
+        first, second = self._rng.sample(candidates, 2)
+        return first if inflight.outstanding(first) <= inflight.outstanding(second) else second
+
+
+class ConsistentHash(RoutingStrategy):
+    """
+    Maps a routing key (e.g. a session or dataset id) to the same agent for
+    cache affinity, moving only ~1/N of the keys when the pool changes.
+
+    With ``load_factor`` set, an agent already holding more than
+    ``ceil(load_factor * mean)`` in-flight tasks is skipped in favour of the
+    next one on the ring (consistent hashing with bounded loads). Tasks
+    without a key fall back to least-outstanding.
+    """
+
+    name = "consistent_hash"
+
+    def __init__(self, replicas: int = 100, load_factor: Optional[float] = 1.25):
+        self.replicas = replicas
+        self.load_factor = load_factor
+        self._rings: Dict[Tuple[str, ...], Tuple[List[int], List[str]]] = {}
+        self._fallback = LeastOutstanding()
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+    def _ring(self, candidates: Sequence[str]) -> Tuple[List[int], List[str]]:
+        members = tuple(sorted(set(candidates)))
+        ring = self._rings.get(members)
+        if ring is None:
+            points = sorted((self._hash(f"{agent_id}#{i}"), agent_id) for agent_id in members for i in range(self.replicas))
+            ring = ([point for point, _ in points], [agent_id for _, agent_id in points])
+            if len(self._rings) >= 64:
+                self._rings.clear()
+            self._rings[members] = ring
+        return ring
+
+    def choose(self, candidates, inflight, key=None):
+        if key is None:
+            return self._fallback.choose(candidates, inflight)
+        points, owners = self._ring(candidates)
+        start = bisect.bisect(points, self._hash(str(key))) % len(points)
+        if not self.load_factor:
+            return owners[start]
+
+        total = sum(inflight.outstanding(agent_id) for agent_id in set(candidates)) + 1
+        limit = math.ceil(self.load_factor * total / len(set(candidates)))
+        seen = set()
+        for step in range(len(points)):
+            agent_id = owners[(start + step) % len(points)]
+            if agent_id in seen:
+                continue
+            if inflight.outstanding(agent_id) < limit:
+                return agent_id
+            seen.add(agent_id)
+        return owners[start]
+
+
+STRATEGIES = {
+    cls.name: cls for cls in (FirstCandidate, LeastOutstanding, PowerOfTwoChoices, ConsistentHash)
+}
+
+# Shared by every dispatcher so routing sees the load they jointly create.
+default_inflight = InFlightTracker()
+
+
+class RoutingEngine:
+    """
+    Load-aware agent selection with pluggable strategies.
+
+    ``select`` picks an agent from candidate ids with the configured (or a
+    per-call) strategy; ``dispatched`` brackets the agent's work so the
+    in-flight counters stay accurate. Per-strategy decision latency, task
+    latency and assignment imbalance are reported by ``get_metrics``.
+    """
+
+    def __init__(self, strategy: str = "least_outstanding", inflight: Optional[InFlightTracker] = None):
+        self.inflight = inflight or default_inflight
+        self.strategies: Dict[str, RoutingStrategy] = {name: cls() for name, cls in STRATEGIES.items()}
+        if strategy not in self.strategies:
+            raise ValueError(f"Unknown routing strategy: {strategy}")
+        self.strategy = strategy
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Dict] = {}
+
+    def register_strategy(self, strategy: RoutingStrategy) -> None:
+        self.strategies[strategy.name] = strategy
+
+    def select(self, candidates: Iterable[str], key: Optional[str] = None, strategy: Optional[str] = None) -> Optional[str]:
+        """
+        Args:
+            candidates: Agent ids able to take the task.
+            key (str, optional): Affinity key used by hashing strategies.
+            strategy (str, optional): Overrides the engine's default strategy.
+
+        Returns:
+            Optional[str]: The chosen agent id, or None without candidates.
+        """
+        candidates = list(candidates)
+        if not candidates:
+            return None
+        name = strategy or self.strategy
+        started = time.perf_counter()
+        agent_id = self.strategies[name].choose(candidates, self.inflight, key)
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            metrics = self._metrics.get(name)
+            if metrics is None:
+                metrics = self._metrics[name] = {
+                    "decisions": 0, "decision_time": 0.0, "max_decision_time": 0.0,
+                    "completed": 0, "task_time": 0.0, "assigned": {},
+                }
+            metrics["decisions"] += 1
+            metrics["decision_time"] += elapsed
+            metrics["max_decision_time"] = max(metrics["max_decision_time"], elapsed)
+            metrics["assigned"][agent_id] = metrics["assigned"].get(agent_id, 0) + 1
+        return agent_id
+
+    def acquire(self, agent_id: str) -> None:
+        self.inflight.acquire(agent_id)
+
+    def release(self, agent_id: str, duration: Optional[float] = None, strategy: Optional[str] = None) -> None:
+        self.inflight.release(agent_id)
+        if duration is None:
+            return
+        with self._lock:
+            metrics = self._metrics.get(strategy or self.strategy)
+            if metrics is not None:
+                metrics["completed"] += 1
+                metrics["task_time"] += duration
+
+    @contextmanager
+    def dispatched(self, agent_id: str, strategy: Optional[str] = None):
+        """Counts ``agent_id`` as busy with one more task for the duration of the block."""
+        self.acquire(agent_id)
+        started = time.perf_counter()
+        try:
+            yield agent_id
+        finally:
+            self.release(agent_id, time.perf_counter() - started, strategy)
+
+    def get_metrics(self) -> Dict[str, Dict]:
+        """
+        Returns:
+            Dict[str, Dict]: Per strategy: decision count, mean/max decision
+            latency (µs), completed tasks and mean task latency (ms), and the
+            assignment imbalance (max / mean tasks per chosen agent; 1.0 is
+            perfectly even). ``"inflight"`` holds the current counters.
+        """
+        with self._lock:
+            report = {}
+            for name, metrics in self._metrics.items():
+                assigned = metrics["assigned"]
+                mean = sum(assigned.values()) / len(assigned) if assigned else 0.0
+                report[name] = {
+                    "decisions": metrics["decisions"],
+                    "avg_decision_us": round(metrics["decision_time"] / metrics["decisions"] * 1e6, 3),
+                    "max_decision_us": round(metrics["max_decision_time"] * 1e6, 3),
+                    "completed": metrics["completed"],
+                    "avg_task_ms": round(metrics["task_time"] / metrics["completed"] * 1e3, 3) if metrics["completed"] else 0.0,
+                    "imbalance": round(max(assigned.values()) / mean, 3) if mean else 0.0,
+                    "assigned": dict(assigned),
+                }
+        report["inflight"] = self.inflight.snapshot()
+        return report
+
+    def reset_metrics(self) -> None:
+        with self._lock:
+            self._metrics = {}
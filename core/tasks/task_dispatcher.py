@@ -2,7 +2,6 @@
 
 import logging
 from core.tasks.task_router import TaskRouter
-from core.agent.agent_registry import agent_registry
 
 logging.basicConfig(
     filename='core/logs/execution.log',
@@ -11,23 +10,24 @@ logging.basicConfig(
 )
 
 class TaskDispatcher:
-    def __init__(self):
-        self.router = TaskRouter()
+    def __init__(self, strategy: str = "least_outstanding"):
+        self.router = TaskRouter(strategy)
 
     def dispatch(self, task: dict):
         try:
-            # Route task to best agent (by ID)
-            agent_id = self.router.route_task(task)
-            if not agent_id:
+            # Route task to the least loaded capable agent
+            agent = self.router.route_task(task)
+            if not agent:
                 logging.warning(f"No suitable agent found for task '{task['name']}'")
                 return None
 
-            # Lookup agent object (assuming registry holds live objects or proxies)
-            agent = agent_registry.agents.get(agent_id)
-            if not agent or not hasattr(agent, 'execute'):
-                raise ValueError(f"Agent '{agent_id}' not found or does not implement 'execute()'")
+            agent_id = agent.agent_id
+            if not hasattr(agent, 'execute'):
+                raise ValueError(f"Agent '{agent_id}' does not implement 'execute()'")
 
-            result = agent.execute(task)
+            # Count the task as in flight so concurrent routing sees this agent's load
+            with self.router.engine.dispatched(agent_id, task.get("routing_strategy")):
+                result = agent.execute(task)
 
             logging.info(
                 f"Task '{task['name']}' executed by {agent_id} with result: {result}"
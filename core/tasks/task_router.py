@@ -2,24 +2,41 @@
 
 import logging
 from core.agents.agent_registry import AgentRegistry
+from core.tasks.routing import RoutingEngine
 
 class TaskRouter:
-    def __init__(self):
+    """
+    Routes tasks to agents with the required skill through a load-aware
+    RoutingEngine (``least_outstanding``, ``power_of_two``,
+    ``consistent_hash`` or the legacy ``first``). Tasks may carry an
+    ``affinity_key`` (used by consistent hashing) and a per-task
+    ``routing_strategy`` override.
+    """
+
+    def __init__(self, strategy: str = "least_outstanding", engine: RoutingEngine = None):
         self.registry = AgentRegistry()
+        self.engine = engine or RoutingEngine(strategy)
 
     def route_task(self, task):
         task_type = task.get("type")
         if not task_type:
             raise ValueError("Task must include a 'type' field.")
 
-        candidates = self.registry.get_agents_by_skill(task_type)
+        candidates = {agent.agent_id: agent for agent in self.registry.get_agents_by_skill(task_type)}
 
         if not candidates:
             logging.warning(f"[Router] No available agents for task type: {task_type}")
             return None
 
-        # TODO: Could use least-loaded, round-robin, or predictive here
-        selected_agent = candidates[0]
+        agent_id = self.engine.select(
+            list(candidates),
+            key=task.get("affinity_key"),
+            strategy=task.get("routing_strategy"),
+        )
+        selected_agent = candidates[agent_id]
 
         logging.info(f"[Router] Task '{task['name']}' routed to agent: {selected_agent.agent_id}")
         return selected_agent
+
+    def get_metrics(self):
+        return self.engine.get_metrics()
@@ -0,0 +1,62 @@
+# File: /core/tasks/tests/test_routing.py
+
+from core.tasks.routing import ConsistentHash, InFlightTracker, RoutingEngine
+
+AGENTS = [f"agent-{i}" for i in range(8)]
+
+
+def test_least_outstanding_spreads_concurrent_work():
+    engine = RoutingEngine("least_outstanding", inflight=InFlightTracker())
+    chosen = []
+    for _ in range(len(AGENTS)):
+        agent_id = engine.select(AGENTS)
+        engine.acquire(agent_id)
+        chosen.append(agent_id)
+    assert sorted(chosen) == sorted(AGENTS)
+
+    engine.release("agent-3")
+    assert engine.select(AGENTS) == "agent-3"
+
+
+def test_power_of_two_keeps_imbalance_low():
+    engine = RoutingEngine("power_of_two", inflight=InFlightTracker())
+    for _ in range(2000):
+        agent_id = engine.select(AGENTS)
+        engine.acquire(agent_id)
+        if engine.inflight.outstanding(agent_id) > 2:
+            engine.release(agent_id, duration=0.001)
+
+    metrics = engine.get_metrics()["power_of_two"]
+    assert metrics["decisions"] == 2000
+    assert metrics["imbalance"] < 1.2
+    assert max(engine.inflight.snapshot().values()) <= 3
+
+
+def test_consistent_hash_is_sticky_and_moves_few_keys():
+    inflight = InFlightTracker()
+    strategy = ConsistentHash(load_factor=None)
+    keys = [f"session-{i}" for i in range(1000)]
+    before = {key: strategy.choose(AGENTS, inflight, key) for key in keys}
+    assert before == {key: strategy.choose(AGENTS, inflight, key) for key in keys}
+
+    after = {key: strategy.choose(AGENTS[:-1], inflight, key) for key in keys}
+    moved = sum(before[key] != after[key] for key in keys)
+    assert moved == sum(owner == AGENTS[-1] for owner in before.values())
+
+
+def test_consistent_hash_bounded_load_skips_hot_agent():
+    inflight = InFlightTracker()
+    strategy = ConsistentHash(load_factor=1.25)
+    home = strategy.choose(AGENTS, inflight, "hot-key")
+    for _ in range(5):
+        inflight.acquire(home)
+    assert strategy.choose(AGENTS, inflight, "hot-key") != home
+
+
+def test_dispatched_context_tracks_inflight_and_latency():
+    engine = RoutingEngine(inflight=InFlightTracker())
+    agent_id = engine.select(AGENTS)
+    with engine.dispatched(agent_id):
+        assert engine.inflight.outstanding(agent_id) == 1
+    assert engine.inflight.outstanding(agent_id) == 0
+    assert engine.get_metrics()["least_outstanding"]["completed"] == 1
@@ -0,0 +1,145 @@
+# File: /core/tests/test_task_manager.py
+
+import asyncio
+import importlib
+import json
+import sys
+
+import pytest
+
+from core.task_manager import TaskManager
+
+PROBE_PLUGIN = """
+import asyncio
+
+VERSION = {version}
+state = {{"active": 0, "peak": 0}}
+
+
+async def work(args):
+    state["active"] += 1
+    state["peak"] = max(state["peak"], state["active"])
+    await asyncio.sleep(0.01)
+    state["active"] -= 1
+    return args
+
+
+async def version(args):
+    return VERSION
+
+
+async def block(args):
+    await asyncio.sleep(3600)
+
+
+def register():
+    return {{"probe_work": work, "probe_version": version, "probe_block": block}}
+"""
+
+
+def make_manager(tmp_path, **kwargs):
+    return TaskManager(task_file=str(tmp_path / "tasks" / "task_queue.json"), **kwargs)
+
+
+@pytest.fixture
+def probe_plugin(tmp_path, monkeypatch):
+    """A plugins.probe_plugin module on disk; ``plugins`` is a namespace package."""
+    path = tmp_path / "plugin_src" / "plugins" / "probe_plugin.py"
+    path.parent.mkdir(parents=True)
+    path.write_text(PROBE_PLUGIN.format(version=1))
+    monkeypatch.syspath_prepend(str(tmp_path / "plugin_src"))
+    monkeypatch.setattr(sys, "dont_write_bytecode", True)
+    yield path
+    sys.modules.pop("plugins.probe_plugin", None)
+
+
+def test_wal_replay_restores_transitions(tmp_path):
+    manager = make_manager(tmp_path)
+    first = manager.add_task("echo_a")
+    second = manager.add_task("echo_b", priority=5)
+    manager.cancel_task(first["id"])
+    manager.close()
+
+    reloaded = make_manager(tmp_path)
+    assert {t["id"]: t["status"] for t in reloaded.queue} == {first["id"]: "cancelled", second["id"]: "pending"}
+    assert reloaded.get_queue()[0]["id"] == second["id"]
+    assert reloaded.add_task("echo_c")["id"] == 3
+
+
+def test_compaction_keeps_the_transition_that_triggered_it(tmp_path):
+    manager = make_manager(tmp_path, compact_every=3)
+    task = manager.add_task("echo_a")
+    manager.add_task("echo_b")
+    manager.cancel_task(task["id"])  # third record: compacts
+    manager.close()
+
+    with open(manager.task_file) as f:
+        assert json.load(f)[0]["status"] == "cancelled"
+    with open(manager.wal_file) as f:
+        assert f.read() == ""
+    assert make_manager(tmp_path, compact_every=3).tasks_by_id[task["id"]]["status"] == "cancelled"
+
+
+def test_torn_wal_tail_and_interrupted_tasks(tmp_path):
+    manager = make_manager(tmp_path)
+    task = manager.add_task("echo_a")
+    manager._update_task(task, status="running")
+    manager.close()
+    with open(manager.wal_file, "a") as f:
+        f.write('{"op": "update", "id": 1, "fie')
+
+    reloaded = make_manager(tmp_path)
+    assert reloaded.tasks_by_id[task["id"]]["status"] == "pending"
+    with open(reloaded.wal_file) as f:
+        assert all(line.endswith("}") for line in f.read().splitlines())
+
+
+def test_run_all_honours_concurrency_limits(tmp_path, probe_plugin):
+    manager = make_manager(tmp_path, max_concurrency=2)
+    for i in range(6):
+        manager.add_task("probe_work", args=[i])
+    asyncio.run(manager.run_all())
+
+    state = sys.modules["plugins.probe_plugin"].state
+    assert state["peak"] == 2
+    assert [t["result"] for t in manager.queue] == [[i] for i in range(6)]
+
+    state["peak"] = 0
+    capped = make_manager(tmp_path / "capped", max_concurrency=4, command_limits={"probe_work": 1})
+    for i in range(4):
+        capped.add_task("probe_work", args=[i])
+    asyncio.run(capped.run_all())
+    assert state["peak"] == 1
+    assert all(t["status"] == "complete" for t in capped.queue)
+
+
+def test_handler_is_reloaded_after_module_changes(tmp_path, probe_plugin):
+    manager = make_manager(tmp_path)
+    first = manager.get_handler("probe_version")
+    assert manager.get_handler("probe_version") is first  # cached
+
+    probe_plugin.write_text(PROBE_PLUGIN.format(version=2))
+    importlib.reload(sys.modules["plugins.probe_plugin"])
+    assert asyncio.run(manager.get_handler("probe_version")([])) == 2
+
+    probe_plugin.write_text(PROBE_PLUGIN.format(version=3))
+    manager.reload_plugin("probe")
+    assert asyncio.run(manager.get_handler("probe_version")([])) == 3
+
+
+def test_cancelling_a_running_task_marks_it_cancelled(tmp_path, probe_plugin):
+    manager = make_manager(tmp_path, max_concurrency=2)
+    blocked = manager.add_task("probe_block")
+    other = manager.add_task("probe_work", args=["ok"])
+
+    async def scenario():
+        runner = asyncio.ensure_future(manager.run_all())
+        while blocked["id"] not in manager._running:
+            await asyncio.sleep(0.001)
+        manager.cancel_task(blocked["id"])
+        await asyncio.wait_for(runner, 1)
+
+    asyncio.run(scenario())
+    assert blocked["status"] == "cancelled" and "error" not in blocked
+    assert other["status"] == "complete"
+    assert make_manager(tmp_path).tasks_by_id[blocked["id"]]["status"] == "cancelled"
@@ -0,0 +1,205 @@
+import argparse
+import json
+import os
+import resource
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from core.sandbox.worker_pool import SandboxUnavailable, SandboxWorkerPool
+from plugin_eval.sandbox_runner import load_plugin_module
+from plugin_eval.test_suite import PluginTestSuite
+from plugin_eval.trust_scorecard import TrustScorecard
+from plugins.plugin_scanner import shared_scanner
+
+REPORT_VERSION = 1
+APPROVAL_SCORE = 80
+RESULT_PREVIEW_CHARS = 200
+
+def _run_plugin_test(path, func, args):
+    """
+    Runs one test vector inside a sandbox worker and measures it.
+
+    The plugin module is loaded once per worker and plugin version, so later
+    tests of the same plugin on this worker share its module state, as they
+    do in PluginTestSuite. ``max_rss_kb`` is the worker's peak resident set
+    size once the test has finished.
+    """
+    try:
+        plugin_func = getattr(load_plugin_module(path), func)
+    except Exception as e:
+        return {"status": "load_failed", "result": f"{type(e).__name__}: {e}",
+                "wall_ms": 0.0, "cpu_ms": 0.0, "max_rss_kb": _max_rss_kb()}
+
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    try:
+        status, result = "success", repr(plugin_func(*args))[:RESULT_PREVIEW_CHARS]
+    except Exception as e:
+        status, result = "error", f"{type(e).__name__}: {e}"
+    return {
+        "status": status,
+        "result": result,
+        "wall_ms": round((time.perf_counter() - wall_start) * 1000, 3),
+        "cpu_ms": round((time.process_time() - cpu_start) * 1000, 3),
+        "max_rss_kb": _max_rss_kb(),
+    }
+
+
+def _max_rss_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class BatchEvaluator:
+    """
+    Evaluates a set of plugins in parallel and scores them in one batch.
+
+    Every plugin is audited through the shared scanner (uncached verdicts are
+    computed in a process pool); the test vectors of clean plugins are then
+    spread over a SandboxWorkerPool, so tests of one plugin, and of different
+    plugins, run concurrently, each with its own timeout. Trust scores are
+    committed with a single TrustScorecard write and a JSON report is
+    returned that can be diffed between releases.
+    """
+
+    def __init__(self, tests=None, workers=None, test_timeout=5, cpu_seconds=None, max_memory_mb=None,
+                 scanner=None, scorecard=None):
+        """
+        Args:
+            tests (list, optional): Test vectors ``{"func", "args"}``; defaults to PluginTestSuite's.
+            workers (int, optional): Sandbox worker processes (and concurrent tests).
+            test_timeout (float): Wall-clock seconds allowed per test.
+            cpu_seconds (int, optional): CPU time allowed per test (RLIMIT_CPU).
+            max_memory_mb (int, optional): Address-space limit per worker (RLIMIT_AS).
+            scanner (PluginScanner, optional): Defaults to the shared scanner.
+            scorecard (TrustScorecard, optional): Defaults to plugin_eval/trusted_plugins.json.
+        """
+        self.tests = tests or PluginTestSuite.DEFAULT_TESTS
+        self.workers = workers or os.cpu_count() or 1
+        self.test_timeout = test_timeout
+        self.cpu_seconds = cpu_seconds
+        self.max_memory_mb = max_memory_mb
+        self.scanner = scanner or shared_scanner()
+        self.scorecard = scorecard or TrustScorecard()
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = SandboxWorkerPool(size=self.workers, cpu_seconds=self.cpu_seconds,
+                                           max_memory_mb=self.max_memory_mb,
+                                           preload=("plugin_eval.batch_evaluator",))
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def evaluate_directory(self, plugin_dir, recursive=False):
+        if recursive:
+            paths = [os.path.join(root, name) for root, _, names in os.walk(plugin_dir)
+                     for name in names if name.endswith(".py")]
+        else:
+            paths = [os.path.join(plugin_dir, name) for name in os.listdir(plugin_dir) if name.endswith(".py")]
+        return self.evaluate(sorted(paths))
+
+    def evaluate(self, paths):
+        """
+        Returns:
+            dict: The evaluation report (see write_report).
+        """
+        started = time.perf_counter()
+        paths = list(paths)
+        verdicts = self.scanner.scan_paths(paths)
+
+        jobs = [(path, test) for path in paths if not verdicts[path] for test in self.tests]
+        if jobs:
+            self._get_pool()  # started here, not concurrently by the test threads
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            outcomes = list(executor.map(lambda job: self._run_test(*job), jobs))
+        results = {path: [] for path in paths if not verdicts[path]}
+        for (path, _), outcome in zip(jobs, outcomes):
+            results[path].append(outcome)
+
+        scores = self.scorecard.score_plugins((path, results.get(path, []), None) for path in paths)
+
+        plugins = []
+        for path in paths:
+            score, plugin_id = scores[path]
+            plugins.append({
+                "path": path,
+                "plugin_id": plugin_id,
+                "status": "audit_failed" if verdicts[path] else "evaluated",
+                "findings": verdicts[path],
+                "score": score,
+                "approved": score >= APPROVAL_SCORE,
+                "tests": results.get(path, []),
+            })
+        return {
+            "report_version": REPORT_VERSION,
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "config": {"tests": self.tests, "workers": self.workers, "test_timeout": self.test_timeout,
+                       "cpu_seconds": self.cpu_seconds, "max_memory_mb": self.max_memory_mb},
+            "summary": self._summarize(plugins, time.perf_counter() - started),
+            "plugins": plugins,
+        }
+
+    def _run_test(self, path, test):
+        record = {"func": test["func"], "args": test["args"]}
+        started = time.perf_counter()
+        try:
+            status, value = self._get_pool().call(_run_plugin_test, (path, test["func"], test["args"]),
+                                                  timeout=self.test_timeout)
+        except SandboxUnavailable as e:
+            status, value = "error", str(e)
+        if status == "success":
+            record.update(value)
+        else:
+            # timeout / crashed (e.g. CPU or memory limit): the worker was replaced
+            record.update({"status": status, "result": value, "cpu_ms": None, "max_rss_kb": None,
+                           "wall_ms": round((time.perf_counter() - started) * 1000, 3)})
+        return record
+
+    @staticmethod
+    def _summarize(plugins, elapsed):
+        tests = [t for p in plugins for t in p["tests"]]
+        statuses = {}
+        for test in tests:
+            statuses[test["status"]] = statuses.get(test["status"], 0) + 1
+        return {
+            "plugins": len(plugins),
+            "audit_failed": sum(p["status"] == "audit_failed" for p in plugins),
+            "approved": sum(p["approved"] for p in plugins),
+            "tests_run": len(tests),
+            "test_statuses": statuses,
+            "elapsed_s": round(elapsed, 3),
+        }
+
+
+def write_report(report, path):
+    """Writes the report as stable, sorted JSON so two runs diff cleanly."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate and score every plugin in a directory")
+    parser.add_argument("plugin_dir")
+    parser.add_argument("--report", default="plugin_eval/evaluation_report.json")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--timeout", type=float, default=5)
+    parser.add_argument("--recursive", action="store_true")
+    args = parser.parse_args()
+
+    with BatchEvaluator(workers=args.workers, test_timeout=args.timeout) as evaluator:
+        report = evaluator.evaluate_directory(args.plugin_dir, recursive=args.recursive)
+    write_report(report, args.report)
+    print(json.dumps(report["summary"], indent=2))
@@ -3,7 +3,37 @@ import os
 import traceback
 import time
 
+from core.sandbox.worker_pool import SandboxUnavailable, shared_pool
+from plugins.plugin_cache import shared_cache
+
+# Plugin modules loaded by this sandbox worker, keyed by (path, sha256)
+_worker_modules = {}
+
+def load_plugin_module(path):
+    """Loads a plugin in the calling (worker) process, once per plugin version."""
+    entry = shared_cache().get(path)
+    key = (entry.path, entry.sha256)
+    module = _worker_modules.get(key)
+    if module is None:
+        module = _worker_modules[key] = shared_cache().load_entry(entry, f"evaluated_plugin_{entry.sha256[:12]}")
+    return module
+
+def _call_plugin(path, entry_function, args):
+    return getattr(load_plugin_module(path), entry_function)(*args)
+
 def restricted_runner(plugin_func, args, timeout=5):
+    try:
+        status, result = shared_pool().call(plugin_func, args, timeout=timeout)
+    except SandboxUnavailable:
+        return _run_in_process(plugin_func, args, timeout)
+
+    if status in ("success", "error"):
+        return status, result
+    if status == "timeout":
+        return "timeout", "Execution timed out"
+    return "error", "No result returned"
+
+def _run_in_process(plugin_func, args, timeout):
     def wrapper(q, plugin_func, args):
         try:
             result = plugin_func(*args)
@@ -31,7 +61,13 @@ class SandboxRunner:
     def run_plugin(self, plugin_module, entry_function='run', args=[]):
         try:
             func = getattr(plugin_module, entry_function)
-            status, result = restricted_runner(func, args, timeout=self.timeout)
+            path = getattr(plugin_module, "__file__", None)
+            if path:
+                # Plugin modules cannot be pickled by reference, so the worker loads its own copy
+                status, result = restricted_runner(_call_plugin, (path, entry_function, list(args)),
+                                                   timeout=self.timeout)
+            else:
+                status, result = restricted_runner(func, args, timeout=self.timeout)
             return {"status": status, "result": result}
         except Exception as e:
             return {"status": "load_error", "result": str(e)}
@@ -1,31 +1,38 @@
 import importlib.util
 import os
+from plugins.plugin_scanner import shared_scanner
 
 class PluginTestSuite:
-    def __init__(self, sandbox_runner):
+    DEFAULT_TESTS = [
+        {"func": "run", "args": []},
+        {"func": "run", "args": ["sample input"]}
+    ]
+
+    def __init__(self, sandbox_runner, scanner=None, tests=None):
         self.sandbox_runner = sandbox_runner
+        self.scanner = scanner or shared_scanner()
+        self.tests = tests or self.DEFAULT_TESTS
 
     def load_plugin(self, path):
         try:
             spec = importlib.util.spec_from_file_location("plugin", path)
             plugin = importlib.util.module_from_spec(spec)
             spec.loader.exec_module(plugin)
-            return plugin
+            return plugin, None
         except Exception as e:
             return None, str(e)
 
     def test_plugin(self, plugin_path):
+        findings = self.scanner.scan_file(plugin_path)
+        if findings:
+            return {"status": "audit_failed", "findings": findings}
+
         plugin, err = self.load_plugin(plugin_path)
         if plugin is None:
             return {"status": "load_failed", "error": err}
-        
-        tests = [
-            {"func": "run", "args": []},
-            {"func": "run", "args": ["sample input"]}
-        ]
 
         results = []
-        for test in tests:
+        for test in self.tests:
             result = self.sandbox_runner.run_plugin(plugin, entry_function=test["func"], args=test["args"])
             results.append(result)
         
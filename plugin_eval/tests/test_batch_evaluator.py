@@ -0,0 +1,70 @@
+# File: /plugin_eval/tests/test_batch_evaluator.py
+
+import json
+
+import pytest
+
+from plugin_eval.batch_evaluator import BatchEvaluator, write_report
+from plugin_eval.trust_scorecard import TrustScorecard
+from plugins.plugin_scanner import PluginScanner
+
+PLUGINS = {
+    "echo.py": "def run(data=None):\n    return {'echo': data}\n",
+    "flaky.py": "def run(data=None):\n    if data is None:\n        raise ValueError('needs input')\n    return data\n",
+    "spin.py": "def run(data=None):\n    while True:\n        pass\n",
+    "evil.py": "import os\n\ndef run(data=None):\n    return os.system('true')\n",
+    "no_entry.py": "def helper():\n    return 1\n",
+}
+
+
+@pytest.fixture
+def plugin_dir(tmp_path):
+    directory = tmp_path / "plugins"
+    directory.mkdir()
+    for name, source in PLUGINS.items():
+        (directory / name).write_text(source)
+    return directory
+
+
+@pytest.fixture
+def evaluator(tmp_path):
+    scorecard = TrustScorecard(database_path=str(tmp_path / "trusted_plugins.json"))
+    with BatchEvaluator(workers=2, test_timeout=1, scanner=PluginScanner(cache_dir=None),
+                        scorecard=scorecard) as evaluator:
+        yield evaluator
+
+
+def test_batch_evaluation_report(plugin_dir, evaluator, tmp_path):
+    report = evaluator.evaluate_directory(str(plugin_dir))
+    plugins = {p["path"].rsplit("/", 1)[-1]: p for p in report["plugins"]}
+
+    assert [t["status"] for t in plugins["echo.py"]["tests"]] == ["success", "success"]
+    assert plugins["echo.py"]["score"] == 100.0 and plugins["echo.py"]["approved"]
+    assert [t["status"] for t in plugins["flaky.py"]["tests"]] == ["error", "success"]
+    assert plugins["flaky.py"]["score"] == 50.0
+    assert [t["status"] for t in plugins["spin.py"]["tests"]] == ["timeout", "timeout"]
+    assert [t["status"] for t in plugins["no_entry.py"]["tests"]] == ["load_failed", "load_failed"]
+    assert plugins["evil.py"]["status"] == "audit_failed" and plugins["evil.py"]["tests"] == []
+
+    measured = plugins["echo.py"]["tests"][0]
+    assert measured["wall_ms"] >= 0 and measured["cpu_ms"] >= 0 and measured["max_rss_kb"] > 0
+    assert report["summary"]["plugins"] == 5 and report["summary"]["approved"] == 1
+    assert report["summary"]["test_statuses"]["timeout"] == 2
+
+    # Both spinning tests timed out concurrently on separate workers
+    assert report["summary"]["elapsed_s"] < 3
+
+    report_path = tmp_path / "report.json"
+    write_report(report, str(report_path))
+    assert json.loads(report_path.read_text())["plugins"][0]["path"].endswith("echo.py")
+
+
+def test_scores_are_written_once(plugin_dir, evaluator, monkeypatch):
+    writes = []
+    save = evaluator.scorecard._save_db
+    monkeypatch.setattr(evaluator.scorecard, "_save_db", lambda: (writes.append(1), save()))
+    evaluator.evaluate([str(plugin_dir / "echo.py"), str(plugin_dir / "flaky.py"), str(plugin_dir / "evil.py")])
+    assert len(writes) == 1
+
+    stored = json.load(open(evaluator.scorecard.database_path))
+    assert sorted(entry["score"] for entry in stored.values()) == [0.0, 50.0, 100.0]
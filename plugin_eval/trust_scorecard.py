@@ -1,5 +1,6 @@
 import json
 import hashlib
+import os
 
 class TrustScorecard:
     def __init__(self, database_path="plugin_eval/trusted_plugins.json"):
@@ -14,21 +15,26 @@ class TrustScorecard:
             self.db = {}
 
     def _save_db(self):
-        with open(self.database_path, 'w') as f:
+        tmp_path = f"{self.database_path}.tmp"
+        with open(tmp_path, 'w') as f:
             json.dump(self.db, f, indent=2)
+        os.replace(tmp_path, self.database_path)
 
     def _hash_plugin(self, path):
         with open(path, 'rb') as f:
             return hashlib.sha256(f.read()).hexdigest()
 
-    def score_plugin(self, test_results, plugin_path):
+    def _record_score(self, test_results, plugin_path, plugin_id=None):
+        # A plugin that produced no test results (failed audit or load) scores 0
+        if not isinstance(test_results, list):
+            test_results = []
         total = len(test_results)
         success = sum(1 for r in test_results if r['status'] == "success")
         fail = total - success
 
-        trust_score = round((success / total) * 100, 2)
+        trust_score = round((success / total) * 100, 2) if total else 0.0
 
-        plugin_id = self._hash_plugin(plugin_path)
+        plugin_id = plugin_id or self._hash_plugin(plugin_path)
         self.db[plugin_id] = {
             "score": trust_score,
             "tests_run": total,
@@ -36,10 +42,25 @@ class TrustScorecard:
             "fail": fail,
             "path": plugin_path
         }
+        return trust_score, plugin_id
 
+    def score_plugin(self, test_results, plugin_path):
+        trust_score, plugin_id = self._record_score(test_results, plugin_path)
         self._save_db()
         return trust_score, plugin_id
 
+    def score_plugins(self, results):
+        """
+        Scores a batch of plugins and writes the database once.
+
+        :param results: Iterable of (plugin_path, test_results, plugin_id or None).
+        :return: Plugin path -> (trust score, plugin id).
+        """
+        scores = {path: self._record_score(test_results, path, plugin_id)
+                  for path, test_results, plugin_id in results}
+        self._save_db()
+        return scores
+
     def get_plugin_score(self, plugin_path):
         plugin_id = self._hash_plugin(plugin_path)
         return self.db.get(plugin_id, None)
@@ -4,11 +4,17 @@ from plugin_runtime.runtimes.node_runtime import NodeRuntime
 from plugin_runtime.runtimes.bash_runtime import BashRuntime
 
 class PluginExecutor:
-    def __init__(self):
+    def __init__(self, pool_sizes=None, persistent=True):
+        """
+        :param pool_sizes: Long-lived processes per runtime, e.g. {"node": 2, "bash": 4}.
+            Node keeps that many hosts per plugin; bash shares them across plugins.
+        :param persistent: False spawns a fresh node/bash process for every call.
+        """
+        pool_sizes = {"node": 1, "bash": 1, **(pool_sizes or {})}
         self.runtimes = {
             "python": PythonRuntime(),
-            "node": NodeRuntime(),
-            "bash": BashRuntime()
+            "node": NodeRuntime(pool_size=pool_sizes["node"], persistent=persistent),
+            "bash": BashRuntime(pool_size=pool_sizes["bash"], persistent=persistent)
         }
 
     def execute(self, plugin_path, runtime="python", args=None):
@@ -18,6 +24,15 @@ class PluginExecutor:
             raise FileNotFoundError("Plugin path does not exist")
         return self.runtimes[runtime].run(plugin_path, args or {})
 
+    def health_check(self):
+        """Pings the long-lived runtime processes, restarting unresponsive ones."""
+        return {name: rt.health_check() for name, rt in self.runtimes.items() if hasattr(rt, "health_check")}
+
+    def close(self):
+        for rt in self.runtimes.values():
+            if hasattr(rt, "close"):
+                rt.close()
+
 if __name__ == "__main__":
     executor = PluginExecutor()
     # Test Python plugin
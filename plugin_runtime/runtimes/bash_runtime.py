@@ -1,12 +1,228 @@
 import subprocess
+import os
+import queue
+import select
+import shlex
+import shutil
+import signal
+import tempfile
+import threading
+import time
+import uuid
+from typing import List, Tuple
+
+_SH_SHEBANGS = ("bash", "sh")
+
+
+class BashHostError(RuntimeError):
+    pass
+
+
+class BashHost:
+    """
+    One long-lived ``bash`` process that runs plugin scripts on request.
+
+    Shell scripts are sourced in a subshell, i.e. a fork of the warm shell, so
+    no new interpreter starts and ``exit``/``cd``/variables stay confined to
+    the call; ``$0`` is set to the script path. Other scripts are executed as
+    commands. Output goes to per-host files and the exit status comes back on
+    the host's stdout behind a unique marker.
+    """
+
+    def __init__(self):
+        self.proc = subprocess.Popen(
+            ["bash", "--noprofile", "--norc"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        self.workdir = tempfile.mkdtemp(prefix="bash_host_")
+        self._buffer = b""
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def _command(self, path: str, args: List[str], out: str, err: str) -> str:
+        quoted_args = " ".join(shlex.quote(arg) for arg in args)
+        redirects = f"</dev/null >{shlex.quote(out)} 2>{shlex.quote(err)}"
+        if _is_shell_script(path):
+            script = shlex.quote(path)
+            return f"( BASH_ARGV0={script}; set -- {quoted_args}; . {script} ) {redirects}"
+        return f"{shlex.quote(path)} {quoted_args} {redirects}"
+
+    def run(self, path: str, args: List[str], timeout: float) -> Tuple[int, str, str]:
+        """
+        :return: (exit status, stdout, stderr) of the script.
+        :raises TimeoutError: The script did not finish in time (the host is killed).
+        """
+        token = uuid.uuid4().hex
+        # Fresh files per call: truncating the previous call's output can stall on a journal flush
+        out = os.path.join(self.workdir, f"{token}.out")
+        err = os.path.join(self.workdir, f"{token}.err")
+        command = self._command(os.path.abspath(path), args, out, err)
+        self._send(f"{command}; printf '\\n{token} %d\\n' $?\n")
+        status = int(self._read_marker(token, timeout))
+        stdout, stderr = _read_and_remove(out), _read_and_remove(err)
+        return status, stdout, stderr
+
+    def ping(self, timeout: float = 2) -> bool:
+        token = uuid.uuid4().hex
+        try:
+            self._send(f"printf '\\n{token} 0\\n'\n")
+            self._read_marker(token, timeout)
+            return True
+        except (BashHostError, TimeoutError):
+            return False
+
+    def _send(self, line: str):
+        try:
+            self.proc.stdin.write(line.encode())
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise BashHostError(f"Bash host is not accepting commands: {e}") from e
+
+    def _read_marker(self, token: str, timeout: float) -> str:
+        marker = f"\n{token} ".encode()
+        deadline = time.monotonic() + timeout
+        fd = self.proc.stdout.fileno()
+        while marker not in self._buffer or not self._buffer.split(marker, 1)[1].count(b"\n"):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.kill()
+                raise TimeoutError(f"timed out after {timeout} seconds")
+            readable, _, _ = select.select([fd], [], [], remaining)
+            if readable:
+                chunk = os.read(fd, 4096)
+                if not chunk:
+                    raise BashHostError(f"Bash host exited with code {self.proc.wait()}")
+                self._buffer += chunk
+        _, rest = self._buffer.split(marker, 1)
+        value, self._buffer = rest.split(b"\n", 1)
+        return value.decode()
+
+    def kill(self):
+        if self.alive:
+            try:
+                # The session includes any subshell or command still running
+                os.killpg(self.proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        self.proc.wait()
+
+    def close(self):
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(2)
+        except (OSError, subprocess.TimeoutExpired):
+            self.kill()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+def _read_and_remove(path: str) -> str:
+    with open(path, "rb") as f:
+        data = f.read().decode()
+    os.unlink(path)
+    return data
+
+
+def _is_shell_script(path: str) -> bool:
+    try:
+        with open(path, "rb") as f:
+            first = f.readline(256)
+    except OSError:
+        return False
+    if not first.startswith(b"#!"):
+        return True
+    interpreter = first[2:].split()
+    if not interpreter:
+        return True
+    name = os.path.basename(interpreter[0].decode(errors="replace"))
+    if name == "env" and len(interpreter) > 1:
+        name = interpreter[1].decode(errors="replace")
+    return name in _SH_SHEBANGS
+
 
 class BashRuntime:
+    def __init__(self, pool_size: int = 1, persistent: bool = True, timeout: float = 5):
+        """
+        :param pool_size: Long-lived bash processes shared by all bash plugins.
+        :param persistent: Run scripts in the long-lived hosts instead of a new process per call.
+        :param timeout: Seconds allowed per call.
+        """
+        self.pool_size = pool_size
+        self.persistent = persistent
+        self.timeout = timeout
+        self._idle: "queue.Queue[BashHost]" = queue.Queue()
+        self._started = 0
+        self._lock = threading.Lock()
+
     def run(self, path, args):
+        argv = [f"{k}={v}" for k, v in args.items()]
+        if not self.persistent:
+            return self._run_spawned(path, argv)
+        host = self._checkout()
         try:
-            cmd = [path] + [f"{k}={v}" for k, v in args.items()]
-            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=5)
+            returncode, stdout, stderr = host.run(path, argv, self.timeout)
+        except TimeoutError as e:
+            return f"[BASH EXEC ERROR] {path} {e}"
+        except Exception as e:
+            host.kill()
+            return f"[BASH EXEC ERROR] {e}"
+        finally:
+            self._checkin(host)
+        if returncode != 0:
+            return f"[BASH ERROR] {stderr}"
+        return stdout
+
+    def _run_spawned(self, path, argv):
+        try:
+            cmd = [path] + argv
+            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=self.timeout)
             if result.returncode != 0:
                 return f"[BASH ERROR] {result.stderr.decode()}"
             return result.stdout.decode()
         except Exception as e:
             return f"[BASH EXEC ERROR] {e}"
+
+    def _checkout(self) -> BashHost:
+        with self._lock:
+            if self._idle.empty() and self._started < self.pool_size:
+                self._started += 1
+                return BashHost()
+        host = self._idle.get()
+        if not host.alive:
+            host.close()
+            host = BashHost()
+        return host
+
+    def _checkin(self, host: BashHost):
+        # A host that died is restarted on its next checkout
+        self._idle.put(host)
+
+    def health_check(self, timeout: float = 2) -> List[bool]:
+        """
+        Pings every idle host and replaces the ones that do not answer.
+        """
+        report = []
+        for _ in range(self._idle.qsize()):
+            try:
+                host = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            healthy = host.alive and host.ping(timeout)
+            report.append(healthy)
+            if not healthy:
+                host.kill()
+                host.close()
+                host = BashHost()
+            self._idle.put(host)
+        return report
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._lock:
+            self._started = 0
@@ -0,0 +1,85 @@
+// plugin_runtime/runtimes/node_host.js
+//
+// Long-lived host for one Node plugin. Speaks newline-delimited JSON-RPC 2.0
+// on stdin/stdout: {"id", "method": "run" | "ping", "params"} in, one
+// {"id", "result"} or {"id", "error"} line out per request. Requests are
+// handled concurrently and answered in completion order.
+//
+// Only plugins that opt in with a "use persistent"; directive at the top of
+// the file are hosted here. They must export their handler: module.exports =
+// fn, or module.exports.run / module.exports.default. It receives the args
+// object and may return a value or a promise.
+
+"use strict";
+
+const { createRequire } = require("module");
+const readline = require("readline");
+
+const rpcWrite = process.stdout.write.bind(process.stdout);
+// Anything the plugin prints goes to stderr so it cannot corrupt the RPC stream
+process.stdout.write = (chunk, encoding, callback) => process.stderr.write(chunk, encoding, callback);
+
+function send(message) {
+  let line;
+  try {
+    line = JSON.stringify(message);
+  } catch (err) {
+    line = JSON.stringify({
+      jsonrpc: "2.0",
+      id: message.id,
+      error: { code: -32603, message: `Result is not JSON serialisable: ${err.message}` },
+    });
+  }
+  rpcWrite(line + "\n");
+}
+
+function describe(err) {
+  return String((err && err.stack) || err);
+}
+
+// Started as `node -e <this file> <plugin path>`
+const pluginPath = process.argv[1];
+let handler;
+try {
+  // Resolve from the plugin's own location, not the host's working directory
+  const mod = createRequire(pluginPath)(pluginPath);
+  handler = typeof mod === "function" ? mod : mod && (mod.run || mod.default);
+  if (typeof handler !== "function") {
+    throw new Error(`${pluginPath} does not export a handler function`);
+  }
+} catch (err) {
+  send({ jsonrpc: "2.0", method: "load_error", params: { message: describe(err) } });
+  process.exit(1);
+}
+
+const rl = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+
+rl.on("line", async (line) => {
+  if (!line.trim()) return;
+  let request;
+  try {
+    request = JSON.parse(line);
+  } catch (err) {
+    send({ jsonrpc: "2.0", id: null, error: { code: -32700, message: "Parse error" } });
+    return;
+  }
+  const { id, method, params } = request;
+  if (method === "ping") {
+    send({ jsonrpc: "2.0", id, result: "pong" });
+    return;
+  }
+  if (method !== "run") {
+    send({ jsonrpc: "2.0", id, error: { code: -32601, message: `Method not found: ${method}` } });
+    return;
+  }
+  try {
+    const result = await handler(params || {});
+    send({ jsonrpc: "2.0", id, result: result === undefined ? null : result });
+  } catch (err) {
+    send({ jsonrpc: "2.0", id, error: { code: -32000, message: describe(err) } });
+  }
+});
+
+rl.on("close", () => process.exit(0));
+
+send({ jsonrpc: "2.0", method: "ready", params: { pid: process.pid } });
@@ -1,14 +1,260 @@
 import subprocess
 import json
+import itertools
+import os
+import re
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Dict, List, Optional
+
+HOST_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "node_host.js")
+_host_source = None
+# Opt-in for the long-lived host: a "use persistent"; directive in the file's prologue
+_PERSISTENT_PRAGMA = re.compile(r"""(["'])use persistent\1;?""")
+_PROLOGUE_SKIP = re.compile(r"""#!.*|//.*|(["'])use strict\1;?""")
+
+
+class NodeHostError(RuntimeError):
+    pass
+
+
+class NodeHost:
+    """
+    One long-lived ``node`` process hosting a plugin (see node_host.js).
+    Requests carry an id, so any number of callers can have calls in flight
+    on the same process; a reader thread routes each response to its caller.
+    """
+
+    def __init__(self, path: str, startup_timeout: float = 10):
+        self.path = os.path.abspath(path)
+        self.mtime = os.path.getmtime(self.path)
+        # Passed with -e so the host does not depend on the package.json scope it lives in
+        self.proc = subprocess.Popen(
+            ["node", "-e", _read_host_source(), self.path],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=None,
+        )
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, Future] = {}
+        self._exited = False
+        self._lock = threading.Lock()
+        self._ready = Future()
+        self._reader = threading.Thread(target=self._read, daemon=True, name=f"NodeHost-{self.proc.pid}")
+        self._reader.start()
+        try:
+            self._ready.result(startup_timeout)
+        except FutureTimeout:
+            self.kill()
+            raise NodeHostError(f"Node host for {path} did not start within {startup_timeout}s")
+        except NodeHostError:
+            self.kill()
+            raise
+
+    @property
+    def alive(self) -> bool:
+        return not self._exited and self.proc.poll() is None
+
+    @property
+    def outstanding(self) -> int:
+        return len(self._pending)
+
+    def _read(self):
+        for line in self.proc.stdout:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            method = message.get("method")
+            if method == "ready":
+                self._ready.set_result(message["params"]["pid"])
+            elif method == "load_error":
+                self._ready.set_exception(NodeHostError(message["params"]["message"]))
+            else:
+                with self._lock:
+                    future = self._pending.pop(message.get("id"), None)
+                if future is not None:
+                    future.set_result(message)
+        # EOF: the process exited; fail everything still waiting on it
+        self.proc.wait()
+        error = NodeHostError(f"Node host exited with code {self.proc.returncode}")
+        if not self._ready.done():
+            self._ready.set_exception(error)
+        with self._lock:
+            self._exited = True
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(error)
+
+    def request(self, method: str, params=None, timeout: Optional[float] = None) -> dict:
+        request_id = next(self._ids)
+        future = Future()
+        line = json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}) + "\n"
+        with self._lock:
+            if not self.alive:
+                raise NodeHostError(f"Node host exited with code {self.proc.returncode}")
+            self._pending[request_id] = future
+            try:
+                self.proc.stdin.write(line.encode())
+                self.proc.stdin.flush()
+            except (BrokenPipeError, OSError) as e:
+                self._pending.pop(request_id, None)
+                raise NodeHostError(f"Node host is not accepting requests: {e}") from e
+        try:
+            return future.result(timeout)
+        except FutureTimeout:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise
+
+    def ping(self, timeout: float = 2) -> bool:
+        try:
+            return self.request("ping", timeout=timeout).get("result") == "pong"
+        except (FutureTimeout, NodeHostError):
+            return False
+
+    def kill(self):
+        if self.alive:
+            self.proc.kill()
+        self.proc.wait()
+
+    def close(self, timeout: float = 2):
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout)
+        except (OSError, subprocess.TimeoutExpired):
+            self.kill()
+
+
+def _read_host_source() -> str:
+    global _host_source
+    if _host_source is None:
+        with open(HOST_SCRIPT, "r", encoding="utf-8") as f:
+            _host_source = f.read()
+    return _host_source
+
 
 class NodeRuntime:
+    def __init__(self, pool_size: int = 1, persistent: bool = True, timeout: float = 10):
+        """
+        :param pool_size: Long-lived node processes per plugin (persistent mode).
+        :param persistent: Keep plugins that opt in with a ``"use persistent";``
+            directive loaded in host processes instead of spawning ``node`` per
+            call. Such a plugin exports its handler (see node_host.js); every
+            other plugin reads its input from stdin and is spawned per call.
+        :param timeout: Seconds allowed per call.
+        """
+        self.pool_size = pool_size
+        self.persistent = persistent
+        self.timeout = timeout
+        self._hosts: Dict[str, List[NodeHost]] = {}
+        self._modes: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
     def run(self, path, args):
+        if self.persistent and self._opts_in(path):
+            return self._run_persistent(path, args)
+        return self._run_spawned(path, args)
+
+    def _run_spawned(self, path, args):
         try:
             input_data = json.dumps(args)
             result = subprocess.run(["node", path], input=input_data.encode(),
-                                    stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=10)
+                                    stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=self.timeout)
             if result.returncode != 0:
                 return f"[NODE ERROR] {result.stderr.decode()}"
             return result.stdout.decode()
         except Exception as e:
             return f"[NODE EXEC ERROR] {e}"
+
+    def _run_persistent(self, path, args):
+        try:
+            host = self._host_for(path)
+        except NodeHostError as e:
+            # Not remembered: the next call starts a fresh host
+            return f"[NODE ERROR] {e}"
+        try:
+            response = host.request("run", args, timeout=self.timeout)
+        except FutureTimeout:
+            # A handler stuck in synchronous code blocks every call on its host
+            host.kill()
+            return f"[NODE EXEC ERROR] {path} timed out after {self.timeout} seconds"
+        except Exception as e:
+            return f"[NODE EXEC ERROR] {e}"
+        if "error" in response:
+            return f"[NODE ERROR] {response['error'].get('message')}"
+        result = response.get("result")
+        return result if isinstance(result, str) else json.dumps(result)
+
+    def _opts_in(self, path) -> bool:
+        """
+        Whether the plugin's prologue (before its first statement, past a
+        shebang, // comments and "use strict") holds the ``"use persistent";``
+        directive. Cached per file version; the plugin is not run.
+        """
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return False
+        cached = self._modes.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        opted_in = False
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if _PERSISTENT_PRAGMA.fullmatch(line):
+                    opted_in = True
+                    break
+                if line and not _PROLOGUE_SKIP.fullmatch(line):
+                    break
+        self._modes[path] = (mtime, opted_in)
+        return opted_in
+
+    def _host_for(self, path) -> NodeHost:
+        """
+        Least-loaded live host for the plugin. Hosts that died are restarted
+        and hosts running an outdated copy of the plugin file are replaced.
+        """
+        key = os.path.abspath(path)
+        mtime = os.path.getmtime(key)
+        with self._lock:
+            hosts = self._hosts.setdefault(key, [])
+            for index, host in enumerate(hosts):
+                if not host.alive or host.mtime != mtime:
+                    host.kill()
+                    hosts[index] = None
+            hosts[:] = [host for host in hosts if host is not None]
+            if len(hosts) < self.pool_size and (not hosts or min(h.outstanding for h in hosts) > 0):
+                hosts.append(NodeHost(key))
+            return min(hosts, key=lambda h: h.outstanding)
+
+    def health_check(self, timeout: float = 2) -> Dict[str, List[bool]]:
+        """
+        Pings every host and restarts the ones that do not answer.
+
+        :return: Plugin path -> health of each of its hosts before restarts.
+        """
+        with self._lock:
+            snapshot = {path: list(hosts) for path, hosts in self._hosts.items()}
+        report = {}
+        for path, hosts in snapshot.items():
+            report[path] = []
+            for host in hosts:
+                healthy = host.alive and host.ping(timeout)
+                report[path].append(healthy)
+                if not healthy:
+                    host.kill()
+                    with self._lock:
+                        live = self._hosts.get(path, [])
+                        if host in live:
+                            try:
+                                live[live.index(host)] = NodeHost(path)
+                            except NodeHostError:
+                                live.remove(host)
+        return report
+
+    def close(self):
+        with self._lock:
+            hosts = [host for pool in self._hosts.values() for host in pool]
+            self._hosts.clear()
+        for host in hosts:
+            host.close()
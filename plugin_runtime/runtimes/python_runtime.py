@@ -1,23 +1,4 @@
-python -m pip install -r c:/Users/Mohammed/Downloads/ai_os_complete/ai_os/requirements.txt
-from pip._vendor.rich.console import Console
-console = Console()
-with Live(console=console, refresh_per_second=4) as live:
-    # Run your show.py program here
-    runtime = PythonRuntime()
-    result = runtime.run("show.py", {})
-    live.update(result)
-from pip._vendor.rich.console import Console
-console = Console()
-with Live(console=console, refresh_per_second=4) as live:
-    # Run your show.py program here
-    runtime = PythonRuntime()
-    result = runtime.run("show.py", {})
-    live.update(result)
-runtime = PythonRuntime()
-result = runtime.run("show.py", {})
-print(result)
-result = runtime.run("show.py", {})
-print(result)
+import runpy
 
 class PythonRuntime:
     def run(self, path, args):
@@ -0,0 +1,167 @@
+# File: /plugin_runtime/tests/test_persistent_runtimes.py
+
+import json
+import os
+import shutil
+import threading
+import time
+
+import pytest
+
+from plugin_runtime.executor import PluginExecutor
+from plugin_runtime.runtimes.bash_runtime import BashRuntime
+from plugin_runtime.runtimes.node_runtime import NodeRuntime
+
+needs_node = pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+needs_bash = pytest.mark.skipif(shutil.which("bash") is None, reason="bash is not installed")
+
+NODE_HANDLER = """
+"use persistent";
+let calls = 0;
+module.exports = async function (args) {
+  calls += 1;
+  console.log("log lines do not break the protocol");
+  if (args.fail) throw new Error("plugin failed");
+  if (args.delay) await new Promise((resolve) => setTimeout(resolve, args.delay));
+  if (args.spin) while (true) {}
+  return { echo: args.text, calls, pid: process.pid };
+};
+"""
+
+NODE_STDIN_SCRIPT = """
+let data = "";
+process.stdin.on("data", (chunk) => (data += chunk));
+process.stdin.on("end", () => process.stdout.write("legacy:" + JSON.parse(data).text));
+"""
+
+
+def write(tmp_path, name, source, mode=0o644):
+    path = tmp_path / name
+    path.write_text(source)
+    path.chmod(mode)
+    return str(path)
+
+
+@needs_node
+def test_node_host_reuses_process_and_multiplexes(tmp_path):
+    plugin = write(tmp_path, "handler.js", NODE_HANDLER)
+    runtime = NodeRuntime(pool_size=1)
+    try:
+        first = json.loads(runtime.run(plugin, {"text": "a"}))
+        second = json.loads(runtime.run(plugin, {"text": "b"}))
+        assert first["echo"] == "a" and second["calls"] == 2
+        assert first["pid"] == second["pid"]
+        assert "plugin failed" in runtime.run(plugin, {"fail": True})
+
+        # Concurrent slow calls overlap on the single host instead of queueing
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(runtime.run(plugin, {"delay": 300})))
+                   for _ in range(5)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert time.perf_counter() - started < 1.0
+        assert len({json.loads(r)["pid"] for r in results}) == 1
+    finally:
+        runtime.close()
+
+
+@needs_node
+def test_node_host_restarts_after_timeout_and_crash(tmp_path):
+    plugin = write(tmp_path, "handler.js", NODE_HANDLER)
+    runtime = NodeRuntime(pool_size=1, timeout=0.5)
+    try:
+        pid = json.loads(runtime.run(plugin, {}))["pid"]
+        assert "timed out" in runtime.run(plugin, {"spin": True})
+        restarted = json.loads(runtime.run(plugin, {}))
+        assert restarted["pid"] != pid and restarted["calls"] == 1
+
+        os.kill(restarted["pid"], 9)
+        time.sleep(0.1)
+        assert runtime.health_check()[os.path.abspath(plugin)] == [False]
+        assert json.loads(runtime.run(plugin, {}))["pid"] != restarted["pid"]
+    finally:
+        runtime.close()
+
+
+@needs_node
+def test_node_stdin_scripts_keep_spawn_per_call(tmp_path):
+    plugin = write(tmp_path, "legacy.js", NODE_STDIN_SCRIPT)
+    runtime = NodeRuntime()
+    assert runtime.run(plugin, {"text": "hi"}) == "legacy:hi"
+    assert runtime._hosts == {}
+
+
+@needs_node
+def test_node_persistent_mode_needs_the_directive(tmp_path):
+    # Mentions module.exports but reads stdin: hosting it would run its top level twice
+    script = write(tmp_path, "mixed.js", "// module.exports is unused here\n" + NODE_STDIN_SCRIPT
+                   + "module.exports = {};\n")
+    handler = write(tmp_path, "handler.js", NODE_HANDLER.replace('"use persistent";', ""))
+    late = write(tmp_path, "late.js", "let x = 1;\n" + NODE_HANDLER)
+    runtime = NodeRuntime()
+    assert runtime.run(script, {"text": "hi"}) == "legacy:hi"
+    assert runtime.run(handler, {"text": "hi"}) == ""
+    assert runtime.run(late, {"text": "hi"}) == ""
+    assert runtime._hosts == {}
+
+
+@needs_node
+def test_node_load_failure_is_not_remembered(tmp_path):
+    marker = tmp_path / "broken"
+    marker.write_text("")
+    plugin = write(tmp_path, "handler.js", NODE_HANDLER.replace(
+        '"use persistent";', '"use persistent";\nif (require("fs").existsSync(__dirname + "/broken")) '
+                             'throw new Error("not ready");'))
+    runtime = NodeRuntime()
+    try:
+        assert "not ready" in runtime.run(plugin, {})
+        marker.unlink()
+        assert json.loads(runtime.run(plugin, {"text": "ok"}))["echo"] == "ok"
+        assert len(runtime._hosts[os.path.abspath(plugin)]) == 1
+    finally:
+        runtime.close()
+
+
+@needs_bash
+def test_bash_host_runs_scripts_in_isolated_subshells(tmp_path):
+    script = write(tmp_path, "plugin.sh", '#!/bin/bash\ncd /\nCOUNT=$((COUNT + 1))\necho "$0 $1 $COUNT $$"\n', 0o755)
+    failing = write(tmp_path, "fail.sh", "#!/bin/sh\necho bad >&2\nexit 3\n", 0o755)
+    python_script = write(tmp_path, "plugin.py", "#!/usr/bin/env python3\nimport sys\nprint(sys.argv[1:])\n", 0o755)
+    runtime = BashRuntime(pool_size=1)
+    try:
+        first = runtime.run(script, {"name": "x"}).split()
+        second = runtime.run(script, {"name": "y"}).split()
+        assert first[:3] == [script, "name=x", "1"] and second[1:3] == ["name=y", "1"]
+        assert first[3] == second[3]  # same long-lived host
+        assert runtime.run(failing, {}) == "[BASH ERROR] bad\n"
+        assert runtime.run(python_script, {"a": 1}) == "['a=1']\n"
+        assert runtime.health_check() == [True]
+    finally:
+        runtime.close()
+
+
+@needs_bash
+def test_bash_timeout_kills_and_replaces_host(tmp_path):
+    script = write(tmp_path, "slow.sh", "#!/bin/bash\nsleep 5\n", 0o755)
+    fast = write(tmp_path, "fast.sh", "#!/bin/bash\necho ok\n", 0o755)
+    runtime = BashRuntime(pool_size=1, timeout=0.3)
+    try:
+        assert "timed out" in runtime.run(script, {})
+        assert runtime.run(fast, {}) == "ok\n"
+    finally:
+        runtime.close()
+
+
+@needs_bash
+def test_executor_pool_sizes(tmp_path):
+    executor = PluginExecutor(pool_sizes={"bash": 2})
+    try:
+        assert executor.runtimes["bash"].pool_size == 2
+        assert executor.runtimes["node"].pool_size == 1
+        script = write(tmp_path, "plugin.sh", "#!/bin/bash\necho hi\n", 0o755)
+        assert executor.execute(script, "bash") == "hi\n"
+    finally:
+        executor.close()
@@ -3,7 +3,23 @@
 import multiprocessing
 import time
 
+from core.sandbox.worker_pool import SandboxUnavailable, shared_pool
+
 def run_code_snippet(code: str, input_data: dict = {}, timeout: int = 3):
+    try:
+        status, value = shared_pool().run_snippet(code, input_data, timeout=timeout)
+    except SandboxUnavailable:
+        return _run_in_process(code, input_data, timeout)
+
+    if status == "success":
+        return value
+    if status == "error":
+        return f"Error: {value}"
+    if status == "timeout":
+        return "Execution timed out."
+    return "No output."
+
+def _run_in_process(code: str, input_data: dict, timeout: int):
     def target(queue, code, input_data):
         try:
             local_vars = {"input_data": input_data}
@@ -8,11 +8,13 @@ import subprocess
 import requests
 from urllib.parse import urlparse
 from plugin_store.installer.dependency_resolver import DependencyResolver
+from plugins.plugin_scanner import shared_scanner
 
 class PluginInstaller:
-    def __init__(self, plugin_dir='plugins', log_file='plugin_store/installer/installer_logs.json'):
+    def __init__(self, plugin_dir='plugins', log_file='plugin_store/installer/installer_logs.json', scanner=None):
         self.plugin_dir = plugin_dir
         self.resolver = DependencyResolver()
+        self.scanner = scanner or shared_scanner()
         self.log_file = log_file
         self._init_logs()
 
@@ -62,6 +64,13 @@ class PluginInstaller:
                 raise Exception(f"❌ Missing metadata key: {key}")
         return metadata
 
+    def _audit_plugin(self, plugin_path):
+        report = self.scanner.scan_directory(plugin_path, recursive=True)
+        findings = [f"{os.path.relpath(path, plugin_path)}: {finding}"
+                    for path, items in report.items() for finding in items]
+        if findings:
+            raise Exception("❌ Plugin failed security audit:\n" + "\n".join(findings))
+
     def install_from_url(self, url):
         try:
             archive = self._download_plugin(url)
@@ -75,6 +84,7 @@ class PluginInstaller:
             plugin_root = os.path.join(temp_dir, content_list[0])
 
             metadata = self._verify_metadata(plugin_root)
+            self._audit_plugin(plugin_root)
             dest_path = os.path.join(self.plugin_dir, metadata["id"])
 
             if os.path.exists(dest_path):
@@ -0,0 +1,227 @@
+import hashlib
+import hmac
+import importlib.util
+import marshal
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from importlib.machinery import SourceFileLoader
+from types import CodeType, ModuleType
+from typing import Callable, Dict, Iterable, List, Optional
+
+Auditor = Callable[[str], List[str]]
+
+_CODE_TAG = importlib.util.MAGIC_NUMBER.hex()
+_DIGEST_SIZE = hashlib.sha256().digest_size
+# Signs code blobs when no key is configured; they then only verify in this process
+_PROCESS_KEY = os.urandom(32)
+
+
+@dataclass
+class CachedPlugin:
+    """
+    One version of a plugin file: its content hash, compiled code and audit findings.
+    """
+    path: str
+    sha256: str
+    mtime_ns: int
+    size: int
+    code: CodeType
+    source: str = field(repr=False)
+    audits: Dict[str, List[str]] = field(default_factory=dict, repr=False)
+
+
+class _CachedCodeLoader(SourceFileLoader):
+    """Source loader that hands out an already compiled code object."""
+
+    def __init__(self, fullname: str, path: str, code: CodeType):
+        super().__init__(fullname, path)
+        self._code = code
+
+    def get_code(self, fullname):
+        return self._code
+
+
+class PluginCache:
+    """
+    Content-addressed cache of plugin files.
+
+    Each file is read, hashed (SHA-256) and compiled once per version. A
+    version is recognised by ``(mtime_ns, size)`` without reading the file;
+    when those change the file is re-hashed, and only a new hash triggers a
+    recompile and re-audit. Audit findings are kept per auditor name, so
+    callers with different rule sets share the compiled code.
+
+    With ``cache_dir`` set, compiled code is also marshalled to
+    ``<cache_dir>/<sha256>.<python magic>.bin`` so a fresh process skips
+    compilation for plugins it has seen before. Each blob starts with an
+    HMAC-SHA256 of the source hash and the code, keyed with ``cache_key``;
+    a blob that does not verify is ignored and the audited source is
+    compiled instead. Without ``cache_key`` a random per-process key is
+    used, so blobs are only reused across processes that share a key.
+
+    The directory must still be trusted: writable only by the user running
+    the plugins, and never shared with anything that holds the key.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_workers: Optional[int] = None,
+                 cache_key: Optional[bytes] = None):
+        self.cache_dir = cache_dir
+        self.cache_key = cache_key or _PROCESS_KEY
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) + 4)
+        self._entries: Dict[str, CachedPlugin] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def get(self, path: str) -> CachedPlugin:
+        """
+        :return: The cache entry for the current version of ``path``.
+        :raises OSError: The file cannot be read.
+        :raises SyntaxError: The plugin does not compile.
+        """
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+            self.hits += 1
+            return entry
+
+        with open(path, "rb") as f:
+            data = f.read()
+        sha256 = hashlib.sha256(data).hexdigest()
+        if entry and entry.sha256 == sha256:
+            # Touched but unchanged
+            entry.mtime_ns, entry.size = st.st_mtime_ns, st.st_size
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        source = importlib.util.decode_source(data)
+        code = self._load_code(sha256) or self._compile(sha256, source, path)
+        entry = CachedPlugin(path, sha256, st.st_mtime_ns, st.st_size, code, source)
+        with self._lock:
+            self._entries[path] = entry
+        return entry
+
+    def audit(self, path: str, auditor: Auditor, auditor_name: str = "default") -> List[str]:
+        """
+        Runs ``auditor`` over the plugin source once per file version.
+
+        :return: The auditor's findings; empty when the plugin is clean.
+        """
+        return self.audit_entry(self.get(path), auditor, auditor_name)
+
+    @staticmethod
+    def audit_entry(entry: CachedPlugin, auditor: Auditor, auditor_name: str = "default") -> List[str]:
+        """Like audit(), for an entry already returned by get()."""
+        findings = entry.audits.get(auditor_name)
+        if findings is None:
+            findings = entry.audits[auditor_name] = list(auditor(entry.source))
+        return findings
+
+    def load_module(self, path: str, module_name: str) -> ModuleType:
+        """
+        Executes the cached code of ``path`` in a new module named ``module_name``.
+        """
+        return self.load_entry(self.get(path), module_name)
+
+    @staticmethod
+    def load_entry(entry: CachedPlugin, module_name: str) -> ModuleType:
+        """
+        Like load_module(), for an entry already returned by get(), so the
+        module runs exactly the version that was audited.
+        """
+        loader = _CachedCodeLoader(module_name, entry.path, entry.code)
+        spec = importlib.util.spec_from_file_location(module_name, entry.path, loader=loader)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def prefetch(self, paths: Iterable[str], auditor: Optional[Auditor] = None,
+                 auditor_name: str = "default") -> Dict[str, Exception]:
+        """
+        Reads, hashes, compiles and (optionally) audits plugins in parallel.
+
+        :return: Path -> error for the plugins that could not be prepared.
+        """
+        def prepare(path):
+            if auditor is not None:
+                self.audit(path, auditor, auditor_name)
+            else:
+                self.get(path)
+
+        errors = {}
+        paths = list(paths)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {path: pool.submit(prepare, path) for path in paths}
+        for path, future in futures.items():
+            if future.exception() is not None:
+                errors[path] = future.exception()
+        return errors
+
+    def invalidate(self, path: Optional[str] = None):
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(path), None)
+
+    def _code_path(self, sha256: str) -> str:
+        return os.path.join(self.cache_dir, f"{sha256}.{_CODE_TAG}.bin")
+
+    def _digest(self, sha256: str, data: bytes) -> bytes:
+        return hmac.new(self.cache_key, sha256.encode() + data, hashlib.sha256).digest()
+
+    def _load_code(self, sha256: str) -> Optional[CodeType]:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._code_path(sha256), "rb") as f:
+                blob = f.read()
+        except OSError:
+            return None
+        digest, data = blob[:_DIGEST_SIZE], blob[_DIGEST_SIZE:]
+        if not hmac.compare_digest(digest, self._digest(sha256, data)):
+            return None
+        try:
+            return marshal.loads(data)
+        except (EOFError, ValueError, TypeError):
+            return None
+
+    def _compile(self, sha256: str, source: str, path: str) -> CodeType:
+        code = compile(source, path, "exec", dont_inherit=True)
+        if self.cache_dir:
+            target = self._code_path(sha256)
+            tmp = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                data = marshal.dumps(code)
+                with open(tmp, "wb") as f:
+                    f.write(self._digest(sha256, data) + data)
+                os.replace(tmp, target)
+            except OSError:
+                pass
+        return code
+
+
+_shared_cache: Optional[PluginCache] = None
+_shared_lock = threading.Lock()
+
+
+def shared_cache() -> PluginCache:
+    """
+    Process-wide cache used by PluginManager, PluginLoader and PluginSandbox.
+    Set ``PLUGIN_CACHE_DIR`` (a trusted directory, see PluginCache) and
+    ``PLUGIN_CACHE_KEY`` to persist compiled code across processes.
+    """
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            key = os.environ.get("PLUGIN_CACHE_KEY")
+            _shared_cache = PluginCache(cache_dir=os.environ.get("PLUGIN_CACHE_DIR") or None,
+                                        cache_key=key.encode() if key else None)
+        return _shared_cache
@@ -1,11 +1,12 @@
-import importlib.util
 import os
+from plugins.plugin_cache import shared_cache
 from plugins.plugin_utils import PluginUtils
 
 class PluginLoader:
-    def __init__(self, plugin_dir="plugins/user_plugins"):
+    def __init__(self, plugin_dir="plugins/user_plugins", cache=None, scanner=None):
         self.plugin_dir = plugin_dir
-        self.utils = PluginUtils()
+        self.utils = PluginUtils(scanner)
+        self.cache = cache or shared_cache()
         os.makedirs(plugin_dir, exist_ok=True)
 
     def list_plugins(self):
@@ -16,14 +17,19 @@ class PluginLoader:
         if not os.path.exists(plugin_path):
             raise FileNotFoundError(f"Plugin not found: {plugin_path}")
 
-        audit = self.utils.audit_plugin(plugin_path)
+        # Audited and compiled once per plugin version; the audited entry is the one loaded
+        entry = self.cache.get(plugin_path)
+        audit = self.cache.audit_entry(entry, self.utils.scan_code, "plugin_utils")
         if audit:
             raise PermissionError("Plugin failed security audit:\n" + "\n".join(audit))
 
-        spec = importlib.util.spec_from_file_location(name[:-3], plugin_path)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        return module
+        return self.cache.load_entry(entry, name[:-3])
+
+    def preload(self):
+        """Audits and compiles every plugin in the directory in parallel."""
+        self.utils.audit_directory(self.plugin_dir)  # fills the verdict cache using a process pool
+        paths = [os.path.join(self.plugin_dir, name) for name in self.list_plugins()]
+        return self.cache.prefetch(paths, self.utils.scan_code, "plugin_utils")
 
 if __name__ == "__main__":
     loader = PluginLoader()
@@ -0,0 +1,290 @@
+import ast
+import hashlib
+import json
+import os
+import re
+import threading
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Modules a plugin may not import at all
+RESTRICTED_IMPORTS = {"os", "sys", "shutil", "ctypes", "socket", "subprocess", "multiprocessing", "pty", "builtins"}
+
+# Fully qualified callables, after resolving import aliases
+RESTRICTED_CALLS = {
+    "eval", "exec", "compile", "__import__", "globals", "breakpoint",
+    "os.system", "os.popen", "os.remove", "os.unlink", "os.rmdir", "os.removedirs",
+    "os.execv", "os.execve", "os.execl", "os.execlp", "os.execvp", "os.fork", "os.kill",
+    "shutil.rmtree", "shutil.move",
+    "subprocess.run", "subprocess.call", "subprocess.check_call", "subprocess.check_output",
+    "subprocess.Popen", "subprocess.getoutput", "subprocess.getstatusoutput",
+    "importlib.import_module", "ctypes.CDLL", "socket.socket",
+}
+
+# Attribute names used to escape a restricted namespace
+RESTRICTED_ATTRIBUTES = {
+    "__subclasses__", "__globals__", "__builtins__", "__code__", "__closure__",
+    "__getattribute__", "__bases__", "__mro__", "f_globals", "f_locals", "gi_frame",
+}
+
+# Callables that behave like the open() builtin
+OPEN_CALLS = {"open", "io.open", "codecs.open"}
+
+WRITE_MODES = set("wax+")
+SHELL_FRAGMENTS = ("rm -rf",)
+
+# Every finding needs one of these words in the source text once identifiers
+# are NFKC-normalized, as the parser does, so such a source is clean and is
+# not parsed at all
+_TRIGGERS = re.compile("|".join(
+    [r"\b(?:%s)\b" % "|".join(sorted(
+        RESTRICTED_IMPORTS | {name.rsplit(".", 1)[-1] for name in RESTRICTED_CALLS}
+        | RESTRICTED_ATTRIBUTES | {"open", "del"}))]
+    + [re.escape(fragment) for fragment in SHELL_FRAGMENTS]
+))
+
+# Bumped when the scanning logic changes in a way the rule tables do not show
+SCANNER_REVISION = 2
+
+RULES_VERSION = hashlib.sha256(json.dumps([
+    SCANNER_REVISION, sorted(RESTRICTED_IMPORTS), sorted(RESTRICTED_CALLS), sorted(RESTRICTED_ATTRIBUTES),
+    sorted(OPEN_CALLS), sorted(WRITE_MODES), SHELL_FRAGMENTS,
+]).encode()).hexdigest()[:12]
+
+
+class _Visitor(ast.NodeVisitor):
+    """Single walk over a module that records every restricted construct it meets."""
+
+    def __init__(self):
+        self.aliases: Dict[str, str] = {}
+        self.findings: List[str] = []
+
+    def flag(self, node, message):
+        self.findings.append(f"[SECURITY] {message} (line {getattr(node, 'lineno', '?')})")
+
+    def qualified_name(self, node) -> Optional[str]:
+        parts = []
+        while isinstance(node, ast.Attribute):
+            parts.append(node.attr)
+            node = node.value
+        if not isinstance(node, ast.Name):
+            return None
+        parts.append(self.aliases.get(node.id, node.id))
+        name = ".".join(reversed(parts))
+        # builtins.eval is eval
+        return name[len("builtins."):] if name.startswith("builtins.") else name
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            top = alias.name.split(".")[0]
+            if alias.asname:
+                self.aliases[alias.asname] = alias.name
+            else:
+                self.aliases[top] = top  # `import a.b` binds `a`
+            if top in RESTRICTED_IMPORTS:
+                self.flag(node, f"Restricted import: {alias.name}")
+        self.generic_visit(node)
+
+    def visit_ImportFrom(self, node):
+        module = node.module or ""
+        for alias in node.names:
+            self.aliases[alias.asname or alias.name] = f"{module}.{alias.name}" if module else alias.name
+        if module.split(".")[0] in RESTRICTED_IMPORTS:
+            self.flag(node, f"Restricted import: from {module} import {', '.join(a.name for a in node.names)}")
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        name = self.qualified_name(node.func)
+        if name in RESTRICTED_CALLS:
+            self.flag(node, f"Restricted call: {name}()")
+        elif name in OPEN_CALLS and self._opens_for_writing(node):
+            self.flag(node, f"File opened for writing: {name}()")
+        self.generic_visit(node)
+
+    def visit_Attribute(self, node):
+        if node.attr in RESTRICTED_ATTRIBUTES:
+            self.flag(node, f"Restricted attribute access: .{node.attr}")
+        self.generic_visit(node)
+
+    def visit_Name(self, node):
+        if node.id in RESTRICTED_ATTRIBUTES:
+            self.flag(node, f"Restricted name: {node.id}")
+
+    def visit_Delete(self, node):
+        self.flag(node, "del statement")
+        self.generic_visit(node)
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, str):
+            for fragment in SHELL_FRAGMENTS:
+                if fragment in node.value:
+                    self.flag(node, f"Shell command in string: {fragment}")
+
+    @staticmethod
+    def _opens_for_writing(node) -> bool:
+        mode = node.args[1] if len(node.args) > 1 else None
+        for keyword in node.keywords:
+            if keyword.arg == "mode":
+                mode = keyword.value
+        if mode is None:
+            return False
+        if isinstance(mode, ast.Constant) and isinstance(mode.value, str):
+            return bool(WRITE_MODES & set(mode.value))
+        return True  # mode computed at runtime: assume the worst
+
+
+def scan_source(source: str, filename: str = "<plugin>") -> List[str]:
+    """
+    Parses the plugin once and walks the tree a single time.
+
+    :return: Findings as ``[SECURITY] ...`` lines; empty when the plugin is clean.
+        Source that does not parse is reported rather than trusted.
+    """
+    # Python reads `ｅｖａｌ` as `eval`, so the gate must see the normalized text too
+    text = source if source.isascii() else unicodedata.normalize("NFKC", source)
+    if not _TRIGGERS.search(text):
+        return []
+    try:
+        tree = ast.parse(source, filename)
+    except (SyntaxError, ValueError) as e:
+        return [f"[SECURITY] Plugin could not be parsed: {e}"]
+    visitor = _Visitor()
+    visitor.visit(tree)
+    return visitor.findings
+
+
+class PluginScanner:
+    """
+    AST plugin scanner with an on-disk verdict cache.
+
+    Verdicts are stored as ``<cache_dir>/<sha256>.<rules version>.json``, keyed
+    by the SHA-256 of the plugin source, so every caller (loader, installer,
+    test suite) and every process scans a given plugin version once. A change
+    to the rule tables changes RULES_VERSION and with it every cache key.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = "data/plugin_scan_cache", max_workers: Optional[int] = None,
+                 min_parallel: int = 16):
+        """
+        :param cache_dir: Verdict cache directory; None keeps verdicts in memory only.
+        :param max_workers: Processes used by scan_directory().
+        :param min_parallel: Below this many uncached files scan_directory() scans
+            in-process, where pool startup would cost more than it saves.
+        """
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_parallel = min_parallel
+        self._memory: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def digest(source: str) -> str:
+        return hashlib.sha256(source.encode("utf-8", errors="surrogateescape")).hexdigest()
+
+    def scan_source(self, source: str, filename: str = "<plugin>") -> List[str]:
+        sha256 = self.digest(source)
+        findings = self.cached_verdict(sha256)
+        if findings is None:
+            findings = scan_source(source, filename)
+            self.store_verdict(sha256, findings)
+        return findings
+
+    def scan_file(self, path: str) -> List[str]:
+        with open(path, "rb") as f:
+            source = f.read().decode("utf-8", errors="replace")
+        return self.scan_source(source, path)
+
+    def scan_directory(self, directory: str, recursive: bool = False) -> Dict[str, List[str]]:
+        """
+        Scans every ``.py`` file under ``directory``; uncached files are spread over a process pool.
+
+        :return: File path -> findings.
+        """
+        return self.scan_paths(_python_files(directory, recursive))
+
+    def scan_paths(self, paths: Iterable[str]) -> Dict[str, List[str]]:
+        results: Dict[str, List[str]] = {}
+        pending: Dict[str, Tuple[str, str]] = {}  # path -> (sha256, source)
+        for path in paths:
+            with open(path, "rb") as f:
+                source = f.read().decode("utf-8", errors="replace")
+            sha256 = self.digest(source)
+            findings = self.cached_verdict(sha256)
+            if findings is None:
+                pending[path] = (sha256, source)
+            else:
+                results[path] = findings
+
+        # Workers scan the exact text that was hashed, never a re-read of the file,
+        # so a file swapped in between cannot be cached under the other version's hash
+        sources = [source for _, source in pending.values()]
+        if len(pending) >= self.min_parallel and self.max_workers > 1:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                scanned = list(pool.map(scan_source, sources, pending, chunksize=8))
+        else:
+            scanned = [scan_source(source, path) for source, path in zip(sources, pending)]
+
+        for (path, (sha256, _)), findings in zip(pending.items(), scanned):
+            self.store_verdict(sha256, findings)
+            results[path] = findings
+        return results
+
+    def cached_verdict(self, sha256: str) -> Optional[List[str]]:
+        with self._lock:
+            findings = self._memory.get(sha256)
+        if findings is not None or not self.cache_dir:
+            return findings
+        try:
+            with open(self._verdict_path(sha256), "r") as f:
+                findings = json.load(f)["findings"]
+        except (OSError, ValueError, KeyError):
+            return None
+        with self._lock:
+            self._memory[sha256] = findings
+        return findings
+
+    def store_verdict(self, sha256: str, findings: List[str]):
+        with self._lock:
+            self._memory[sha256] = findings
+        if not self.cache_dir:
+            return
+        target = self._verdict_path(sha256)
+        tmp = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump({"sha256": sha256, "rules": RULES_VERSION, "findings": findings}, f)
+            os.replace(tmp, target)
+        except OSError:
+            pass
+
+    def _verdict_path(self, sha256: str) -> str:
+        return os.path.join(self.cache_dir, f"{sha256}.{RULES_VERSION}.json")
+
+
+def _python_files(directory: str, recursive: bool) -> List[str]:
+    if not recursive:
+        return sorted(e.path for e in os.scandir(directory) if e.name.endswith(".py") and e.is_file())
+    return sorted(
+        os.path.join(root, name)
+        for root, _, names in os.walk(directory)
+        for name in names if name.endswith(".py")
+    )
+
+
+_shared_scanner: Optional[PluginScanner] = None
+_shared_lock = threading.Lock()
+
+
+def shared_scanner() -> PluginScanner:
+    """
+    Process-wide scanner used by PluginUtils, PluginLoader, PluginInstaller and
+    PluginTestSuite. ``PLUGIN_SCAN_CACHE_DIR`` overrides the verdict cache location.
+    """
+    global _shared_scanner
+    with _shared_lock:
+        if _shared_scanner is None:
+            _shared_scanner = PluginScanner(cache_dir=os.environ.get("PLUGIN_SCAN_CACHE_DIR", "data/plugin_scan_cache"))
+        return _shared_scanner
@@ -1,25 +1,12 @@
-import re
-import os
+from plugins.plugin_scanner import shared_scanner
 
 class PluginUtils:
-    def __init__(self):
-        self.restricted_patterns = [
-            r'os\.system',
-            r'subprocess\.',
-            r'eval\(',
-            r'exec\(',
-            r'open\(.+, [\'\"]w[\'\"]\)',
-            r'del ',
-            r'rm -rf',
-            r'import (os|sys|shutil|ctypes|socket)'
-        ]
+    def __init__(self, scanner=None):
+        # Single-pass AST scan; verdicts are cached on disk by source SHA-256
+        self.scanner = scanner or shared_scanner()
 
     def scan_code(self, code: str):
-        warnings = []
-        for pattern in self.restricted_patterns:
-            if re.search(pattern, code):
-                warnings.append(f"[SECURITY] Suspicious pattern detected: {pattern}")
-        return warnings
+        return self.scanner.scan_source(code)
 
     def read_plugin_file(self, path: str) -> str:
         with open(path, 'r') as f:
@@ -27,8 +14,10 @@ class PluginUtils:
 
     def audit_plugin(self, path: str):
         print(f"[AUDIT] Scanning plugin: {path}")
-        code = self.read_plugin_file(path)
-        return self.scan_code(code)
+        return self.scanner.scan_file(path)
+
+    def audit_directory(self, directory: str):
+        return self.scanner.scan_directory(directory)
 
 if __name__ == "__main__":
     scanner = PluginUtils()
@@ -4,7 +4,25 @@ import signal
 import sys
 import os
 
+from core.sandbox.worker_pool import SandboxUnavailable, shared_pool
+
 def run_with_limits(plugin_func, timeout=5, mem_limit_mb=100):
+    try:
+        status, value = shared_pool(max_memory_mb=mem_limit_mb).call(plugin_func, timeout=timeout)
+    except SandboxUnavailable:
+        # e.g. a lambda or nested function, which cannot be sent to a pooled worker
+        return _run_in_process(plugin_func, timeout, mem_limit_mb)
+
+    if status == "success":
+        return "done"
+    if status == "error":
+        return f"error: {value}"
+    if status == "timeout":
+        print("[SANDBOX] Plugin exceeded runtime or memory limit. Killing...")
+        return "terminated"
+    return "no response"
+
+def _run_in_process(plugin_func, timeout, mem_limit_mb):
     def set_limits():
         resource.setrlimit(resource.RLIMIT_AS, (mem_limit_mb * 1024 * 1024, resource.RLIM_INFINITY))
         signal.signal(signal.SIGXCPU, signal.SIG_IGN)
@@ -26,7 +26,7 @@ async def cancel_task(args):
     return taskman.cancel_task(int(args[0]))
 
 async def save_queue(args):
-    taskman._save_queue()
+    taskman.compact()
     return {"status": "queue_saved"}
 
 def register():
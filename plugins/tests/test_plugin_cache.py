@@ -0,0 +1,162 @@
+# File: /plugins/tests/test_plugin_cache.py
+
+import marshal
+import os
+
+import pytest
+
+from core.plugin_manager import PluginManager
+from plugins.plugin_cache import PluginCache
+from plugins.plugin_loader import PluginLoader
+from plugins.plugin_scanner import PluginScanner
+from secure_gateway.sandbox import PluginSandbox
+
+PLUGIN = """
+def register():
+    return {{"version": {version}, "file": __file__}}
+"""
+
+
+def write_plugin(directory, name, version=1):
+    path = directory / f"{name}.py"
+    path.write_text(PLUGIN.format(version=version))
+    return str(path)
+
+
+def test_cache_recompiles_only_changed_content(tmp_path):
+    cache = PluginCache()
+    path = write_plugin(tmp_path, "alpha")
+    first = cache.get(path)
+    assert cache.get(path) is first and cache.misses == 1
+
+    # Touched but identical content keeps the compiled code
+    os.utime(path, ns=(first.mtime_ns + 10**9, first.mtime_ns + 10**9))
+    assert cache.get(path).code is first.code and cache.misses == 1
+
+    write_plugin(tmp_path, "alpha", version=2)
+    second = cache.get(path)
+    assert second.sha256 != first.sha256 and cache.misses == 2
+    assert cache.load_module(path, "alpha").register()["version"] == 2
+
+
+def test_audit_runs_once_per_version(tmp_path):
+    cache = PluginCache()
+    path = write_plugin(tmp_path, "alpha")
+    calls = []
+
+    def auditor(source):
+        calls.append(source)
+        return ["finding"] if "version\": 2" in source else []
+
+    assert cache.audit(path, auditor) == [] and cache.audit(path, auditor) == []
+    write_plugin(tmp_path, "alpha", version=2)
+    assert cache.audit(path, auditor) == ["finding"]
+    assert len(calls) == 2
+
+
+def test_compiled_code_persists_across_caches(tmp_path):
+    plugin_dir = tmp_path / "plugins"
+    plugin_dir.mkdir()
+    path = write_plugin(plugin_dir, "alpha")
+    cache_dir = str(tmp_path / "cache")
+    PluginCache(cache_dir=cache_dir, cache_key=b"k").get(path)
+    assert len(os.listdir(cache_dir)) == 1
+
+    fresh = PluginCache(cache_dir=cache_dir, cache_key=b"k")
+    compiled = []
+    fresh._compile = lambda *args: compiled.append(args)
+    assert fresh.load_module(path, "alpha").register()["file"] == path
+    assert compiled == []
+
+
+def test_code_blob_that_fails_verification_is_not_loaded(tmp_path):
+    plugin_dir = tmp_path / "plugins"
+    plugin_dir.mkdir()
+    path = write_plugin(plugin_dir, "alpha")
+    cache_dir = tmp_path / "cache"
+    PluginCache(cache_dir=str(cache_dir), cache_key=b"k").get(path)
+    blob = next(cache_dir.iterdir())
+
+    # A blob swapped in by someone without the key
+    evil = compile("def register():\n    return {'version': 'evil'}\n", path, "exec")
+    blob.write_bytes(bytes(32) + marshal.dumps(evil))
+    assert PluginCache(cache_dir=str(cache_dir), cache_key=b"k").load_module(path, "a1").register()["version"] == 1
+
+    # A valid blob read with another key is recompiled from source too
+    PluginCache(cache_dir=str(cache_dir), cache_key=b"k").get(path)
+    other = PluginCache(cache_dir=str(cache_dir), cache_key=b"other")
+    compile_ = other._compile
+    compiled = []
+    other._compile = lambda *args: compiled.append(args) or compile_(*args)
+    assert other.load_module(path, "a2").register()["version"] == 1
+    assert len(compiled) == 1
+
+
+def test_plugin_manager_lazy_discovery_and_reload(tmp_path):
+    for i in range(20):
+        write_plugin(tmp_path, f"plugin_{i}")
+    manager = PluginManager(plugin_dir=str(tmp_path), lazy=True, cache=PluginCache())
+    manager.load_plugins()
+    assert manager.plugins == {} and len(manager.list_plugins()) == 20
+
+    assert manager.get_plugin("plugin_3")["version"] == 1
+    assert list(manager.plugins) == ["plugin_3"]
+
+    write_plugin(tmp_path, "plugin_3", version=2)
+    assert manager.get_plugin("plugin_3")["version"] == 2
+
+
+def test_plugin_manager_eager_parallel_load_skips_unchanged(tmp_path):
+    for i in range(10):
+        write_plugin(tmp_path, f"plugin_{i}")
+    (tmp_path / "broken.py").write_text("def register(:\n")
+    manager = PluginManager(plugin_dir=str(tmp_path), cache=PluginCache())
+    manager.load_plugins()
+    assert len(manager.plugins) == 10
+
+    before = dict(manager.plugins)
+    write_plugin(tmp_path, "plugin_0", version=2)
+    manager.load_plugins()
+    assert manager.plugins["plugin_0"]["version"] == 2
+    assert all(manager.plugins[name] is before[name] for name in before if name != "plugin_0")
+
+
+def test_loader_and_sandbox_use_cache(tmp_path, monkeypatch):
+    cache = PluginCache()
+    write_plugin(tmp_path, "clean")
+    (tmp_path / "dirty.py").write_text("import os\nos.system('true')\n")
+    loader = PluginLoader(plugin_dir=str(tmp_path), cache=cache, scanner=PluginScanner(cache_dir=None))
+    assert loader.preload() == {}
+    assert loader.load_plugin("clean.py").register()["version"] == 1
+    with pytest.raises(PermissionError):
+        loader.load_plugin("dirty.py")
+
+    monkeypatch.chdir(tmp_path)
+    sandbox = PluginSandbox(allowed_paths=["clean"], cache=cache)
+    assert sandbox.load_plugin("clean.py").register()["version"] == 1
+    assert cache.misses == 2
+
+
+def test_plugin_manager_retries_a_version_that_failed_to_load(tmp_path, monkeypatch):
+    write_plugin(tmp_path, "alpha")
+    cache = PluginCache()
+    manager = PluginManager(plugin_dir=str(tmp_path), lazy=True, cache=cache)
+    manager.load_plugins()
+
+    load_entry = cache.load_entry
+    monkeypatch.setattr(cache, "load_entry", lambda entry, name: 1 / 0)
+    assert manager.get_plugin("alpha") is None
+    monkeypatch.setattr(cache, "load_entry", load_entry)
+    assert manager.get_plugin("alpha")["version"] == 1
+
+
+def test_loader_audits_and_loads_one_entry(tmp_path, monkeypatch):
+    cache = PluginCache()
+    write_plugin(tmp_path, "clean")
+    loader = PluginLoader(plugin_dir=str(tmp_path), cache=cache, scanner=PluginScanner(cache_dir=None))
+    lookups = []
+    get = cache.get
+    monkeypatch.setattr(cache, "get", lambda path: lookups.append(path) or get(path))
+
+    assert loader.load_plugin("clean.py").register()["version"] == 1
+    assert len(lookups) == 1
@@ -0,0 +1,144 @@
+# File: /plugins/tests/test_plugin_scanner.py
+
+import os
+
+import pytest
+
+from plugin_eval.test_suite import PluginTestSuite
+from plugins import plugin_scanner
+from plugins.plugin_scanner import PluginScanner, scan_source
+from plugins.plugin_utils import PluginUtils
+
+DANGEROUS = """
+import os as o
+from subprocess import run as launch
+import json
+
+def handler(path):
+    o.system("ls")
+    launch(["ls"])
+    eval("1 + 1")
+    open(path, "w").write("x")
+    open(path, mode="a+")
+    ().__class__.__bases__[0].__subclasses__()
+    del path
+    return "rm -rf /"
+"""
+
+CLEAN = """
+import json
+
+def load_config(path):
+    with open(path) as f:
+        return json.load(f)
+
+def run(data=None):
+    return {"evaluate": "exec_mode", "data": data}
+"""
+
+
+def test_single_pass_flags_resolved_names():
+    findings = "\n".join(scan_source(DANGEROUS))
+    for expected in ("Restricted import: os", "from subprocess import run", "os.system()",
+                     "subprocess.run()", "eval()", ".__subclasses__", ".__bases__", "del statement", "rm -rf"):
+        assert expected in findings
+    assert findings.count("File opened for writing") == 2
+    assert "(line 7)" in findings
+
+
+def test_clean_plugin_and_unparseable_source():
+    # Words like "exec" or "eval" in names and strings are not calls
+    assert scan_source(CLEAN) == []
+    assert "could not be parsed" in scan_source("def broken(:\n    open(path)\n")[0]
+
+
+def test_verdicts_persist_by_sha256(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "verdicts")
+    plugin = tmp_path / "plugin.py"
+    plugin.write_text(DANGEROUS)
+    first = PluginScanner(cache_dir=cache_dir).scan_file(str(plugin))
+    assert len(os.listdir(cache_dir)) == 1
+
+    # A fresh scanner (e.g. another process) reuses the stored verdict without parsing
+    monkeypatch.setattr(plugin_scanner, "scan_source", lambda *a: pytest.fail("rescanned"))
+    assert PluginScanner(cache_dir=cache_dir).scan_file(str(plugin)) == first
+    assert PluginUtils(PluginScanner(cache_dir=cache_dir)).scan_code(DANGEROUS) == first
+
+
+def test_scan_directory_uses_process_pool_for_misses(tmp_path):
+    plugin_dir = tmp_path / "plugins"
+    plugin_dir.mkdir()
+    for i in range(6):
+        (plugin_dir / f"clean_{i}.py").write_text(CLEAN + f"\nPLUGIN_ID = {i}\n")
+    (plugin_dir / "dangerous.py").write_text(DANGEROUS)
+    scanner = PluginScanner(cache_dir=str(tmp_path / "verdicts"), max_workers=2, min_parallel=2)
+    report = scanner.scan_directory(str(plugin_dir))
+    assert len(report) == 7 and sum(bool(f) for f in report.values()) == 1
+    assert len(os.listdir(tmp_path / "verdicts")) == 7
+    assert scanner.scan_directory(str(plugin_dir)) == report
+
+
+@pytest.mark.parametrize("min_parallel", [1, 100])
+def test_verdict_is_stored_for_the_source_that_was_scanned(tmp_path, min_parallel):
+    plugin = tmp_path / "swapped.py"
+    plugin.write_text(DANGEROUS)
+    scanner = PluginScanner(cache_dir=None, max_workers=2, min_parallel=min_parallel)
+    cached_verdict = scanner.cached_verdict
+
+    def swap_after_hashing(sha256):
+        plugin.write_text(CLEAN)  # replaced between the hash and the scan
+        return cached_verdict(sha256)
+
+    scanner.cached_verdict = swap_after_hashing
+    assert scanner.scan_paths([str(plugin)])[str(plugin)]
+    assert cached_verdict(PluginScanner.digest(DANGEROUS))
+
+
+class _Runner:
+    def run_plugin(self, plugin, entry_function, args):
+        return getattr(plugin, entry_function)(*args)
+
+
+def test_suite_rejects_flagged_plugins(tmp_path):
+    dangerous = tmp_path / "dangerous.py"
+    dangerous.write_text(DANGEROUS)
+    clean = tmp_path / "clean.py"
+    clean.write_text(CLEAN)
+    suite = PluginTestSuite(_Runner(), scanner=PluginScanner(cache_dir=None))
+    assert suite.test_plugin(str(dangerous))["status"] == "audit_failed"
+    assert suite.test_plugin(str(clean))[1]["data"] == "sample input"
+
+
+def test_builtins_module_and_open_variants_are_flagged():
+    source = (
+        "import builtins\nimport io\nimport codecs\nfrom builtins import exec as run_code\n\n"
+        "def handler(path):\n"
+        "    builtins.eval('1')\n"
+        "    builtins.exec('x = 1')\n"
+        "    run_code('y = 2')\n"
+        "    io.open(path, 'w')\n"
+        "    codecs.open(path, mode='a')\n"
+        "    io.open(path)\n"
+    )
+    findings = "\n".join(scan_source(source))
+    assert "Restricted import: builtins" in findings
+    assert "Restricted call: eval() (line 7)" in findings
+    assert "Restricted call: exec() (line 8)" in findings
+    assert "Restricted call: exec() (line 9)" in findings
+    assert "File opened for writing: io.open() (line 10)" in findings
+    assert "File opened for writing: codecs.open() (line 11)" in findings
+    assert "(line 12)" not in findings
+
+
+def test_fullwidth_identifiers_are_normalized_before_the_gate():
+    source = (
+        "import ｓｕｂｐｒｏｃｅｓｓ\n\n"
+        "def handle(payload=None):\n"
+        "    ｅｖａｌ('1')\n"
+        "    return ｓｕｂｐｒｏｃｅｓｓ.ｇｅｔｏｕｔｐｕｔ('echo pwned')\n"
+    )
+    findings = "\n".join(scan_source(source))
+    assert "Restricted import: subprocess" in findings
+    assert "Restricted call: eval() (line 4)" in findings
+    assert "Restricted call: subprocess.getoutput() (line 5)" in findings
+    assert PluginUtils(PluginScanner(cache_dir=None)).scan_code(source)
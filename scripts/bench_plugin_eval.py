@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Plugin evaluation benchmark - the sequential PluginTestSuite / SandboxRunner /
+TrustScorecard.score_plugin loop against plugin_eval.batch_evaluator.
+
+Usage:
+    python scripts/bench_plugin_eval.py --plugins 100 --sleep-ms 20 --workers 4
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from plugin_eval.batch_evaluator import BatchEvaluator  # noqa: E402
+from plugin_eval.sandbox_runner import SandboxRunner  # noqa: E402
+from plugin_eval.test_suite import PluginTestSuite  # noqa: E402
+from plugin_eval.trust_scorecard import TrustScorecard  # noqa: E402
+from plugins.plugin_scanner import PluginScanner  # noqa: E402
+
+PLUGIN = """
+import time
+
+PLUGIN_ID = {n}
+
+def run(data=None):
+    time.sleep({sleep})
+    total = sum(i * i for i in range({work}))
+    return {{"plugin": PLUGIN_ID, "data": data, "total": total}}
+"""
+
+
+def write_plugins(directory: str, count: int, sleep_ms: float, work: int):
+    for n in range(count):
+        with open(os.path.join(directory, f"plugin_{n:04d}.py"), "w") as f:
+            f.write(PLUGIN.format(n=n, sleep=sleep_ms / 1000, work=work))
+
+
+def sequential(paths, database_path, timeout):
+    tester = PluginTestSuite(SandboxRunner(timeout=timeout), scanner=PluginScanner(cache_dir=None))
+    scorecard = TrustScorecard(database_path=database_path)
+    approved = 0
+    for path in paths:
+        score, _ = scorecard.score_plugin(tester.test_plugin(path), path)
+        approved += score >= 80
+    return approved
+
+
+def batch(paths, database_path, timeout, workers):
+    scorecard = TrustScorecard(database_path=database_path)
+    with BatchEvaluator(workers=workers, test_timeout=timeout, scanner=PluginScanner(cache_dir=None),
+                        scorecard=scorecard) as evaluator:
+        report = evaluator.evaluate(paths)
+    return report["summary"]["approved"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sequential vs batch plugin evaluation")
+    parser.add_argument("--plugins", type=int, default=100)
+    parser.add_argument("--sleep-ms", type=float, default=20)
+    parser.add_argument("--work", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--timeout", type=float, default=5)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="bench_plugin_eval_")
+    plugin_dir = os.path.join(root, "plugins")
+    os.makedirs(plugin_dir)
+    write_plugins(plugin_dir, args.plugins, args.sleep_ms, args.work)
+    paths = sorted(os.path.join(plugin_dir, name) for name in os.listdir(plugin_dir))
+    tests = len(paths) * len(PluginTestSuite.DEFAULT_TESTS)
+    print(f"{args.plugins} plugins, {tests} tests, {args.sleep_ms} ms sleep per test, {args.workers} workers")
+
+    try:
+        for label, fn in (
+            ("sequential (process per test)", lambda: sequential(paths, os.path.join(root, "seq.json"),
+                                                                  args.timeout)),
+            ("batch evaluator", lambda: batch(paths, os.path.join(root, "batch.json"), args.timeout,
+                                              args.workers)),
+        ):
+            started = time.perf_counter()
+            approved = fn()
+            elapsed = time.perf_counter() - started
+            print(f"{label:<32} {elapsed:7.2f} s  {tests / elapsed:8.1f} tests/s  approved {approved}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
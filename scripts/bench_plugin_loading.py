@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Plugin loading benchmark - cold start, warm reload and lazy discovery of a
+directory of generated plugins through core.plugin_manager.PluginManager.
+
+Usage:
+    python scripts/bench_plugin_loading.py --plugins 500 --functions 40
+"""
+
+import argparse
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.plugin_manager import PluginManager  # noqa: E402
+from plugins.plugin_cache import PluginCache  # noqa: E402
+
+FUNCTION = '''
+def handler_{i}(data):
+    """Handler {i}."""
+    total = 0
+    for item in data.get("items", []):
+        if isinstance(item, dict) and item.get("kind") == "k{i}":
+            total += item.get("value", 0) * {i}
+    return {{"handler": {i}, "total": total}}
+'''
+
+
+def write_plugins(directory: str, count: int, functions: int):
+    body = "".join(FUNCTION.format(i=i) for i in range(functions))
+    handlers = ", ".join(f'"h{i}": handler_{i}' for i in range(functions))
+    for n in range(count):
+        with open(os.path.join(directory, f"plugin_{n:04d}.py"), "w") as f:
+            # Distinct content per plugin, so no two files share a cache entry
+            f.write(f"PLUGIN_ID = {n}\n{body}\n\ndef register():\n    return {{{handlers}}}\n")
+
+
+def baseline_load(directory: str) -> int:
+    """The previous PluginManager.load_plugins loop, without logging."""
+    loaded = 0
+    for filename in os.listdir(directory):
+        if filename.endswith(".py") and not filename.startswith("__"):
+            spec = importlib.util.spec_from_file_location(filename[:-3], os.path.join(directory, filename))
+            mod = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(mod)
+            loaded += bool(mod.register())
+    return loaded
+
+
+def timed(label, fn):
+    started = time.perf_counter()
+    result = fn()
+    print(f"{label:<40} {(time.perf_counter() - started) * 1000:9.1f} ms  ({result})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plugin cache / lazy discovery benchmark")
+    parser.add_argument("--plugins", type=int, default=500)
+    parser.add_argument("--functions", type=int, default=40)
+    args = parser.parse_args()
+
+    import logging
+    logging.getLogger("AIOS").setLevel(logging.WARNING)
+
+    root = tempfile.mkdtemp(prefix="bench_plugin_loading_")
+    plugin_dir = os.path.join(root, "plugins")
+    cache_dir = os.path.join(root, "cache")
+    os.makedirs(plugin_dir)
+    write_plugins(plugin_dir, args.plugins, args.functions)
+    sys.dont_write_bytecode = True  # keep __pycache__ out of the baseline numbers
+    print(f"{args.plugins} plugins x {args.functions} functions")
+
+    def eager(cache):
+        manager = PluginManager(plugin_dir=plugin_dir, cache=cache)
+        manager.load_plugins()
+        return f"{len(manager.plugins)} loaded"
+
+    try:
+        timed("baseline (read + compile + exec)", lambda: baseline_load(plugin_dir))
+        cache = PluginCache(cache_dir=cache_dir)
+        timed("cached, cold (hash + compile)", lambda: eager(cache))
+        timed("cached, new process (disk code)", lambda: eager(PluginCache(cache_dir=cache_dir)))
+
+        manager = PluginManager(plugin_dir=plugin_dir, cache=cache)
+        manager.load_plugins()
+        timed("reload, nothing changed", lambda: (manager.load_plugins(), "stat only")[1])
+
+        lazy = PluginManager(plugin_dir=plugin_dir, lazy=True, cache=PluginCache(cache_dir=cache_dir))
+        timed("lazy discovery", lambda: (lazy.load_plugins(), f"{len(lazy.list_plugins())} found")[1])
+        timed("lazy first get_plugin", lambda: f"{len(lazy.get_plugin('plugin_0000'))} handlers")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
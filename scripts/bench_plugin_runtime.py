@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Plugin runtime benchmark - compares spawn-per-call with the persistent Node
+and Bash runtime hosts of plugin_runtime.PluginExecutor.
+
+Usage:
+    python scripts/bench_plugin_runtime.py --calls 200 --concurrency 8 --pool-size 2
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from plugin_runtime.executor import PluginExecutor  # noqa: E402
+
+NODE_PLUGIN = """
+"use persistent";
+module.exports = function (args) {
+  return "hello " + args.name;
+};
+
+if (require.main === module) {
+  let data = "";
+  process.stdin.on("data", (chunk) => (data += chunk));
+  process.stdin.on("end", () => process.stdout.write(module.exports(JSON.parse(data))));
+}
+"""
+
+BASH_PLUGIN = """#!/bin/bash
+echo "hello ${1#name=}"
+"""
+
+
+def write_plugins(directory: str) -> dict:
+    plugins = {"node": os.path.join(directory, "hello.js"), "bash": os.path.join(directory, "hello.sh")}
+    for runtime, source in (("node", NODE_PLUGIN), ("bash", BASH_PLUGIN)):
+        with open(plugins[runtime], "w") as f:
+            f.write(source)
+        os.chmod(plugins[runtime], 0o755)
+    return plugins
+
+
+def bench(executor: PluginExecutor, runtime: str, path: str, calls: int, concurrency: int) -> dict:
+    expected = "hello bench"
+    assert executor.execute(path, runtime, {"name": "bench"}).strip() == expected  # warm-up / sanity check
+
+    latencies = []
+
+    def one(_):
+        started = time.perf_counter()
+        output = executor.execute(path, runtime, {"name": "bench"})
+        latencies.append(time.perf_counter() - started)
+        return output.strip() == expected
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        ok = sum(pool.map(one, range(calls)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "calls_per_s": calls / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "ok": ok,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spawn-per-call vs persistent plugin runtimes")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--pool-size", type=int, default=1)
+    parser.add_argument("--runtimes", nargs="+", default=["node", "bash"])
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="bench_plugins_")
+    plugins = write_plugins(directory)
+    print(f"{args.calls} calls, concurrency {args.concurrency}, pool size {args.pool_size}")
+    try:
+        for runtime in args.runtimes:
+            if shutil.which(runtime) is None:
+                print(f"{runtime}: not installed, skipped")
+                continue
+            for persistent in (False, True):
+                executor = PluginExecutor(pool_sizes={runtime: args.pool_size}, persistent=persistent)
+                try:
+                    result = bench(executor, runtime, plugins[runtime], args.calls, args.concurrency)
+                finally:
+                    executor.close()
+                mode = "persistent" if persistent else "spawn"
+                print(f"{runtime:<5} {mode:<10} {result['calls_per_s']:9.1f} calls/s  "
+                      f"p50 {result['p50_ms']:7.2f} ms  p95 {result['p95_ms']:7.2f} ms  "
+                      f"ok {result['ok']}/{args.calls}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Plugin scanner benchmark - the previous eight-regex PluginUtils.scan_code
+against the single-pass AST scanner, sequential, over a process pool, and
+from the SHA-256 verdict cache.
+
+Usage:
+    python scripts/bench_plugin_scanner.py --plugins 400 --functions 60 --workers 4
+"""
+
+import argparse
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from plugins.plugin_scanner import PluginScanner, scan_source  # noqa: E402
+
+REGEX_PATTERNS = [
+    r'os\.system', r'subprocess\.', r'eval\(', r'exec\(', r'open\(.+, [\'\"]w[\'\"]\)',
+    r'del ', r'rm -rf', r'import (os|sys|shutil|ctypes|socket)',
+]
+
+FUNCTION = '''
+def handler_{i}(data, path=None):
+    """Handler {i} for the generated plugin."""
+    results = []
+    for index, item in enumerate(data.get("items", [])):
+        if isinstance(item, dict) and item.get("kind") == "k{i}":
+            results.append({{"index": index, "value": item.get("value", 0) * {i}}})
+    return results
+'''
+
+FILE_READER = '''
+def read_input(path):
+    with open(path) as f:
+        return json.load(f)
+'''
+
+
+def regex_scan(code: str):
+    return [f"[SECURITY] Suspicious pattern detected: {p}" for p in REGEX_PATTERNS if re.search(p, code)]
+
+
+def write_plugins(directory: str, count: int, functions: int):
+    body = "".join(FUNCTION.format(i=i) for i in range(functions))
+    for n in range(count):
+        # Every fourth plugin reads files, which the scanner has to parse to clear
+        extra = FILE_READER if n % 4 == 0 else ""
+        with open(os.path.join(directory, f"plugin_{n:04d}.py"), "w") as f:
+            f.write(f"import json\nPLUGIN_ID = {n}\n{body}{extra}")
+
+
+def timed(label, fn):
+    started = time.perf_counter()
+    result = fn()
+    print(f"{label:<36} {(time.perf_counter() - started) * 1000:9.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regex vs AST plugin scanning")
+    parser.add_argument("--plugins", type=int, default=400)
+    parser.add_argument("--functions", type=int, default=60)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="bench_plugin_scanner_")
+    plugin_dir = os.path.join(root, "plugins")
+    os.makedirs(plugin_dir)
+    write_plugins(plugin_dir, args.plugins, args.functions)
+    paths = sorted(os.path.join(plugin_dir, name) for name in os.listdir(plugin_dir))
+    sources = [open(path).read() for path in paths]
+    print(f"{args.plugins} plugins x {args.functions} functions, {args.workers} workers")
+
+    try:
+        timed("regex scan_code (previous)", lambda: [regex_scan(s) for s in sources])
+        timed("ast scan, sequential", lambda: [scan_source(s) for s in sources])
+        cold = PluginScanner(cache_dir=os.path.join(root, "verdicts"), max_workers=args.workers)
+        timed("ast scan_directory, process pool", lambda: cold.scan_directory(plugin_dir))
+        warm = PluginScanner(cache_dir=os.path.join(root, "verdicts"))
+        timed("scan_directory, disk verdict cache", lambda: warm.scan_directory(plugin_dir))
+        timed("scan_directory, memory verdict cache", lambda: warm.scan_directory(plugin_dir))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
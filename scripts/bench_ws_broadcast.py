@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+WebSocket broadcast benchmark - compares the old sequential fan-out with the
+queued, topic-routed WebSocketManager using simulated clients.
+
+Usage:
+    python scripts/bench_ws_broadcast.py --clients 5000 --messages 50
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.realtime.websocket.manager import WebSocketManager  # noqa: E402
+
+
+class SimulatedClient:
+    def __init__(self, index: int, latency: float):
+        self.remote_address = ("sim", index)
+        self.latency = latency
+        self.received = 0
+
+    async def send(self, msg):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.received += 1
+
+    async def close(self):
+        pass
+
+
+def make_clients(count: int, slow_ratio: float, slow_latency: float):
+    rng = random.Random(42)
+    return [
+        SimulatedClient(i, slow_latency if rng.random() < slow_ratio else 0.0)
+        for i in range(count)
+    ]
+
+
+async def bench_sequential(clients, messages: int) -> float:
+    """The original broadcast: await every client's send in turn."""
+    start = time.perf_counter()
+    for n in range(messages):
+        msg = f'{{"seq": {n}}}'
+        for client in clients:
+            await client.send(msg)
+    return time.perf_counter() - start
+
+
+async def bench_queued(clients, messages: int, topics: int) -> dict:
+    manager = WebSocketManager(max_queue=messages + 1, send_timeout=1.0)
+    for index, client in enumerate(clients):
+        await manager.register(client)
+        if topics:
+            manager.subscribe(client, [f"agent.{index % topics}.#"])
+
+    start = time.perf_counter()
+    enqueue_time = 0.0
+    for n in range(messages):
+        topic = f"agent.{n % topics}.status" if topics else None
+        t0 = time.perf_counter()
+        await manager.broadcast({"seq": n}, topic=topic)
+        enqueue_time += time.perf_counter() - t0
+    await manager.flush()
+    total = time.perf_counter() - start
+
+    for client in clients:
+        await manager.unregister(client)
+    return {"total": total, "enqueue": enqueue_time, "evicted": manager.evicted}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=5000)
+    parser.add_argument("--messages", type=int, default=50)
+    parser.add_argument("--slow-ratio", type=float, default=0.01, help="fraction of clients with slow sends")
+    parser.add_argument("--slow-latency", type=float, default=0.002, help="seconds per send for slow clients")
+    parser.add_argument("--topics", type=int, default=10, help="topic partitions for the routed run (0 = broadcast to all)")
+    parser.add_argument("--skip-sequential", action="store_true")
+    args = parser.parse_args()
+
+    print(f"clients={args.clients} messages={args.messages} slow={args.slow_ratio:.1%}@{args.slow_latency * 1000:.1f}ms")
+
+    if not args.skip_sequential:
+        elapsed = await bench_sequential(make_clients(args.clients, args.slow_ratio, args.slow_latency), args.messages)
+        print(f"sequential    : {elapsed:8.3f}s total, {elapsed / args.messages * 1000:8.2f} ms/message")
+
+    for label, topics in (("queued (all)", 0), (f"queued ({args.topics} topics)", args.topics)):
+        result = await bench_queued(make_clients(args.clients, args.slow_ratio, args.slow_latency), args.messages, topics)
+        print(
+            f"{label:<14}: {result['total']:8.3f}s total, "
+            f"{result['enqueue'] / args.messages * 1000:8.2f} ms/message publisher-side, "
+            f"evicted={result['evicted']}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
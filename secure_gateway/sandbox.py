@@ -1,9 +1,10 @@
-import importlib.util
 import os
+from plugins.plugin_cache import shared_cache
 
 class PluginSandbox:
-    def __init__(self, allowed_paths=None):
+    def __init__(self, allowed_paths=None, cache=None):
         self.allowed_paths = allowed_paths or ["plugins/", "tasks/"]
+        self.cache = cache or shared_cache()
 
     def is_safe(self, path):
         return any(path.startswith(ap) for ap in self.allowed_paths)
@@ -14,10 +15,7 @@ class PluginSandbox:
         if not os.path.exists(path):
             raise FileNotFoundError("Plugin not found.")
         
-        spec = importlib.util.spec_from_file_location("plugin", path)
-        plugin = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(plugin)
-        return plugin
+        return self.cache.load_module(path, "plugin")
 
 if __name__ == "__main__":
     sb = PluginSandbox()